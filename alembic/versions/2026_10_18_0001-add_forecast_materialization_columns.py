@@ -0,0 +1,31 @@
+"""add_forecast_materialization_columns
+
+Revision ID: forecast_materialization_001
+Revises: fix_confidence_precision_001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'forecast_materialization_001'
+down_revision: Union[str, None] = 'fix_confidence_precision_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('forecast_results', sa.Column('best_model', sa.String(50), nullable=True))
+    op.add_column('forecast_results', sa.Column('data_watermark', sa.Date(), nullable=True))
+    op.create_index(
+        'idx_forecast_results_lookup',
+        'forecast_results',
+        ['tenant_id', 'product_id', 'forecast_horizon_days']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_forecast_results_lookup', table_name='forecast_results')
+    op.drop_column('forecast_results', 'data_watermark')
+    op.drop_column('forecast_results', 'best_model')
@@ -0,0 +1,44 @@
+"""add_product_equivalence_table
+
+Revision ID: product_equivalence_001
+Revises: forecast_materialization_001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'product_equivalence_001'
+down_revision: Union[str, None] = 'forecast_materialization_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tenants.id and products.id are native UUID on PostgreSQL (fix_uuid_types_001)
+UUID = sa.String(36).with_variant(postgresql.UUID(as_uuid=True), 'postgresql')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_equivalence',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('tenant_id', UUID, nullable=False),
+        sa.Column('product_id', UUID, nullable=False),
+        sa.Column('competitor_product_id', UUID, nullable=False),
+        sa.Column('confidence', sa.Float(), nullable=False),
+        sa.Column('mapping_type', sa.String(50), nullable=False),
+        sa.Column('matched_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['competitor_product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('tenant_id', 'product_id', 'competitor_product_id', name='uq_product_equivalence_pair'),
+    )
+    op.create_index('idx_product_equivalence_product', 'product_equivalence', ['tenant_id', 'product_id'])
+    op.create_index('idx_product_equivalence_competitor', 'product_equivalence', ['tenant_id', 'competitor_product_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_product_equivalence_competitor', table_name='product_equivalence')
+    op.drop_index('idx_product_equivalence_product', table_name='product_equivalence')
+    op.drop_table('product_equivalence')
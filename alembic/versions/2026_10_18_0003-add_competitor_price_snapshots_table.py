@@ -0,0 +1,52 @@
+"""add_competitor_price_snapshots_table
+
+Revision ID: competitor_price_snapshot_001
+Revises: product_equivalence_001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'competitor_price_snapshot_001'
+down_revision: Union[str, None] = 'product_equivalence_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tenants.id and products.id are native UUID on PostgreSQL (fix_uuid_types_001)
+UUID = sa.String(36).with_variant(postgresql.UUID(as_uuid=True), 'postgresql')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'competitor_price_snapshots',
+        sa.Column('id', UUID, primary_key=True),
+        sa.Column('tenant_id', UUID, nullable=False),
+        sa.Column('product_id', UUID, nullable=False),
+        sa.Column('category', sa.String(255), nullable=True),
+        sa.Column('our_price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('competitor_count', sa.Integer(), nullable=False),
+        sa.Column('min_price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('max_price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('avg_price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('price_position', sa.String(20), nullable=False),
+        sa.Column('price_gap_percentage', sa.Float(), nullable=False),
+        sa.Column('potential_revenue_gain', sa.Float(), nullable=False),
+        sa.Column('active_promotions', sa.Integer(), nullable=False),
+        sa.Column('competitor_prices', sa.JSON(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('tenant_id', 'product_id', name='uq_competitor_price_snapshot_product'),
+    )
+    op.create_index(
+        'idx_competitor_price_snapshot_category', 'competitor_price_snapshots',
+        ['tenant_id', 'category', 'product_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_competitor_price_snapshot_category', table_name='competitor_price_snapshots')
+    op.drop_table('competitor_price_snapshots')
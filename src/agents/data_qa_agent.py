@@ -1,11 +1,18 @@
 """Data Quality Assurance Agent - Layer 0 of Tiered Intelligence"""
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
-from statistics import mean, stdev
-from collections import Counter
+from datetime import datetime
 from uuid import UUID
-import re
 
+import numpy as np
+
+from src.processing.quality_columns import (
+    ProductColumns,
+    ReviewColumns,
+    age_in_days,
+    contains_any,
+    count_duplicated_values,
+    older_than
+)
 from src.schemas.product import ProductResponse
 from src.schemas.review import ReviewResponse
 from src.schemas.data_quality import (
@@ -71,22 +78,37 @@ class DataQAAgent:
         if not products:
             return self._create_empty_report()
         
+        # Extract the assessed fields once; every check is vectorized over the columns
+        return self.assess_product_columns(
+            ProductColumns.from_products(products, self.required_product_fields)
+        )
+    
+    def assess_product_columns(self, columns: ProductColumns) -> DataQualityReport:
+        """
+        Assess quality of product data already extracted into columns.
+        
+        Args:
+            columns: Product columns (at least one product)
+            
+        Returns:
+            Complete data quality report
+        """
         # Assess each dimension
-        completeness = self._assess_product_completeness(products)
-        validity = self._assess_product_validity(products)
-        freshness = self._assess_product_freshness(products)
-        consistency = self._assess_product_consistency(products)
-        accuracy = self._assess_product_accuracy(products)
+        completeness = self._assess_product_completeness(columns)
+        validity = self._assess_product_validity(columns)
+        freshness = self._assess_product_freshness(columns)
+        consistency = self._assess_product_consistency(columns)
+        accuracy = self._assess_product_accuracy(columns)
         
         # Detect anomalies
-        anomalies = self._detect_product_anomalies(products)
+        anomalies = self._detect_product_anomalies(columns)
         
         # Identify missing data
-        missing_data = self._identify_missing_product_data(products)
+        missing_data = self._identify_missing_product_data(columns)
         
         # Generate recommendations
         recommendations = self._generate_product_recommendations(
-            anomalies, missing_data, products
+            anomalies, missing_data, columns
         )
         
         # Calculate overall score (weighted average)
@@ -110,7 +132,7 @@ class DataQAAgent:
             anomalies=anomalies,
             missing_data=missing_data,
             recommendations=recommendations,
-            entities_assessed=len(products),
+            entities_assessed=len(columns),
             assessment_timestamp=datetime.utcnow().isoformat()
         )
     
@@ -130,22 +152,34 @@ class DataQAAgent:
         if not reviews:
             return self._create_empty_report()
         
+        return self.assess_review_columns(ReviewColumns.from_reviews(reviews))
+    
+    def assess_review_columns(self, columns: ReviewColumns) -> DataQualityReport:
+        """
+        Assess quality of review data already extracted into columns.
+        
+        Args:
+            columns: Review columns (at least one review)
+            
+        Returns:
+            Complete data quality report
+        """
         # Assess each dimension
-        completeness = self._assess_review_completeness(reviews)
-        validity = self._assess_review_validity(reviews)
-        freshness = self._assess_review_freshness(reviews)
-        consistency = self._assess_review_consistency(reviews)
-        accuracy = self._assess_review_accuracy(reviews)
+        completeness = self._assess_review_completeness(columns)
+        validity = self._assess_review_validity(columns)
+        freshness = self._assess_review_freshness(columns)
+        consistency = self._assess_review_consistency(columns)
+        accuracy = self._assess_review_accuracy(columns)
         
         # Detect anomalies
-        anomalies = self._detect_review_anomalies(reviews)
+        anomalies = self._detect_review_anomalies(columns)
         
         # Identify missing data
-        missing_data = self._identify_missing_review_data(reviews)
+        missing_data = self._identify_missing_review_data(columns)
         
         # Generate recommendations
         recommendations = self._generate_review_recommendations(
-            anomalies, missing_data, reviews
+            anomalies, missing_data, columns
         )
         
         # Calculate overall score
@@ -169,7 +203,7 @@ class DataQAAgent:
             anomalies=anomalies,
             missing_data=missing_data,
             recommendations=recommendations,
-            entities_assessed=len(reviews),
+            entities_assessed=len(columns),
             assessment_timestamp=datetime.utcnow().isoformat()
         )
     
@@ -211,35 +245,20 @@ class DataQAAgent:
     
     # ==================== Product Assessment Methods ====================
     
-    def _assess_product_completeness(self, products: List[ProductResponse]) -> QualityDimension:
+    def _assess_product_completeness(self, columns: ProductColumns) -> QualityDimension:
         """Assess completeness of product data"""
         total_fields = len(self.required_product_fields) + 3  # + optional fields
-        scores = []
-        issues_count = 0
         
-        for product in products:
-            present_fields = 0
-            
-            # Check required fields
-            for field in self.required_product_fields:
-                if getattr(product, field, None) is not None:
-                    present_fields += 1
-            
-            # Check optional but important fields
-            if product.category:
-                present_fields += 1
-            if product.inventory_level is not None:
-                present_fields += 1
-            if product.metadata:
-                present_fields += 1
-            
-            score = present_fields / total_fields
-            scores.append(score)
-            
-            if score < 0.8:
-                issues_count += 1
-        
-        avg_score = mean(scores) if scores else 0.0
+        # Required fields plus optional but important fields
+        present_fields = (
+            columns.required_present
+            + columns.has_category
+            + ~np.isnan(columns.inventory)
+            + columns.has_metadata
+        )
+        scores = present_fields / total_fields
+        issues_count = int(np.count_nonzero(scores < 0.8))
+        avg_score = float(scores.mean()) if len(scores) else 0.0
         
         return QualityDimension(
             score=avg_score,
@@ -247,28 +266,16 @@ class DataQAAgent:
             details=f"{issues_count} products with incomplete data"
         )
     
-    def _assess_product_validity(self, products: List[ProductResponse]) -> QualityDimension:
+    def _assess_product_validity(self, columns: ProductColumns) -> QualityDimension:
         """Assess validity of product data"""
-        issues_count = 0
-        
-        for product in products:
-            # Check price validity
-            if product.price <= 0:
-                issues_count += 1
-            
-            # Check SKU format
-            if not product.sku or len(product.sku) < 3:
-                issues_count += 1
-            
-            # Check currency code
-            if len(product.currency) != 3:
-                issues_count += 1
-            
-            # Check inventory
-            if product.inventory_level is not None and product.inventory_level < 0:
-                issues_count += 1
+        issues_count = int(
+            np.count_nonzero(columns.price <= 0)              # Price validity
+            + np.count_nonzero(columns.sku_length < 3)        # SKU format
+            + np.count_nonzero(columns.currency_length != 3)  # Currency code
+            + np.count_nonzero(columns.inventory < 0)         # Inventory
+        )
         
-        score = max(0.0, 1.0 - (issues_count / len(products)))
+        score = max(0.0, 1.0 - (issues_count / len(columns)))
         
         return QualityDimension(
             score=score,
@@ -276,19 +283,11 @@ class DataQAAgent:
             details=f"{issues_count} validation issues found"
         )
     
-    def _assess_product_freshness(self, products: List[ProductResponse]) -> QualityDimension:
+    def _assess_product_freshness(self, columns: ProductColumns) -> QualityDimension:
         """Assess freshness of product data"""
-        now = datetime.utcnow()
-        threshold = timedelta(days=self.freshness_threshold_days)
-        stale_count = 0
-        
-        for product in products:
-            if product.updated_at:
-                age = now - product.updated_at
-                if age > threshold:
-                    stale_count += 1
+        stale_count = int(np.count_nonzero(older_than(columns.ages, self.freshness_threshold_days)))
         
-        score = max(0.0, 1.0 - (stale_count / len(products)))
+        score = max(0.0, 1.0 - (stale_count / len(columns)))
         
         return QualityDimension(
             score=score,
@@ -296,23 +295,14 @@ class DataQAAgent:
             details=f"{stale_count} products with stale data (>{self.freshness_threshold_days} days)"
         )
     
-    def _assess_product_consistency(self, products: List[ProductResponse]) -> QualityDimension:
+    def _assess_product_consistency(self, columns: ProductColumns) -> QualityDimension:
         """Assess consistency of product data"""
-        issues_count = 0
+        # Duplicate SKUs and inconsistent naming
+        duplicates = count_duplicated_values(columns.sku)
+        duplicate_names = count_duplicated_values(columns.name_lower)
+        issues_count = duplicates + duplicate_names
         
-        # Check for duplicate SKUs
-        skus = [p.sku for p in products]
-        sku_counts = Counter(skus)
-        duplicates = sum(1 for count in sku_counts.values() if count > 1)
-        issues_count += duplicates
-        
-        # Check for inconsistent naming
-        names = [p.name.lower() for p in products]
-        name_counts = Counter(names)
-        duplicate_names = sum(1 for count in name_counts.values() if count > 1)
-        issues_count += duplicate_names
-        
-        score = max(0.0, 1.0 - (issues_count / len(products)))
+        score = max(0.0, 1.0 - (issues_count / len(columns)))
         
         return QualityDimension(
             score=score,
@@ -320,21 +310,17 @@ class DataQAAgent:
             details=f"{duplicates} duplicate SKUs, {duplicate_names} duplicate names"
         )
     
-    def _assess_product_accuracy(self, products: List[ProductResponse]) -> QualityDimension:
+    def _assess_product_accuracy(self, columns: ProductColumns) -> QualityDimension:
         """Assess accuracy of product data (based on heuristics)"""
-        issues_count = 0
+        # Suspiciously round prices (might be placeholders) are a soft warning
+        round_prices = np.count_nonzero((columns.price % 100 == 0) & (columns.price > 100))
         
-        for product in products:
-            # Check for suspiciously round prices (might be placeholders)
-            if product.price % 100 == 0 and product.price > 100:
-                issues_count += 0.5  # Soft warning
-            
-            # Check for generic names
-            generic_terms = ['product', 'item', 'test', 'sample', 'demo']
-            if any(term in product.name.lower() for term in generic_terms):
-                issues_count += 1
+        # Generic names
+        generic_terms = ['product', 'item', 'test', 'sample', 'demo']
+        generic_names = np.count_nonzero(contains_any(columns.name_lower, generic_terms))
         
-        score = max(0.0, 1.0 - (issues_count / len(products)))
+        issues_count = 0.5 * round_prices + generic_names
+        score = max(0.0, 1.0 - (issues_count / len(columns)))
         
         return QualityDimension(
             score=score,
@@ -342,49 +328,50 @@ class DataQAAgent:
             details=f"{int(issues_count)} potential accuracy issues"
         )
     
-    def _detect_product_anomalies(self, products: List[ProductResponse]) -> List[Anomaly]:
+    def _detect_product_anomalies(self, columns: ProductColumns) -> List[Anomaly]:
         """Detect anomalies in product data"""
         anomalies = []
         
-        if len(products) < 3:
+        if len(columns) < 3:
             return anomalies  # Need more data for statistical analysis
         
-        # Price outlier detection
-        prices = [float(p.price) for p in products]
-        price_mean = mean(prices)
-        price_std = stdev(prices) if len(prices) > 1 else 0
+        # Price outlier detection (z-scores of all prices at once)
+        prices = columns.price
+        price_mean = float(prices.mean())
+        price_std = float(prices.std(ddof=1))
         
         if price_std > 0:
-            for product in products:
-                z_score = abs((float(product.price) - price_mean) / price_std)
-                if z_score > self.price_outlier_threshold:
-                    anomalies.append(Anomaly(
-                        type="price_outlier",
-                        severity="medium" if z_score < 4 else "high",
-                        description=f"Price ${product.price} is {z_score:.1f} std devs from mean ${price_mean:.2f}",
-                        affected_entities=[str(product.id)],
-                        confidence=min(0.95, z_score / 5.0)
-                    ))
+            z_scores = np.abs((prices - price_mean) / price_std)
+            for index in np.flatnonzero(z_scores > self.price_outlier_threshold):
+                product = columns.products[index]
+                z_score = float(z_scores[index])
+                anomalies.append(Anomaly(
+                    type="price_outlier",
+                    severity="medium" if z_score < 4 else "high",
+                    description=f"Price ${product.price} is {z_score:.1f} std devs from mean ${price_mean:.2f}",
+                    affected_entities=columns.entity_ids([index]),
+                    confidence=min(0.95, z_score / 5.0)
+                ))
         
         # Zero inventory detection
-        zero_inventory = [p for p in products if p.inventory_level == 0]
-        if len(zero_inventory) > len(products) * 0.5:
+        zero_inventory = np.flatnonzero(columns.inventory == 0)
+        if len(zero_inventory) > len(columns) * 0.5:
             anomalies.append(Anomaly(
                 type="high_out_of_stock_rate",
                 severity="high",
-                description=f"{len(zero_inventory)} products out of stock ({len(zero_inventory)/len(products)*100:.1f}%)",
-                affected_entities=[str(p.id) for p in zero_inventory],
+                description=f"{len(zero_inventory)} products out of stock ({len(zero_inventory)/len(columns)*100:.1f}%)",
+                affected_entities=columns.entity_ids(zero_inventory),
                 confidence=0.9
             ))
         
         return anomalies
     
-    def _identify_missing_product_data(self, products: List[ProductResponse]) -> List[MissingData]:
+    def _identify_missing_product_data(self, columns: ProductColumns) -> List[MissingData]:
         """Identify missing product data"""
         missing = []
         
         # Check for missing categories
-        no_category = sum(1 for p in products if not p.category)
+        no_category = int(np.count_nonzero(~columns.has_category))
         if no_category > 0:
             missing.append(MissingData(
                 field="category",
@@ -394,7 +381,7 @@ class DataQAAgent:
             ))
         
         # Check for missing inventory data
-        no_inventory = sum(1 for p in products if p.inventory_level is None)
+        no_inventory = int(np.count_nonzero(np.isnan(columns.inventory)))
         if no_inventory > 0:
             missing.append(MissingData(
                 field="inventory_level",
@@ -407,17 +394,15 @@ class DataQAAgent:
     
     # ==================== Review Assessment Methods ====================
     
-    def _assess_review_completeness(self, reviews: List[ReviewResponse]) -> QualityDimension:
+    def _assess_review_completeness(self, columns: ReviewColumns) -> QualityDimension:
         """Assess completeness of review data"""
-        issues_count = 0
-        
-        for review in reviews:
-            if not review.text or len(review.text) < 10:
-                issues_count += 1
-            if not review.rating or review.rating < 1 or review.rating > 5:
-                issues_count += 1
+        rating = columns.rating
+        issues_count = int(
+            np.count_nonzero(columns.text_length < 10)
+            + np.count_nonzero(np.isnan(rating) | (rating < 1) | (rating > 5))
+        )
         
-        score = max(0.0, 1.0 - (issues_count / (len(reviews) * 2)))
+        score = max(0.0, 1.0 - (issues_count / (len(columns) * 2)))
         
         return QualityDimension(
             score=score,
@@ -425,20 +410,16 @@ class DataQAAgent:
             details=f"{issues_count} incomplete reviews"
         )
     
-    def _assess_review_validity(self, reviews: List[ReviewResponse]) -> QualityDimension:
+    def _assess_review_validity(self, columns: ReviewColumns) -> QualityDimension:
         """Assess validity of review data"""
-        issues_count = 0
-        
-        for review in reviews:
-            # Check rating range
-            if review.rating < 1 or review.rating > 5:
-                issues_count += 1
-            
-            # Check text length (too short or suspiciously long)
-            if len(review.text) < 5 or len(review.text) > 5000:
-                issues_count += 1
+        issues_count = int(
+            # Rating range
+            np.count_nonzero((columns.rating < 1) | (columns.rating > 5))
+            # Text length (too short or suspiciously long)
+            + np.count_nonzero((columns.text_length < 5) | (columns.text_length > 5000))
+        )
         
-        score = max(0.0, 1.0 - (issues_count / len(reviews)))
+        score = max(0.0, 1.0 - (issues_count / len(columns)))
         
         return QualityDimension(
             score=score,
@@ -446,19 +427,11 @@ class DataQAAgent:
             details=f"{issues_count} invalid reviews"
         )
     
-    def _assess_review_freshness(self, reviews: List[ReviewResponse]) -> QualityDimension:
+    def _assess_review_freshness(self, columns: ReviewColumns) -> QualityDimension:
         """Assess freshness of review data"""
-        now = datetime.utcnow()
-        threshold = timedelta(days=90)  # Reviews older than 90 days
-        old_count = 0
-        
-        for review in reviews:
-            if review.created_at:
-                age = now - review.created_at
-                if age > threshold:
-                    old_count += 1
+        old_count = int(np.count_nonzero(older_than(columns.ages, 90)))  # Reviews older than 90 days
         
-        score = max(0.0, 1.0 - (old_count / len(reviews)))
+        score = max(0.0, 1.0 - (old_count / len(columns)))
         
         return QualityDimension(
             score=score,
@@ -466,23 +439,17 @@ class DataQAAgent:
             details=f"{old_count} reviews older than 90 days"
         )
     
-    def _assess_review_consistency(self, reviews: List[ReviewResponse]) -> QualityDimension:
+    def _assess_review_consistency(self, columns: ReviewColumns) -> QualityDimension:
         """Assess consistency of review data"""
-        issues_count = 0
-        
-        # Check for rating-text mismatch
-        for review in reviews:
-            text_lower = review.text.lower()
-            
-            # Positive rating with negative text
-            if review.rating >= 4 and any(word in text_lower for word in ['terrible', 'awful', 'worst', 'hate']):
-                issues_count += 1
-            
-            # Negative rating with positive text
-            if review.rating <= 2 and any(word in text_lower for word in ['excellent', 'amazing', 'best', 'love']):
-                issues_count += 1
+        # Positive rating with negative text, negative rating with positive text
+        negative_text = contains_any(columns.text_lower, ['terrible', 'awful', 'worst', 'hate'])
+        positive_text = contains_any(columns.text_lower, ['excellent', 'amazing', 'best', 'love'])
+        issues_count = int(
+            np.count_nonzero((columns.rating >= 4) & negative_text)
+            + np.count_nonzero((columns.rating <= 2) & positive_text)
+        )
         
-        score = max(0.0, 1.0 - (issues_count / len(reviews)))
+        score = max(0.0, 1.0 - (issues_count / len(columns)))
         
         return QualityDimension(
             score=score,
@@ -490,27 +457,24 @@ class DataQAAgent:
             details=f"{issues_count} rating-text mismatches"
         )
     
-    def _assess_review_accuracy(self, reviews: List[ReviewResponse]) -> QualityDimension:
+    def _assess_review_accuracy(self, columns: ReviewColumns) -> QualityDimension:
         """Assess accuracy of review data (spam detection)"""
-        spam_count = sum(1 for r in reviews if r.is_spam)
-        
-        # Additional spam indicators
-        suspicious_count = 0
-        for review in reviews:
-            # Very short reviews
-            if len(review.text) < 10:
-                suspicious_count += 0.5
-            
-            # Excessive caps
-            if sum(1 for c in review.text if c.isupper()) / len(review.text) > 0.5:
-                suspicious_count += 0.5
-            
-            # Repeated characters
-            if re.search(r'(.)\1{4,}', review.text):
-                suspicious_count += 0.5
+        spam_count = int(np.count_nonzero(columns.is_spam))
+        
+        # Additional spam indicators: very short reviews, excessive caps, repeated characters
+        lengths = columns.text_length
+        caps_ratio = np.divide(
+            columns.uppercase_count, lengths,
+            out=np.zeros(len(lengths)), where=lengths > 0
+        )
+        suspicious_count = 0.5 * (
+            np.count_nonzero(lengths < 10)
+            + np.count_nonzero(caps_ratio > 0.5)
+            + np.count_nonzero(columns.has_repeated_run)
+        )
         
         total_issues = spam_count + int(suspicious_count)
-        score = max(0.0, 1.0 - (total_issues / len(reviews)))
+        score = max(0.0, 1.0 - (total_issues / len(columns)))
         
         return QualityDimension(
             score=score,
@@ -518,26 +482,26 @@ class DataQAAgent:
             details=f"{spam_count} spam, {int(suspicious_count)} suspicious reviews"
         )
     
-    def _detect_review_anomalies(self, reviews: List[ReviewResponse]) -> List[Anomaly]:
+    def _detect_review_anomalies(self, columns: ReviewColumns) -> List[Anomaly]:
         """Detect anomalies in review data"""
         anomalies = []
         
         # Check for review bombing (many reviews in short time)
-        if len(reviews) >= 10:
-            recent_reviews = [r for r in reviews if (datetime.utcnow() - r.created_at).days < 7]
-            if len(recent_reviews) > len(reviews) * 0.5:
+        if len(columns) >= 10:
+            recent_reviews = np.flatnonzero(age_in_days(columns.ages) < 7)
+            if len(recent_reviews) > len(columns) * 0.5:
                 anomalies.append(Anomaly(
                     type="review_surge",
                     severity="medium",
                     description=f"{len(recent_reviews)} reviews in last 7 days (possible review bombing)",
-                    affected_entities=[str(r.id) for r in recent_reviews],
+                    affected_entities=columns.entity_ids(recent_reviews),
                     confidence=0.7
                 ))
         
         # Check for rating polarization
-        ratings = [r.rating for r in reviews]
+        ratings = columns.rating
         if len(ratings) >= 5:
-            extreme_ratings = sum(1 for r in ratings if r == 1 or r == 5)
+            extreme_ratings = int(np.count_nonzero((ratings == 1) | (ratings == 5)))
             if extreme_ratings / len(ratings) > 0.8:
                 anomalies.append(Anomaly(
                     type="rating_polarization",
@@ -549,12 +513,12 @@ class DataQAAgent:
         
         return anomalies
     
-    def _identify_missing_review_data(self, reviews: List[ReviewResponse]) -> List[MissingData]:
+    def _identify_missing_review_data(self, columns: ReviewColumns) -> List[MissingData]:
         """Identify missing review data"""
         missing = []
         
         # Check for missing sentiment analysis
-        no_sentiment = sum(1 for r in reviews if not r.sentiment)
+        no_sentiment = int(np.count_nonzero(~columns.has_sentiment))
         if no_sentiment > 0:
             missing.append(MissingData(
                 field="sentiment",
@@ -571,7 +535,7 @@ class DataQAAgent:
         self,
         anomalies: List[Anomaly],
         missing_data: List[MissingData],
-        products: List[ProductResponse]
+        columns: ProductColumns
     ) -> List[str]:
         """Generate actionable recommendations for product data"""
         recommendations = []
@@ -589,8 +553,8 @@ class DataQAAgent:
                 recommendations.append(missing.recommendation)
         
         # General recommendations
-        stale_products = sum(1 for p in products if (datetime.utcnow() - p.updated_at).days > 30)
-        if stale_products > len(products) * 0.3:
+        stale_products = int(np.count_nonzero(age_in_days(columns.ages) > 30))
+        if stale_products > len(columns) * 0.3:
             recommendations.append(f"Refresh data for {stale_products} products (>30 days old)")
         
         return recommendations
@@ -599,7 +563,7 @@ class DataQAAgent:
         self,
         anomalies: List[Anomaly],
         missing_data: List[MissingData],
-        reviews: List[ReviewResponse]
+        columns: ReviewColumns
     ) -> List[str]:
         """Generate actionable recommendations for review data"""
         recommendations = []
@@ -615,8 +579,8 @@ class DataQAAgent:
                 recommendations.append(missing.recommendation)
         
         # Check if enough reviews for confidence
-        if len(reviews) < self.min_reviews_for_confidence:
-            recommendations.append(f"Collect more reviews (current: {len(reviews)}, recommended: {self.min_reviews_for_confidence}+)")
+        if len(columns) < self.min_reviews_for_confidence:
+            recommendations.append(f"Collect more reviews (current: {len(columns)}, recommended: {self.min_reviews_for_confidence}+)")
         
         return recommendations
     
@@ -25,6 +25,22 @@ from statsmodels.tsa.arima.model import ARIMA
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
 from statsmodels.tsa.seasonal import seasonal_decompose
 
+from src.forecasting.model_cache import (
+    CachedModelState,
+    FittedModelCache,
+    get_fitted_model_cache,
+    series_fingerprint
+)
+from src.forecasting.series import ForecastSeries
+from src.forecasting.reconciliation import historical_shares, mint_reconcile, top_down
+from src.forecasting.vectorized import (
+    BaselineSelection,
+    DemandMatrix,
+    seasonal_strength,
+    select_baselines,
+    trend_slopes
+)
+
 # Prophet (optional - graceful fallback if not installed)
 try:
     from prophet import Prophet
@@ -34,16 +50,6 @@ except ImportError:
     print("Warning: Prophet not installed. Install with: pip install prophet")
 
 
-@dataclass
-class ForecastPoint:
-    """Single forecast data point"""
-    date: date
-    predicted_quantity: float
-    lower_bound: float
-    upper_bound: float
-    confidence: float
-
-
 @dataclass
 class SeasonalityPattern:
     """Detected seasonality pattern"""
@@ -78,7 +84,7 @@ class DemandForecastResult:
     product_id: UUID
     product_name: str
     forecast_horizon_days: int
-    forecast_points: List[ForecastPoint]
+    forecast_points: ForecastSeries
     
     # Model comparison
     best_model: str
@@ -103,22 +109,21 @@ class DemandForecastResult:
     historical_data_points: int
     forecast_generated_at: datetime
     
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for API response"""
+    def to_dict(self, compact: bool = False) -> Dict:
+        """
+        Convert to dictionary for API response
+        
+        Args:
+            compact: Encode forecast_points as columns (see ForecastSeries.encode)
+                instead of one record per day, for caching
+        """
         return {
             "product_id": str(self.product_id),
             "product_name": self.product_name,
             "forecast_horizon_days": self.forecast_horizon_days,
-            "forecast_points": [
-                {
-                    "date": fp.date.isoformat(),
-                    "predicted_quantity": round(fp.predicted_quantity, 2),
-                    "lower_bound": round(fp.lower_bound, 2),
-                    "upper_bound": round(fp.upper_bound, 2),
-                    "confidence": round(fp.confidence, 3)
-                }
-                for fp in self.forecast_points
-            ],
+            "forecast_points": (
+                self.forecast_points.encode() if compact else self.forecast_points.to_records()
+            ),
             "best_model": self.best_model,
             "model_performances": [
                 {
@@ -159,6 +164,43 @@ class DemandForecastResult:
         }
 
 
+@dataclass
+class HierarchicalForecastResult:
+    """Reconciled forecasts across the tenant / category / SKU hierarchy"""
+    reconciliation: str  # 'proportional' or 'mint'
+    forecast_horizon_days: int
+    sku_forecasts: List[DemandForecastResult]
+    category_forecasts: Dict[str, ForecastSeries]
+    category_models: Dict[str, str]  # Best ensemble model per category
+    total_forecast: Optional[ForecastSeries]
+    model_fits: Dict[str, int]  # 'aggregate' (ensemble fits) and 'sku_baseline'
+    
+    def to_dict(self, compact: bool = False) -> Dict:
+        """
+        Convert to dictionary for API response
+        
+        Args:
+            compact: Encode forecast series as columns instead of daily records
+        """
+        def series(forecast: ForecastSeries):
+            return forecast.encode() if compact else forecast.to_records()
+        
+        return {
+            "reconciliation": self.reconciliation,
+            "forecast_horizon_days": self.forecast_horizon_days,
+            "sku_forecasts": [f.to_dict(compact=compact) for f in self.sku_forecasts],
+            "category_forecasts": {
+                category: {
+                    "best_model": self.category_models[category],
+                    "forecast_points": series(forecast)
+                }
+                for category, forecast in self.category_forecasts.items()
+            },
+            "total_forecast": series(self.total_forecast) if self.total_forecast else None,
+            "model_fits": self.model_fits
+        }
+
+
 class DemandForecastAgent:
     """
     Demand Forecast Agent - Multi-model time series forecasting
@@ -169,18 +211,50 @@ class DemandForecastAgent:
     - Seasonality detection and decomposition
     - Inventory risk alerts
     - QA-adjusted confidence scoring
+    - Fitted-model reuse and incremental updates across requests
+    - Vectorized baseline forecasting for many products at once
+    - Hierarchical (category-level) forecasting with reconciliation
     """
     
-    def __init__(self, tenant_id: UUID):
+    # Model to fall back to when a model cannot be fitted or forecast
+    MODEL_FALLBACKS = {
+        'prophet': 'arima',
+        'arima': 'exponential_smoothing',
+        'exponential_smoothing': 'moving_average',
+    }
+    
+    # Forecast interval/confidence shape of the vectorized baseline models
+    BASELINE_UNCERTAINTY = {
+        'moving_average': dict(uncertainty_rate=0.2, confidence_floor=0.3, confidence_decay=0.5),
+        'simple_exponential_smoothing': dict(uncertainty_rate=0.15, confidence_floor=0.4, confidence_decay=0.4),
+        'holt': dict(uncertainty_rate=0.15, confidence_floor=0.4, confidence_decay=0.4),
+        'seasonal_naive': dict(uncertainty_rate=0.2, confidence_floor=0.3, confidence_decay=0.5),
+        'hierarchical': dict(uncertainty_rate=0.2, confidence_floor=0.4, confidence_decay=0.4),
+    }
+    
+    # Hierarchical forecasting
+    RECONCILIATION_METHODS = ('proportional', 'mint')
+    UNCATEGORIZED = 'uncategorized'
+    
+    def __init__(
+        self,
+        tenant_id: UUID,
+        model_cache: Optional[FittedModelCache] = None,
+        use_model_cache: bool = True
+    ):
         """
         Initialize Demand Forecast Agent
         
         Args:
             tenant_id: Tenant UUID for multi-tenancy isolation
+            model_cache: Fitted-model cache (defaults to the process-wide cache)
+            use_model_cache: Set False to always refit models from scratch
         """
         self.tenant_id = tenant_id
         self.min_data_points = 14  # Minimum 2 weeks of data
         self.confidence_threshold = 0.6
+        self.max_incremental_days = 7  # Full refit after a week of incremental updates
+        self.model_cache = (model_cache or get_fitted_model_cache()) if use_model_cache else None
     
     def forecast_demand(
         self,
@@ -213,17 +287,14 @@ class DemandForecastAgent:
         seasonality = self._detect_seasonality(df)
         trend = self._detect_trend(df)
         
-        # Generate forecasts with multiple models
-        model_results = self._generate_multi_model_forecasts(df, forecast_horizon_days)
-        
-        # Select best model
-        best_model_name, best_forecast, model_performances = self._select_best_model(
-            model_results, df
+        # Generate forecasts with multiple models and select the best one
+        best_model_name, best_forecast, model_performances = self._run_models(
+            product_id, df, forecast_horizon_days
         )
         
         # Calculate base confidence
         base_confidence = self._calculate_base_confidence(
-            df, best_forecast, model_performances
+            len(df), best_forecast, model_performances
         )
         
         # Apply QA adjustment
@@ -231,7 +302,7 @@ class DemandForecastAgent:
         
         # Generate inventory alerts
         alerts = self._generate_inventory_alerts(
-            df, best_forecast, current_inventory, final_confidence
+            best_forecast, current_inventory, final_confidence
         )
         
         # Calculate reorder recommendation
@@ -259,6 +330,309 @@ class DemandForecastAgent:
             forecast_generated_at=datetime.utcnow()
         )
     
+    def forecast_demand_baselines(
+        self,
+        products: List[Dict],
+        forecast_horizon_days: int = 30
+    ) -> List[DemandForecastResult]:
+        """
+        Forecast many products at once with the vectorized baseline models.
+        
+        All series are stacked into one SKU x day matrix; moving average,
+        simple/Holt exponential smoothing and seasonal naive are backtested
+        and selected per SKU with array operations instead of per-product
+        model objects. Use for long-tail catalogs; reserve forecast_demand
+        (ARIMA/Prophet ensemble) for the products that matter most.
+        
+        Args:
+            products: Dicts with 'product_id', 'product_name', 'sales_history'
+                and optionally 'current_inventory'. Products without sales are skipped.
+            forecast_horizon_days: Number of days to forecast (default: 30)
+        
+        Returns:
+            DemandForecastResult per product with sales, in input order
+        """
+        products = [p for p in products if p['sales_history']]
+        matrix = DemandMatrix.from_series({p['product_id']: p['sales_history'] for p in products})
+        if not matrix.product_ids:
+            return []
+        
+        selection = select_baselines(
+            matrix, forecast_horizon_days, min_data_points=self.min_data_points
+        )
+        return self._build_matrix_results(
+            products, matrix, selection, selection.forecasts, selection.best_models,
+            forecast_horizon_days
+        )
+    
+    def forecast_demand_hierarchical(
+        self,
+        products: List[Dict],
+        forecast_horizon_days: int = 30,
+        reconciliation: str = 'proportional'
+    ) -> "HierarchicalForecastResult":
+        """
+        Forecast many products through the category hierarchy.
+        
+        The model ensemble (ARIMA/Prophet/exponential smoothing) is fitted
+        once per category on the aggregated demand - plus once on the tenant
+        total for MinT - and only the vectorized baselines run per SKU. The
+        levels are then reconciled so SKU forecasts add up to their category:
+        
+        - 'proportional': category forecasts are split over their SKUs by
+          historical share of category demand (top-down)
+        - 'mint': total, category and SKU forecasts are combined by MinT
+          with backtest error variances as weights
+        
+        Args:
+            products: Dicts as for forecast_demand_baselines, plus optionally
+                'category' (products without one form their own group)
+            forecast_horizon_days: Number of days to forecast (default: 30)
+            reconciliation: 'proportional' or 'mint'
+        
+        Returns:
+            HierarchicalForecastResult with SKU, category and total forecasts
+        """
+        if reconciliation not in self.RECONCILIATION_METHODS:
+            raise ValueError(f"Unknown reconciliation method: {reconciliation}")
+        
+        horizon = forecast_horizon_days
+        products = [p for p in products if p['sales_history']]
+        matrix = DemandMatrix.from_series({p['product_id']: p['sales_history'] for p in products})
+        if not matrix.product_ids:
+            return HierarchicalForecastResult(
+                reconciliation=reconciliation,
+                forecast_horizon_days=horizon,
+                sku_forecasts=[],
+                category_forecasts={},
+                category_models={},
+                total_forecast=None,
+                model_fits={'aggregate': 0, 'sku_baseline': 0}
+            )
+        
+        by_id = {p['product_id']: p for p in products}
+        category_names, groups = np.unique(
+            [by_id[pid].get('category') or self.UNCATEGORIZED for pid in matrix.product_ids],
+            return_inverse=True
+        )
+        n_categories = len(category_names)
+        
+        # Cheap models per SKU
+        selection = select_baselines(matrix, horizon, min_data_points=self.min_data_points)
+        
+        # Rich models once per aggregated series
+        category_values = self._aggregate_rows(matrix.values, groups, n_categories)
+        category_fits = [
+            self._forecast_aggregate(row, matrix.start_date, horizon) for row in category_values
+        ]
+        category_base = np.vstack([forecast for _, forecast, _ in category_fits])
+        aggregate_fits = n_categories
+        
+        if reconciliation == 'mint':
+            total_values = self._aggregate_rows(matrix.values, np.zeros_like(groups), 1)[0]
+            _, total_base, total_variance = self._forecast_aggregate(
+                total_values, matrix.start_date, horizon
+            )
+            aggregate_fits += 1
+            
+            best_rmse = np.array([
+                selection.errors[model]['rmse'][row]
+                for row, model in enumerate(selection.best_models)
+            ])
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', category=RuntimeWarning)
+                recent_variance = np.nanvar(matrix.values[:, -28:], axis=1)
+            sku_variance = np.where(np.isnan(best_rmse), recent_variance, best_rmse ** 2)
+            
+            _, _, sku_forecasts = mint_reconcile(
+                total_base,
+                category_base,
+                selection.forecasts,
+                groups,
+                np.concatenate([[total_variance], [v for _, _, v in category_fits], sku_variance])
+            )
+        else:
+            shares = historical_shares(matrix.values, groups)
+            sku_forecasts = top_down(category_base, groups, shares)
+        
+        # Clip negatives at the SKU level and aggregate back up so every level stays coherent
+        sku_forecasts = np.maximum(np.nan_to_num(sku_forecasts), 0)
+        category_forecasts = np.vstack([
+            sku_forecasts[groups == k].sum(axis=0) for k in range(n_categories)
+        ])
+        
+        last_date = pd.Timestamp(matrix.end_date)
+        uncertainty = self.BASELINE_UNCERTAINTY['hierarchical']
+        
+        return HierarchicalForecastResult(
+            reconciliation=reconciliation,
+            forecast_horizon_days=horizon,
+            sku_forecasts=self._build_matrix_results(
+                products, matrix, selection, sku_forecasts,
+                ['hierarchical'] * len(matrix.product_ids), horizon
+            ),
+            category_forecasts={
+                str(name): self._build_forecast_series(
+                    category_forecasts[k], last_date, horizon, **uncertainty
+                )
+                for k, name in enumerate(category_names)
+            },
+            category_models={
+                str(name): category_fits[k][0] for k, name in enumerate(category_names)
+            },
+            total_forecast=self._build_forecast_series(
+                category_forecasts.sum(axis=0), last_date, horizon, **uncertainty
+            ),
+            model_fits={'aggregate': aggregate_fits, 'sku_baseline': len(matrix.product_ids)}
+        )
+    
+    def _aggregate_rows(self, values: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+        """Sum SKU rows per group; NaN until the first SKU of a group has sold"""
+        totals = np.zeros((n_groups, values.shape[1]))
+        np.add.at(totals, groups, np.nan_to_num(values))
+        started = np.zeros((n_groups, values.shape[1]), dtype=bool)
+        np.logical_or.at(started, groups, ~np.isnan(values))
+        return np.where(started, totals, np.nan)
+    
+    def _forecast_aggregate(
+        self, values: np.ndarray, start_date: date, horizon: int
+    ) -> Tuple[str, np.ndarray, float]:
+        """
+        Fit the model ensemble on an aggregated daily series.
+        
+        Returns:
+            (best model name, point forecast, error variance) where the
+            variance is the best model's squared validation RMSE, or the
+            recent variance of the series when it is too short to validate
+        """
+        first = int(np.argmax(~np.isnan(values)))
+        df = pd.DataFrame({
+            'date': pd.date_range(start_date + timedelta(days=first), periods=len(values) - first, freq='D'),
+            'quantity': values[first:]
+        })
+        best_model_name, forecast, performances = self._run_models(None, df, horizon)
+        
+        best = next((p for p in performances if p.model_name == best_model_name), None)
+        if best is not None:
+            variance = best.rmse ** 2
+        else:
+            variance = float(np.var(values[first:][-28:]))
+        return best_model_name, forecast.predicted_quantity, variance
+    
+    def _build_matrix_results(
+        self,
+        products: List[Dict],
+        matrix: DemandMatrix,
+        selection: BaselineSelection,
+        forecasts: np.ndarray,
+        best_models: List[str],
+        horizon: int
+    ) -> List[DemandForecastResult]:
+        """
+        Build per-SKU results from forecasts over a demand matrix.
+        
+        Args:
+            products: Product dicts as passed to forecast_demand_baselines
+            matrix: Demand matrix the forecasts were computed from
+            selection: Baseline backtests (reported as model performances)
+            forecasts: (n_skus, horizon) point forecasts in matrix row order
+            best_models: Model label per SKU (keys of BASELINE_UNCERTAINTY)
+            horizon: Number of days forecast
+        """
+        values = matrix.values
+        # Per-SKU diagnostics in one pass over the matrix
+        n_obs = matrix.n_obs
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            means = np.nanmean(values, axis=1)
+            stds = np.nanstd(values, axis=1, ddof=1)
+        zero_ratios = np.sum(values == 0, axis=1) / n_obs
+        slopes = trend_slopes(values)
+        weekly_strength = seasonal_strength(values, 7)
+        monthly_strength = seasonal_strength(values, 30)
+        
+        last_date = pd.Timestamp(matrix.end_date)
+        today = datetime.now().date()
+        by_id = {p['product_id']: p for p in products}
+        results = []
+        
+        for row, product_id in enumerate(matrix.product_ids):
+            product = by_id[product_id]
+            best_model = best_models[row]
+            
+            data_quality_score, qa_metadata = self._score_data_quality(
+                data_points=int(n_obs[row]),
+                days_since_last_sale=(today - matrix.last_sale_dates[row]).days,
+                zero_ratio=float(zero_ratios[row]),
+                std=float(stds[row]),
+                mean=float(means[row]),
+                forecast_horizon=horizon
+            )
+            
+            forecast_points = self._build_forecast_series(
+                forecasts[row], last_date, horizon,
+                **self.BASELINE_UNCERTAINTY[best_model]
+            )
+            
+            model_performances = []
+            if selection.validated[row]:
+                model_performances = [
+                    ModelPerformance(
+                        model_name=model_name,
+                        mae=float(errors['mae'][row]),
+                        rmse=float(errors['rmse'][row]),
+                        mape=float(errors['mape'][row]),
+                        confidence_score=float(errors['confidence'][row])
+                    )
+                    for model_name, errors in selection.errors.items()
+                    if not np.isnan(errors['confidence'][row])
+                ]
+            
+            enough_history = n_obs[row] >= 14
+            seasonality = {
+                'weekly': SeasonalityPattern(
+                    'weekly', float(weekly_strength[row]),
+                    bool(enough_history and weekly_strength[row] > 0.1)
+                ),
+                'monthly': SeasonalityPattern(
+                    'monthly', float(monthly_strength[row]),
+                    bool(n_obs[row] >= 60 and monthly_strength[row] > 0.1)
+                )
+            }
+            trend = self._classify_trend(slopes[row], means[row]) if n_obs[row] >= 7 else 'stable'
+            
+            base_confidence = self._calculate_base_confidence(
+                int(n_obs[row]), forecast_points, model_performances
+            )
+            final_confidence = base_confidence * data_quality_score
+            current_inventory = product.get('current_inventory')
+            
+            results.append(DemandForecastResult(
+                product_id=product_id,
+                product_name=product['product_name'],
+                forecast_horizon_days=horizon,
+                forecast_points=forecast_points,
+                best_model=best_model,
+                model_performances=model_performances,
+                seasonality=seasonality,
+                trend=trend,
+                current_inventory=current_inventory,
+                alerts=self._generate_inventory_alerts(
+                    forecast_points, current_inventory, final_confidence
+                ),
+                reorder_recommendation=self._calculate_reorder_point(
+                    forecast_points, current_inventory
+                ),
+                base_confidence=base_confidence,
+                data_quality_score=data_quality_score,
+                final_confidence=final_confidence,
+                qa_metadata=qa_metadata,
+                historical_data_points=int(n_obs[row]),
+                forecast_generated_at=datetime.utcnow()
+            ))
+        
+        return results
+    
     def _prepare_data(self, sales_history: List[Dict]) -> pd.DataFrame:
         """Prepare sales data for forecasting"""
         df = pd.DataFrame(sales_history)
@@ -290,11 +664,29 @@ class DemandForecastAgent:
         self, df: pd.DataFrame, forecast_horizon: int
     ) -> Tuple[float, Dict]:
         """Assess data quality for forecasting"""
+        return self._score_data_quality(
+            data_points=len(df),
+            days_since_last_sale=(datetime.now().date() - df['date'].max().date()).days,
+            zero_ratio=(df['quantity'] == 0).sum() / len(df),
+            std=df['quantity'].std(),
+            mean=df['quantity'].mean(),
+            forecast_horizon=forecast_horizon
+        )
+    
+    def _score_data_quality(
+        self,
+        data_points: int,
+        days_since_last_sale: int,
+        zero_ratio: float,
+        std: float,
+        mean: float,
+        forecast_horizon: int
+    ) -> Tuple[float, Dict]:
+        """Turn series statistics into a quality score and QA metadata"""
         qa_metadata = {}
         penalties = []
         
         # Check 1: Sufficient data points
-        data_points = len(df)
         qa_metadata['data_points'] = data_points
         
         if data_points < self.min_data_points:
@@ -305,7 +697,6 @@ class DemandForecastAgent:
             qa_metadata['limited_data'] = True
         
         # Check 2: Data recency
-        days_since_last_sale = (datetime.now().date() - df['date'].max().date()).days
         qa_metadata['days_since_last_sale'] = days_since_last_sale
         
         if days_since_last_sale > 7:
@@ -313,7 +704,6 @@ class DemandForecastAgent:
             qa_metadata['stale_data'] = True
         
         # Check 3: Zero sales ratio
-        zero_ratio = (df['quantity'] == 0).sum() / len(df)
         qa_metadata['zero_sales_ratio'] = round(zero_ratio, 3)
         
         if zero_ratio > 0.5:
@@ -323,11 +713,11 @@ class DemandForecastAgent:
             penalties.append(('moderate_zero_ratio', 0.1))
         
         # Check 4: Variance (too stable or too volatile)
-        if df['quantity'].std() == 0:
+        if std == 0 or np.isnan(std):
             penalties.append(('no_variance', 0.3))
             qa_metadata['no_variance'] = True
         else:
-            cv = df['quantity'].std() / (df['quantity'].mean() + 1)  # Coefficient of variation
+            cv = std / (mean + 1)  # Coefficient of variation
             qa_metadata['coefficient_of_variation'] = round(cv, 3)
             
             if cv > 0.8:  # Lowered from 2.0 to 0.8 for better volatility detection
@@ -402,8 +792,10 @@ class DemandForecastAgent:
         # Calculate slope
         slope = np.polyfit(x, y, 1)[0]
         
-        # Determine trend
-        mean_quantity = df['quantity'].mean()
+        return self._classify_trend(slope, df['quantity'].mean())
+    
+    def _classify_trend(self, slope: float, mean_quantity: float) -> str:
+        """Classify a daily slope relative to mean demand"""
         if abs(slope) < mean_quantity * 0.01:  # Less than 1% change per day
             return 'stable'
         elif slope > 0:
@@ -411,161 +803,285 @@ class DemandForecastAgent:
         else:
             return 'decreasing'
     
-    def _generate_multi_model_forecasts(
-        self, df: pd.DataFrame, horizon: int
-    ) -> Dict[str, List[ForecastPoint]]:
-        """Generate forecasts using multiple models"""
-        results = {}
+    def _run_models(
+        self, product_id: Optional[UUID], df: pd.DataFrame, horizon: int
+    ) -> Tuple[str, ForecastSeries, List[ModelPerformance]]:
+        """
+        Fit candidate models, validate them and pick the best one.
         
-        # Model 1: Moving Average (baseline)
-        results['moving_average'] = self._forecast_moving_average(df, horizon)
+        Fits are looked up in the fitted-model cache first: an identical
+        series reuses fits and validation scores, a series that only gained
+        a few new days updates the cached fits incrementally.
+        """
+        if self.model_cache is None or product_id is None or len(df) < 14:
+            model_results = self._generate_multi_model_forecasts(df, horizon)
+            return self._select_best_model(model_results, df)
+        
+        start_date = df['date'].min().date()
+        quantities = df['quantity'].values
+        state = self.model_cache.get(self.tenant_id, product_id)
+        
+        if state is not None and state.matches(start_date, quantities):
+            # Same series as last time - forecasting from cached fits is cheap
+            self.model_cache.record('hits')
+            fits = dict(state.full_fits)
+            model_results = self._generate_multi_model_forecasts(df, horizon, fits)
+            return state.best_model, model_results[state.best_model], state.performances
+        
+        extension = state.extension_days(start_date, quantities) if state is not None else None
+        
+        if extension is not None and state.appended_days + extension <= self.max_incremental_days:
+            # New days were appended - update the fits instead of refitting
+            self.model_cache.record('incremental_updates')
+            full_fits = self._update_fits(state.full_fits, df)
+            validation_fits = self._update_fits(state.validation_fits, df.iloc[:-7])
+            appended_days = state.appended_days + extension
+        else:
+            self.model_cache.record('misses')
+            full_fits = {}
+            validation_fits = {}
+            appended_days = 0
+        
+        model_results = self._generate_multi_model_forecasts(df, horizon, full_fits)
+        best_model_name, best_forecast, performances = self._select_best_model(
+            model_results, df, validation_fits
+        )
         
-        # Model 2: Exponential Smoothing
-        results['exponential_smoothing'] = self._forecast_exponential_smoothing(df, horizon)
+        self.model_cache.put(self.tenant_id, product_id, CachedModelState(
+            fingerprint=series_fingerprint(start_date, quantities),
+            start_date=start_date,
+            n_obs=len(df),
+            full_fits=full_fits,
+            validation_fits=validation_fits,
+            performances=performances,
+            best_model=best_model_name,
+            appended_days=appended_days
+        ))
         
-        # Model 3: ARIMA
-        results['arima'] = self._forecast_arima(df, horizon)
+        return best_model_name, best_forecast, performances
+    
+    def _generate_multi_model_forecasts(
+        self, df: pd.DataFrame, horizon: int, fits: Optional[Dict[str, object]] = None
+    ) -> Dict[str, ForecastSeries]:
+        """
+        Generate forecasts using multiple models
+        
+        Args:
+            df: Prepared daily sales data
+            horizon: Number of days to forecast
+            fits: Fitted models to reuse; models fitted here are added to it
+        """
+        fits = {} if fits is None else fits
+        model_names = ['moving_average', 'exponential_smoothing', 'arima']
         
-        # Model 4: Prophet (if available)
         if PROPHET_AVAILABLE:
-            results['prophet'] = self._forecast_prophet(df, horizon)
+            model_names.append('prophet')
         
-        return results
+        return {
+            model_name: self._forecast_from_fit(model_name, df, horizon, fits)
+            for model_name in model_names
+        }
+    
+    def _fit_model(
+        self, model_name: str, df: pd.DataFrame, previous: Optional[object] = None
+    ) -> Optional[object]:
+        """
+        Fit a candidate model, warm-starting from a previous fit if given.
+        
+        Args:
+            model_name: 'exponential_smoothing', 'arima' or 'prophet'
+            df: Prepared daily sales data
+            previous: Fit on a prefix of df to update incrementally
+            
+        Returns:
+            Fitted model, or None if fitting failed
+        """
+        try:
+            if model_name == 'exponential_smoothing':
+                return self._fit_exponential_smoothing(df, previous)
+            if model_name == 'arima':
+                return self._fit_arima(df, previous)
+            if model_name == 'prophet' and PROPHET_AVAILABLE:
+                return self._fit_prophet(df, previous)
+        except Exception:
+            pass
+        return None
+    
+    def _update_fits(self, fits: Dict[str, object], df: pd.DataFrame) -> Dict[str, object]:
+        """Incrementally update cached fits to a series that gained new days"""
+        return {
+            model_name: self._fit_model(model_name, df, previous) if previous is not None else None
+            for model_name, previous in fits.items()
+        }
+    
+    def _forecast_from_fit(
+        self, model_name: str, df: pd.DataFrame, horizon: int, fits: Dict[str, object]
+    ) -> ForecastSeries:
+        """
+        Forecast with a candidate model, fitting it on demand.
+        
+        Falls back along prophet -> arima -> exponential_smoothing ->
+        moving_average when a model cannot be fitted or forecast.
+        """
+        if model_name == 'moving_average':
+            return self._forecast_moving_average(df, horizon)
+        
+        if model_name not in fits:
+            fits[model_name] = self._fit_model(model_name, df)
+        
+        fitted = fits[model_name]
+        if fitted is not None:
+            try:
+                if model_name == 'exponential_smoothing':
+                    return self._build_forecast_series(
+                        fitted.forecast(steps=horizon), df['date'].max(), horizon,
+                        uncertainty_rate=0.15, confidence_floor=0.4, confidence_decay=0.4
+                    )
+                if model_name == 'arima':
+                    return self._build_forecast_series(
+                        fitted.forecast(steps=horizon), df['date'].max(), horizon,
+                        uncertainty_rate=0.2, confidence_floor=0.5, confidence_decay=0.3
+                    )
+                if model_name == 'prophet':
+                    return self._forecast_series_from_prophet(fitted, horizon)
+            except Exception:
+                pass
+        
+        return self._forecast_from_fit(self.MODEL_FALLBACKS[model_name], df, horizon, fits)
+    
+    def _build_forecast_series(
+        self,
+        values,
+        last_date: pd.Timestamp,
+        horizon: int,
+        uncertainty_rate: float,
+        confidence_floor: float,
+        confidence_decay: float
+    ) -> ForecastSeries:
+        """Build a forecast with uncertainty growing over the horizon"""
+        values = np.asarray(values, dtype=float)
+        steps = np.arange(1, len(values) + 1)
+        uncertainty = np.abs(values) * uncertainty_rate * (steps / horizon)
+        
+        return ForecastSeries(
+            start_date=(last_date + timedelta(days=1)).date(),
+            predicted_quantity=np.maximum(values, 0),
+            lower_bound=np.maximum(values - uncertainty, 0),
+            upper_bound=values + uncertainty,
+            confidence=np.maximum(confidence_floor, 1.0 - (steps / horizon) * confidence_decay)
+        )
     
     def _forecast_moving_average(
         self, df: pd.DataFrame, horizon: int
-    ) -> List[ForecastPoint]:
+    ) -> ForecastSeries:
         """Simple moving average forecast"""
         window = min(7, len(df))
         ma = df['quantity'].rolling(window=window).mean().iloc[-1]
         
-        forecast_points = []
-        last_date = df['date'].max()
-        
-        for i in range(1, horizon + 1):
-            forecast_date = (last_date + timedelta(days=i)).date()
-            # Simple forecast with increasing uncertainty
-            uncertainty = ma * 0.2 * (i / horizon)
-            
-            forecast_points.append(ForecastPoint(
-                date=forecast_date,
-                predicted_quantity=max(0, ma),
-                lower_bound=max(0, ma - uncertainty),
-                upper_bound=ma + uncertainty,
-                confidence=max(0.3, 1.0 - (i / horizon) * 0.5)
-            ))
-        
-        return forecast_points
+        return self._build_forecast_series(
+            np.full(horizon, ma), df['date'].max(), horizon,
+            uncertainty_rate=0.2, confidence_floor=0.3, confidence_decay=0.5
+        )
     
     def _forecast_exponential_smoothing(
         self, df: pd.DataFrame, horizon: int
-    ) -> List[ForecastPoint]:
+    ) -> ForecastSeries:
         """Exponential smoothing forecast"""
-        try:
-            model = ExponentialSmoothing(
-                df['quantity'],
-                seasonal_periods=7 if len(df) >= 14 else None,
-                trend='add' if len(df) >= 14 else None,
-                seasonal='add' if len(df) >= 14 else None
-            )
-            fitted_model = model.fit()
-            forecast = fitted_model.forecast(steps=horizon)
-            
-            forecast_points = []
-            last_date = df['date'].max()
-            
-            for i, value in enumerate(forecast, 1):
-                forecast_date = (last_date + timedelta(days=i)).date()
-                uncertainty = abs(value) * 0.15 * (i / horizon)
-                
-                forecast_points.append(ForecastPoint(
-                    date=forecast_date,
-                    predicted_quantity=max(0, value),
-                    lower_bound=max(0, value - uncertainty),
-                    upper_bound=value + uncertainty,
-                    confidence=max(0.4, 1.0 - (i / horizon) * 0.4)
-                ))
-            
-            return forecast_points
-        
-        except Exception:
-            # Fallback to moving average
-            return self._forecast_moving_average(df, horizon)
+        return self._forecast_from_fit('exponential_smoothing', df, horizon, {})
     
     def _forecast_arima(
         self, df: pd.DataFrame, horizon: int
-    ) -> List[ForecastPoint]:
+    ) -> ForecastSeries:
         """ARIMA forecast"""
-        try:
-            # Auto-select ARIMA parameters (simplified)
-            model = ARIMA(df['quantity'], order=(1, 1, 1))
-            fitted_model = model.fit()
-            forecast_result = fitted_model.forecast(steps=horizon)
-            
-            forecast_points = []
-            last_date = df['date'].max()
-            
-            for i, value in enumerate(forecast_result, 1):
-                forecast_date = (last_date + timedelta(days=i)).date()
-                uncertainty = abs(value) * 0.2 * (i / horizon)
-                
-                forecast_points.append(ForecastPoint(
-                    date=forecast_date,
-                    predicted_quantity=max(0, value),
-                    lower_bound=max(0, value - uncertainty),
-                    upper_bound=value + uncertainty,
-                    confidence=max(0.5, 1.0 - (i / horizon) * 0.3)
-                ))
-            
-            return forecast_points
-        
-        except Exception:
-            # Fallback to exponential smoothing
-            return self._forecast_exponential_smoothing(df, horizon)
+        return self._forecast_from_fit('arima', df, horizon, {})
     
     def _forecast_prophet(
         self, df: pd.DataFrame, horizon: int
-    ) -> List[ForecastPoint]:
+    ) -> ForecastSeries:
         """Prophet forecast (Facebook's forecasting library)"""
-        try:
-            # Prepare data for Prophet
-            prophet_df = df.rename(columns={'date': 'ds', 'quantity': 'y'})
-            
-            # Initialize and fit model
-            model = Prophet(
-                daily_seasonality=False,
-                weekly_seasonality=True if len(df) >= 14 else False,
-                yearly_seasonality=False
-            )
-            model.fit(prophet_df)
-            
-            # Generate future dates
-            future = model.make_future_dataframe(periods=horizon)
-            forecast = model.predict(future)
-            
-            # Extract forecast points
-            forecast_points = []
-            forecast_data = forecast.tail(horizon)
-            
-            for _, row in forecast_data.iterrows():
-                forecast_points.append(ForecastPoint(
-                    date=row['ds'].date(),
-                    predicted_quantity=max(0, row['yhat']),
-                    lower_bound=max(0, row['yhat_lower']),
-                    upper_bound=max(0, row['yhat_upper']),
-                    confidence=0.7  # Prophet provides good confidence
-                ))
-            
-            return forecast_points
+        return self._forecast_from_fit('prophet', df, horizon, {})
+    
+    def _fit_exponential_smoothing(self, df: pd.DataFrame, previous=None):
+        """Fit Holt-Winters; warm start reuses smoothing parameters and initial states"""
+        seasonal = len(df) >= 14
+        config = dict(
+            seasonal_periods=7 if seasonal else None,
+            trend='add' if seasonal else None,
+            seasonal='add' if seasonal else None
+        )
         
-        except Exception:
-            # Fallback to ARIMA
-            return self._forecast_arima(df, horizon)
+        if previous is None:
+            return ExponentialSmoothing(df['quantity'], **config).fit()
+        
+        params = previous.params
+        initial_states = {'initial_level': params['initial_level']}
+        smoothing = {'smoothing_level': params['smoothing_level']}
+        if seasonal:
+            initial_states['initial_trend'] = params['initial_trend']
+            initial_states['initial_seasonal'] = params['initial_seasons']
+            smoothing['smoothing_trend'] = params['smoothing_trend']
+            smoothing['smoothing_seasonal'] = params['smoothing_seasonal']
+        
+        model = ExponentialSmoothing(
+            df['quantity'], **config, initialization_method='known', **initial_states
+        )
+        return model.fit(**smoothing, optimized=False)
+    
+    def _fit_arima(self, df: pd.DataFrame, previous=None):
+        """Fit ARIMA(1,1,1); warm start appends new observations with fixed parameters"""
+        if previous is None:
+            # Auto-select ARIMA parameters (simplified)
+            return ARIMA(df['quantity'], order=(1, 1, 1)).fit()
+        
+        return previous.append(df['quantity'].iloc[previous.nobs:], refit=False)
+    
+    def _fit_prophet(self, df: pd.DataFrame, previous=None):
+        """Fit Prophet; warm start initializes the optimizer from the previous fit"""
+        prophet_df = df.rename(columns={'date': 'ds', 'quantity': 'y'})
+        
+        model = Prophet(
+            daily_seasonality=False,
+            weekly_seasonality=True if len(df) >= 14 else False,
+            yearly_seasonality=False
+        )
+        
+        if previous is None:
+            return model.fit(prophet_df)
+        
+        init = {
+            name: previous.params[name][0][0] if name in ('k', 'm', 'sigma_obs') else previous.params[name][0]
+            for name in ('k', 'm', 'sigma_obs', 'delta', 'beta')
+        }
+        return model.fit(prophet_df, init=init)
+    
+    def _forecast_series_from_prophet(self, model, horizon: int) -> ForecastSeries:
+        """Extract the forecast from a fitted Prophet model"""
+        future = model.make_future_dataframe(periods=horizon)
+        forecast_data = model.predict(future).tail(horizon)
+        
+        return ForecastSeries(
+            start_date=forecast_data['ds'].iloc[0].date(),
+            predicted_quantity=np.maximum(forecast_data['yhat'].to_numpy(dtype=float), 0),
+            lower_bound=np.maximum(forecast_data['yhat_lower'].to_numpy(dtype=float), 0),
+            upper_bound=np.maximum(forecast_data['yhat_upper'].to_numpy(dtype=float), 0),
+            confidence=np.full(horizon, 0.7)  # Prophet provides good confidence
+        )
     
     def _select_best_model(
-        self, model_results: Dict[str, List[ForecastPoint]], df: pd.DataFrame
-    ) -> Tuple[str, List[ForecastPoint], List[ModelPerformance]]:
-        """Select best model based on historical performance"""
+        self,
+        model_results: Dict[str, ForecastSeries],
+        df: pd.DataFrame,
+        validation_fits: Optional[Dict[str, object]] = None
+    ) -> Tuple[str, ForecastSeries, List[ModelPerformance]]:
+        """
+        Select best model based on historical performance
+        
+        Args:
+            model_results: Forecasts per model on the full series
+            df: Prepared daily sales data
+            validation_fits: Models fitted on the training split to reuse;
+                models fitted here are added to it
+        """
         if len(df) < 14:
             # Not enough data for validation, use exponential smoothing
             return 'exponential_smoothing', model_results['exponential_smoothing'], []
@@ -573,25 +1089,17 @@ class DemandForecastAgent:
         # Use last 7 days as validation set
         train_df = df.iloc[:-7]
         test_df = df.iloc[-7:]
+        validation_fits = {} if validation_fits is None else validation_fits
         
         performances = []
         
         for model_name, _ in model_results.items():
             try:
                 # Generate forecast for validation period
-                if model_name == 'moving_average':
-                    val_forecast = self._forecast_moving_average(train_df, 7)
-                elif model_name == 'exponential_smoothing':
-                    val_forecast = self._forecast_exponential_smoothing(train_df, 7)
-                elif model_name == 'arima':
-                    val_forecast = self._forecast_arima(train_df, 7)
-                elif model_name == 'prophet':
-                    val_forecast = self._forecast_prophet(train_df, 7)
-                else:
-                    continue
+                val_forecast = self._forecast_from_fit(model_name, train_df, 7, validation_fits)
                 
                 # Calculate errors
-                predictions = [fp.predicted_quantity for fp in val_forecast]
+                predictions = val_forecast.predicted_quantity
                 actuals = test_df['quantity'].values
                 
                 mae = np.mean(np.abs(predictions - actuals))
@@ -624,15 +1132,15 @@ class DemandForecastAgent:
     
     def _calculate_base_confidence(
         self,
-        df: pd.DataFrame,
-        forecast: List[ForecastPoint],
+        data_points: int,
+        forecast: ForecastSeries,
         performances: List[ModelPerformance]
     ) -> float:
         """Calculate base confidence before QA adjustment"""
         confidence_factors = []
         
         # Factor 1: Data quantity
-        data_factor = min(1.0, len(df) / 60)  # Full confidence at 60+ days
+        data_factor = min(1.0, data_points / 60)  # Full confidence at 60+ days
         confidence_factors.append(data_factor)
         
         # Factor 2: Model performance
@@ -643,7 +1151,7 @@ class DemandForecastAgent:
             confidence_factors.append(0.6)
         
         # Factor 3: Forecast stability (variance in predictions)
-        predictions = [fp.predicted_quantity for fp in forecast]
+        predictions = forecast.predicted_quantity
         if np.std(predictions) > 0:
             stability = 1.0 / (1.0 + np.std(predictions) / (np.mean(predictions) + 1))
             confidence_factors.append(stability)
@@ -655,8 +1163,7 @@ class DemandForecastAgent:
     
     def _generate_inventory_alerts(
         self,
-        df: pd.DataFrame,
-        forecast: List[ForecastPoint],
+        forecast: ForecastSeries,
         current_inventory: Optional[int],
         confidence: float
     ) -> List[InventoryAlert]:
@@ -667,7 +1174,7 @@ class DemandForecastAgent:
             return alerts
         
         # Calculate average daily demand from forecast
-        avg_daily_demand = np.mean([fp.predicted_quantity for fp in forecast[:7]])
+        avg_daily_demand = np.mean(forecast.predicted_quantity[:7])
         
         # Alert 1: Stockout risk
         days_of_stock = current_inventory / (avg_daily_demand + 1)
@@ -721,7 +1228,7 @@ class DemandForecastAgent:
     
     def _calculate_reorder_point(
         self,
-        forecast: List[ForecastPoint],
+        forecast: ForecastSeries,
         current_inventory: Optional[int]
     ) -> Optional[int]:
         """Calculate recommended reorder quantity"""
@@ -729,7 +1236,7 @@ class DemandForecastAgent:
             return None
         
         # Calculate expected demand for next 30 days
-        expected_demand_30d = sum(fp.predicted_quantity for fp in forecast[:30])
+        expected_demand_30d = float(np.sum(forecast.predicted_quantity[:30]))
         
         # Safety stock (20% buffer)
         safety_stock = expected_demand_30d * 0.2
@@ -15,6 +15,7 @@ from src.schemas.pricing import (
     ProductEquivalenceMapping
 )
 from src.schemas.product import ProductResponse
+from src.pricing.equivalence import ProductEquivalenceIndex
 from src.schemas.data_quality import DataQualityReport, ProductQualityMetadata
 
 
@@ -359,38 +360,34 @@ class EnhancedPricingIntelligenceAgent:
         Returns:
             List of product equivalence mappings
         """
-        mappings = []
+        return self.map_product_equivalences([our_product], competitor_products)
+    
+    def map_product_equivalences(
+        self,
+        our_products: List[ProductResponse],
+        competitor_products: List[ProductResponse],
+        index: Optional[ProductEquivalenceIndex] = None
+    ) -> List[ProductEquivalenceMapping]:
+        """
+        Map many products to equivalent competitor products.
         
-        for comp_product in competitor_products:
-            # Calculate similarity score
-            name_similarity = self._calculate_name_similarity(
-                our_product.name,
-                comp_product.name
-            )
-            
-            # Check SKU similarity
-            sku_similarity = self._calculate_name_similarity(
-                our_product.normalized_sku,
-                comp_product.normalized_sku
-            )
-            
-            # Combined confidence score
-            confidence = (name_similarity * 0.7) + (sku_similarity * 0.3)
+        Competitors are indexed once (character n-gram TF-IDF) and each
+        product is scored exactly only against its top candidates instead
+        of the whole competitor catalog.
+        
+        Args:
+            our_products: Our products
+            competitor_products: List of competitor products
+            index: Prebuilt index over competitor_products (built here if omitted)
             
-            # Only include if confidence is above threshold
-            if confidence >= self.mapping_confidence_threshold:
-                # Determine mapping type
-                mapping_type = "exact_sku" if sku_similarity > 0.9 else "name_similarity"
-                
-                mapping = ProductEquivalenceMapping(
-                    our_product_id=our_product.id,
-                    competitor_product_id=comp_product.id,
-                    confidence=confidence,
-                    mapping_type=mapping_type
-                )
-                mappings.append(mapping)
+        Returns:
+            List of product equivalence mappings, grouped by product
+        """
+        if not our_products or not competitor_products:
+            return []
         
-        return mappings
+        index = index or ProductEquivalenceIndex(competitor_products)
+        return index.match(our_products, self.mapping_confidence_threshold)
     
     def _calculate_name_similarity(self, name1: str, name2: str) -> float:
         """Calculate similarity between two product names"""
@@ -510,6 +507,45 @@ class EnhancedPricingIntelligenceAgent:
         
         return alerts
     
+    async def detect_stored_price_changes(
+        self,
+        db,
+        product_ids: List[UUID],
+        threshold_percent: float = 5.0,
+        days: int = 30
+    ) -> List[PriceChangeAlert]:
+        """
+        Detect significant price changes from stored price history.
+        
+        Consecutive prices are compared in the database, so only the
+        alert rows are loaded.
+        
+        Args:
+            db: Database session
+            product_ids: Products to check
+            threshold_percent: Minimum absolute change in percent
+            days: Look-back window
+            
+        Returns:
+            List of price change alerts
+        """
+        from src.crud.price_history import detect_price_changes_bulk
+        
+        changes = await detect_price_changes_bulk(
+            db, self.tenant_id, product_ids, threshold_percent=threshold_percent, days=days
+        )
+        return [
+            PriceChangeAlert(
+                product_id=change.product_id,
+                old_price=change.old_price,
+                new_price=change.new_price,
+                change_percentage=change.price_change_percent,
+                timestamp=change.timestamp,
+                competitor_id=change.competitor_id
+            )
+            for change in changes
+        ]
+    
     def extract_promotions(
         self,
         competitor_data: List[Dict]
@@ -79,7 +79,8 @@ async def cache_health_check(
         return {
             "enabled": True,
             "healthy": is_healthy,
-            "message": "Cache is healthy" if is_healthy else "Cache is unhealthy"
+            "message": "Cache is healthy" if is_healthy else "Cache is unhealthy",
+            "pool": cache.get_pool_stats()
         }
     except Exception as e:
         return {
@@ -1,17 +1,17 @@
 """Competitor Price Dashboard API endpoints"""
 from typing import List, Dict, Any, Optional
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from pydantic import BaseModel
-from decimal import Decimal
 
 from src.database import get_db
 from src.models.product import Product
 from src.models.user import User
 from src.auth.dependencies import get_current_active_user, get_tenant_id
+from src.pricing.competitor_snapshots import CompetitorSnapshotService
 
 router = APIRouter(prefix="/competitor-dashboard", tags=["competitor-dashboard"])
 
@@ -21,7 +21,7 @@ class CompetitorPrice(BaseModel):
     competitor_name: str
     price: float
     currency: str
-    last_updated: datetime
+    last_updated: Optional[datetime] = None
     price_change_7d: Optional[float] = None
     price_change_30d: Optional[float] = None
     is_on_sale: bool = False
@@ -75,6 +75,7 @@ class DashboardResponse(BaseModel):
     price_alerts: List[PriceAlert]
     top_opportunities: List[ProductPriceComparison]
     generated_at: datetime
+    next_cursor: Optional[str] = None
 
 
 @router.get("/overview", response_model=DashboardResponse)
@@ -83,168 +84,96 @@ async def get_competitor_dashboard(
     current_user: User = Depends(get_current_active_user),
     tenant_id: UUID = Depends(get_tenant_id),
     limit: int = Query(default=20, le=100),
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    cursor: Optional[UUID] = Query(default=None, description="next_cursor of the previous page")
 ) -> DashboardResponse:
     """
     Get comprehensive competitor price dashboard data (TENANT-ISOLATED).
     
+    Price comparisons are read from the precomputed competitor price
+    snapshots in keyset pages; the market overview, alerts and top
+    opportunities cover all tracked products and are cached per tenant
+    until the snapshots are refreshed.
+    
     Args:
         db: Database session
         current_user: Authenticated user
         tenant_id: Tenant ID from JWT token
         limit: Maximum number of products to return
         category: Optional category filter
+        cursor: Resume after this product id
         
     Returns:
         Complete dashboard with market overview, comparisons, and alerts
     """
-    # Fetch our products (TENANT-FILTERED)
-    query = select(Product).where(Product.tenant_id == tenant_id)
-    
-    if category:
-        query = query.where(Product.category == category)
-    
-    query = query.limit(limit)
-    result = await db.execute(query)
-    products = result.scalars().all()
-    
-    # Generate mock competitor data for each product
-    price_comparisons = []
-    price_alerts = []
-    
-    total_products = len(products)
-    products_competitive = 0
-    products_underpriced = 0
-    products_overpriced = 0
-    total_price_gap = 0.0
-    total_revenue_gain = 0.0
-    active_promotions = 0
-    
-    for product in products:
-        # Generate mock competitor prices
-        competitor_prices = _generate_mock_competitor_prices(product)
-        
-        # Calculate statistics
-        competitor_price_values = [cp.price for cp in competitor_prices]
-        min_price = min(competitor_price_values)
-        max_price = max(competitor_price_values)
-        avg_price = sum(competitor_price_values) / len(competitor_price_values)
-        
-        our_price = float(product.price)
-        price_gap = ((our_price - avg_price) / avg_price) * 100
-        total_price_gap += abs(price_gap)
-        
-        # Determine price position
-        if our_price <= min_price:
-            price_position = "lowest"
-            products_underpriced += 1
-        elif our_price >= max_price:
-            price_position = "highest"
-            products_overpriced += 1
-        else:
-            price_position = "competitive"
-            products_competitive += 1
-        
-        # Generate recommendation
-        recommendation = _generate_price_recommendation(
-            our_price, avg_price, min_price, max_price, price_position
-        )
-        
-        # Calculate potential revenue gain
-        if price_position == "underpriced" and our_price < avg_price:
-            potential_gain = (avg_price - our_price) * 0.8  # Conservative estimate
-            total_revenue_gain += potential_gain
-        
-        # Count promotions
-        active_promotions += sum(1 for cp in competitor_prices if cp.is_on_sale)
-        
-        comparison = ProductPriceComparison(
-            product_id=str(product.id),
-            sku=product.sku,
-            name=product.name,
-            our_price=our_price,
-            currency=product.currency,
-            competitor_prices=competitor_prices,
-            min_competitor_price=min_price,
-            max_competitor_price=max_price,
-            avg_competitor_price=avg_price,
-            price_position=price_position,
-            price_gap_percentage=price_gap,
-            recommendation=recommendation
-        )
-        price_comparisons.append(comparison)
-        
-        # Generate alerts for significant price gaps
-        alert = _generate_price_alert(product, our_price, avg_price, price_position, price_gap)
-        if alert:
-            price_alerts.append(alert)
+    service = CompetitorSnapshotService(tenant_id)
     
-    # Calculate market overview
-    avg_price_gap = total_price_gap / total_products if total_products > 0 else 0.0
-    
-    market_overview = MarketOverview(
-        total_products_tracked=total_products,
-        products_competitively_priced=products_competitive,
-        products_underpriced=products_underpriced,
-        products_overpriced=products_overpriced,
-        avg_price_gap=round(avg_price_gap, 2),
-        total_potential_revenue_gain=round(total_revenue_gain, 2),
-        active_competitor_promotions=active_promotions
-    )
+    # Keyset page of comparisons (TENANT-FILTERED)
+    snapshots, next_cursor = await service.get_page(db, limit, cursor=cursor, category=category)
+    price_comparisons = [_build_comparison(snapshot) for snapshot in snapshots]
     
-    # Sort by price gap to find top opportunities
-    top_opportunities = sorted(
-        [pc for pc in price_comparisons if pc.price_position == "underpriced"],
-        key=lambda x: abs(x.price_gap_percentage),
-        reverse=True
-    )[:5]
+    # Tenant-level totals and largest gaps (cached)
+    summary = await service.get_summary(db, category=category)
     
+    price_alerts = [
+        alert for alert in (_generate_price_alert(snapshot) for snapshot in summary["alerts"])
+        if alert
+    ]
     # Sort alerts by severity
     severity_order = {"high": 0, "medium": 1, "low": 2}
     price_alerts.sort(key=lambda x: severity_order.get(x.severity, 3))
     
     return DashboardResponse(
-        market_overview=market_overview,
+        market_overview=MarketOverview(**summary["totals"]),
         price_comparisons=price_comparisons,
         price_alerts=price_alerts[:10],  # Top 10 alerts
-        top_opportunities=top_opportunities,
-        generated_at=datetime.utcnow()
+        top_opportunities=[_build_comparison(snapshot) for snapshot in summary["opportunities"]],
+        generated_at=datetime.utcnow(),
+        next_cursor=str(next_cursor) if next_cursor else None
     )
 
 
-def _generate_mock_competitor_prices(product: Product) -> List[CompetitorPrice]:
-    """Generate mock competitor prices for demonstration"""
-    import random
-    
-    base_price = float(product.price)
-    competitors = ["Amazon", "Walmart", "Target", "Best Buy", "eBay"]
-    
-    competitor_prices = []
-    for competitor in competitors:
-        # Generate price variation (-20% to +30%)
-        variation = random.uniform(-0.20, 0.30)
-        price = base_price * (1 + variation)
-        
-        # Random price changes
-        price_change_7d = random.uniform(-5, 5) if random.random() > 0.3 else None
-        price_change_30d = random.uniform(-10, 10) if random.random() > 0.3 else None
-        
-        # Random promotions
-        is_on_sale = random.random() > 0.7
-        original_price = price * 1.15 if is_on_sale else None
-        
-        competitor_prices.append(CompetitorPrice(
-            competitor_name=competitor,
-            price=round(price, 2),
-            currency=product.currency,
-            last_updated=datetime.utcnow() - timedelta(hours=random.randint(1, 24)),
-            price_change_7d=round(price_change_7d, 2) if price_change_7d else None,
-            price_change_30d=round(price_change_30d, 2) if price_change_30d else None,
-            is_on_sale=is_on_sale,
-            original_price=round(original_price, 2) if original_price else None
-        ))
+@router.post("/snapshots/refresh")
+async def refresh_competitor_snapshots(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    tenant_id: UUID = Depends(get_tenant_id)
+) -> Dict[str, Any]:
+    """
+    Rebuild all competitor price snapshots of the tenant (TENANT-ISOLATED).
     
-    return competitor_prices
+    Snapshots are normally refreshed incrementally when products change;
+    this recomputes them from the current competitor mappings.
+    """
+    service = CompetitorSnapshotService(tenant_id)
+    refreshed = await service.refresh(db)
+    await db.commit()
+    await service.invalidate_cache()
+    return {"snapshots_refreshed": refreshed, "refreshed_at": datetime.utcnow().isoformat()}
+
+
+def _build_comparison(snapshot: Dict[str, Any]) -> ProductPriceComparison:
+    """Build a price comparison from a snapshot dictionary"""
+    return ProductPriceComparison(
+        product_id=snapshot["product_id"],
+        sku=snapshot["sku"],
+        name=snapshot["name"],
+        our_price=snapshot["our_price"],
+        currency=snapshot["currency"],
+        competitor_prices=[CompetitorPrice(**price) for price in snapshot["competitor_prices"]],
+        min_competitor_price=snapshot["min_competitor_price"],
+        max_competitor_price=snapshot["max_competitor_price"],
+        avg_competitor_price=snapshot["avg_competitor_price"],
+        price_position=snapshot["price_position"],
+        price_gap_percentage=snapshot["price_gap_percentage"],
+        recommendation=_generate_price_recommendation(
+            snapshot["our_price"],
+            snapshot["avg_competitor_price"],
+            snapshot["min_competitor_price"],
+            snapshot["max_competitor_price"],
+            snapshot["price_position"]
+        )
+    )
 
 
 def _generate_price_recommendation(
@@ -255,65 +184,51 @@ def _generate_price_recommendation(
     price_position: str
 ) -> str:
     """Generate pricing recommendation"""
-    if price_position == "underpriced":
+    if price_position == "lowest":
         suggested_price = (avg_price + our_price) / 2
         return f"Consider increasing price to ${suggested_price:.2f} (closer to market average)"
-    elif price_position == "overpriced":
+    elif price_position == "highest":
         suggested_price = (avg_price + our_price) / 2
         return f"Consider decreasing price to ${suggested_price:.2f} to be more competitive"
     else:
         return "Price is competitive - maintain current pricing"
 
 
-def _generate_price_alert(
-    product: Product,
-    our_price: float,
-    avg_price: float,
-    price_position: str,
-    price_gap: float
-) -> Optional[PriceAlert]:
+def _generate_price_alert(snapshot: Dict[str, Any]) -> Optional[PriceAlert]:
     """Generate price alert if significant gap exists"""
+    price_gap = snapshot["price_gap_percentage"]
+    price_position = snapshot["price_position"]
     if abs(price_gap) < 10:
         return None  # No alert for small gaps
     
-    if price_position == "underpriced" and price_gap < -15:
+    alert = {
+        "product_id": snapshot["product_id"],
+        "sku": snapshot["sku"],
+        "name": snapshot["name"],
+        "current_price": snapshot["our_price"],
+        "competitor_avg": snapshot["avg_competitor_price"],
+        "created_at": datetime.utcnow()
+    }
+    if price_position == "lowest" and price_gap < -15:
         return PriceAlert(
-            product_id=str(product.id),
-            sku=product.sku,
-            name=product.name,
+            **alert,
             alert_type="underpriced",
             severity="high",
-            message=f"Significantly underpriced by {abs(price_gap):.1f}% - potential revenue loss",
-            current_price=our_price,
-            competitor_avg=avg_price,
-            created_at=datetime.utcnow()
+            message=f"Significantly underpriced by {abs(price_gap):.1f}% - potential revenue loss"
         )
-    elif price_position == "overpriced" and price_gap > 15:
+    elif price_position == "highest" and price_gap > 15:
         return PriceAlert(
-            product_id=str(product.id),
-            sku=product.sku,
-            name=product.name,
+            **alert,
             alert_type="overpriced",
             severity="high",
-            message=f"Significantly overpriced by {price_gap:.1f}% - may lose sales",
-            current_price=our_price,
-            competitor_avg=avg_price,
-            created_at=datetime.utcnow()
+            message=f"Significantly overpriced by {price_gap:.1f}% - may lose sales"
         )
-    elif abs(price_gap) > 10:
-        return PriceAlert(
-            product_id=str(product.id),
-            sku=product.sku,
-            name=product.name,
-            alert_type="price_gap",
-            severity="medium",
-            message=f"Price gap of {price_gap:.1f}% detected",
-            current_price=our_price,
-            competitor_avg=avg_price,
-            created_at=datetime.utcnow()
-        )
-    
-    return None
+    return PriceAlert(
+        **alert,
+        alert_type="price_gap",
+        severity="medium",
+        message=f"Price gap of {price_gap:.1f}% detected"
+    )
 
 
 @router.get("/categories")
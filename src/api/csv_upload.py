@@ -19,11 +19,23 @@ from src.models.sales_record import SalesRecord
 from src.models.user import User
 from src.schemas.orchestration import ExecutionMode
 from src.auth.dependencies import get_current_active_user, get_tenant_id
-from src.cache.event_bus import get_event_publisher, EventType, DataEvent
+from src.cache.event_bus import get_event_coalescer, get_event_publisher, EventType, DataEvent
+from src.forecasting.materialization import schedule_forecast_materialization
 
 router = APIRouter(prefix="/csv", tags=["CSV Upload"])
 
 
+async def _publish_upload_completed(tenant_id: UUID, filename: str, records_saved: int):
+    """Announce a completed upload (the cache warmer recomputes the tenant's hot entries)"""
+    await get_event_publisher().publish(DataEvent(
+        event_type=EventType.INGESTION_COMPLETED,
+        tenant_id=tenant_id,
+        entity_type='ingestion',
+        entity_id=f"csv_upload:{filename}",
+        metadata={'records_saved': records_saved}
+    ))
+
+
 @router.post("/upload/products")
 async def upload_products_csv(
     file: UploadFile = File(...),
@@ -71,17 +83,14 @@ async def upload_products_csv(
     
     await db.commit()
     
-    # Publish cache invalidation events for each product
-    event_publisher = get_event_publisher()
-    for product in products:
-        event = DataEvent(
-            event_type=EventType.PRODUCT_CREATED,
-            tenant_id=tenant_id,
-            entity_type='product',
-            entity_id=str(product.id),
-            metadata={'sku': product.sku, 'name': product.name}
-        )
-        await event_publisher.publish(event)
+    # Queue cache invalidation (one coalesced event, published off the request path)
+    get_event_coalescer().add(DataEvent.batch(
+        event_type=EventType.PRODUCT_CREATED,
+        tenant_id=tenant_id,
+        entity_type='product',
+        entity_ids=[str(product.id) for product in products]
+    ))
+    await _publish_upload_completed(tenant_id, file.filename, len(products))
     
     # Analyze with LLM
     llm_engine = LLMReasoningEngine(tenant_id=tenant_id)
@@ -203,17 +212,15 @@ async def upload_reviews_csv(
     
     await db.commit()
     
-    # Publish cache invalidation events for each review
-    event_publisher = get_event_publisher()
-    for review in reviews:
-        event = DataEvent(
-            event_type=EventType.REVIEW_CREATED,
-            tenant_id=tenant_id,
-            entity_type='review',
-            entity_id=str(review.id),
-            metadata={'product_id': str(review.product_id), 'rating': review.rating}
-        )
-        await event_publisher.publish(event)
+    # Queue cache invalidation (one coalesced event, published off the request path)
+    get_event_coalescer().add(DataEvent.batch(
+        event_type=EventType.REVIEW_CREATED,
+        tenant_id=tenant_id,
+        entity_type='review',
+        entity_ids=[str(review.id) for review in reviews],
+        product_ids=list(dict.fromkeys(str(review.product_id) for review in reviews))
+    ))
+    await _publish_upload_completed(tenant_id, file.filename, len(reviews))
     
     # Analyze with LLM
     llm_engine = LLMReasoningEngine(tenant_id=tenant_id)
@@ -338,17 +345,18 @@ async def upload_sales_csv(
     
     await db.commit()
     
-    # Publish cache invalidation events for each sales record
-    event_publisher = get_event_publisher()
-    for record in sales_records:
-        event = DataEvent(
-            event_type=EventType.SALES_RECORDED,
-            tenant_id=tenant_id,
-            entity_type='sales',
-            entity_id=str(record.id),
-            metadata={'product_id': str(record.product_id), 'quantity': record.quantity}
-        )
-        await event_publisher.publish(event)
+    # Queue cache invalidation (one coalesced event, published off the request path)
+    get_event_coalescer().add(DataEvent.batch(
+        event_type=EventType.SALES_RECORDED,
+        tenant_id=tenant_id,
+        entity_type='sales',
+        entity_ids=[str(record.id) for record in sales_records],
+        product_ids=list(dict.fromkeys(str(record.product_id) for record in sales_records))
+    ))
+    await _publish_upload_completed(tenant_id, file.filename, len(sales_records))
+    
+    # Refresh materialized forecasts for the affected products in the background
+    schedule_forecast_materialization(tenant_id, [r.product_id for r in sales_records])
     
     # Analyze with LLM
     llm_engine = LLMReasoningEngine(tenant_id=tenant_id)
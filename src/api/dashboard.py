@@ -8,15 +8,16 @@ from sqlalchemy import func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from src.database import get_db
+from src.database import get_db, get_read_db
 from src.models.product import Product
 from src.models.review import Review
 from src.models.query_history import QueryHistory
 from src.services.data_service import DataService
+from src.cache.warming import WarmableEndpoint, get_cache_warmer
 from src.services.cache_service import (
     make_cache_key,
-    get_cached,
-    set_cached,
+    get_or_compute_cached,
+    get_many_cached,
     get_ttl
 )
 
@@ -24,6 +25,42 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
+# Widgets the cache warmer recomputes after ingestion: cache type -> loader(data_service, params)
+WARMABLE_WIDGETS = {
+    "dashboard_stats": lambda service, params: service.get_dashboard_stats(),
+    "dashboard_kpis": lambda service, params: service.get_dashboard_kpis(days=params["days"]),
+    "dashboard_trends": lambda service, params: service.get_dashboard_trends(days=params["days"]),
+    "dashboard_alerts": lambda service, params: service.get_dashboard_alerts(),
+    "dashboard_insights": lambda service, params: service.get_dashboard_insights(),
+    "dashboard_activity": lambda service, params: service.get_recent_activity(limit=params["limit"]),
+}
+
+
+def _widget_cache_key(cache_type: str, tenant_id, params: Dict[str, Any]) -> str:
+    """Cache key of a widget (the user email is loader context, not part of the key)"""
+    return make_cache_key(cache_type, str(tenant_id), **{k: v for k, v in params.items() if k != "email"})
+
+
+def _register_warmable_widgets():
+    warmer = get_cache_warmer()
+    for cache_type, load in WARMABLE_WIDGETS.items():
+        warmer.register(WarmableEndpoint(
+            name=cache_type,
+            cache_key=lambda tenant_id, params, cache_type=cache_type: _widget_cache_key(cache_type, tenant_id, params),
+            loader=lambda db, tenant_id, params, load=load: load(
+                DataService(tenant_id=str(tenant_id), email=params.get("email"), db=db), params
+            ),
+            ttl=get_ttl(cache_type)
+        ))
+
+
+_register_warmable_widgets()
+
+
+def record_widget_access(cache_type: str, tenant_id: str, email: str, **params):
+    """Count a widget access for cache warming"""
+    get_cache_warmer().record_access(cache_type, tenant_id, {"email": email, **params})
+
 
 def get_tenant_id_from_request(request: Request) -> UUID:
     """Extract tenant_id from request state (set by middleware)"""
@@ -43,7 +80,7 @@ def get_user_email_from_request(request: Request) -> str:
 @router.get("/stats")
 async def get_dashboard_stats(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get dashboard statistics
@@ -56,21 +93,17 @@ async def get_dashboard_stats(
         
         # Step 1: Build cache key
         cache_key = make_cache_key("dashboard_stats", tenant_id)
+        record_widget_access("dashboard_stats", tenant_id, email)
         
-        # Step 2: Check cache
-        cached_data = await get_cached(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
-        # Step 3: Cache miss - fetch from DataService
-        logger.info(f"Fetching dashboard stats from Mock API for tenant {tenant_id}")
+        # Step 2: Serve from cache; on a miss or expiry one request refetches from DataService
         data_service = DataService(tenant_id=tenant_id, email=email, db=db)
-        stats = await data_service.get_dashboard_stats()
-        
-        # Step 4: Store in cache
-        await set_cached(cache_key, stats, ttl=get_ttl("dashboard_stats"))
+        stats = await get_or_compute_cached(
+            cache_key,
+            data_service.get_dashboard_stats,
+            ttl=get_ttl("dashboard_stats")
+        )
         
-        # Step 5: Return
+        # Step 3: Return
         return stats
         
     except Exception as e:
@@ -82,7 +115,7 @@ async def get_dashboard_stats(
 async def get_recent_activity(
     request: Request,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> List[Dict[str, Any]]:
     """
     Get recent activity
@@ -95,21 +128,17 @@ async def get_recent_activity(
         
         # Step 1: Build cache key with limit parameter
         cache_key = make_cache_key("dashboard_activity", tenant_id, limit=limit)
+        record_widget_access("dashboard_activity", tenant_id, email, limit=limit)
         
-        # Step 2: Check cache
-        cached_data = await get_cached(cache_key)
-        if cached_data is not None:
-            return cached_data
-        
-        # Step 3: Cache miss - fetch from DataService
-        logger.info(f"Fetching recent activity from Mock API for tenant {tenant_id} (limit={limit})")
+        # Step 2: Serve from cache; on a miss or expiry one request refetches from DataService
         data_service = DataService(tenant_id=tenant_id, email=email, db=db)
-        activities = await data_service.get_recent_activity(limit=limit)
-        
-        # Step 4: Store in cache
-        await set_cached(cache_key, activities, ttl=get_ttl("dashboard_activity"))
+        activities = await get_or_compute_cached(
+            cache_key,
+            lambda: data_service.get_recent_activity(limit=limit),
+            ttl=get_ttl("dashboard_activity")
+        )
         
-        # Step 5: Return
+        # Step 3: Return
         return activities
         
     except Exception as e:
@@ -122,7 +151,7 @@ async def get_recent_activity(
 async def get_dashboard_kpis(
     request: Request,
     days: int = 30,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get key performance indicators for the dashboard
@@ -135,21 +164,17 @@ async def get_dashboard_kpis(
         
         # Step 1: Build cache key with days parameter
         cache_key = make_cache_key("dashboard_kpis", tenant_id, days=days)
+        record_widget_access("dashboard_kpis", tenant_id, email, days=days)
         
-        # Step 2: Check cache
-        cached_data = await get_cached(cache_key)
-        if cached_data is not None:
-            return {"payload": cached_data}
-        
-        # Step 3: Cache miss - fetch from DataService
-        logger.info(f"Fetching dashboard KPIs from Mock API for tenant {tenant_id} (days={days})")
+        # Step 2: Serve from cache; on a miss or expiry one request refetches from DataService
         data_service = DataService(tenant_id=tenant_id, email=email, db=db)
-        kpis = await data_service.get_dashboard_kpis(days=days)
-        
-        # Step 4: Store in cache
-        await set_cached(cache_key, kpis, ttl=get_ttl("dashboard_kpis"))
+        kpis = await get_or_compute_cached(
+            cache_key,
+            lambda: data_service.get_dashboard_kpis(days=days),
+            ttl=get_ttl("dashboard_kpis")
+        )
         
-        # Step 5: Return
+        # Step 3: Return
         return {"payload": kpis}
         
     except Exception as e:
@@ -160,7 +185,7 @@ async def get_dashboard_kpis(
 @router.get("/insights")
 async def get_dashboard_insights(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get AI-generated insights for the dashboard
@@ -173,21 +198,17 @@ async def get_dashboard_insights(
         
         # Step 1: Build cache key
         cache_key = make_cache_key("dashboard_insights", tenant_id)
+        record_widget_access("dashboard_insights", tenant_id, email)
         
-        # Step 2: Check cache
-        cached_data = await get_cached(cache_key)
-        if cached_data is not None:
-            return {"payload": cached_data}
-        
-        # Step 3: Cache miss - fetch from DataService
-        logger.info(f"Fetching dashboard insights from Mock API for tenant {tenant_id}")
+        # Step 2: Serve from cache; on a miss or expiry one request refetches from DataService
         data_service = DataService(tenant_id=tenant_id, email=email, db=db)
-        insights_data = await data_service.get_dashboard_insights()
-        
-        # Step 4: Store in cache
-        await set_cached(cache_key, insights_data, ttl=get_ttl("dashboard_insights"))
+        insights_data = await get_or_compute_cached(
+            cache_key,
+            data_service.get_dashboard_insights,
+            ttl=get_ttl("dashboard_insights")
+        )
         
-        # Step 5: Return
+        # Step 3: Return
         return {"payload": insights_data}
         
     except Exception as e:
@@ -198,7 +219,7 @@ async def get_dashboard_insights(
 @router.get("/alerts")
 async def get_dashboard_alerts(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get critical alerts for the dashboard
@@ -211,21 +232,17 @@ async def get_dashboard_alerts(
         
         # Step 1: Build cache key
         cache_key = make_cache_key("dashboard_alerts", tenant_id)
+        record_widget_access("dashboard_alerts", tenant_id, email)
         
-        # Step 2: Check cache
-        cached_data = await get_cached(cache_key)
-        if cached_data is not None:
-            return {"payload": cached_data}
-        
-        # Step 3: Cache miss - fetch from DataService
-        logger.info(f"Fetching dashboard alerts from Mock API for tenant {tenant_id}")
+        # Step 2: Serve from cache; on a miss or expiry one request refetches from DataService
         data_service = DataService(tenant_id=tenant_id, email=email, db=db)
-        alerts_data = await data_service.get_dashboard_alerts()
-        
-        # Step 4: Store in cache
-        await set_cached(cache_key, alerts_data, ttl=get_ttl("dashboard_alerts"))
+        alerts_data = await get_or_compute_cached(
+            cache_key,
+            data_service.get_dashboard_alerts,
+            ttl=get_ttl("dashboard_alerts")
+        )
         
-        # Step 5: Return
+        # Step 3: Return
         return {"payload": alerts_data}
         
     except Exception as e:
@@ -237,7 +254,7 @@ async def get_dashboard_alerts(
 async def get_dashboard_trends(
     request: Request,
     days: int = 30,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get sales trends over time
@@ -250,21 +267,17 @@ async def get_dashboard_trends(
         
         # Step 1: Build cache key with days parameter
         cache_key = make_cache_key("dashboard_trends", tenant_id, days=days)
+        record_widget_access("dashboard_trends", tenant_id, email, days=days)
         
-        # Step 2: Check cache
-        cached_data = await get_cached(cache_key)
-        if cached_data is not None:
-            return {"payload": cached_data}
-        
-        # Step 3: Cache miss - fetch from DataService
-        logger.info(f"Fetching dashboard trends from Mock API for tenant {tenant_id} (days={days})")
+        # Step 2: Serve from cache; on a miss or expiry one request refetches from DataService
         data_service = DataService(tenant_id=tenant_id, email=email, db=db)
-        trends = await data_service.get_dashboard_trends(days=days)
-        
-        # Step 4: Store in cache
-        await set_cached(cache_key, trends, ttl=get_ttl("dashboard_trends"))
+        trends = await get_or_compute_cached(
+            cache_key,
+            lambda: data_service.get_dashboard_trends(days=days),
+            ttl=get_ttl("dashboard_trends")
+        )
         
-        # Step 5: Return
+        # Step 3: Return
         return {"payload": trends}
         
     except Exception as e:
@@ -272,6 +285,64 @@ async def get_dashboard_trends(
         raise HTTPException(status_code=500, detail=f"Failed to fetch trends: {str(e)}")
 
 
+@router.get("/overview")
+async def get_dashboard_overview(
+    request: Request,
+    days: int = 30,
+    activity_limit: int = 10,
+    db: AsyncSession = Depends(get_read_db)
+) -> Dict[str, Any]:
+    """
+    Get all dashboard widgets in one response
+    Shares cache entries with the per-widget endpoints and reads them
+    with a single cache round-trip; missing widgets are fetched through
+    the same stampede-protected path as the per-widget endpoints
+    WITH REDIS CACHING
+    """
+    try:
+        tenant_id = str(get_tenant_id_from_request(request))
+        email = get_user_email_from_request(request)
+        data_service = DataService(tenant_id=tenant_id, email=email, db=db)
+        
+        # Widget -> (cache type, cache key parameters)
+        widget_params = {
+            "stats": ("dashboard_stats", {}),
+            "kpis": ("dashboard_kpis", {"days": days}),
+            "trends": ("dashboard_trends", {"days": days}),
+            "alerts": ("dashboard_alerts", {}),
+            "insights": ("dashboard_insights", {}),
+            "activity": ("dashboard_activity", {"limit": activity_limit}),
+        }
+        widgets = {}
+        for name, (cache_type, params) in widget_params.items():
+            record_widget_access(cache_type, tenant_id, email, **params)
+            load = WARMABLE_WIDGETS[cache_type]
+            widgets[name] = (
+                cache_type,
+                make_cache_key(cache_type, tenant_id, **params),
+                lambda load=load, params=params: load(data_service, params)
+            )
+        
+        # Step 1: One batched cache read for every widget
+        cached = await get_many_cached([cache_key for _, cache_key, _ in widgets.values()])
+        
+        # Step 2: Fetch missing widgets (sequentially; they share the DB session)
+        overview = {}
+        for name, (cache_type, cache_key, load) in widgets.items():
+            if cache_key in cached:
+                overview[name] = cached[cache_key]
+                continue
+            logger.info(f"Fetching dashboard {name} for tenant {tenant_id}")
+            overview[name] = await get_or_compute_cached(cache_key, load, ttl=get_ttl(cache_type))
+        
+        # Step 3: Return
+        return {"payload": overview}
+        
+    except Exception as e:
+        logger.error(f"Error fetching dashboard overview: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch dashboard overview: {str(e)}")
+
+
 @router.get("/query-history")
 async def get_dashboard_query_history(
     request: Request,
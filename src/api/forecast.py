@@ -1,21 +1,30 @@
 """Demand Forecast API endpoints"""
 from uuid import UUID
-from typing import List, Optional
+from typing import Callable, List, Optional
+import json
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel, Field
 
-from src.database import get_db
+from src.database import get_db, get_session_factory
 from src.models.product import Product
 from src.models.sales_record import SalesRecord
 from src.models.user import User
 from src.agents.demand_forecast_agent import DemandForecastAgent
+from src.forecasting.batch_engine import BatchForecastItem, ForecastBatchEngine
+from src.forecasting.materialization import ForecastMaterializer, data_watermark
+from src.forecasting.series import compact_forecast_dict, expand_forecast_dict
+from src.config import settings
 from src.auth.dependencies import get_current_active_user, get_tenant_id
 from src.cache.instance import get_cache_manager
+from src.cache.warming import WarmableEndpoint, get_cache_warmer
 
 router = APIRouter(prefix="/forecast", tags=["forecast"])
 
+PRODUCT_FORECAST_CACHE_TTL = 3600
+
 
 class ForecastRequest(BaseModel):
     """Request for demand forecast"""
@@ -28,6 +37,20 @@ class ForecastRequest(BaseModel):
     )
 
 
+class BatchForecastRequest(BaseModel):
+    """Request for a streamed batch forecast"""
+    product_ids: Optional[List[UUID]] = Field(
+        default=None,
+        description="Product IDs to forecast (omit to forecast every product of the tenant)"
+    )
+    forecast_horizon_days: int = Field(
+        default=30,
+        ge=7,
+        le=90,
+        description="Number of days to forecast (7-90)"
+    )
+
+
 class ForecastResponse(BaseModel):
     """Response containing demand forecasts"""
     forecasts: List[dict]
@@ -45,7 +68,8 @@ async def generate_demand_forecast(
     Generate demand forecasts for products (TENANT-ISOLATED).
     
     This endpoint:
-    1. Fetches historical sales data for the specified products
+    1. Serves fresh materialized forecasts and fetches historical sales data
+       for the remaining products
     2. Generates multi-model forecasts (ARIMA, Prophet, Exponential Smoothing)
     3. Detects seasonality and trends
     4. Generates inventory alerts
@@ -60,67 +84,53 @@ async def generate_demand_forecast(
     Returns:
         ForecastResponse with forecasts and summary
     """
-    # Initialize agent (TENANT-AWARE)
-    agent = DemandForecastAgent(tenant_id=tenant_id)
+    horizon = request.forecast_horizon_days
+    materializer = ForecastMaterializer(tenant_id=tenant_id)
+    
+    # Serve precomputed forecasts where still valid (TENANT-AWARE)
+    stored = await materializer.get_fresh_forecasts(db, request.product_ids, horizon)
+    
+    # Load the remaining products and sales series in two set-based queries
+    engine = materializer.engine
+    jobs = await engine.prepare_jobs(
+        db, [pid for pid in request.product_ids if pid not in stored]
+    )
+    
+    # Fit stale/missing products in parallel off the event loop
+    live_items = await engine.run(jobs, horizon)
+    live = {item.product_id: item for item in live_items}
+    
+    if horizon == settings.forecast_materialization_horizon_days:
+        await materializer.save(
+            db,
+            {item.product_id: item.forecast for item in live_items if item.status == 'completed'},
+            {job.product_id: data_watermark(job.sales_history) for job in jobs},
+            horizon
+        )
+    
+    items = []
+    for product_id in request.product_ids:
+        if product_id in stored:
+            forecast = stored[product_id]
+            items.append(BatchForecastItem(
+                product_id=product_id,
+                product_name=forecast['product_name'],
+                status='completed',
+                forecast=forecast
+            ))
+        elif product_id in live:
+            items.append(live[product_id])
     
     forecasts = []
     total_alerts = 0
     products_with_insufficient_data = []
     
-    for product_id in request.product_ids:
-        # Fetch product (TENANT-FILTERED)
-        result = await db.execute(
-            select(Product).where(
-                Product.id == product_id,
-                Product.tenant_id == tenant_id  # TENANT ISOLATION
-            )
-        )
-        product = result.scalar_one_or_none()
-        
-        if not product:
-            continue
-        
-        # Fetch sales history (TENANT-FILTERED)
-        sales_result = await db.execute(
-            select(SalesRecord).where(
-                SalesRecord.product_id == product_id,
-                SalesRecord.tenant_id == tenant_id  # TENANT ISOLATION
-            ).order_by(SalesRecord.date.asc())
-        )
-        sales_records = sales_result.scalars().all()
-        
-        if not sales_records:
-            products_with_insufficient_data.append(product.name)
-            continue
-        
-        # Convert to format expected by agent
-        sales_history = [
-            {
-                'date': record.date,
-                'quantity': record.quantity
-            }
-            for record in sales_records
-        ]
-        
-        # Generate forecast
-        try:
-            forecast_result = agent.forecast_demand(
-                product_id=product.id,
-                product_name=product.name,
-                sales_history=sales_history,
-                forecast_horizon_days=request.forecast_horizon_days,
-                current_inventory=product.inventory_level
-            )
-            
-            forecasts.append(forecast_result.to_dict())
-            total_alerts += len(forecast_result.alerts)
-        
-        except Exception as e:
-            # Log error but continue with other products
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error forecasting for product {product.name}: {e}")
-            products_with_insufficient_data.append(product.name)
+    for item in items:
+        if item.status == 'completed':
+            forecasts.append(item.forecast)
+            total_alerts += len(item.forecast['alerts'])
+        else:
+            products_with_insufficient_data.append(item.product_name)
     
     if not forecasts:
         raise HTTPException(
@@ -145,24 +155,78 @@ async def generate_demand_forecast(
     )
 
 
-@router.get("/product/{product_id}", response_model=dict)
-async def get_product_forecast(
-    product_id: UUID,
-    forecast_horizon_days: int = Query(default=30, ge=7, le=90),
+@router.post("/batch/stream")
+async def stream_batch_forecast(
+    request: BatchForecastRequest,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     tenant_id: UUID = Depends(get_tenant_id)
-) -> dict:
-    """Get demand forecast for a single product with cache."""
+) -> StreamingResponse:
+    """
+    Stream demand forecasts for many products as they finish (TENANT-ISOLATED).
+    
+    Products are fitted in parallel on the forecast process pool. The response
+    is newline-delimited JSON: one ``result`` line per product (with aggregate
+    progress) followed by a final ``summary`` line.
+    
+    Args:
+        request: Product IDs (or none for a tenant-wide run) and horizon
+        db: Database session
+        current_user: Authenticated user
+        tenant_id: Tenant ID from JWT token
+        
+    Returns:
+        StreamingResponse of NDJSON events
+    """
+    engine = ForecastBatchEngine(tenant_id=tenant_id)
+    # Load everything up front - the session is released before streaming starts
+    jobs = await engine.prepare_jobs(db, request.product_ids)
+    
+    async def event_stream():
+        total_alerts = 0
+        confidences = []
+        async for item, progress in engine.stream_forecasts(jobs, request.forecast_horizon_days):
+            if item.forecast:
+                total_alerts += len(item.forecast['alerts'])
+                confidences.append(item.forecast['final_confidence'])
+            yield json.dumps({
+                "type": "result",
+                "item": item.to_dict(),
+                "progress": progress.to_dict()
+            }) + "\n"
+        
+        yield json.dumps({
+            "type": "summary",
+            "summary": {
+                "total_products_forecasted": len(confidences),
+                "total_alerts_generated": total_alerts,
+                "forecast_horizon_days": request.forecast_horizon_days,
+                "average_confidence": round(sum(confidences) / len(confidences), 3) if confidences else 0.0
+            }
+        }) + "\n"
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
 
-    cache = get_cache_manager()
-    cache_key = f"forecast:{tenant_id}:{product_id}:{forecast_horizon_days}"
 
-    if cache:
-        cached = await cache.get(key=cache_key)
-        if cached:
-            return cached
+def product_forecast_cache_key(tenant_id, product_id, forecast_horizon_days: int) -> str:
+    return f"forecast:{tenant_id}:{product_id}:{forecast_horizon_days}"
+
+
+async def compute_product_forecast(
+    db: AsyncSession,
+    tenant_id: UUID,
+    product_id: UUID,
+    forecast_horizon_days: int
+) -> dict:
+    """
+    Forecast of one product as cached (compact forecast points).
     
+    Served from the materialized forecast_results row when it is still
+    valid, computed live otherwise.
+    
+    Raises:
+        HTTPException: If the product or its sales history is missing, or the forecast fails
+    """
     # Fetch product (TENANT-FILTERED)
     result = await db.execute(
         select(Product).where(
@@ -202,31 +266,93 @@ async def get_product_forecast(
         for record in sales_records
     ]
     
-    # Initialize agent and generate forecast (TENANT-AWARE)
-    agent = DemandForecastAgent(tenant_id=tenant_id)
+    # Serve the materialized forecast if it is still valid
+    materializer = ForecastMaterializer(tenant_id=tenant_id)
+    stored = await materializer.get_fresh_forecasts(db, [product.id], forecast_horizon_days)
+    
+    if product.id in stored:
+        result = dict(stored[product.id])
+    else:
+        # Initialize agent and generate forecast (TENANT-AWARE)
+        agent = DemandForecastAgent(tenant_id=tenant_id)
+    
+        try:
+            forecast_result = agent.forecast_demand(
+                product_id=product.id,
+                product_name=product.name,
+                sales_history=sales_history,
+                forecast_horizon_days=forecast_horizon_days,
+                current_inventory=product.inventory_level
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error generating forecast: {str(e)}"
+            )
     
-    try:
-        forecast_result = agent.forecast_demand(
-            product_id=product.id,
-            product_name=product.name,
-            sales_history=sales_history,
-            forecast_horizon_days=forecast_horizon_days,
-            current_inventory=product.inventory_level
-        )
         result = forecast_result.to_dict()
-        # Attach historical sales so the frontend chart can show actual vs forecast
-        result["historical_sales"] = [
-            {"date": r["date"].isoformat() if hasattr(r["date"], "isoformat") else str(r["date"]),
-             "quantity": r["quantity"]}
-            for r in sales_history[-90:]  # last 90 days max
-        ]
-        # Cache for 1 hour — forecasts are expensive to compute
-        if cache:
-            await cache.set(key=cache_key, value=result, ttl=3600)
-        return result
-    
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error generating forecast: {str(e)}"
+        if forecast_horizon_days == settings.forecast_materialization_horizon_days:
+            await materializer.save(
+                db,
+                {product.id: result},
+                {product.id: data_watermark(sales_history)},
+                forecast_horizon_days
+            )
+    
+    # Attach historical sales so the frontend chart can show actual vs forecast
+    result["historical_sales"] = [
+        {"date": r["date"].isoformat() if hasattr(r["date"], "isoformat") else str(r["date"]),
+         "quantity": r["quantity"]}
+        for r in sales_history[-90:]  # last 90 days max
+    ]
+    return compact_forecast_dict(result)
+
+
+# Recomputed by the cache warmer after ingestion when frequently requested
+get_cache_warmer().register(WarmableEndpoint(
+    name="forecast_product",
+    cache_key=lambda tenant_id, params: product_forecast_cache_key(
+        tenant_id, params["product_id"], params["forecast_horizon_days"]
+    ),
+    loader=lambda db, tenant_id, params: compute_product_forecast(
+        db, tenant_id, UUID(params["product_id"]), params["forecast_horizon_days"]
+    ),
+    ttl=PRODUCT_FORECAST_CACHE_TTL
+))
+
+
+@router.get("/product/{product_id}", response_model=dict)
+async def get_product_forecast(
+    product_id: UUID,
+    forecast_horizon_days: int = Query(default=30, ge=7, le=90),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+    current_user: User = Depends(get_current_active_user),
+    tenant_id: UUID = Depends(get_tenant_id)
+) -> dict:
+    """
+    Get demand forecast for a single product (TENANT-ISOLATED).
+    
+    Served from the cache, then from the materialized forecast_results row,
+    and computed live only when both are missing or stale.
+    """
+
+    async def compute_forecast() -> dict:
+        # Shared with concurrent requests and may outlive this one - use its own session
+        async with session_factory() as db:
+            result = await compute_product_forecast(db, tenant_id, product_id, forecast_horizon_days)
+            await db.commit()
+            return result
+
+    # Cache for 1 hour — forecasts are expensive to compute, so an expired
+    # entry is recomputed by one request while the others get the previous one
+    get_cache_warmer().record_access(
+        "forecast_product", tenant_id,
+        {"product_id": str(product_id), "forecast_horizon_days": forecast_horizon_days}
+    )
+    cache = get_cache_manager()
+    cache_key = product_forecast_cache_key(tenant_id, product_id, forecast_horizon_days)
+    if cache:
+        return expand_forecast_dict(
+            await cache.get_or_compute(key=cache_key, compute=compute_forecast, ttl=PRODUCT_FORECAST_CACHE_TTL)
         )
+    return expand_forecast_dict(await compute_forecast())
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from pydantic import BaseModel
 
-from src.database import get_db
+from src.database import get_read_db
 from src.models.product import Product
 from src.models.review import Review
 
@@ -37,7 +37,7 @@ class InsightsResponse(BaseModel):
 async def generate_insights(
     tenant_id: str = None,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Generate intelligent insights from current data.
@@ -326,7 +326,7 @@ async def generate_insights(
 @router.get("/summary")
 async def get_insights_summary(
     tenant_id: str = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a quick summary of key metrics for insights"""
     try:
@@ -1,6 +1,7 @@
 """Metrics API endpoint for Prometheus scraping and JSON summary"""
 from fastapi import APIRouter, Response
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from src.database import get_pool_stats
 from src.observability.metrics import get_metrics_collector
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
@@ -19,4 +20,5 @@ async def metrics():
 async def metrics_summary():
     """Human-readable JSON summary of system performance stats."""
     collector = get_metrics_collector()
+    collector.record_db_pool_stats(get_pool_stats())
     return collector.get_summary()
@@ -1,9 +1,11 @@
 """Pricing intelligence API endpoints"""
-from typing import List
+import json
+from typing import List, Optional
 from uuid import UUID
 import uuid
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
 
@@ -18,6 +20,7 @@ from src.schemas.pricing import (
     MarketData
 )
 from src.agents.pricing_intelligence import PricingIntelligenceAgent
+from src.pricing.recommendations import BulkPricingRecommendationEngine
 from src.auth.dependencies import get_current_active_user, get_tenant_id
 from src.cache.instance import get_cache_manager
 from decimal import Decimal
@@ -181,6 +184,58 @@ async def get_price_history(
     return result_payload
 
 
+@router.get("/recommendations")
+async def stream_bulk_pricing_recommendations(
+    cursor: Optional[UUID] = Query(default=None, description="Resume after this product id"),
+    page_size: Optional[int] = Query(default=None, ge=1, le=5000),
+    max_pages: Optional[int] = Query(default=None, ge=1),
+    current_user: User = Depends(get_current_active_user),
+    tenant_id: UUID = Depends(get_tenant_id)
+) -> StreamingResponse:
+    """
+    Stream pricing recommendations for the whole catalog (TENANT-ISOLATED).
+    
+    The catalog is walked in keyset pages of ``page_size`` products; each
+    page costs three queries and is evaluated with NumPy. The response is
+    newline-delimited JSON: one ``page`` line per page (with ``next_cursor``
+    to resume from) followed by a final ``summary`` line.
+    
+    Args:
+        cursor: Resume after this product id
+        page_size: Products per page (defaults to settings)
+        max_pages: Stop after this many pages
+        current_user: Authenticated user
+        tenant_id: Tenant ID from JWT token
+        
+    Returns:
+        StreamingResponse of NDJSON events
+    """
+    engine = BulkPricingRecommendationEngine(tenant_id=tenant_id, page_size=page_size)
+    
+    async def event_stream():
+        products = recommendations = pages = 0
+        next_cursor = cursor
+        async for page in engine.iter_pages(cursor=cursor, max_pages=max_pages):
+            pages += 1
+            products += len(page.items)
+            recommendations += sum(len(item["recommendations"]) for item in page.items)
+            next_cursor = page.next_cursor
+            yield json.dumps({"type": "page", "page": pages, **page.to_dict()}) + "\n"
+        
+        finished = max_pages is None or pages < max_pages
+        yield json.dumps({
+            "type": "summary",
+            "summary": {
+                "pages": pages,
+                "products": products,
+                "recommendations": recommendations,
+                "next_cursor": None if finished or next_cursor is None else str(next_cursor)
+            }
+        }) + "\n"
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
 @router.get("/recommendations/{product_id}")
 async def get_pricing_recommendations(
     product_id: UUID,
@@ -20,6 +20,8 @@ from src.schemas.sentiment import SentimentAnalysisResult
 from src.agents.pricing_intelligence_v2 import EnhancedPricingIntelligenceAgent
 from src.agents.sentiment_analysis_v2 import EnhancedSentimentAgent
 from src.agents.data_qa_agent import DataQAAgent
+from src.processing.qa_report_cache import get_qa_report_cache
+from src.pricing.equivalence_store import ProductEquivalenceStore
 from src.schemas.product import ProductResponse
 from src.schemas.review import ReviewResponse
 from src.auth.dependencies import get_current_active_user, get_tenant_id
@@ -438,17 +440,17 @@ async def _execute_pricing_analysis(
     # Convert to response schemas
     our_products = [ProductResponse.model_validate(p) for p in products]
     
-    # Layer 0: Assess data quality
-    qa_report = qa_agent.assess_product_data_quality(our_products)
+    # Layer 0: Assess data quality (cached until the products change)
+    qa_report = get_qa_report_cache().get_product_report(qa_agent, our_products, product_ids)
     
-    # Get mock competitor data (for MVP)
-    competitor_products = _get_mock_competitor_products(our_products)
-    
-    # Create product mappings
-    all_mappings = []
-    for our_product in our_products:
-        mappings = agent.map_product_equivalence(our_product, competitor_products)
-        all_mappings.extend(mappings)
+    # Stored competitor mappings (one indexed join); mock competitor data for the MVP otherwise
+    all_mappings, competitor_products = await ProductEquivalenceStore(tenant_id).get_mappings(
+        db, [p.id for p in our_products]
+    )
+    if not all_mappings:
+        competitor_products = _get_mock_competitor_products(our_products)
+        # Competitors indexed once for all products
+        all_mappings = agent.map_product_equivalences(our_products, competitor_products)
     
     # Calculate price gaps
     price_gaps = agent.calculate_price_gaps(
@@ -457,9 +459,11 @@ async def _execute_pricing_analysis(
         all_mappings
     )
     
-    # Detect price changes
-    historical_prices = _get_mock_historical_prices(our_products, competitor_products)
-    price_changes = agent.detect_price_changes(historical_prices)
+    # Detect price changes (computed in the database; mock history if none is stored)
+    price_changes = await agent.detect_stored_price_changes(db, [p.id for p in our_products])
+    if not price_changes:
+        historical_prices = _get_mock_historical_prices(our_products, competitor_products)
+        price_changes = agent.detect_price_changes(historical_prices)
     
     # Extract promotions
     competitor_data = _get_mock_competitor_data(competitor_products)
@@ -514,6 +518,8 @@ async def _execute_sentiment_analysis(
     # Initialize enhanced agent (TENANT-AWARE)
     agent = EnhancedSentimentAgent(tenant_id=tenant_id)
     
+    qa_report_cache = get_qa_report_cache()
+    
     results = []
     all_reviews = []
     
@@ -549,8 +555,8 @@ async def _execute_sentiment_analysis(
         
         all_reviews.extend(reviews)
         
-        # Layer 0: Assess review data quality
-        review_qa_report = qa_agent.assess_review_data_quality(reviews)
+        # Layer 0: Assess review data quality (cached until the product's reviews change)
+        review_qa_report = qa_report_cache.get_review_report(qa_agent, reviews, [product_id])
         
         # Perform sentiment analysis with QA integration
         analysis_result = agent.calculate_aggregate_sentiment_with_qa(
@@ -560,7 +566,9 @@ async def _execute_sentiment_analysis(
         results.append(analysis_result)
     
     # Create overall QA report for all reviews
-    overall_qa_report = qa_agent.assess_review_data_quality(all_reviews) if all_reviews else None
+    overall_qa_report = (
+        qa_report_cache.get_review_report(qa_agent, all_reviews, product_ids) if all_reviews else None
+    )
     
     return (results if results else None), overall_qa_report
 
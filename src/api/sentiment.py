@@ -13,6 +13,7 @@ from src.models.user import User
 from src.schemas.sentiment import SentimentAnalysisResult, TopicCluster
 from src.auth.dependencies import get_current_active_user, get_tenant_id
 from src.cache.instance import get_cache_manager
+from src.cache.warming import WarmableEndpoint, get_cache_warmer
 
 
 def _normalize_sentiment(val: str | None) -> str:
@@ -36,25 +37,20 @@ def _cutoff(time_range: str) -> datetime | None:
 router = APIRouter(prefix="/sentiment", tags=["sentiment"])
 
 
-@router.get("/product/{product_id}", response_model=SentimentAnalysisResult)
-async def get_product_sentiment(
-    product_id: UUID,
-    time_range: str = Query(default="30d"),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-    tenant_id: UUID = Depends(get_tenant_id),
-) -> SentimentAnalysisResult:
-    """Aggregate sentiment filtered by time range, with cache."""
+SENTIMENT_CACHE_TTL = 86400  # 24h TTL for sentiment data
 
-    cache = get_cache_manager()
-    cache_key = f"sentiment:{tenant_id}:{product_id}:{time_range}"
 
-    # Try cache first
-    if cache:
-        cached = await cache.get(key=cache_key)
-        if cached:
-            return SentimentAnalysisResult(**cached)
+def sentiment_cache_key(tenant_id, product_id, time_range: str) -> str:
+    return f"sentiment:{tenant_id}:{product_id}:{time_range}"
+
 
+async def aggregate_product_sentiment(
+    db: AsyncSession,
+    tenant_id: UUID,
+    product_id: UUID,
+    time_range: str
+) -> SentimentAnalysisResult:
+    """Aggregate the sentiment of a product's reviews in a time range (all time if it has none)"""
     # DB query
     query = select(Review).where(
         Review.product_id == product_id,
@@ -79,7 +75,7 @@ async def get_product_sentiment(
         used_range = "all"
 
     if not records:
-        empty = SentimentAnalysisResult(
+        return SentimentAnalysisResult(
             product_id=product_id,
             aggregate_sentiment=0.0,
             sentiment_distribution={"positive": 0, "negative": 0, "neutral": 0},
@@ -87,7 +83,6 @@ async def get_product_sentiment(
             confidence_score=0.0, total_reviews=0,
             qa_metadata={"time_range": time_range, "note": "no reviews found"},
         )
-        return empty
 
     total = len(records)
     counts: Dict[str, int] = {"positive": 0, "negative": 0, "neutral": 0}
@@ -119,7 +114,7 @@ async def get_product_sentiment(
         for rating, revs in sorted(rating_groups.items(), key=lambda x: -len(x[1]))[:5]
     ]
 
-    response = SentimentAnalysisResult(
+    return SentimentAnalysisResult(
         product_id=product_id,
         aggregate_sentiment=round(aggregate, 4),
         sentiment_distribution=counts,
@@ -131,9 +126,49 @@ async def get_product_sentiment(
         qa_metadata={"time_range": used_range, "requested_range": time_range, "fallback": used_range == "all"},
     )
 
-    # Store in cache — 24h TTL for sentiment data
+
+async def _load_sentiment(db: AsyncSession, tenant_id: UUID, params: dict):
+    """Cache warmer loader (products without reviews are not cached)"""
+    response = await aggregate_product_sentiment(db, tenant_id, UUID(params["product_id"]), params["time_range"])
+    return response.model_dump(mode="json") if response.total_reviews else None
+
+
+# Recomputed by the cache warmer after ingestion when frequently requested
+get_cache_warmer().register(WarmableEndpoint(
+    name="sentiment_product",
+    cache_key=lambda tenant_id, params: sentiment_cache_key(tenant_id, params["product_id"], params["time_range"]),
+    loader=_load_sentiment,
+    ttl=SENTIMENT_CACHE_TTL
+))
+
+
+@router.get("/product/{product_id}", response_model=SentimentAnalysisResult)
+async def get_product_sentiment(
+    product_id: UUID,
+    time_range: str = Query(default="30d"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    tenant_id: UUID = Depends(get_tenant_id),
+) -> SentimentAnalysisResult:
+    """Aggregate sentiment filtered by time range, with cache."""
+
+    get_cache_warmer().record_access(
+        "sentiment_product", tenant_id, {"product_id": str(product_id), "time_range": time_range}
+    )
+    cache = get_cache_manager()
+    cache_key = sentiment_cache_key(tenant_id, product_id, time_range)
+
+    # Try cache first
     if cache:
-        await cache.set(key=cache_key, value=response.model_dump(mode="json"), ttl=86400)
+        cached = await cache.get(key=cache_key)
+        if cached:
+            return SentimentAnalysisResult(**cached)
+
+    response = await aggregate_product_sentiment(db, tenant_id, product_id, time_range)
+
+    # Store in cache (products without reviews are not cached)
+    if cache and response.total_reviews:
+        await cache.set(key=cache_key, value=response.model_dump(mode="json"), ttl=SENTIMENT_CACHE_TTL)
 
     return response
 
@@ -1,9 +1,23 @@
 """Redis-based cache manager for Quick Mode optimization"""
-import json
+import asyncio
 import logging
+import math
+import random
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Any, Dict
-from uuid import UUID
+from typing import Optional, Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+from uuid import UUID, uuid4
+
+from src.cache.codec import CacheCodec
+from src.cache.local_cache import LocalLRUCache, pattern_to_regex
+from src.cache.tags import (
+    TAG_INDEX_KEY,
+    entity_tag,
+    key_entity_ids,
+    tags_for_key,
+    tags_for_pattern,
+    type_tag
+)
 
 try:
     import redis.asyncio as redis
@@ -15,6 +29,11 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def _decode_key(key) -> str:
+    """Key as str (the Redis client returns bytes)"""
+    return key.decode() if isinstance(key, bytes) else key
+
+
 class CacheManager:
     """
     Manages Redis caching with freshness guarantees for Quick Mode.
@@ -27,6 +46,43 @@ class CacheManager:
     LRU Eviction:
     - Redis handles LRU eviction automatically when maxmemory is reached
     - Configure Redis with: maxmemory-policy allkeys-lru
+    
+    Two tiers:
+    - L1: bounded in-process LRU (byte-accounted, per cache type quotas).
+      In front of Redis it keeps entries for at most ``local_ttl`` seconds
+      and remembers missing keys for ``negative_ttl`` seconds; without
+      Redis (memory fallback) it is the only store and honours entry TTLs.
+    - L2: Redis, shared by all worker processes.
+    
+    Connections:
+    - One bounded connection pool per process (BlockingConnectionPool:
+      callers wait up to ``pool_timeout`` for a free connection instead of
+      opening more). Health checks and TCP keepalive detect dead
+      connections before they are used.
+    - ``connect`` runs under a lock, so concurrent first requests share a
+      single connection attempt. Other components needing Redis (the data
+      event transport) use ``client`` instead of their own connections.
+    
+    Payloads:
+    - Entries are encoded by a CacheCodec (binary serializer, compression
+      above a size threshold, versioned header); both tiers store the
+      encoded bytes. Plain JSON entries from before the codec still decode.
+    
+    Invalidation:
+    - Each Redis entry registers its key in tag sets (tenant, cache type,
+      entities in its identifier; see src.cache.tags) in the same pipeline
+      as the write. Pattern and tenant invalidation read the affected tag
+      set instead of scanning the keyspace; ``compact_tags`` drops members
+      of expired entries.
+    
+    Stampede protection (``get_or_compute``):
+    - Only one caller recomputes an expired entry: callers of the same
+      process share its computation, other workers wait on a Redis lease.
+    - Expired entries are kept ``stale_ttl`` seconds longer and served to
+      everyone else while the refresh runs.
+    - Entries record how long they took to compute; expensive entries are
+      refreshed probabilistically ahead of expiry (XFetch), so usually one
+      request refreshes them before they expire at all.
     """
     
     # Cache freshness thresholds (in seconds)
@@ -41,13 +97,52 @@ class CacheManager:
     DEFAULT_MAX_MEMORY_MB = 256
     DEFAULT_TTL = 3600  # 1 hour default TTL
     
+    # In-process tier defaults
+    DEFAULT_LOCAL_MAX_MB = 64
+    DEFAULT_LOCAL_TTL = 30  # Seconds an entry read from Redis is served locally
+    DEFAULT_NEGATIVE_TTL = 5  # Seconds a key missing from Redis is remembered
+    DEFAULT_LOCAL_TYPE_SHARES = {
+        'query_result': 0.4,
+        'pricing': 0.25,
+        'sentiment': 0.25,
+        'forecast': 0.25,
+        'dashboard': 0.25,
+    }
+    DEFAULT_LOCAL_TYPE_SHARE = 0.2  # Cache types not listed above
+    
+    # Stampede protection defaults
+    DEFAULT_STALE_TTL = 300  # Seconds an expired entry is served while it is recomputed
+    DEFAULT_LEASE_TTL = 30  # Seconds a recompute lease is held at most
+    DEFAULT_XFETCH_BETA = 1.0  # > 1 refreshes earlier, 0 disables early refresh
+    LEASE_PREFIX = "cachelease"
+    LEASE_POLL_INTERVAL = 0.05  # Seconds between checks while another worker recomputes
+    
+    # Connection pool defaults
+    DEFAULT_MAX_CONNECTIONS = 50
+    DEFAULT_POOL_TIMEOUT = 2.0  # Seconds a caller waits for a free connection
+    DEFAULT_HEALTH_CHECK_INTERVAL = 30  # Seconds a connection may be idle before it is pinged on checkout
+    CONNECT_TIMEOUT = 3.0  # Seconds the first ping may take
+    SOCKET_TIMEOUT = 2.0
+    
     def __init__(
         self,
         redis_url: str = "redis://localhost:6379/0",
         max_memory_mb: int = DEFAULT_MAX_MEMORY_MB,
         default_ttl: int = DEFAULT_TTL,
         eviction_policy: str = "allkeys-lru",
-        use_memory_fallback: bool = False
+        use_memory_fallback: bool = False,
+        local_max_mb: float = DEFAULT_LOCAL_MAX_MB,
+        local_ttl: int = DEFAULT_LOCAL_TTL,
+        negative_ttl: int = DEFAULT_NEGATIVE_TTL,
+        local_type_shares: Optional[Dict[str, float]] = None,
+        codec: Optional[CacheCodec] = None,
+        stale_ttl: int = DEFAULT_STALE_TTL,
+        lease_ttl: float = DEFAULT_LEASE_TTL,
+        xfetch_beta: float = DEFAULT_XFETCH_BETA,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        pool_timeout: float = DEFAULT_POOL_TIMEOUT,
+        health_check_interval: int = DEFAULT_HEALTH_CHECK_INTERVAL,
+        socket_keepalive: bool = True
     ):
         """
         Initialize cache manager with Redis connection.
@@ -57,7 +152,19 @@ class CacheManager:
             max_memory_mb: Maximum memory for cache in MB
             default_ttl: Default TTL for cache entries in seconds
             eviction_policy: Redis eviction policy (default: allkeys-lru)
-            use_memory_fallback: Use in-memory dict fallback if Redis unavailable
+            use_memory_fallback: Use the in-process tier alone if Redis unavailable
+            local_max_mb: Memory budget of the in-process tier in MB
+            local_ttl: Seconds entries are served from the in-process tier in front of Redis
+            negative_ttl: Seconds a key missing from Redis is remembered (0 disables)
+            local_type_shares: Maximum fraction of the in-process budget per cache type
+            codec: Payload serializer/compressor (default: fastest available)
+            stale_ttl: Seconds get_or_compute serves an expired entry while one caller recomputes it
+            lease_ttl: Seconds a get_or_compute recompute lease is held at most
+            xfetch_beta: Eagerness of probabilistic early refresh in get_or_compute (0 disables)
+            max_connections: Size of the Redis connection pool
+            pool_timeout: Seconds to wait for a free pooled connection
+            health_check_interval: Seconds idle before a connection is health-checked (0 disables)
+            socket_keepalive: Enable TCP keepalive on Redis connections
         """
         if not REDIS_AVAILABLE:
             logger.warning("Redis package not installed. Cache will be disabled.")
@@ -67,19 +174,62 @@ class CacheManager:
         self.default_ttl = default_ttl
         self.eviction_policy = eviction_policy
         self.use_memory_fallback = use_memory_fallback
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self.health_check_interval = health_check_interval
+        self.socket_keepalive = socket_keepalive
+        self._pool = None  # redis.BlockingConnectionPool once connected
         self._redis: Optional[redis.Redis] = None
-        self._memory_cache: Dict[str, Any] = {}  # In-memory fallback
+        self._connect_lock = asyncio.Lock()
+        self.local_ttl = local_ttl
+        self.negative_ttl = negative_ttl
+        self.codec = codec or CacheCodec()
+        self.stale_ttl = stale_ttl
+        self.lease_ttl = lease_ttl
+        self.xfetch_beta = xfetch_beta
+        self._inflight: Dict[str, asyncio.Task] = {}  # get_or_compute recomputations of this process
+        self._memory_cache = LocalLRUCache(  # L1 (the only tier in memory fallback mode)
+            max_bytes=int(local_max_mb * 1024 * 1024),
+            type_shares=local_type_shares if local_type_shares is not None else self.DEFAULT_LOCAL_TYPE_SHARES,
+            default_type_share=self.DEFAULT_LOCAL_TYPE_SHARE
+        )
         self._redis_failed: bool = False  # Stop retrying after first timeout
         self._metrics = {
             'hits': 0,
             'misses': 0,
             'sets': 0,
             'invalidations': 0,
-            'evictions': 0
+            'evictions': 0,
+            'l1_hits': 0,
+            'l1_negative_hits': 0,
+            'l2_hits': 0,
+            'l2_misses': 0,
+            'recomputes': 0,
+            'early_refreshes': 0,
+            'stale_served': 0,
+            'coalesced_waits': 0
         }
     
-    async def connect(self):
-        """Establish Redis connection and configure LRU eviction"""
+    @property
+    def client(self) -> Optional["redis.Redis"]:
+        """Redis client on the cache's connection pool (None when Redis is unavailable)"""
+        return self._redis
+    
+    @property
+    def is_connected(self) -> bool:
+        """Whether Redis is connected (otherwise the cache is memory-only or disabled)"""
+        return self._redis is not None
+    
+    async def connect(self, retry: bool = True):
+        """
+        Open the Redis connection pool and configure LRU eviction.
+        
+        Concurrent callers share one attempt. The client is published only
+        after it answered a ping, so no caller uses a half-open connection.
+        
+        Args:
+            retry: Try again after an earlier attempt failed
+        """
         if not REDIS_AVAILABLE:
             if self.use_memory_fallback:
                 logger.warning("Redis package not available. Using in-memory fallback.")
@@ -87,42 +237,53 @@ class CacheManager:
             logger.warning("Redis package not available. Cache disabled.")
             return
         
-        if self._redis is None:
+        async with self._connect_lock:
+            if self._redis is not None or (self._redis_failed and not retry):
+                return
+            
+            pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.max_connections,
+                timeout=self.pool_timeout,
+                health_check_interval=self.health_check_interval,
+                socket_keepalive=self.socket_keepalive,
+                decode_responses=False,  # Payloads are binary (see CacheCodec)
+                socket_connect_timeout=self.SOCKET_TIMEOUT,
+                socket_timeout=self.SOCKET_TIMEOUT,
+                retry_on_timeout=False
+            )
+            client = redis.Redis(connection_pool=pool)
             try:
-                # Add connection timeout to prevent hanging
-                self._redis = await redis.from_url(
-                    self.redis_url,
-                    encoding="utf-8",
-                    decode_responses=True,
-                    socket_connect_timeout=2,
-                    socket_timeout=2,
-                    retry_on_timeout=False
-                )
-                
-                # Test connection with timeout
-                import asyncio
-                await asyncio.wait_for(self._redis.ping(), timeout=5.0)
-                
-                # Configure Redis for LRU eviction
-                await self._configure_lru_eviction()
-                
-                logger.info("Redis cache connected successfully with LRU eviction")
-            except asyncio.TimeoutError:
-                logger.error(f"Redis connection timeout - server not reachable at {self.redis_url}")
-                self._redis_failed = True
-                if self.use_memory_fallback:
-                    logger.warning("Using in-memory cache fallback")
-                else:
-                    logger.warning("Continuing without cache")
-                self._redis = None
+                await asyncio.wait_for(client.ping(), timeout=self.CONNECT_TIMEOUT)
             except Exception as e:
-                logger.error(f"Failed to connect to Redis: {e}")
+                if isinstance(e, asyncio.TimeoutError):
+                    logger.error(f"Redis connection timeout - server not reachable at {self.redis_url}")
+                else:
+                    logger.error(f"Failed to connect to Redis: {e}")
                 self._redis_failed = True
                 if self.use_memory_fallback:
                     logger.warning("Using in-memory cache fallback")
                 else:
                     logger.warning("Continuing without cache")
-                self._redis = None
+                await pool.disconnect()
+                return
+            
+            self._pool = pool
+            self._redis = client
+            self._redis_failed = False
+            
+            # Configure Redis for LRU eviction
+            await self._configure_lru_eviction()
+            
+            logger.info(
+                f"Redis cache connected successfully with LRU eviction "
+                f"(pool: {self.max_connections} connections)"
+            )
+    
+    async def _ensure_connected(self):
+        """Connect on first use, unless an earlier attempt failed"""
+        if self._redis is None and not self._redis_failed:
+            await self.connect(retry=False)
     
     async def _configure_lru_eviction(self):
         """Configure Redis for LRU eviction policy"""
@@ -141,11 +302,15 @@ class CacheManager:
             logger.warning("Redis may need manual configuration for production use")
     
     async def disconnect(self):
-        """Close Redis connection"""
-        if self._redis:
-            await self._redis.aclose()
-            self._redis = None
-            logger.info("Redis cache disconnected")
+        """Close the Redis client and its connection pool"""
+        async with self._connect_lock:
+            if self._redis:
+                await self._redis.aclose()
+                self._redis = None
+                logger.info("Redis cache disconnected")
+            if self._pool is not None:
+                await self._pool.disconnect()
+                self._pool = None
     
     def _build_cache_key(
         self,
@@ -191,8 +356,7 @@ class CacheManager:
         Returns:
             Cached data or None if not found or stale
         """
-        if not self._redis and not self._redis_failed:
-            await self.connect()
+        await self._ensure_connected()
         
         # Determine which API pattern is being used
         if key is not None:
@@ -207,40 +371,20 @@ class CacheManager:
         else:
             raise ValueError("Must provide either 'key' or all of (cache_type, tenant_id, identifier)")
         
-        # Use memory fallback if Redis unavailable
-        if not self._redis and self.use_memory_fallback:
-            cached_json = self._memory_cache.get(full_key)
-            if cached_json is None:
-                self._metrics['misses'] += 1
-                return None
-            
-            cached_data = json.loads(cached_json)
-            
-            # Check freshness if requested and cache_type is known
-            if check_freshness and cache_type_for_freshness and not self._is_fresh(cache_type_for_freshness, cached_data):
-                self._metrics['misses'] += 1
-                return None
-            
-            self._metrics['hits'] += 1
-            return cached_data.get('data')
-        
-        if not self._redis:
-            self._metrics['misses'] += 1
-            return None
-        
         try:
-            # Get cached data
-            cached_json = await self._redis.get(full_key)
+            payload = await self._read(full_key)
             
-            if cached_json is None:
+            if payload is None:
                 self._metrics['misses'] += 1
                 logger.debug(f"Cache miss: {full_key}")
                 return None
             
-            cached_data = json.loads(cached_json)
+            cached_data = self.codec.decode(payload)
             
             # Check freshness if requested and cache_type is known
-            if check_freshness and cache_type_for_freshness and not self._is_fresh(cache_type_for_freshness, cached_data):
+            if self._is_expired(cached_data) or (
+                check_freshness and cache_type_for_freshness and not self._is_fresh(cache_type_for_freshness, cached_data)
+            ):
                 self._metrics['misses'] += 1
                 logger.debug(f"Cache stale: {full_key}")
                 return None
@@ -254,6 +398,38 @@ class CacheManager:
             self._metrics['misses'] += 1
             return None
     
+    async def _read(self, full_key: str) -> Optional[str]:
+        """
+        Read a serialized entry from the in-process tier, then from Redis.
+        
+        Entries read from Redis are kept locally for ``local_ttl`` seconds;
+        keys missing from Redis are remembered for ``negative_ttl`` seconds.
+        """
+        if not self._redis and not self.use_memory_fallback:
+            return None
+        
+        entry = self._memory_cache.get(full_key)
+        if entry is not None:
+            if entry.negative:
+                self._metrics['l1_negative_hits'] += 1
+                return None
+            self._metrics['l1_hits'] += 1
+            return entry.payload
+        
+        if not self._redis:
+            return None  # Memory fallback: the in-process tier is authoritative
+        
+        payload = await self._redis.get(full_key)
+        if payload is None:
+            self._metrics['l2_misses'] += 1
+            if self.negative_ttl > 0:
+                self._memory_cache.set(full_key, None, self.negative_ttl)
+            return None
+        
+        self._metrics['l2_hits'] += 1
+        self._memory_cache.set(full_key, payload, self.local_ttl)
+        return payload
+    
     async def set(
         self,
         cache_type: Optional[str] = None,
@@ -283,8 +459,7 @@ class CacheManager:
         Returns:
             True if successful, False otherwise
         """
-        if not self._redis and not self._redis_failed:
-            await self.connect()
+        await self._ensure_connected()
         
         # Determine which API pattern is being used
         if key is not None:
@@ -304,42 +479,44 @@ class CacheManager:
         
         # Use cache type threshold as default TTL if not specified
         if ttl is None:
-            if cache_type_for_ttl:
-                ttl = self.FRESHNESS_THRESHOLDS.get(cache_type_for_ttl, self.default_ttl)
-            else:
-                ttl = self.default_ttl
+            ttl = self._default_ttl(cache_type_for_ttl)
         
-        # Wrap data with metadata
-        cache_entry = {
-            'data': cache_data,
-            'cached_at': datetime.utcnow().isoformat()
-        }
+        return await self._write(full_key, self._serialize_entry(cache_data), ttl)
+    
+    async def _write(self, full_key: str, payload: bytes, ttl: int) -> bool:
+        """
+        Store an encoded entry in Redis (with its tags) and in the in-process tier.
         
+        Returns:
+            True if successful, False otherwise
+        """
         # Use memory fallback if Redis unavailable
         if not self._redis and self.use_memory_fallback:
-            self._memory_cache[full_key] = json.dumps(cache_entry, default=str)
+            if not self._memory_cache.set(full_key, payload, ttl):
+                logger.debug(f"Cache set (memory) skipped, entry exceeds its quota: {full_key}")
+                return False
             self._metrics['sets'] += 1
             logger.debug(f"Cache set (memory): {full_key}")
             return True
         
         # Guard against Redis being None
         if not self._redis:
-            logger.warning(f"Cannot set cache: Redis unavailable and no fallback enabled")
+            logger.warning("Cannot set cache: Redis unavailable and no fallback enabled")
             return False
         
         try:
-            # Store in Redis with TTL
-            await self._redis.setex(
-                full_key,
-                ttl,
-                json.dumps(cache_entry, default=str)
-            )
+            # Store in Redis with TTL (and its tags), and locally for reads from this process
+            pipe = self._redis.pipeline(transaction=False)
+            self._queue_write(pipe, full_key, payload, ttl)
+            await pipe.execute()
+            self._memory_cache.set(full_key, payload, min(ttl, self.local_ttl))
             
             self._metrics['sets'] += 1
             logger.debug(f"Cache set: {full_key} (TTL: {ttl}s)")
             return True
         
         except Exception as e:
+            self._memory_cache.delete(full_key)
             logger.error(f"Error setting cache: {e}")
             return False
     
@@ -366,8 +543,7 @@ class CacheManager:
         Returns:
             True if deleted, False otherwise
         """
-        if not self._redis and not self._redis_failed:
-            await self.connect()
+        await self._ensure_connected()
         
         # Determine which API pattern is being used
         if key is not None:
@@ -379,10 +555,11 @@ class CacheManager:
         else:
             raise ValueError("Must provide either 'key' or all of (cache_type, tenant_id, identifier)")
         
+        local_deleted = self._memory_cache.delete(full_key)
+        
         # Use memory fallback if Redis unavailable
         if not self._redis and self.use_memory_fallback:
-            if full_key in self._memory_cache:
-                del self._memory_cache[full_key]
+            if local_deleted:
                 self._metrics['invalidations'] += 1
                 logger.info(f"Cache invalidated (memory): {full_key}")
                 return True
@@ -404,6 +581,550 @@ class CacheManager:
             logger.error(f"Error deleting from cache: {e}")
             return False
     
+    # ==================== Stampede protection ====================
+    
+    async def get_or_compute(
+        self,
+        cache_type: Optional[str] = None,
+        tenant_id: Optional[UUID] = None,
+        identifier: Optional[str] = None,
+        compute: Optional[Callable[[], Awaitable[Any]]] = None,
+        ttl: Optional[int] = None,
+        key: Optional[str] = None,
+        stale_ttl: Optional[int] = None,
+        beta: Optional[float] = None
+    ) -> Any:
+        """
+        Return cached data, computing and caching it once when missing or expired.
+        
+        Supports two calling patterns:
+        1. Structured: get_or_compute(cache_type, tenant_id, identifier, compute, ttl)
+        2. Simple: get_or_compute(key=full_key, compute=compute, ttl=ttl)
+        
+        - Fresh entry: returned, unless XFetch picks this call to refresh it
+          early (more likely the closer the expiry and the longer the entry
+          took to compute).
+        - Expired entry (within ``stale_ttl``): the caller winning the
+          recompute lease refreshes it; everyone else gets the stale data.
+          A failed refresh also serves the stale data.
+        - Missing entry: the lease winner computes it, concurrent callers of
+          this process share that computation and other workers wait for
+          the result (computing it themselves if the lease lapses).
+        
+        Args:
+            cache_type: Type of cached data (pricing, sentiment, forecast, etc.)
+            tenant_id: Tenant UUID for isolation
+            identifier: Unique identifier for the cached item
+            compute: Coroutine function producing the data (must be JSON serializable)
+            ttl: Seconds the data is fresh (defaults to cache_type threshold)
+            key: Full cache key (alternative to cache_type/tenant_id/identifier)
+            stale_ttl: Seconds expired data may still be served (defaults to the manager's)
+            beta: Early refresh eagerness (defaults to the manager's; 0 disables)
+            
+        Returns:
+            Cached or computed data
+            
+        Raises:
+            Whatever ``compute`` raises when there is no stale data to serve
+        """
+        if compute is None:
+            raise ValueError("get_or_compute requires a compute function")
+        full_key, cache_type_for_ttl = self._resolve_key(cache_type, tenant_id, identifier, key)
+        
+        await self._ensure_connected()
+        
+        ttl = self._default_ttl(cache_type_for_ttl) if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        beta = self.xfetch_beta if beta is None else beta
+        
+        cached_data = await self._read_entry(full_key)
+        if cached_data is not None:
+            remaining = self._remaining_ttl(cached_data, ttl)
+            if remaining > 0 and not self._refresh_early(cached_data, remaining, beta):
+                self._metrics['hits'] += 1
+                return cached_data.get('data')
+            
+            if remaining > -stale_ttl:
+                # Refresh now if no one else is; serve the cached data otherwise
+                token = None if full_key in self._inflight else await self._acquire_lease(full_key)
+                if token is None:
+                    self._metrics['hits' if remaining > 0 else 'stale_served'] += 1
+                    return cached_data.get('data')
+                
+                self._metrics['early_refreshes' if remaining > 0 else 'misses'] += 1
+                try:
+                    return await self._compute_once(full_key, compute, ttl, stale_ttl, token)
+                except Exception as e:
+                    logger.error(f"Refreshing {full_key} failed, serving the cached entry: {e}")
+                    self._metrics['stale_served'] += 1
+                    return cached_data.get('data')
+        
+        self._metrics['misses'] += 1
+        inflight = self._inflight.get(full_key)
+        if inflight is not None:
+            self._metrics['coalesced_waits'] += 1
+            return await asyncio.shield(inflight)
+        
+        token = await self._acquire_lease(full_key)
+        if token is None:
+            # Another worker is computing the entry
+            self._metrics['coalesced_waits'] += 1
+            cached_data = await self._wait_for_entry(full_key, ttl)
+            if cached_data is not None:
+                return cached_data.get('data')
+        return await self._compute_once(full_key, compute, ttl, stale_ttl, token)
+    
+    async def refresh(
+        self,
+        cache_type: Optional[str] = None,
+        tenant_id: Optional[UUID] = None,
+        identifier: Optional[str] = None,
+        compute: Optional[Callable[[], Awaitable[Any]]] = None,
+        ttl: Optional[int] = None,
+        key: Optional[str] = None,
+        stale_ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Recompute and store an entry now (e.g. cache warming after new data).
+        
+        The entry is written like a get_or_compute entry. Nothing is done if
+        another caller is already recomputing it.
+        
+        Args:
+            cache_type: Type of cached data (pricing, sentiment, forecast, etc.)
+            tenant_id: Tenant UUID for isolation
+            identifier: Unique identifier for the cached item
+            compute: Coroutine function producing the data (must be JSON serializable)
+            ttl: Seconds the data is fresh (defaults to cache_type threshold)
+            key: Full cache key (alternative to cache_type/tenant_id/identifier)
+            stale_ttl: Seconds expired data may still be served (defaults to the manager's)
+            
+        Returns:
+            True if recomputed, False if a recomputation was already running
+            
+        Raises:
+            Whatever ``compute`` raises
+        """
+        if compute is None:
+            raise ValueError("refresh requires a compute function")
+        full_key, cache_type_for_ttl = self._resolve_key(cache_type, tenant_id, identifier, key)
+        
+        await self._ensure_connected()
+        
+        ttl = self._default_ttl(cache_type_for_ttl) if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        if full_key in self._inflight:
+            return False
+        token = await self._acquire_lease(full_key)
+        if token is None:
+            return False
+        await self._compute_once(full_key, compute, ttl, stale_ttl, token)
+        return True
+    
+    def _resolve_key(
+        self,
+        cache_type: Optional[str],
+        tenant_id: Optional[UUID],
+        identifier: Optional[str],
+        key: Optional[str]
+    ) -> Tuple[str, Optional[str]]:
+        """Full key and cache type of the structured or simple calling pattern"""
+        if key is not None:
+            return key, (key.split(':')[0] if ':' in key else None)
+        if cache_type is not None and tenant_id is not None and identifier is not None:
+            return self._build_cache_key(cache_type, tenant_id, identifier), cache_type
+        raise ValueError("Must provide either 'key' or all of (cache_type, tenant_id, identifier)")
+    
+    async def _compute_once(
+        self,
+        full_key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        token: Optional[str]
+    ) -> Any:
+        """Run a computation shared by every caller of this process, store it and release the lease (None is not stored)"""
+        task = self._inflight.get(full_key)
+        if task is not None:
+            # Started by a concurrent caller while the lease was being acquired
+            await self._release_lease(full_key, token)
+            return await asyncio.shield(task)
+        
+        async def run():
+            try:
+                started = time.monotonic()
+                data = await compute()
+                compute_seconds = time.monotonic() - started
+                self._metrics['recomputes'] += 1
+                if data is not None:
+                    payload = self._serialize_entry(data, ttl=ttl, compute_seconds=compute_seconds)
+                    await self._write(full_key, payload, ttl + stale_ttl)
+                return data
+            finally:
+                await self._release_lease(full_key, token)
+        
+        task = asyncio.get_running_loop().create_task(run())
+        self._inflight[full_key] = task
+        task.add_done_callback(
+            lambda done: self._inflight.pop(full_key) if self._inflight.get(full_key) is done else None
+        )
+        # Shielded: a cancelled caller does not cancel the computation others wait for
+        return await asyncio.shield(task)
+    
+    async def _read_entry(self, full_key: str) -> Optional[Dict[str, Any]]:
+        """Read and decode an entry (None if missing or unreadable)"""
+        try:
+            payload = await self._read(full_key)
+            return self.codec.decode(payload) if payload is not None else None
+        except Exception as e:
+            logger.error(f"Error retrieving from cache: {e}")
+            return None
+    
+    async def _acquire_lease(self, full_key: str) -> Optional[str]:
+        """
+        Acquire the cross-worker recompute lease of a key.
+        
+        Returns:
+            Lease token, or None if another worker holds the lease
+        """
+        token = uuid4().hex
+        if not self._redis:
+            return token  # Single process: concurrent callers share the in-process computation
+        try:
+            acquired = await self._redis.set(
+                f"{self.LEASE_PREFIX}:{full_key}", token, nx=True, px=int(self.lease_ttl * 1000)
+            )
+            return token if acquired else None
+        except Exception as e:
+            logger.warning(f"Could not acquire recompute lease for {full_key}: {e}")
+            return token
+    
+    async def _release_lease(self, full_key: str, token: Optional[str]):
+        """Release a lease if still held by this token (a lapsed lease may belong to another worker)"""
+        if not token or not self._redis:
+            return
+        lease_key = f"{self.LEASE_PREFIX}:{full_key}"
+        try:
+            holder = await self._redis.get(lease_key)
+            if _decode_key(holder) == token:
+                await self._redis.delete(lease_key)
+        except Exception as e:
+            logger.warning(f"Could not release recompute lease for {full_key}: {e}")
+    
+    async def _wait_for_entry(self, full_key: str, ttl: int) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the lease holder to store a fresh entry.
+        
+        Returns:
+            The entry, or None if the lease was released or lapsed without one
+        """
+        lease_key = f"{self.LEASE_PREFIX}:{full_key}"
+        deadline = time.monotonic() + self.lease_ttl
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.LEASE_POLL_INTERVAL)
+            try:
+                payload, holder = await self._redis.mget([full_key, lease_key])
+                cached_data = self.codec.decode(payload) if payload is not None else None
+            except Exception as e:
+                logger.error(f"Error waiting for cache entry {full_key}: {e}")
+                return None
+            if cached_data is not None and self._remaining_ttl(cached_data, ttl) > 0:
+                self._memory_cache.set(full_key, payload, self.local_ttl)
+                return cached_data
+            if holder is None:
+                return None
+        return None
+    
+    def _remaining_ttl(self, cached_data: Dict[str, Any], ttl: int) -> float:
+        """Seconds until an entry expires (negative once expired); its own TTL wins over ``ttl``"""
+        try:
+            age = (datetime.utcnow() - datetime.fromisoformat(cached_data['cached_at'])).total_seconds()
+        except Exception:
+            return -math.inf
+        return cached_data.get('ttl', ttl) - age
+    
+    @staticmethod
+    def _refresh_early(cached_data: Dict[str, Any], remaining: float, beta: float) -> bool:
+        """XFetch: refresh when compute time x beta x -ln(U), U ~ (0, 1], reaches the remaining TTL"""
+        compute_seconds = cached_data.get('compute_seconds')
+        if not compute_seconds or beta <= 0:
+            return False
+        return -compute_seconds * beta * math.log(1.0 - random.random()) >= remaining
+    
+    def _is_expired(self, cached_data: Dict[str, Any]) -> bool:
+        """Whether a get_or_compute entry is past its TTL (kept only to be served while recomputed)"""
+        return 'ttl' in cached_data and self._remaining_ttl(cached_data, cached_data['ttl']) <= 0
+    
+    # ==================== Batch operations ====================
+    
+    def _resolve_keys(
+        self,
+        cache_type: Optional[str],
+        tenant_id: Optional[UUID],
+        identifiers: Optional[Iterable[str]],
+        keys: Optional[Iterable[str]]
+    ) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        Full keys of a batch as (name, full_key, cache_type) triples.
+        
+        Names are the identifiers (structured API) or the full keys (simple API).
+        """
+        if keys is not None:
+            return [(key, key, key.split(':')[0] if ':' in key else None) for key in keys]
+        if cache_type is not None and tenant_id is not None and identifiers is not None:
+            return [
+                (identifier, self._build_cache_key(cache_type, tenant_id, identifier), cache_type)
+                for identifier in identifiers
+            ]
+        raise ValueError("Must provide either 'keys' or all of (cache_type, tenant_id, identifiers)")
+    
+    async def _read_many(self, full_keys: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Read serialized entries from the in-process tier, then the rest with one MGET.
+        
+        Same tiering rules as ``_read``.
+        """
+        found: Dict[str, Optional[str]] = {}
+        if not self._redis and not self.use_memory_fallback:
+            return found
+        
+        remote = []
+        for full_key in dict.fromkeys(full_keys):
+            entry = self._memory_cache.get(full_key)
+            if entry is None:
+                remote.append(full_key)
+            elif entry.negative:
+                self._metrics['l1_negative_hits'] += 1
+            else:
+                self._metrics['l1_hits'] += 1
+                found[full_key] = entry.payload
+        
+        if not remote or not self._redis:
+            return found  # Memory fallback: the in-process tier is authoritative
+        
+        for full_key, payload in zip(remote, await self._redis.mget(remote)):
+            if payload is None:
+                self._metrics['l2_misses'] += 1
+                if self.negative_ttl > 0:
+                    self._memory_cache.set(full_key, None, self.negative_ttl)
+                continue
+            self._metrics['l2_hits'] += 1
+            self._memory_cache.set(full_key, payload, self.local_ttl)
+            found[full_key] = payload
+        return found
+    
+    async def get_many(
+        self,
+        cache_type: Optional[str] = None,
+        tenant_id: Optional[UUID] = None,
+        identifiers: Optional[Iterable[str]] = None,
+        check_freshness: bool = True,
+        keys: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve several cached entries with at most one Redis round-trip.
+        
+        Supports two calling patterns:
+        1. Structured: get_many(cache_type, tenant_id, identifiers, check_freshness)
+        2. Simple: get_many(keys=[full_key, ...])
+        
+        Args:
+            cache_type: Type of cached data (pricing, sentiment, forecast, etc.)
+            tenant_id: Tenant UUID for isolation
+            identifiers: Unique identifiers of the cached items
+            check_freshness: Whether to check each entry is still fresh
+            keys: Full cache keys (alternative to cache_type/tenant_id/identifiers)
+            
+        Returns:
+            Cached data by identifier (or full key); missing and stale entries are omitted
+        """
+        await self._ensure_connected()
+        
+        resolved = self._resolve_keys(cache_type, tenant_id, identifiers, keys)
+        if not resolved:
+            return {}
+        
+        try:
+            found = await self._read_many([full_key for _, full_key, _ in resolved])
+        except Exception as e:
+            logger.error(f"Error retrieving batch from cache: {e}")
+            self._metrics['misses'] += len(resolved)
+            return {}
+        
+        results = {}
+        for name, full_key, entry_type in resolved:
+            payload = found.get(full_key)
+            try:
+                cached_data = self.codec.decode(payload) if payload is not None else None
+            except Exception as e:
+                logger.error(f"Error decoding cache entry {full_key}: {e}")
+                cached_data = None
+            
+            if cached_data is None or self._is_expired(cached_data) or (
+                check_freshness and entry_type and not self._is_fresh(entry_type, cached_data)
+            ):
+                self._metrics['misses'] += 1
+                continue
+            
+            self._metrics['hits'] += 1
+            results[name] = cached_data.get('data')
+        
+        logger.debug(f"Cache batch get: {len(results)}/{len(resolved)} hits")
+        return results
+    
+    async def set_many(
+        self,
+        cache_type: Optional[str] = None,
+        tenant_id: Optional[UUID] = None,
+        items: Optional[Dict[str, Any]] = None,
+        ttl: Optional[int] = None,
+        mapping: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Store several entries with one pipelined Redis round-trip.
+        
+        Supports two calling patterns:
+        1. Structured: set_many(cache_type, tenant_id, {identifier: data}, ttl)
+        2. Simple: set_many(mapping={full_key: data}, ttl=ttl)
+        
+        Args:
+            cache_type: Type of cached data (pricing, sentiment, forecast, etc.)
+            tenant_id: Tenant UUID for isolation
+            items: Data to cache by identifier (must be JSON serializable)
+            ttl: Time-to-live in seconds (defaults to each entry's cache_type threshold)
+            mapping: Data to cache by full key (alternative to cache_type/tenant_id/items)
+            
+        Returns:
+            Number of entries stored
+        """
+        await self._ensure_connected()
+        
+        values = mapping if mapping is not None else items
+        resolved = self._resolve_keys(
+            cache_type, tenant_id,
+            identifiers=list(items) if mapping is None and items is not None else None,
+            keys=list(mapping) if mapping is not None else None
+        )
+        if not resolved:
+            return 0
+        
+        entries = [
+            (full_key, self._serialize_entry(values[name]), ttl if ttl is not None else self._default_ttl(entry_type))
+            for name, full_key, entry_type in resolved
+        ]
+        
+        # Use memory fallback if Redis unavailable
+        if not self._redis and self.use_memory_fallback:
+            stored = sum(self._memory_cache.set(full_key, payload, entry_ttl)
+                         for full_key, payload, entry_ttl in entries)
+            self._metrics['sets'] += stored
+            logger.debug(f"Cache batch set (memory): {stored}/{len(entries)} entries")
+            return stored
+        
+        if not self._redis:
+            logger.warning("Cannot set cache batch: Redis unavailable and no fallback enabled")
+            return 0
+        
+        try:
+            # SET with EX sets value and expiry in one command; the pipeline sends all at once
+            pipe = self._redis.pipeline(transaction=False)
+            for full_key, payload, entry_ttl in entries:
+                self._queue_write(pipe, full_key, payload, entry_ttl)
+            await pipe.execute()
+            
+            for full_key, payload, entry_ttl in entries:
+                self._memory_cache.set(full_key, payload, min(entry_ttl, self.local_ttl))
+            
+            self._metrics['sets'] += len(entries)
+            logger.debug(f"Cache batch set: {len(entries)} entries")
+            return len(entries)
+        
+        except Exception as e:
+            for full_key, _, _ in entries:
+                self._memory_cache.delete(full_key)
+            logger.error(f"Error setting cache batch: {e}")
+            return 0
+    
+    async def delete_many(
+        self,
+        cache_type: Optional[str] = None,
+        tenant_id: Optional[UUID] = None,
+        identifiers: Optional[Iterable[str]] = None,
+        keys: Optional[Iterable[str]] = None
+    ) -> int:
+        """
+        Delete several entries with one Redis round-trip.
+        
+        Supports two calling patterns:
+        1. Structured: delete_many(cache_type, tenant_id, identifiers)
+        2. Simple: delete_many(keys=[full_key, ...])
+        
+        Args:
+            cache_type: Type of cached data (pricing, sentiment, forecast, etc.)
+            tenant_id: Tenant UUID for isolation
+            identifiers: Unique identifiers of the cached items
+            keys: Full cache keys (alternative to cache_type/tenant_id/identifiers)
+            
+        Returns:
+            Number of entries deleted
+        """
+        await self._ensure_connected()
+        
+        full_keys = list(dict.fromkeys(full_key for _, full_key, _ in
+                                       self._resolve_keys(cache_type, tenant_id, identifiers, keys)))
+        if not full_keys:
+            return 0
+        
+        local_deleted = sum(self._memory_cache.delete(full_key) for full_key in full_keys)
+        
+        # Use memory fallback if Redis unavailable
+        if not self._redis and self.use_memory_fallback:
+            self._metrics['invalidations'] += local_deleted
+            return local_deleted
+        
+        if not self._redis:
+            return 0
+        
+        try:
+            deleted = await self._redis.delete(*full_keys)
+            self._metrics['invalidations'] += deleted
+            logger.info(f"Cache batch invalidated: {deleted} entries")
+            return deleted
+        
+        except Exception as e:
+            logger.error(f"Error deleting batch from cache: {e}")
+            return 0
+    
+    def _serialize_entry(
+        self,
+        data: Any,
+        ttl: Optional[int] = None,
+        compute_seconds: Optional[float] = None
+    ) -> bytes:
+        """
+        Wrap data with metadata and encode it.
+        
+        Args:
+            data: Data to cache
+            ttl: Logical TTL, for entries kept longer to be served stale (get_or_compute)
+            compute_seconds: Time the data took to compute (drives early refresh)
+        """
+        cache_entry = {
+            'data': data,
+            'cached_at': datetime.utcnow().isoformat()
+        }
+        if ttl is not None:
+            cache_entry['ttl'] = ttl
+        if compute_seconds is not None:
+            cache_entry['compute_seconds'] = round(compute_seconds, 4)
+        return self.codec.encode(cache_entry)
+    
+    def _default_ttl(self, cache_type: Optional[str]) -> int:
+        """Default TTL of a cache type (its freshness threshold)"""
+        if cache_type:
+            return self.FRESHNESS_THRESHOLDS.get(cache_type, self.default_ttl)
+        return self.default_ttl
+    
     async def invalidate_pattern(
         self,
         cache_type: Optional[str] = None,
@@ -425,8 +1146,7 @@ class CacheManager:
         Returns:
             Number of entries invalidated
         """
-        if not self._redis and not self._redis_failed:
-            await self.connect()
+        await self._ensure_connected()
         
         # Determine which API pattern is being used
         if tenant_id is None and cache_type is not None:
@@ -438,21 +1158,11 @@ class CacheManager:
         else:
             raise ValueError("Must provide either a pattern string or (cache_type, tenant_id, pattern)")
         
+        local_deleted = self._memory_cache.delete_matching(search_pattern)
+        
         # Use memory fallback if Redis unavailable
         if not self._redis and self.use_memory_fallback:
-            # Convert Redis-style pattern to regex for memory cache
-            # Redis patterns use * for any characters, we need to convert to regex
-            import re
-            # Escape special regex characters except *
-            regex_pattern = re.escape(search_pattern).replace(r'\*', '.*')
-            regex = re.compile(f'^{regex_pattern}$')
-            
-            keys_to_delete = [k for k in self._memory_cache.keys() if regex.match(k)]
-            deleted = 0
-            for key in keys_to_delete:
-                del self._memory_cache[key]
-                deleted += 1
-            
+            deleted = local_deleted
             if deleted > 0:
                 self._metrics['invalidations'] += deleted
                 logger.info(f"Cache pattern invalidated (memory): {search_pattern} ({deleted} entries)")
@@ -460,31 +1170,194 @@ class CacheManager:
         
         # Guard against Redis being None
         if not self._redis:
-            logger.warning(f"Cannot invalidate pattern: Redis not connected and no fallback")
+            logger.warning("Cannot invalidate pattern: Redis not connected and no fallback")
             return 0
         
         try:
-            # Find matching keys
-            keys = []
-            logger.debug(f"Scanning Redis for pattern: {search_pattern}")
-            async for key in self._redis.scan_iter(match=search_pattern):
-                keys.append(key)
-                logger.debug(f"Found matching key: {key}")
-            
-            # Delete all matching keys
-            if keys:
-                deleted = await self._redis.delete(*keys)
+            deleted = await self._delete_matching(search_pattern)
+            if deleted:
                 self._metrics['invalidations'] += deleted
                 logger.info(f"Cache pattern invalidated: {search_pattern} ({deleted} entries)")
-                return deleted
+            else:
+                logger.debug(f"No keys found matching pattern: {search_pattern}")
+            return deleted
+        
+        except Exception as e:
+            logger.error(f"Error invalidating cache pattern: {e}")
+            return 0
+    
+    async def invalidate_entities(
+        self,
+        cache_type: str,
+        tenant_id: UUID,
+        entity_ids: Iterable[str],
+        local_only: bool = False
+    ) -> int:
+        """
+        Invalidate entries of a cache type whose identifier mentions any of the entities.
+        
+        Equivalent to ``invalidate_pattern(cache_type, tenant_id, "*{entity_id}*")``
+        for every entity, with one tag lookup round-trip and one delete
+        round-trip for the whole set.
+        
+        Args:
+            cache_type: Type of cached data
+            tenant_id: Tenant UUID
+            entity_ids: Entity UUIDs (products, mostly)
+            local_only: Only drop entries from this process's in-process tier
             
-            logger.debug(f"No keys found matching pattern: {search_pattern}")
+        Returns:
+            Number of entries invalidated
+        """
+        entity_ids = list(dict.fromkeys(str(entity_id).lower() for entity_id in entity_ids))
+        if not entity_ids:
             return 0
         
+        prefix = f"{cache_type}:{tenant_id}:"
+        wanted = set(entity_ids)
+        local_deleted = self._memory_cache.delete_where(
+            lambda key: key.startswith(prefix) and not wanted.isdisjoint(key_entity_ids(key))
+        )
+        if local_only:
+            return local_deleted
+        
+        await self._ensure_connected()
+        
+        # Use memory fallback if Redis unavailable
+        if not self._redis and self.use_memory_fallback:
+            self._metrics['invalidations'] += local_deleted
+            return local_deleted
+        
+        if not self._redis:
+            return 0
+        
+        try:
+            domain = type_tag(tenant_id, cache_type)
+            pipe = self._redis.pipeline(transaction=False)
+            for entity_id in entity_ids:
+                pipe.sinter([domain, entity_tag(tenant_id, entity_id)])
+            keys = set()
+            for members in await pipe.execute():
+                keys.update(map(_decode_key, members))
+            
+            deleted = await self._unlink_tagged(sorted(keys))
+            self._metrics['invalidations'] += deleted
+            if deleted:
+                logger.info(f"Cache invalidated: {deleted} {cache_type} entries for {len(entity_ids)} entities")
+            return deleted
+        
         except Exception as e:
-            logger.error(f"Error invalidating cache pattern: {e}")
+            logger.error(f"Error invalidating {cache_type} entries for entities: {e}")
             return 0
     
+    def invalidate_local(self, pattern: str) -> int:
+        """
+        Drop entries matching a pattern from this process's in-process tier only.
+        
+        Used for changes made by other workers, which invalidated Redis themselves.
+        
+        Returns:
+            Number of local entries removed
+        """
+        deleted = self._memory_cache.delete_matching(pattern)
+        if deleted:
+            logger.debug(f"Local cache tier invalidated: {pattern} ({deleted} entries)")
+        return deleted
+    
+    # ==================== Tag sets ====================
+    
+    @staticmethod
+    def _queue_write(pipe, full_key: str, payload: bytes, ttl: int):
+        """Queue SET ... EX and the key's tag registrations on a pipeline"""
+        pipe.set(full_key, payload, ex=ttl)
+        tags = tags_for_key(full_key)
+        for tag in tags:
+            pipe.sadd(tag, full_key)
+        if tags:
+            pipe.sadd(TAG_INDEX_KEY, *tags)
+    
+    async def _delete_matching(self, pattern: str) -> int:
+        """
+        Delete Redis keys matching a glob pattern.
+        
+        Candidates come from the pattern's tag sets (one SMEMBERS/SINTER) and
+        are removed with their tag registrations in one pipeline; patterns
+        without a literal tenant segment fall back to a keyspace scan.
+        """
+        tags = tags_for_pattern(pattern)
+        if tags is None:
+            logger.debug(f"Scanning Redis for pattern: {pattern}")
+            keys = [key async for key in self._redis.scan_iter(match=pattern)]
+            return await self._redis.delete(*keys) if keys else 0
+        
+        members = await (self._redis.smembers(tags[0]) if len(tags) == 1 else self._redis.sinter(tags))
+        regex = pattern_to_regex(pattern)
+        return await self._unlink_tagged([key for key in map(_decode_key, members) if regex.match(key)])
+    
+    async def _unlink_tagged(self, keys: List[str]) -> int:
+        """Delete keys and their tag registrations in one pipeline"""
+        if not keys:
+            return 0
+        
+        by_tag: Dict[str, List[str]] = {}
+        for key in keys:
+            for tag in tags_for_key(key):
+                by_tag.setdefault(tag, []).append(key)
+        
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.unlink(*keys)
+        for tag, tagged in by_tag.items():
+            pipe.srem(tag, *tagged)
+        results = await pipe.execute()
+        return results[0]
+    
+    async def compact_tags(self, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Remove members of expired or deleted entries from the tag sets.
+        
+        Args:
+            batch_size: Tag sets checked per pipeline round-trip
+            
+        Returns:
+            Number of tag sets checked, members removed and tag sets dropped
+        """
+        stats = {'tags_checked': 0, 'members_removed': 0, 'tags_removed': 0}
+        if not self._redis:
+            return stats
+        
+        tags = sorted(map(_decode_key, await self._redis.smembers(TAG_INDEX_KEY)))
+        for start in range(0, len(tags), batch_size):
+            batch = tags[start:start + batch_size]
+            
+            pipe = self._redis.pipeline(transaction=False)
+            for tag in batch:
+                pipe.smembers(tag)
+            members = [set(map(_decode_key, result)) for result in await pipe.execute()]
+            
+            candidates = sorted(set().union(*members))
+            pipe = self._redis.pipeline(transaction=False)
+            for key in candidates:
+                pipe.exists(key)
+            live = {key for key, exists in zip(candidates, await pipe.execute()) if exists}
+            
+            pipe = self._redis.pipeline(transaction=False)
+            for tag, tagged in zip(batch, members):
+                dead = tagged - live
+                if dead:
+                    pipe.srem(tag, *dead)
+                    stats['members_removed'] += len(dead)
+                if not tagged & live:
+                    pipe.srem(TAG_INDEX_KEY, tag)
+                    stats['tags_removed'] += 1
+            await pipe.execute()
+            stats['tags_checked'] += len(batch)
+        
+        logger.info(
+            f"Cache tags compacted: {stats['members_removed']} stale members, "
+            f"{stats['tags_removed']} empty tag sets"
+        )
+        return stats
+    
     def _is_fresh(self, cache_type: str, cached_data: Dict[str, Any]) -> bool:
         """
         Check if cached data is still fresh.
@@ -527,7 +1400,10 @@ class CacheManager:
         metrics = {
             **self._metrics,
             'total_requests': total_requests,
-            'hit_rate_percent': round(hit_rate, 2)
+            'hit_rate_percent': round(hit_rate, 2),
+            'l1': self._memory_cache.get_stats(),
+            'codec': self.codec.get_stats(),
+            'pool': self.get_pool_stats()
         }
         
         # Get Redis info if connected
@@ -554,6 +1430,23 @@ class CacheManager:
         
         return metrics
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get Redis connection pool utilization.
+        
+        Returns:
+            Dictionary with pool size, connections in use and idle connections
+        """
+        stats = {'connected': self._redis is not None, 'max_connections': self.max_connections}
+        if self._pool is not None:
+            in_use = len(getattr(self._pool, '_in_use_connections', ()))
+            stats.update({
+                'in_use': in_use,
+                'idle': len(getattr(self._pool, '_available_connections', ())),
+                'utilization_percent': round(in_use / self.max_connections * 100, 2) if self.max_connections else 0
+            })
+        return stats
+    
     async def clear_tenant_cache(self, tenant_id: UUID) -> int:
         """
         Clear all cache entries for a tenant.
@@ -564,20 +1457,15 @@ class CacheManager:
         Returns:
             Number of entries cleared
         """
-        if not self._redis and not self._redis_failed:
-            await self.connect()
+        await self._ensure_connected()
         
         pattern = f"*:{tenant_id}:*"
         
+        local_deleted = self._memory_cache.delete_matching(pattern)
+        
         # Use memory fallback if Redis unavailable
         if not self._redis and self.use_memory_fallback:
-            import fnmatch
-            keys_to_delete = [k for k in self._memory_cache.keys() if fnmatch.fnmatch(k, pattern)]
-            deleted = 0
-            for key in keys_to_delete:
-                del self._memory_cache[key]
-                deleted += 1
-            
+            deleted = local_deleted
             if deleted > 0:
                 logger.info(f"Cleared cache for tenant {tenant_id} (memory): {deleted} entries")
             return deleted
@@ -587,16 +1475,10 @@ class CacheManager:
             return 0
         
         try:
-            keys = []
-            async for key in self._redis.scan_iter(match=pattern):
-                keys.append(key)
-            
-            if keys:
-                deleted = await self._redis.delete(*keys)
+            deleted = await self._delete_matching(pattern)
+            if deleted:
                 logger.info(f"Cleared cache for tenant {tenant_id}: {deleted} entries")
-                return deleted
-            
-            return 0
+            return deleted
         
         except Exception as e:
             logger.error(f"Error clearing tenant cache: {e}")
@@ -610,8 +1492,7 @@ class CacheManager:
             True if healthy, False otherwise
         """
         try:
-            if not self._redis and not self._redis_failed:
-                await self.connect()
+            await self._ensure_connected()
             
             # If still no Redis after connect attempt, return False
             if not self._redis:
@@ -0,0 +1,196 @@
+"""
+Cache Codec - Binary serialization and compression of cached payloads
+
+Encoded payloads start with a 4-byte header:
+
+    0xC1 | version | serializer id | compression id
+
+``0xC1`` never starts UTF-8 text (nor a msgpack object), so entries written
+before the codec existed (plain JSON text) are recognised by the missing
+header and still decode. Payloads are compressed only above a size
+threshold and only when compression actually makes them smaller.
+
+Serializers (fastest available by default): orjson, msgpack, json.
+Compressors: lz4 (if installed), zlib.
+"""
+import json
+import logging
+import zlib
+from typing import Any, Callable, Dict, NamedTuple, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0xC1
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+DEFAULT_COMPRESS_MIN_BYTES = 1024
+DEFAULT_ZLIB_LEVEL = 3  # Most of the size reduction of level 6 at a fraction of the CPU
+
+
+class _Format(NamedTuple):
+    """Encoding functions of one serializer or compressor"""
+    id: int
+    encode: Callable
+    decode: Callable
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, default=str, separators=(',', ':')).encode()
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=str, use_bin_type=True)
+
+
+def _msgpack_loads(payload: bytes) -> Any:
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+SERIALIZERS: Dict[str, _Format] = {'json': _Format(ord('j'), _json_dumps, json.loads)}
+if ORJSON_AVAILABLE:
+    SERIALIZERS['orjson'] = _Format(ord('o'), _orjson_dumps, orjson.loads)
+if MSGPACK_AVAILABLE:
+    SERIALIZERS['msgpack'] = _Format(ord('m'), _msgpack_dumps, _msgpack_loads)
+
+COMPRESSORS: Dict[str, _Format] = {
+    'none': _Format(ord('n'), bytes, bytes),
+    'zlib': _Format(ord('z'), lambda data: zlib.compress(data, DEFAULT_ZLIB_LEVEL), zlib.decompress),
+}
+if LZ4_AVAILABLE:
+    COMPRESSORS['lz4'] = _Format(ord('l'), lz4.frame.compress, lz4.frame.decompress)
+
+_SERIALIZERS_BY_ID = {fmt.id: fmt for fmt in SERIALIZERS.values()}
+_COMPRESSORS_BY_ID = {fmt.id: fmt for fmt in COMPRESSORS.values()}
+
+
+def _choose(name: str, available: Dict[str, _Format], preference, kind: str) -> str:
+    """Resolve 'auto' and fall back when a configured library is not installed"""
+    if name == 'auto':
+        return next(candidate for candidate in preference if candidate in available)
+    if name not in available:
+        fallback = next(candidate for candidate in preference if candidate in available)
+        logger.warning(f"Cache {kind} '{name}' not available. Using {fallback}.")
+        return fallback
+    return name
+
+
+class CacheCodec:
+    """
+    Encodes cache entries to compact binary payloads and decodes them back.
+
+    Decoding uses the serializer and compressor recorded in each payload's
+    header, so entries written with another configuration still decode.
+    """
+
+    def __init__(
+        self,
+        serializer: str = 'auto',
+        compression: str = 'auto',
+        compress_min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES
+    ):
+        """
+        Initialize codec.
+
+        Args:
+            serializer: 'auto', 'orjson', 'msgpack' or 'json'
+            compression: 'auto', 'lz4', 'zlib' or 'none'
+            compress_min_bytes: Payloads smaller than this are stored uncompressed
+        """
+        self.serializer = _choose(serializer, SERIALIZERS, ('orjson', 'msgpack', 'json'), 'serializer')
+        self.compression = _choose(compression, COMPRESSORS, ('lz4', 'zlib', 'none'), 'compression')
+        self.compress_min_bytes = compress_min_bytes
+        self._serializer = SERIALIZERS[self.serializer]
+        self._compressor = COMPRESSORS[self.compression]
+        self._metrics = {
+            'encoded': 0,
+            'compressed': 0,
+            'serialized_bytes': 0,
+            'stored_bytes': 0,
+            'legacy_decoded': 0
+        }
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Serialize (and compress, if worthwhile) a value.
+
+        Returns:
+            Header plus payload bytes
+        """
+        serializer = self._serializer
+        try:
+            body = serializer.encode(value)
+        except TypeError:
+            # e.g. integers beyond 64 bits for orjson
+            serializer = SERIALIZERS['json']
+            body = serializer.encode(value)
+
+        compressor = COMPRESSORS['none']
+        serialized_size = len(body)
+        if self._compressor.id != compressor.id and serialized_size >= self.compress_min_bytes:
+            compressed = self._compressor.encode(body)
+            if len(compressed) < serialized_size:
+                compressor, body = self._compressor, compressed
+                self._metrics['compressed'] += 1
+
+        payload = bytes((MAGIC, FORMAT_VERSION, serializer.id, compressor.id)) + body
+        self._metrics['encoded'] += 1
+        self._metrics['serialized_bytes'] += serialized_size
+        self._metrics['stored_bytes'] += len(payload)
+        return payload
+
+    def decode(self, payload: Union[bytes, str]) -> Any:
+        """
+        Decode a payload written by ``encode`` or a legacy JSON text entry.
+
+        Raises:
+            ValueError: If the header names an unknown version, or a serializer
+                or compressor that is not installed
+        """
+        if isinstance(payload, str) or not payload or payload[0] != MAGIC:
+            self._metrics['legacy_decoded'] += 1
+            return json.loads(payload)
+
+        version, serializer_id, compressor_id = payload[1], payload[2], payload[3]
+        serializer = _SERIALIZERS_BY_ID.get(serializer_id)
+        compressor = _COMPRESSORS_BY_ID.get(compressor_id)
+        if version != FORMAT_VERSION or serializer is None or compressor is None:
+            raise ValueError(
+                f"Cannot decode cache payload (version {version}, "
+                f"serializer {chr(serializer_id)!r}, compression {chr(compressor_id)!r})"
+            )
+        return serializer.decode(compressor.decode(payload[HEADER_SIZE:]))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get codec statistics"""
+        serialized = self._metrics['serialized_bytes']
+        return {
+            **self._metrics,
+            'serializer': self.serializer,
+            'compression': self.compression,
+            'compression_ratio': round(self._metrics['stored_bytes'] / serialized, 3) if serialized else 1.0
+        }
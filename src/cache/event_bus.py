@@ -1,12 +1,16 @@
 """Event-driven cache invalidation system"""
 import asyncio
+import json
 import logging
+import os
 from datetime import datetime
-from typing import Dict, List, Callable, Any, Optional, Set
+from typing import Dict, List, Callable, Any, Optional, Set, Union
 from enum import Enum
-from uuid import UUID
+from uuid import UUID, uuid4
 from dataclasses import dataclass, field
 
+from src.cache.tags import is_entity_id
+
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +26,7 @@ class EventType(Enum):
     SALES_RECORDED = "sales_recorded"
     INVENTORY_UPDATED = "inventory_updated"
     FORECAST_GENERATED = "forecast_generated"
+    INGESTION_COMPLETED = "ingestion_completed"  # entity_id: data source; metadata: records_saved
 
 
 @dataclass
@@ -33,9 +38,97 @@ class DataEvent:
     entity_id: str
     timestamp: datetime = field(default_factory=datetime.utcnow)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    origin: Optional[str] = None  # Worker that published the event (set on publish)
+    entity_ids: List[str] = field(default_factory=list)  # Batch events: every entity covered
+    
+    BATCH_ENTITY_ID = "*"
     
     def __str__(self) -> str:
+        if self.entity_ids:
+            return f"{self.event_type.value}:{self.entity_type}:{len(self.entity_ids)} entities"
         return f"{self.event_type.value}:{self.entity_type}:{self.entity_id}"
+    
+    @classmethod
+    def batch(
+        cls,
+        event_type: EventType,
+        tenant_id: UUID,
+        entity_type: str,
+        entity_ids: List[str],
+        product_ids: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> "DataEvent":
+        """
+        One event for many entities of the same type.
+        
+        Args:
+            event_type: Type of the change
+            tenant_id: Tenant UUID
+            entity_type: Type of the entities
+            entity_ids: Entities covered
+            product_ids: Products the entities belong to (reviews, sales)
+            metadata: Additional metadata
+        """
+        metadata = dict(metadata or {})
+        if product_ids is not None:
+            metadata['product_ids'] = list(product_ids)
+        return cls(
+            event_type=event_type,
+            tenant_id=tenant_id,
+            entity_type=entity_type,
+            entity_id=cls.BATCH_ENTITY_ID,
+            metadata=metadata,
+            entity_ids=list(entity_ids)
+        )
+    
+    @property
+    def all_entity_ids(self) -> List[str]:
+        """Entities covered by the event (one unless it is a batch)"""
+        return self.entity_ids or [self.entity_id]
+    
+    @property
+    def product_ids(self) -> Optional[List[str]]:
+        """
+        Products affected by the event.
+        
+        Returns:
+            Product ids, or None if the event does not say
+        """
+        if self.entity_type == 'product':
+            return self.all_entity_ids
+        if 'product_ids' in self.metadata:
+            return list(self.metadata['product_ids'])
+        if self.metadata.get('product_id'):
+            return [str(self.metadata['product_id'])]
+        return None
+    
+    def to_message(self) -> str:
+        """Serialize for delivery to other workers"""
+        return json.dumps({
+            'event_type': self.event_type.value,
+            'tenant_id': str(self.tenant_id),
+            'entity_type': self.entity_type,
+            'entity_id': self.entity_id,
+            'timestamp': self.timestamp.isoformat(),
+            'metadata': self.metadata,
+            'origin': self.origin,
+            'entity_ids': self.entity_ids
+        }, default=str)
+    
+    @classmethod
+    def from_message(cls, message: Union[bytes, str]) -> "DataEvent":
+        """Deserialize an event sent by ``to_message``"""
+        data = json.loads(message)
+        return cls(
+            event_type=EventType(data['event_type']),
+            tenant_id=UUID(data['tenant_id']),
+            entity_type=data['entity_type'],
+            entity_id=data['entity_id'],
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            metadata=data.get('metadata') or {},
+            origin=data.get('origin'),
+            entity_ids=data.get('entity_ids') or []
+        )
 
 
 class EventPublisher:
@@ -46,29 +139,64 @@ class EventPublisher:
     - Emit events when data is created/updated/deleted
     - Track event history for debugging
     - Support multiple subscribers per event type
+    - Broadcast events to other worker processes through an attached
+      transport (see src.cache.event_transport)
+    
+    Subscribers run in the worker that published the event. Subscribers
+    registered with ``all_workers=True`` (those keeping process-local
+    state) also receive events published by other workers; they can tell
+    them apart with ``is_remote``.
     """
     
     def __init__(self):
         """Initialize event publisher"""
         self._subscribers: Dict[EventType, List[Callable]] = {}
+        self._worker_subscribers: Dict[EventType, List[Callable]] = {}  # Also receive remote events
         self._event_history: List[DataEvent] = []
         self._max_history = 1000
+        self.worker_id = f"{os.getpid()}-{uuid4().hex[:12]}"
+        self._transport = None
         logger.info("EventPublisher initialized")
     
-    def subscribe(self, event_type: EventType, callback: Callable):
+    def subscribe(self, event_type: EventType, callback: Callable, all_workers: bool = False):
         """
         Subscribe to an event type.
         
         Args:
             event_type: Type of event to subscribe to
             callback: Async function to call when event occurs
+            all_workers: Also call it for events published by other workers
         """
         if event_type not in self._subscribers:
             self._subscribers[event_type] = []
         
         self._subscribers[event_type].append(callback)
+        if all_workers:
+            self._worker_subscribers.setdefault(event_type, []).append(callback)
         logger.info(f"Subscribed to {event_type.value}")
     
+    def is_remote(self, event: DataEvent) -> bool:
+        """Whether an event was published by another worker"""
+        return event.origin is not None and event.origin != self.worker_id
+    
+    async def attach_transport(self, transport):
+        """
+        Broadcast published events to other workers and receive theirs.
+        
+        Args:
+            transport: RedisEventTransport or InMemoryEventTransport
+        """
+        await self.detach_transport()
+        await transport.start(self._receive)
+        self._transport = transport
+        logger.info(f"Event publisher {self.worker_id} attached to {type(transport).__name__}")
+    
+    async def detach_transport(self):
+        """Stop broadcasting and receiving events"""
+        if self._transport is not None:
+            transport, self._transport = self._transport, None
+            await transport.stop(self._receive)
+    
     async def publish(self, event: DataEvent):
         """
         Publish an event to all subscribers.
@@ -77,14 +205,39 @@ class EventPublisher:
             event: Data event to publish
         """
         logger.info(f"Publishing event: {event}")
+        if event.origin is None:
+            event.origin = self.worker_id
+        
+        await self._dispatch(event, self._subscribers)
+        
+        if self._transport is not None:
+            try:
+                await self._transport.send(event.to_message())
+            except Exception as e:
+                logger.error(f"Failed to broadcast {event} to other workers: {e}")
+    
+    async def _receive(self, message: Union[bytes, str]):
+        """Dispatch an event received from the transport"""
+        try:
+            event = DataEvent.from_message(message)
+        except Exception as e:
+            logger.error(f"Ignoring malformed data event message: {e}")
+            return
         
+        if not self.is_remote(event):
+            return  # Already dispatched when published here
+        logger.debug(f"Received event from worker {event.origin}: {event}")
+        await self._dispatch(event, self._worker_subscribers)
+    
+    async def _dispatch(self, event: DataEvent, subscribers_by_type: Dict[EventType, List[Callable]]):
+        """Record an event and call its subscribers"""
         # Add to history
         self._event_history.append(event)
         if len(self._event_history) > self._max_history:
             self._event_history.pop(0)
         
         # Notify subscribers
-        subscribers = self._subscribers.get(event.event_type, [])
+        subscribers = subscribers_by_type.get(event.event_type, [])
         
         if not subscribers:
             logger.debug(f"No subscribers for {event.event_type.value}")
@@ -187,9 +340,9 @@ class CacheInvalidationSubscriber:
         }
     
     def _subscribe_to_events(self):
-        """Subscribe to all relevant event types"""
+        """Subscribe to all relevant event types (from every worker, for the local tier)"""
         for event_type in EventType:
-            self.event_publisher.subscribe(event_type, self.handle_event)
+            self.event_publisher.subscribe(event_type, self.handle_event, all_workers=True)
     
     async def handle_event(self, event: DataEvent):
         """
@@ -207,29 +360,50 @@ class CacheInvalidationSubscriber:
             logger.debug(f"No cache dependencies for {event.event_type.value}")
             return
         
+        # Redis is shared: another worker's event was invalidated there by
+        # that worker, only this process's local tier remains
+        remote = self.event_publisher.is_remote(event)
+        
+        # The event's entities and the products they belong to; UUIDs are
+        # invalidated together through tag sets, other ids by pattern
+        entity_ids = [
+            entity_id
+            for entity_id in dict.fromkeys(event.all_entity_ids + (event.product_ids or []))
+            if entity_id and entity_id != DataEvent.BATCH_ENTITY_ID
+        ]
+        tagged_ids = [entity_id for entity_id in entity_ids if is_entity_id(entity_id)]
+        other_ids = [entity_id for entity_id in entity_ids if not is_entity_id(entity_id)]
+        
         # Invalidate each affected cache type
         invalidated_keys = []
         
         for cache_type in affected_caches:
             try:
-                # Build cache key pattern
-                pattern = self._build_invalidation_pattern(
-                    cache_type, event.tenant_id, event.entity_id
-                )
+                count = await self.cache_manager.invalidate_entities(
+                    cache_type, event.tenant_id, tagged_ids, local_only=remote
+                ) if tagged_ids else 0
                 
-                # Invalidate matching keys
-                count = await self.cache_manager.invalidate_pattern(pattern)
+                for entity_id in other_ids:
+                    # Build cache key pattern
+                    pattern = self._build_invalidation_pattern(
+                        cache_type, event.tenant_id, entity_id
+                    )
+                    
+                    # Invalidate matching keys
+                    if remote:
+                        count += self.cache_manager.invalidate_local(pattern)
+                    else:
+                        count += await self.cache_manager.invalidate_pattern(pattern)
                 
                 if count > 0:
                     invalidated_keys.append({
                         'cache_type': cache_type,
-                        'pattern': pattern,
+                        'entities': len(entity_ids),
                         'count': count
                     })
                     
                     logger.info(
-                        f"Invalidated {count} {cache_type} cache entries "
-                        f"for {event.entity_type}:{event.entity_id}"
+                        f"Invalidated {count} {cache_type} cache entries for {event}"
                     )
             
             except Exception as e:
@@ -346,9 +520,102 @@ class CacheInvalidationSubscriber:
         }
 
 
+class EventCoalescer:
+    """
+    Coalesces per-entity events into batch events off the request path.
+    
+    Events are grouped per tenant, event type and entity type. Each group is
+    published as one batch DataEvent once ``window_seconds`` have passed
+    since its first event, so a bulk upload runs every subscriber once per
+    affected entity set instead of once per row.
+    """
+    
+    def __init__(
+        self,
+        event_publisher: EventPublisher,
+        window_seconds: float = 0.2,
+        max_batch_size: int = 5000
+    ):
+        """
+        Initialize coalescer.
+        
+        Args:
+            event_publisher: EventPublisher the batches are published to
+            window_seconds: Delay during which events of a group are collected
+            max_batch_size: Entities per published batch event
+        """
+        self.event_publisher = event_publisher
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._tasks: Dict[tuple, asyncio.Task] = {}
+    
+    def add(self, event: DataEvent):
+        """Queue an event (must be called from the event loop; never blocks)"""
+        key = (event.tenant_id, event.event_type, event.entity_type)
+        group = self._pending.setdefault(key, {'entity_ids': {}, 'product_ids': {}, 'unknown_products': False})
+        group['entity_ids'].update(dict.fromkeys(event.all_entity_ids))
+        product_ids = event.product_ids
+        if product_ids is None:
+            group['unknown_products'] = True
+        else:
+            group['product_ids'].update(dict.fromkeys(product_ids))
+        
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.get_running_loop().create_task(self._flush_later(key))
+    
+    def add_many(self, events: List[DataEvent]):
+        """Queue several events"""
+        for event in events:
+            self.add(event)
+    
+    async def flush(self):
+        """Publish everything queued now (e.g. on shutdown)"""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+        for key in list(self._pending):
+            await self._publish(key)
+    
+    async def _flush_later(self, key: tuple):
+        """Publish a group once its window has passed"""
+        await asyncio.sleep(self.window_seconds)
+        self._tasks.pop(key, None)
+        await self._publish(key)
+    
+    async def _publish(self, key: tuple):
+        """Publish a queued group as batch events"""
+        group = self._pending.pop(key, None)
+        if not group:
+            return
+        tenant_id, event_type, entity_type = key
+        entity_ids = list(group['entity_ids'])
+        # Product events name their products as entities; other chunks all carry
+        # the group's products (they are not tracked per entity)
+        if entity_type == 'product' or group['unknown_products']:
+            product_ids = None
+        else:
+            product_ids = list(group['product_ids'])
+        
+        for start in range(0, len(entity_ids), self.max_batch_size):
+            try:
+                await self.event_publisher.publish(DataEvent.batch(
+                    event_type=event_type,
+                    tenant_id=tenant_id,
+                    entity_type=entity_type,
+                    entity_ids=entity_ids[start:start + self.max_batch_size],
+                    product_ids=product_ids
+                ))
+            except Exception as e:
+                logger.error(f"Failed to publish batch {event_type.value} event: {e}")
+        
+        logger.info(f"Published coalesced {event_type.value} event for {len(entity_ids)} {entity_type} entities")
+
+
 # Global instances
 _event_publisher: Optional[EventPublisher] = None
 _cache_subscriber: Optional[CacheInvalidationSubscriber] = None
+_event_coalescer: Optional[EventCoalescer] = None
 
 
 def get_event_publisher() -> EventPublisher:
@@ -359,6 +626,18 @@ def get_event_publisher() -> EventPublisher:
     return _event_publisher
 
 
+def get_event_coalescer() -> EventCoalescer:
+    """Get or create the global event coalescer (publishing to the global publisher)"""
+    global _event_coalescer
+    if _event_coalescer is None:
+        from src.config import settings
+        _event_coalescer = EventCoalescer(
+            get_event_publisher(),
+            window_seconds=settings.cache_event_coalesce_ms / 1000
+        )
+    return _event_coalescer
+
+
 def initialize_cache_invalidation(cache_manager):
     """
     Initialize cache invalidation system.
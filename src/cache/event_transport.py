@@ -0,0 +1,160 @@
+"""
+Event Transport - Delivers data events to every worker process
+
+The in-process EventPublisher dispatches events to subscribers of the
+worker that published them. A transport broadcasts each event to the other
+workers as well, so subscribers holding process-local state (the in-process
+cache tier, memoized reports) see every change:
+
+- RedisEventTransport: Redis pub/sub channel shared by all workers (on the
+  cache's connection pool when given its client)
+- InMemoryEventTransport: stand-in connecting publishers of one process
+  (tests simulate several workers with it)
+
+Delivery is at-most-once: a worker that is disconnected when an event is
+sent misses it, and its local state is bounded by the local TTLs instead.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Union
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = "cache:data_events"
+
+MessageHandler = Callable[[Union[bytes, str]], Awaitable[None]]
+
+
+class InMemoryEventTransport:
+    """Broadcasts messages to every handler started on this instance"""
+
+    def __init__(self):
+        self._handlers: List[MessageHandler] = []
+
+    async def start(self, handler: MessageHandler):
+        """Start delivering messages to a handler"""
+        self._handlers.append(handler)
+
+    async def stop(self, handler: MessageHandler):
+        """Stop delivering messages to a handler"""
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    async def send(self, message: Union[bytes, str]):
+        """Deliver a message to every handler (including the sender's)"""
+        for handler in list(self._handlers):
+            try:
+                await handler(message)
+            except Exception as e:
+                logger.error(f"Event transport handler failed: {e}")
+
+
+class RedisEventTransport:
+    """Broadcasts messages over a Redis pub/sub channel"""
+
+    RECONNECT_DELAY_SECONDS = 1.0
+    MAX_RECONNECT_DELAY_SECONDS = 30.0
+    POLL_INTERVAL_SECONDS = 1.0  # Must stay below the client's socket_timeout
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        channel: str = DEFAULT_CHANNEL,
+        client=None,
+        poll_interval: float = POLL_INTERVAL_SECONDS
+    ):
+        """
+        Initialize Redis transport.
+
+        Args:
+            redis_url: Redis connection URL (used when no client is given)
+            channel: Pub/sub channel shared by all workers
+            client: Redis client to share (e.g. CacheManager.client); it is not closed on stop
+            poll_interval: Seconds each read of the subscription waits for a message
+        """
+        if redis_url is None and client is None:
+            raise ValueError("RedisEventTransport requires a redis_url or a client")
+        self.redis_url = redis_url
+        self.channel = channel
+        self._client = client
+        self.poll_interval = poll_interval
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, handler: MessageHandler):
+        """
+        Connect and listen for messages in a background task.
+
+        Raises:
+            RuntimeError: If the redis package is not installed
+        """
+        if self._client is not None:
+            self._redis = self._client
+        elif not REDIS_AVAILABLE:
+            raise RuntimeError("Redis package not installed")
+        else:
+            self._redis = redis.from_url(self.redis_url, socket_connect_timeout=2)
+        await asyncio.wait_for(self._redis.ping(), timeout=5.0)
+        self._listener = asyncio.get_running_loop().create_task(self._listen(handler))
+        logger.info(f"Listening for data events on Redis channel {self.channel}")
+
+    async def stop(self, handler: MessageHandler):
+        """Stop listening and close the connection (unless it is shared)"""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None and self._redis is not self._client:
+            await self._redis.aclose()
+        self._redis = None
+
+    async def send(self, message: Union[bytes, str]):
+        """Publish a message to the channel"""
+        if self._redis:
+            await self._redis.publish(self.channel, message)
+
+    async def _listen(self, handler: MessageHandler):
+        """
+        Receive messages, resubscribing with backoff after connection errors.
+
+        The subscription is polled with a read timeout below the socket
+        timeout: a blocking listen() on a pooled connection (socket_timeout
+        set) would time out whenever the channel is idle.
+        """
+        delay = self.RECONNECT_DELAY_SECONDS
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                delay = self.RECONNECT_DELAY_SECONDS
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=self.poll_interval
+                    )
+                    if message is None or message.get('type') != 'message':
+                        continue
+                    try:
+                        await handler(message['data'])
+                    except Exception as e:
+                        logger.error(f"Data event handler failed: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Data event subscription lost ({e}); retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
@@ -0,0 +1,220 @@
+"""
+Local LRU Cache - Bounded in-process tier (L1) in front of Redis
+
+Entries are serialized payloads accounted by size in bytes. The cache is
+bounded in total and per cache type (the first segment of the key), so a
+burst of large query results cannot evict every hot dashboard entry.
+Entries expire after their own TTL; expired entries are dropped lazily on
+access and when room is made for new entries.
+
+Negative entries record keys known to be absent from Redis, so repeated
+lookups of missing keys do not cost a network round-trip either.
+"""
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ENTRY_OVERHEAD_BYTES = 96  # Approximate bookkeeping per entry (key, entry object, dict slots)
+
+
+@dataclass
+class LocalEntry:
+    """One cached payload"""
+    payload: Optional[Union[bytes, str]]  # None for negative entries
+    size: int
+    expires_at: float  # time.monotonic() deadline
+    cache_type: str
+
+    @property
+    def negative(self) -> bool:
+        return self.payload is None
+
+
+def cache_type_of(key: str) -> str:
+    """Cache type of a key (``cache_type:tenant_id:identifier``)"""
+    return key.split(':', 1)[0]
+
+
+def pattern_to_regex(pattern: str) -> "re.Pattern":
+    """Compile a Redis glob pattern (``*`` and ``?``) to a regex"""
+    escaped = re.escape(pattern).replace(r'\*', '.*').replace(r'\?', '.')
+    return re.compile(f'^{escaped}$')
+
+
+class LocalLRUCache:
+    """
+    Size- and TTL-bounded LRU of serialized cache payloads.
+
+    Thread-safe; all operations are O(1) except pattern deletion and the
+    evictions needed to make room.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        type_shares: Optional[Dict[str, float]] = None,
+        default_type_share: float = 1.0,
+        max_entry_bytes: Optional[int] = None
+    ):
+        """
+        Initialize local cache.
+
+        Args:
+            max_bytes: Total budget for payloads and keys
+            type_shares: Maximum fraction of the budget per cache type
+            default_type_share: Fraction for cache types not listed
+            max_entry_bytes: Larger entries are not kept locally (defaults to the smallest quota)
+        """
+        self.max_bytes = max_bytes
+        self.type_shares = dict(type_shares or {})
+        self.default_type_share = default_type_share
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[str, LocalEntry]" = OrderedDict()
+        self._type_entries: Dict[str, "OrderedDict[str, None]"] = {}
+        self._type_bytes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = Lock()
+        self._metrics = {
+            'evictions': 0,
+            'expirations': 0,
+            'rejected': 0  # Entries too large to keep locally
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def quota(self, cache_type: str) -> int:
+        """Byte budget of a cache type"""
+        return int(self.max_bytes * self.type_shares.get(cache_type, self.default_type_share))
+
+    def get(self, key: str) -> Optional[LocalEntry]:
+        """
+        Look up a live entry (marks it most recently used).
+
+        Returns:
+            The entry (check ``negative``) or None if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._metrics['expirations'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._type_entries[entry.cache_type].move_to_end(key)
+            return entry
+
+    def set(self, key: str, payload: Optional[Union[bytes, str]], ttl: float) -> bool:
+        """
+        Store a payload (None stores a negative entry).
+
+        Returns:
+            False if the entry does not fit the budget and was not stored
+        """
+        cache_type = cache_type_of(key)
+        size = len(key) + (len(payload) if payload is not None else 0) + ENTRY_OVERHEAD_BYTES
+        quota = self.quota(cache_type)
+        limit = min(quota, self.max_entry_bytes or quota)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > limit or ttl <= 0:
+                self._metrics['rejected'] += size > limit
+                return False
+
+            self._make_room(cache_type, size, quota)
+            self._entries[key] = LocalEntry(payload, size, time.monotonic() + ttl, cache_type)
+            self._type_entries.setdefault(cache_type, OrderedDict())[key] = None
+            self._type_bytes[cache_type] = self._type_bytes.get(cache_type, 0) + size
+            self._bytes += size
+            return True
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry; True if it was present"""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def delete_matching(self, pattern: str) -> int:
+        """Remove entries whose key matches a Redis glob pattern"""
+        regex = pattern_to_regex(pattern)
+        return self.delete_where(lambda key: regex.match(key) is not None)
+
+    def delete_where(self, predicate: Callable[[str], bool]) -> int:
+        """Remove entries whose key satisfies the predicate"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._type_entries.clear()
+            self._type_bytes.clear()
+            self._bytes = 0
+
+    def keys(self):
+        """Snapshot of the cached keys (including expired ones not yet dropped)"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def _make_room(self, cache_type: str, size: int, quota: int):
+        """Evict expired entries, then LRU entries of the type, then global LRU entries"""
+        if self._type_bytes.get(cache_type, 0) + size > quota or self._bytes + size > self.max_bytes:
+            now = time.monotonic()
+            expired = [k for k, e in self._entries.items() if e.expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self._metrics['expirations'] += len(expired)
+
+        type_entries = self._type_entries.get(cache_type)
+        while type_entries and self._type_bytes.get(cache_type, 0) + size > quota:
+            self._remove(next(iter(type_entries)))
+            self._metrics['evictions'] += 1
+        while self._entries and self._bytes + size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._metrics['evictions'] += 1
+
+    def _remove(self, key: str):
+        """Remove an entry (lock held)"""
+        entry = self._entries.pop(key)
+        type_entries = self._type_entries[entry.cache_type]
+        del type_entries[key]
+        if not type_entries:
+            del self._type_entries[entry.cache_type]
+        self._type_bytes[entry.cache_type] -= entry.size
+        if not self._type_bytes[entry.cache_type]:
+            del self._type_bytes[entry.cache_type]
+        self._bytes -= entry.size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                **self._metrics,
+                'entries': len(self._entries),
+                'size_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'bytes_by_type': dict(self._type_bytes)
+            }
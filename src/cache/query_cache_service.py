@@ -2,7 +2,7 @@
 import hashlib
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 from uuid import UUID
 
 from src.cache.cache_manager import CacheManager
@@ -268,6 +268,143 @@ class QueryCacheService:
             data=forecast
         )
     
+    async def get_pricing_analyses(
+        self,
+        tenant_id: UUID,
+        product_ids: Iterable[UUID]
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Retrieve cached pricing analyses of several products in one round-trip.
+        
+        Args:
+            tenant_id: Tenant UUID
+            product_ids: Product UUIDs
+            
+        Returns:
+            Cached analyses by product (products without a fresh entry are omitted)
+        """
+        return await self._get_per_product('pricing', tenant_id, product_ids)
+    
+    async def set_pricing_analyses(
+        self,
+        tenant_id: UUID,
+        analyses: Dict[UUID, Dict[str, Any]]
+    ) -> int:
+        """
+        Cache pricing analyses of several products in one round-trip.
+        
+        Args:
+            tenant_id: Tenant UUID
+            analyses: Pricing analysis results by product
+            
+        Returns:
+            Number of entries cached
+        """
+        return await self._set_per_product('pricing', tenant_id, analyses)
+    
+    async def get_sentiment_analyses(
+        self,
+        tenant_id: UUID,
+        product_ids: Iterable[UUID]
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Retrieve cached sentiment analyses of several products in one round-trip.
+        
+        Args:
+            tenant_id: Tenant UUID
+            product_ids: Product UUIDs
+            
+        Returns:
+            Cached analyses by product (products without a fresh entry are omitted)
+        """
+        return await self._get_per_product('sentiment', tenant_id, product_ids)
+    
+    async def set_sentiment_analyses(
+        self,
+        tenant_id: UUID,
+        analyses: Dict[UUID, Dict[str, Any]]
+    ) -> int:
+        """
+        Cache sentiment analyses of several products in one round-trip.
+        
+        Args:
+            tenant_id: Tenant UUID
+            analyses: Sentiment analysis results by product
+            
+        Returns:
+            Number of entries cached
+        """
+        return await self._set_per_product('sentiment', tenant_id, analyses)
+    
+    async def get_demand_forecasts(
+        self,
+        tenant_id: UUID,
+        product_ids: Iterable[UUID],
+        horizon_days: int = 30
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Retrieve cached demand forecasts of several products in one round-trip.
+        
+        Args:
+            tenant_id: Tenant UUID
+            product_ids: Product UUIDs
+            horizon_days: Forecast horizon
+            
+        Returns:
+            Cached forecasts by product (products without a fresh entry are omitted)
+        """
+        return await self._get_per_product('forecast', tenant_id, product_ids, suffix=f":{horizon_days}")
+    
+    async def set_demand_forecasts(
+        self,
+        tenant_id: UUID,
+        forecasts: Dict[UUID, Dict[str, Any]],
+        horizon_days: int = 30
+    ) -> int:
+        """
+        Cache demand forecasts of several products in one round-trip.
+        
+        Args:
+            tenant_id: Tenant UUID
+            forecasts: Forecast results by product
+            horizon_days: Forecast horizon
+            
+        Returns:
+            Number of entries cached
+        """
+        return await self._set_per_product('forecast', tenant_id, forecasts, suffix=f":{horizon_days}")
+    
+    async def _get_per_product(
+        self,
+        cache_type: str,
+        tenant_id: UUID,
+        product_ids: Iterable[UUID],
+        suffix: str = ""
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """Batch lookup of per-product entries (identifier: product_id + suffix)"""
+        identifiers = {f"{product_id}{suffix}": product_id for product_id in product_ids}
+        cached = await self.cache.get_many(
+            cache_type=cache_type,
+            tenant_id=tenant_id,
+            identifiers=list(identifiers),
+            check_freshness=True
+        )
+        return {identifiers[identifier]: data for identifier, data in cached.items()}
+    
+    async def _set_per_product(
+        self,
+        cache_type: str,
+        tenant_id: UUID,
+        results: Dict[UUID, Dict[str, Any]],
+        suffix: str = ""
+    ) -> int:
+        """Batch store of per-product entries (identifier: product_id + suffix)"""
+        return await self.cache.set_many(
+            cache_type=cache_type,
+            tenant_id=tenant_id,
+            items={f"{product_id}{suffix}": result for product_id, result in results.items()}
+        )
+    
     async def invalidate_product_cache(
         self,
         tenant_id: UUID,
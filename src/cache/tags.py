@@ -0,0 +1,91 @@
+"""
+Cache Tags - Tag sets for invalidating cache entries without keyspace scans
+
+Every entry written to Redis registers its key in the sets of its tags:
+
+- ``cachetag:{tenant_id}``: all entries of a tenant
+- ``cachetag:{tenant_id}:type:{cache_type}``: entries of one data domain
+- ``cachetag:{tenant_id}:entity:{uuid}``: entries whose identifier mentions
+  an entity (products, mostly: ``pricing:{tenant}:{product_id}``,
+  ``forecast:{tenant}:{product_id}:30``)
+
+Invalidation patterns (``cache_type:tenant_id:rest``) are mapped to the
+smallest tag set (or intersection of sets) holding every key they can
+match; the members are then filtered by the pattern itself, so the result
+is exactly what a keyspace SCAN would have found.
+
+Members of tag sets are not removed when entries expire; the compaction
+job drops them (tag sets are listed in ``cachetag:index``).
+"""
+import re
+from typing import List, Optional
+
+TAG_PREFIX = "cachetag"
+TAG_INDEX_KEY = f"{TAG_PREFIX}:index"
+
+_UUID_PATTERN = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+_GLOB_CHARS = re.compile(r'[*?\[\]\\]')
+
+
+def is_entity_id(value: str) -> bool:
+    """Whether a value is an entity UUID (and so has tag sets)"""
+    return _UUID_PATTERN.fullmatch(str(value)) is not None
+
+
+def tenant_tag(tenant_id) -> str:
+    return f"{TAG_PREFIX}:{tenant_id}"
+
+
+def type_tag(tenant_id, cache_type: str) -> str:
+    return f"{TAG_PREFIX}:{tenant_id}:type:{cache_type}"
+
+
+def entity_tag(tenant_id, entity_id) -> str:
+    return f"{TAG_PREFIX}:{tenant_id}:entity:{str(entity_id).lower()}"
+
+
+def entity_ids_in(text: str) -> List[str]:
+    """Entity UUIDs mentioned in a key identifier (lowercase, unique)"""
+    return list(dict.fromkeys(match.lower() for match in _UUID_PATTERN.findall(text)))
+
+
+def key_entity_ids(key: str) -> List[str]:
+    """Entity UUIDs in the identifier part of a cache key"""
+    parts = key.split(':', 2)
+    return entity_ids_in(parts[2]) if len(parts) == 3 else []
+
+
+def tags_for_key(key: str) -> List[str]:
+    """
+    Tags of a cache key (``cache_type:tenant_id[:identifier]``).
+
+    Returns:
+        Tag set keys (empty for keys without a tenant segment)
+    """
+    parts = key.split(':', 2)
+    if len(parts) < 2 or parts[0] == TAG_PREFIX:
+        return []
+    cache_type, tenant_id = parts[0], parts[1]
+    tags = [tenant_tag(tenant_id), type_tag(tenant_id, cache_type)]
+    if len(parts) == 3:
+        tags.extend(entity_tag(tenant_id, entity_id) for entity_id in entity_ids_in(parts[2]))
+    return tags
+
+
+def tags_for_pattern(pattern: str) -> Optional[List[str]]:
+    """
+    Tag sets whose intersection holds every key a glob pattern can match.
+
+    Returns:
+        Tag set keys, or None when the pattern has no literal tenant segment
+        (it must then be resolved by scanning the keyspace)
+    """
+    parts = pattern.split(':', 2)
+    if len(parts) < 2 or _GLOB_CHARS.search(parts[1]) or parts[0] == TAG_PREFIX:
+        return None
+    cache_type, tenant_id = parts[0], parts[1]
+
+    tags = [tenant_tag(tenant_id) if _GLOB_CHARS.search(cache_type) else type_tag(tenant_id, cache_type)]
+    if len(parts) == 3:
+        tags.extend(entity_tag(tenant_id, entity_id) for entity_id in entity_ids_in(parts[2]))
+    return tags
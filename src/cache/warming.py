@@ -0,0 +1,326 @@
+"""
+Cache Warming - Recompute hot cache entries after new data arrives
+
+Endpoints whose results are expensive to rebuild register a loader with
+the CacheWarmer and record each access. The warmer keeps decayed access
+counts per cache entry, so it knows which tenants, endpoints and parameters
+are hot. When an ingestion run or upload completes (INGESTION_COMPLETED
+event), the tenant's hot entries are recomputed in the background, so the
+next dashboard visit does not pay for cold queries:
+
+- runs are debounced per tenant, so the data events of the ingestion have
+  invalidated their entries before warming starts
+- a fixed number of workers warm entries; the queue is ordered by tenant
+  activity, then by entry popularity
+- entries are written through CacheManager.refresh, so an entry already
+  being recomputed (by a request or another worker) is not computed twice
+
+Access counts are kept per worker process; the worker that handles the
+ingestion warms what it has seen requested.
+"""
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+KeyBuilder = Callable[[UUID, Dict[str, Any]], str]
+Loader = Callable[[AsyncSession, UUID, Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class WarmableEndpoint:
+    """A cached endpoint the warmer can recompute"""
+    name: str
+    cache_key: KeyBuilder  # (tenant_id, params) -> cache key
+    loader: Loader  # (db, tenant_id, params) -> data to cache (None: nothing to cache)
+    ttl: int
+
+
+@dataclass
+class WarmTarget:
+    """Access statistics of one cache entry"""
+    endpoint: str
+    tenant_id: UUID
+    params: Dict[str, Any]
+    cache_key: str
+    score: float = 0.0  # Accesses, decayed with the warmer's half-life
+    last_access: float = field(default_factory=time.monotonic)
+
+    def decayed_score(self, now: float, half_life: float) -> float:
+        return self.score * 0.5 ** ((now - self.last_access) / half_life)
+
+
+class CacheWarmer:
+    """
+    Tracks hot cache entries and recomputes them after ingestion.
+    """
+
+    DEFAULT_HALF_LIFE_SECONDS = 3600.0
+    DEFAULT_MAX_TRACKED = 2000
+
+    def __init__(
+        self,
+        cache_manager=None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        concurrency: int = 2,
+        delay_seconds: float = 5.0,
+        max_targets_per_tenant: int = 20,
+        min_score: float = 2.0,
+        half_life_seconds: float = DEFAULT_HALF_LIFE_SECONDS,
+        max_tracked: int = DEFAULT_MAX_TRACKED
+    ):
+        """
+        Initialize cache warmer.
+
+        Args:
+            cache_manager: CacheManager to warm (defaults to the global one)
+            session_factory: Creates database sessions (defaults to AsyncSessionLocal)
+            concurrency: Entries recomputed at the same time
+            delay_seconds: Delay between an ingestion event and warming its tenant
+            max_targets_per_tenant: Hottest entries warmed per tenant and run
+            min_score: Decayed access count below which an entry is not warmed
+            half_life_seconds: Half-life of access counts
+            max_tracked: Entries tracked at most (the coldest are forgotten)
+        """
+        self._cache_manager = cache_manager
+        self._session_factory = session_factory
+        self.concurrency = concurrency
+        self.delay_seconds = delay_seconds
+        self.max_targets_per_tenant = max_targets_per_tenant
+        self.min_score = min_score
+        self.half_life_seconds = half_life_seconds
+        self.max_tracked = max_tracked
+        self._endpoints: Dict[str, WarmableEndpoint] = {}
+        self._targets: Dict[str, WarmTarget] = {}  # By cache key
+        self._queue: "asyncio.PriorityQueue[Tuple[float, float, int, str]]" = asyncio.PriorityQueue()
+        self._queued: Dict[str, WarmTarget] = {}
+        self._sequence = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        self._tasks: Dict[UUID, asyncio.Task] = {}  # Debounced runs per tenant
+        self._metrics = {
+            'runs': 0,
+            'warmed': 0,
+            'skipped': 0,  # Already being recomputed elsewhere
+            'failed': 0
+        }
+
+    # ==================== Access statistics ====================
+
+    def register(self, endpoint: WarmableEndpoint):
+        """Make an endpoint warmable"""
+        self._endpoints[endpoint.name] = endpoint
+
+    def record_access(self, endpoint: str, tenant_id, params: Optional[Dict[str, Any]] = None):
+        """
+        Count an access to a cached endpoint.
+
+        Args:
+            endpoint: Name of a registered endpoint
+            tenant_id: Tenant UUID (or its string)
+            params: Parameters the loader needs (cache key parameters and context)
+        """
+        registered = self._endpoints.get(endpoint)
+        if registered is None:
+            return
+        try:
+            tenant_id = tenant_id if isinstance(tenant_id, UUID) else UUID(str(tenant_id))
+        except ValueError:
+            return  # Demo tenants without a UUID receive no ingestion events
+        params = dict(params or {})
+        cache_key = registered.cache_key(tenant_id, params)
+        now = time.monotonic()
+
+        target = self._targets.get(cache_key)
+        if target is None:
+            if len(self._targets) >= self.max_tracked:
+                self._forget_coldest(now)
+            target = self._targets[cache_key] = WarmTarget(endpoint, tenant_id, params, cache_key)
+        target.score = target.decayed_score(now, self.half_life_seconds) + 1.0
+        target.last_access = now
+        target.params = params
+
+    def hot_targets(self, tenant_id: UUID) -> List[WarmTarget]:
+        """A tenant's entries worth warming, hottest first"""
+        now = time.monotonic()
+        scored = [
+            (target.decayed_score(now, self.half_life_seconds), target)
+            for target in self._targets.values() if target.tenant_id == tenant_id
+        ]
+        hot = sorted((item for item in scored if item[0] >= self.min_score), key=lambda item: -item[0])
+        return [target for _, target in hot[:self.max_targets_per_tenant]]
+
+    def tenant_activity(self, tenant_id: UUID) -> float:
+        """Decayed accesses to all of a tenant's entries"""
+        now = time.monotonic()
+        return sum(
+            target.decayed_score(now, self.half_life_seconds)
+            for target in self._targets.values() if target.tenant_id == tenant_id
+        )
+
+    def _forget_coldest(self, now: float):
+        """Drop the least accessed tenth of the tracked entries"""
+        ranked = sorted(self._targets.values(), key=lambda target: target.decayed_score(now, self.half_life_seconds))
+        for target in ranked[:max(1, len(ranked) // 10)]:
+            del self._targets[target.cache_key]
+
+    # ==================== Warming ====================
+
+    def subscribe(self, event_publisher):
+        """
+        Warm a tenant's hot entries when its ingestion completes.
+
+        Access statistics are per worker, so every worker warms the entries
+        it serves; the refresh lease keeps them from recomputing the same key.
+        """
+        from src.cache.event_bus import EventType
+
+        event_publisher.subscribe(EventType.INGESTION_COMPLETED, self.handle_event, all_workers=True)
+
+    async def handle_event(self, event):
+        """Schedule a (debounced) warming run for the event's tenant"""
+        tenant_id = event.tenant_id
+        if tenant_id not in self._tasks:
+            self._tasks[tenant_id] = asyncio.get_running_loop().create_task(self._warm_later(tenant_id))
+
+    async def _warm_later(self, tenant_id: UUID):
+        await asyncio.sleep(self.delay_seconds)
+        self._tasks.pop(tenant_id, None)
+        self.enqueue_tenant(tenant_id)
+
+    def enqueue_tenant(self, tenant_id: UUID) -> int:
+        """
+        Queue a tenant's hot entries for warming.
+
+        Returns:
+            Number of entries queued
+        """
+        targets = [target for target in self.hot_targets(tenant_id) if target.cache_key not in self._queued]
+        if not targets:
+            return 0
+
+        self._metrics['runs'] += 1
+        priority = -self.tenant_activity(tenant_id)
+        now = time.monotonic()
+        for target in targets:
+            self._queued[target.cache_key] = target
+            score = -target.decayed_score(now, self.half_life_seconds)
+            self._queue.put_nowait((priority, score, next(self._sequence), target.cache_key))
+        self._start_workers()
+        logger.info(f"Queued {len(targets)} cache entries of tenant {tenant_id} for warming")
+        return len(targets)
+
+    def _start_workers(self):
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        loop = asyncio.get_running_loop()
+        while len(self._workers) < self.concurrency:
+            self._workers.append(loop.create_task(self._work()))
+
+    async def _work(self):
+        """Warm queued entries, most active tenants first"""
+        while True:
+            *_, cache_key = await self._queue.get()
+            try:
+                target = self._queued.pop(cache_key, None)
+                if target is not None:
+                    await self.warm(target)
+            finally:
+                self._queue.task_done()
+
+    async def warm(self, target: WarmTarget) -> bool:
+        """
+        Recompute one entry.
+
+        Returns:
+            True if the entry was recomputed
+        """
+        endpoint = self._endpoints.get(target.endpoint)
+        cache_manager = self._cache_manager
+        if cache_manager is None:
+            from src.cache.instance import get_cache_manager
+            cache_manager = get_cache_manager()
+        if endpoint is None or cache_manager is None:
+            return False
+
+        session_factory = self._session_factory
+        if session_factory is None:
+            from src.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        async def compute():
+            async with session_factory() as db:
+                return await endpoint.loader(db, target.tenant_id, target.params)
+
+        try:
+            refreshed = await cache_manager.refresh(key=target.cache_key, compute=compute, ttl=endpoint.ttl)
+        except Exception as e:
+            self._metrics['failed'] += 1
+            logger.warning(f"Warming {target.cache_key} failed: {e}")
+            return False
+
+        self._metrics['warmed' if refreshed else 'skipped'] += 1
+        logger.debug(f"Cache warmed: {target.cache_key}" if refreshed else f"Cache warming skipped: {target.cache_key}")
+        return refreshed
+
+    async def drain(self):
+        """Wait until scheduled runs and queued entries are done"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+        await self._queue.join()
+
+    async def stop(self):
+        """Cancel scheduled runs and workers"""
+        for task in [*self._tasks.values(), *self._workers]:
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), *self._workers, return_exceptions=True)
+        self._tasks.clear()
+        self._workers.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get warmer statistics"""
+        return {
+            **self._metrics,
+            'tracked_entries': len(self._targets),
+            'queued': len(self._queued),
+            'endpoints': sorted(self._endpoints)
+        }
+
+
+# Global instance
+_cache_warmer: Optional[CacheWarmer] = None
+_warming_subscribed = False
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get or create the global cache warmer"""
+    global _cache_warmer
+    if _cache_warmer is None:
+        from src.config import settings
+        _cache_warmer = CacheWarmer(
+            concurrency=settings.cache_warming_concurrency,
+            delay_seconds=settings.cache_warming_delay_seconds,
+            max_targets_per_tenant=settings.cache_warming_max_entries_per_tenant,
+            min_score=settings.cache_warming_min_accesses
+        )
+    return _cache_warmer
+
+
+def initialize_cache_warming() -> Optional[CacheWarmer]:
+    """Subscribe the global cache warmer to the global event publisher"""
+    global _warming_subscribed
+    from src.config import settings
+    if not settings.cache_warming_enabled:
+        return None
+    warmer = get_cache_warmer()
+    if not _warming_subscribed:
+        from src.cache.event_bus import get_event_publisher
+        warmer.subscribe(get_event_publisher())
+        _warming_subscribed = True
+        logger.info("Cache warming initialized")
+    return warmer
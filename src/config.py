@@ -20,6 +20,13 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite+aiosqlite:///./ecommerce_intelligence.db"
+    database_read_replica_url: str | None = None  # Analytical reads (dashboard, insights, general agent) go here when set
+    db_pool_size: int = 10  # Postgres connections kept open per engine and worker
+    db_max_overflow: int = 20  # Extra connections opened under load
+    db_pool_timeout_seconds: float = 30.0  # Wait for a free connection this long before failing
+    db_pool_recycle_seconds: int = 1800  # Replace connections older than this (server/pooler idle limits)
+    sqlite_busy_timeout_ms: int = 5000  # Writers wait for a lock instead of failing with "database is locked"
+    sqlite_mmap_size_mb: int = 256  # Memory-mapped I/O for reads (0 disables)
     
     # Security
     secret_key: str  # No default - must be set in .env
@@ -42,7 +49,50 @@ class Settings(BaseSettings):
     
     # Redis Cache Configuration
     redis_url: str = "redis://localhost:6379/0"
+    redis_max_connections: int = 50  # Connection pool size per worker process
+    redis_pool_timeout_seconds: float = 2.0  # Wait for a free pooled connection this long before failing
+    redis_health_check_interval_seconds: int = 30  # Idle connections are pinged before reuse (0 disables)
+    redis_socket_keepalive: bool = True
     cache_enabled: bool = True
+    cache_local_max_mb: int = 64  # In-process tier (L1) in front of Redis; the whole cache when Redis is down
+    cache_local_ttl_seconds: int = 30  # Entries read from Redis are served from process memory this long
+    cache_negative_ttl_seconds: int = 5  # Keys missing from Redis are remembered this long (0 disables)
+    cache_serializer: str = "auto"  # auto (orjson, then msgpack, then json), orjson, msgpack or json
+    cache_compression: str = "auto"  # auto (lz4, then zlib), lz4, zlib or none
+    cache_compress_min_bytes: int = 1024  # Smaller payloads are stored uncompressed
+    cache_tag_compaction_minutes: int = 60  # Expired entries are dropped from invalidation tag sets this often
+    cache_event_broadcast_enabled: bool = True  # Deliver data events to every worker over Redis pub/sub
+    cache_event_channel: str = "cache:data_events"
+    cache_event_coalesce_ms: int = 200  # Bulk writes publish one batch event per tenant and entity type per window
+    cache_stale_ttl_seconds: int = 300  # Expired entries are served this long while one request recomputes them
+    cache_recompute_lease_seconds: int = 30  # Other workers wait at most this long for a recomputation
+    cache_xfetch_beta: float = 1.0  # Probabilistic early refresh of expensive entries (> 1 earlier, 0 off)
+    cache_warming_enabled: bool = True  # Recompute hot dashboard/forecast/sentiment entries after ingestion
+    cache_warming_concurrency: int = 2
+    cache_warming_delay_seconds: float = 5.0  # After the ingestion event, so its invalidations have run
+    cache_warming_max_entries_per_tenant: int = 20
+    cache_warming_min_accesses: float = 2.0  # Recent accesses (decayed, 1h half-life) for an entry to be warmed
+
+    # Forecasting
+    forecast_max_workers: int = 0  # Process pool size for batch forecasts (0 = one per CPU core)
+    forecast_model_cache_size: int = 512  # Products whose fitted models are kept per worker process
+    forecast_heavy_model_top_skus: int = 100  # SKUs (by recent volume) that get the full model ensemble in tenant-wide runs
+    forecast_long_tail_mode: str = "baseline"  # Remaining SKUs: "baseline" (per-SKU vectorized) or "hierarchical" (category models + reconciliation)
+    forecast_reconciliation_method: str = "proportional"  # Hierarchical reconciliation: "proportional" (top-down) or "mint"
+    forecast_materialization_horizon_days: int = 30  # Horizon precomputed into forecast_results
+    forecast_materialization_hour: int = 3  # Hour of the nightly materialization run
+    forecast_materialization_max_age_hours: int = 36  # Older materialized forecasts are recomputed live
+    forecast_materialize_on_ingest: bool = True  # Refresh materialized forecasts after sales uploads
+
+    # Pricing
+    product_equivalence_maintenance_enabled: bool = True  # Rematch competitor mappings from product events
+    product_equivalence_debounce_seconds: float = 2.0  # Product events are coalesced for this long before rematching
+    pricing_bulk_page_size: int = 500  # Products per page of bulk pricing recommendations
+    competitor_dashboard_cache_ttl_seconds: int = 300  # Cached tenant totals (also dropped on snapshot refresh)
+
+    # Data quality
+    qa_report_cache_size: int = 256  # Data quality reports (tenant x product set) kept per worker process
+    qa_report_cache_ttl_seconds: int = 900  # Reports are rebuilt from scratch after this long (freshness is time dependent)
 
     # Google OAuth
     google_client_id: str | None = None
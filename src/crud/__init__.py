@@ -24,7 +24,9 @@ from src.crud.sales_record import (
     update_sales_record,
     delete_sales_record,
     get_sales_aggregation,
-    get_daily_sales
+    get_daily_sales,
+    get_daily_sales_series,
+    get_latest_sales_dates
 )
 from src.crud.price_history import (
     create_price_history,
@@ -33,6 +35,7 @@ from src.crud.price_history import (
     get_latest_price,
     delete_price_history,
     detect_price_changes,
+    detect_price_changes_bulk,
     get_price_trend,
     get_competitor_price_comparison,
     bulk_create_price_history
@@ -63,6 +66,8 @@ __all__ = [
     "delete_sales_record",
     "get_sales_aggregation",
     "get_daily_sales",
+    "get_daily_sales_series",
+    "get_latest_sales_dates",
     # Price History
     "create_price_history",
     "get_price_history",
@@ -70,6 +75,7 @@ __all__ = [
     "get_latest_price",
     "delete_price_history",
     "detect_price_changes",
+    "detect_price_changes_bulk",
     "get_price_trend",
     "get_competitor_price_comparison",
     "bulk_create_price_history"
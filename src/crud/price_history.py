@@ -3,7 +3,7 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
 from decimal import Decimal
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, case, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.price_history import PriceHistory
 from src.schemas.price_history import PriceHistoryCreate, PriceChange, PriceTrend
@@ -115,43 +115,88 @@ async def detect_price_changes(
     days: int = 7
 ) -> List[PriceChange]:
     """Detect significant price changes for a product (tenant-filtered)"""
-    # Get price history for the last N days
-    start_time = datetime.utcnow() - timedelta(days=days)
-    price_history = await get_price_history_by_product(
-        db, product_id, tenant_id, start_time=start_time, skip=0, limit=1000
+    return await detect_price_changes_bulk(
+        db, tenant_id, [product_id], threshold_percent=threshold_percent, days=days
     )
+
+
+async def detect_price_changes_bulk(
+    db: AsyncSession,
+    tenant_id: UUID,
+    product_ids: Optional[List[UUID]] = None,
+    threshold_percent: float = 5.0,
+    days: int = 7
+) -> List[PriceChange]:
+    """
+    Detect significant price changes for many products in one query (tenant-filtered).
     
-    if len(price_history) < 2:
-        return []
+    Consecutive prices are paired in the database with LAG() over each
+    price series (own prices and every competitor's prices are separate
+    series), so only the rows that cross the threshold are returned.
     
-    # Sort by timestamp ascending
-    price_history.sort(key=lambda x: x.timestamp)
+    Args:
+        db: Database session
+        tenant_id: Tenant UUID
+        product_ids: Products to check (None = all products of the tenant)
+        threshold_percent: Minimum absolute change in percent
+        days: Look-back window
+        
+    Returns:
+        Significant changes ordered by product and timestamp
+    """
+    start_time = datetime.utcnow() - timedelta(days=days)
+    
+    series = (
+        select(
+            PriceHistory.product_id,
+            PriceHistory.competitor_id,
+            PriceHistory.price,
+            PriceHistory.timestamp,
+            func.lag(PriceHistory.price).over(
+                partition_by=(PriceHistory.product_id, PriceHistory.competitor_id),
+                order_by=PriceHistory.timestamp
+            ).label('old_price')
+        )
+        .where(
+            PriceHistory.tenant_id == tenant_id,  # TENANT ISOLATION
+            PriceHistory.timestamp >= start_time
+        )
+    )
+    if product_ids is not None:
+        if not product_ids:
+            return []
+        series = series.where(PriceHistory.product_id.in_(list(product_ids)))
+    series = series.subquery()
+    
+    change = series.c.price - series.c.old_price
+    result = await db.execute(
+        select(
+            series.c.product_id, series.c.competitor_id,
+            series.c.old_price, series.c.price, series.c.timestamp
+        )
+        .where(
+            series.c.old_price.isnot(None),
+            series.c.old_price != 0,
+            func.abs(change) * 100 >= threshold_percent * func.abs(series.c.old_price)
+        )
+        .order_by(series.c.product_id, series.c.timestamp)
+    )
     
-    # Detect changes
     changes = []
-    for i in range(1, len(price_history)):
-        old_price = price_history[i-1].price
-        new_price = price_history[i].price
-        
-        if old_price == 0:
-            continue
-        
+    for row in result.all():
+        old_price = Decimal(str(row.old_price))
+        new_price = Decimal(str(row.price))
         price_change = new_price - old_price
-        price_change_percent = float((price_change / old_price) * 100)
-        
-        # Check if change exceeds threshold
-        is_significant = abs(price_change_percent) >= threshold_percent
-        
-        if is_significant:
-            changes.append(PriceChange(
-                product_id=product_id,
-                old_price=old_price,
-                new_price=new_price,
-                price_change=price_change,
-                price_change_percent=price_change_percent,
-                timestamp=price_history[i].timestamp,
-                is_significant=is_significant
-            ))
+        changes.append(PriceChange(
+            product_id=row.product_id,
+            old_price=old_price,
+            new_price=new_price,
+            price_change=price_change,
+            price_change_percent=float((price_change / old_price) * 100),
+            timestamp=row.timestamp,
+            is_significant=True,
+            competitor_id=row.competitor_id
+        ))
     
     return changes
 
@@ -162,55 +207,70 @@ async def get_price_trend(
     tenant_id: UUID,
     days: int = 30
 ) -> Optional[PriceTrend]:
-    """Analyze price trend for a product (tenant-filtered)"""
-    # Get price history for the last N days
+    """
+    Analyze price trend for a product (tenant-filtered).
+    
+    Statistics are computed with SQL aggregates over the window; the trend
+    compares the average of the more recent half of the records with the
+    average of the older half.
+    """
     start_time = datetime.utcnow() - timedelta(days=days)
-    price_history = await get_price_history_by_product(
-        db, product_id, tenant_id, start_time=start_time, skip=0, limit=1000
-    )
     
-    if not price_history:
-        return None
+    ranked = (
+        select(
+            PriceHistory.price,
+            func.row_number().over(order_by=PriceHistory.timestamp.desc()).label('recency'),
+            func.count().over().label('total')
+        )
+        .where(
+            PriceHistory.product_id == product_id,
+            PriceHistory.tenant_id == tenant_id,  # TENANT ISOLATION
+            PriceHistory.timestamp >= start_time
+        )
+        .subquery()
+    )
     
-    # Get current price (most recent)
-    current_price = price_history[0].price
+    price = ranked.c.price
+    in_recent_half = ranked.c.recency * 2 <= ranked.c.total
+    result = await db.execute(
+        select(
+            func.count().label('data_points'),
+            func.avg(price).label('average_price'),
+            func.min(price).label('min_price'),
+            func.max(price).label('max_price'),
+            func.avg(price * price).label('mean_square'),
+            func.max(case((ranked.c.recency == 1, price))).label('current_price'),
+            func.avg(case((in_recent_half, price))).label('recent_average'),
+            func.avg(case((~in_recent_half, price))).label('older_average')
+        )
+    )
+    stats = result.one()
     
-    # Calculate statistics
-    prices = [float(ph.price) for ph in price_history]
-    average_price = Decimal(str(sum(prices) / len(prices)))
-    min_price = Decimal(str(min(prices)))
-    max_price = Decimal(str(max(prices)))
+    if not stats.data_points:
+        return None
     
-    # Calculate volatility (standard deviation)
-    mean = sum(prices) / len(prices)
-    variance = sum((p - mean) ** 2 for p in prices) / len(prices)
-    volatility = variance ** 0.5
+    average = float(stats.average_price)
+    # Population standard deviation
+    volatility = max(float(stats.mean_square) - average ** 2, 0.0) ** 0.5
     
-    # Determine trend direction
-    if len(price_history) >= 2:
-        # Compare first half average to second half average
-        mid_point = len(price_history) // 2
-        first_half_avg = sum(prices[:mid_point]) / mid_point if mid_point > 0 else 0
-        second_half_avg = sum(prices[mid_point:]) / (len(prices) - mid_point)
-        
-        if second_half_avg > first_half_avg * 1.05:  # 5% threshold
+    trend_direction = "stable"
+    if stats.data_points >= 2:
+        recent_average = float(stats.recent_average)
+        older_average = float(stats.older_average)
+        if recent_average > older_average * 1.05:  # 5% threshold
             trend_direction = "up"
-        elif second_half_avg < first_half_avg * 0.95:  # 5% threshold
+        elif recent_average < older_average * 0.95:  # 5% threshold
             trend_direction = "down"
-        else:
-            trend_direction = "stable"
-    else:
-        trend_direction = "stable"
     
     return PriceTrend(
         product_id=product_id,
-        current_price=current_price,
-        average_price=average_price,
-        min_price=min_price,
-        max_price=max_price,
+        current_price=Decimal(str(stats.current_price)),
+        average_price=Decimal(str(average)),
+        min_price=Decimal(str(stats.min_price)),
+        max_price=Decimal(str(stats.max_price)),
         price_volatility=volatility,
         trend_direction=trend_direction,
-        data_points=len(price_history)
+        data_points=stats.data_points
     )
 
 
@@ -37,7 +37,8 @@ async def create_review(
             event_type=EventType.REVIEW_CREATED,
             tenant_id=tenant_id,
             entity_type='review',
-            entity_id=str(review.id)
+            entity_id=str(review.id),
+            metadata={'product_id': str(review.product_id)}
         )
         await publisher.publish(event)
     except Exception as e:
@@ -1,5 +1,5 @@
 """CRUD operations for SalesRecord model"""
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 from uuid import UUID
 from datetime import date, timedelta
 from decimal import Decimal
@@ -226,3 +226,70 @@ async def get_daily_sales(
     result = sorted(daily_sales.values(), key=lambda x: x['date'])
     
     return result
+
+
+async def get_daily_sales_series(
+    db: AsyncSession,
+    tenant_id: UUID,
+    product_ids: Sequence[UUID]
+) -> Dict[UUID, List[dict]]:
+    """
+    Get daily quantity series for many products in one grouped query (tenant-filtered).
+    
+    Returns a mapping of product_id to a date-ordered list of
+    {'date', 'quantity'} dicts, the format DemandForecastAgent expects.
+    Products without sales are absent from the mapping.
+    """
+    if not product_ids:
+        return {}
+    
+    result = await db.execute(
+        select(
+            SalesRecord.product_id,
+            SalesRecord.date,
+            func.sum(SalesRecord.quantity).label('quantity')
+        )
+        .where(
+            SalesRecord.tenant_id == tenant_id,  # TENANT ISOLATION
+            SalesRecord.product_id.in_(list(product_ids))
+        )
+        .group_by(SalesRecord.product_id, SalesRecord.date)
+        .order_by(SalesRecord.product_id, SalesRecord.date)
+    )
+    
+    series: Dict[UUID, List[dict]] = {}
+    for row in result.all():
+        series.setdefault(row.product_id, []).append({
+            'date': row.date,
+            'quantity': int(row.quantity or 0)
+        })
+    
+    return series
+
+
+async def get_latest_sales_dates(
+    db: AsyncSession,
+    tenant_id: UUID,
+    product_ids: Sequence[UUID]
+) -> Dict[UUID, date]:
+    """
+    Get the most recent sales date per product in one grouped query (tenant-filtered).
+    
+    Products without sales are absent from the mapping.
+    """
+    if not product_ids:
+        return {}
+    
+    result = await db.execute(
+        select(
+            SalesRecord.product_id,
+            func.max(SalesRecord.date).label('latest_date')
+        )
+        .where(
+            SalesRecord.tenant_id == tenant_id,  # TENANT ISOLATION
+            SalesRecord.product_id.in_(list(product_ids))
+        )
+        .group_by(SalesRecord.product_id)
+    )
+    
+    return {row.product_id: row.latest_date for row in result.all()}
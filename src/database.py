@@ -1,20 +1,77 @@
-"""Database connection and session management"""
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+"""Database connection and session management
+
+Engines are created with a profile per backend:
+
+- PostgreSQL (asyncpg): bounded connection pool with pre-ping and recycling
+- SQLite (aiosqlite): WAL journal, NORMAL synchronous, busy timeout and
+  memory-mapped reads on every connection, so readers do not block writers
+
+When ``database_read_replica_url`` is set, analytical reads (dashboard,
+insights, general agent) use a second engine on the replica through
+``get_read_db``/``read_session``; otherwise they use the primary.
+"""
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from src.config import settings
 
-# Create async engine
-_is_postgres = settings.database_url.startswith("postgresql")
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-    # Supabase transaction pooler (pgbouncer) requires prepared statements disabled
-    connect_args={"statement_cache_size": 0} if _is_postgres else {},
-)
+def _is_postgres(url: str) -> bool:
+    return url.startswith("postgresql")
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """create_async_engine arguments of the URL's backend"""
+    if _is_postgres(url):
+        return {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout_seconds,
+            "pool_recycle": settings.db_pool_recycle_seconds,
+            "pool_pre_ping": True,
+            # Supabase transaction pooler (pgbouncer) requires prepared statements disabled
+            "connect_args": {"statement_cache_size": 0},
+        }
+    return {}
+
+
+def _configure_sqlite(engine: AsyncEngine, url: str) -> None:
+    """Set the SQLite pragmas on every new connection"""
+    in_memory = ":memory:" in url or url.rstrip("/").endswith("sqlite+aiosqlite:")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if not in_memory:  # WAL needs a database file
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; safe with WAL
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_mb) * 1024 * 1024}")
+        finally:
+            cursor.close()
 
-# Create session factory
+
+def create_engine_for(url: str) -> AsyncEngine:
+    """Create an async engine with the profile of the URL's backend"""
+    engine = create_async_engine(url, echo=settings.debug, future=True, **_engine_options(url))
+    if _is_sqlite(url):
+        _configure_sqlite(engine, url)
+    return engine
+
+
+# Create async engines (the read engine is the primary unless a replica is configured)
+engine = create_engine_for(settings.database_url)
+read_engine = create_engine_for(settings.database_read_replica_url) if settings.database_read_replica_url else engine
+
+# Create session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -23,6 +80,14 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -45,6 +110,74 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_read_db() -> AsyncSession:
+    """
+    Dependency for read-only analytical sessions (read replica when configured).
+    
+    Replicas lag the primary slightly; use get_db() for reads that must see
+    a write made just before.
+    """
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
+
+
+def get_session_factory() -> Callable[[], AsyncSession]:
+    """
+    Dependency for work that may outlive the request (e.g. a shared cache computation).
+    
+    Sessions opened from the factory belong to the caller, which commits and closes them.
+    """
+    return AsyncSessionLocal
+
+
+@asynccontextmanager
+async def read_session(db: Optional[AsyncSession] = None) -> AsyncIterator[AsyncSession]:
+    """
+    Session for analytical reads outside request dependencies.
+    
+    Args:
+        db: Session of the caller, reused when no read replica is configured
+    """
+    if db is not None and read_engine is engine:
+        yield db
+        return
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+
+
+def _pool_stats(pool) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    for name in ("size", "checkedout", "checkedin", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    size = stats.get("size")
+    if size:
+        capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+        stats["utilization_percent"] = round(stats.get("checkedout", 0) / capacity * 100, 2)
+    return stats
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Get connection pool utilization of the database engines.
+    
+    Returns:
+        Pool statistics of the primary (and the read replica when configured)
+    """
+    stats = {"primary": _pool_stats(engine.pool)}
+    if read_engine is not engine:
+        stats["read_replica"] = _pool_stats(read_engine.pool)
+    return stats
+
+
 async def init_db() -> None:
     """Initialize database tables"""
     async with engine.begin() as conn:
@@ -64,9 +197,16 @@ from src.tenant_session import (
 
 __all__ = [
     "engine",
+    "read_engine",
+    "create_engine_for",
     "AsyncSessionLocal",
+    "AsyncReadSessionLocal",
     "Base",
     "get_db",
+    "get_read_db",
+    "get_session_factory",
+    "read_session",
+    "get_pool_stats",
     "init_db",
     "set_tenant_context",
     "get_tenant_context",
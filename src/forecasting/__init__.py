@@ -0,0 +1,66 @@
+"""Forecasting infrastructure: batch execution and supporting services"""
+from src.forecasting.batch_engine import (
+    AffinityProcessPool,
+    ForecastBatchEngine,
+    ForecastJob,
+    BatchForecastItem,
+    BatchProgress,
+    get_forecast_executor,
+    shutdown_forecast_executor
+)
+from src.forecasting.model_cache import (
+    FittedModelCache,
+    CachedModelState,
+    get_fitted_model_cache,
+    series_fingerprint
+)
+from src.forecasting.series import (
+    ForecastPoint,
+    ForecastSeries,
+    compact_forecast_dict,
+    expand_forecast_dict
+)
+from src.forecasting.vectorized import (
+    DemandMatrix,
+    BaselineSelection,
+    select_baselines
+)
+from src.forecasting.reconciliation import (
+    historical_shares,
+    mint_reconcile,
+    top_down
+)
+from src.forecasting.materialization import (
+    ForecastMaterializer,
+    MaterializationSummary,
+    materialize_all_tenants,
+    schedule_forecast_materialization
+)
+
+__all__ = [
+    "AffinityProcessPool",
+    "ForecastBatchEngine",
+    "ForecastJob",
+    "BatchForecastItem",
+    "BatchProgress",
+    "get_forecast_executor",
+    "shutdown_forecast_executor",
+    "FittedModelCache",
+    "CachedModelState",
+    "get_fitted_model_cache",
+    "series_fingerprint",
+    "ForecastPoint",
+    "ForecastSeries",
+    "compact_forecast_dict",
+    "expand_forecast_dict",
+    "DemandMatrix",
+    "BaselineSelection",
+    "select_baselines",
+    "historical_shares",
+    "mint_reconcile",
+    "top_down",
+    "ForecastMaterializer",
+    "MaterializationSummary",
+    "materialize_all_tenants",
+    "schedule_forecast_materialization"
+]
@@ -0,0 +1,594 @@
+"""
+Forecast Batch Engine - Parallel multi-product demand forecasting
+
+Loads all products and their daily sales series for a request with two
+set-based queries, then fans the per-SKU model fits out across a process
+pool so that CPU-bound statsmodels/Prophet work never runs on the event
+loop. Results are streamed back in completion order together with
+aggregate progress, which lets tenant-wide runs scale with the number of
+cores.
+
+Each product's fits always run on the same worker process, so the
+fitted-model cache of that worker is hit on repeat requests.
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.crud.sales_record import get_daily_sales_series
+from src.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+
+class AffinityProcessPool(Executor):
+    """
+    Process pool that runs all work for a key on the same worker process.
+
+    Fitted models are cached in the memory of the process that fitted them,
+    so with a shared queue a repeat request for a product would only reach
+    the worker holding its fits 1/N of the time. Each worker here is a
+    single-process executor; keyed work goes to the worker chosen from the
+    key, unkeyed work to the worker with the fewest queued tasks.
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Initialize pool.
+
+        Args:
+            max_workers: Number of worker processes
+        """
+        self._workers = [ProcessPoolExecutor(max_workers=1) for _ in range(max_workers)]
+        self._queued = [0] * max_workers
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return len(self._workers)
+
+    def worker_index(self, key: UUID) -> int:
+        """Worker that owns a key"""
+        return key.int % len(self._workers)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        """Run on the least busy worker"""
+        with self._lock:
+            index = min(range(len(self._workers)), key=self._queued.__getitem__)
+        return self._submit_to(index, fn, *args, **kwargs)
+
+    def submit_for(self, key: UUID, fn, /, *args, **kwargs) -> Future:
+        """Run on the worker that owns `key`"""
+        return self._submit_to(self.worker_index(key), fn, *args, **kwargs)
+
+    def broadcast(self, fn, /, *args, **kwargs) -> List[Future]:
+        """Run once on every worker (e.g. to collect per-process statistics)"""
+        return [self._submit_to(i, fn, *args, **kwargs) for i in range(len(self._workers))]
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        for worker in self._workers:
+            worker.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _submit_to(self, index: int, fn, *args, **kwargs) -> Future:
+        future = self._workers[index].submit(fn, *args, **kwargs)
+        with self._lock:
+            self._queued[index] += 1
+        future.add_done_callback(lambda _: self._task_done(index))
+        return future
+
+    def _task_done(self, index: int):
+        with self._lock:
+            self._queued[index] -= 1
+
+
+# Shared process pool (created lazily, one per worker process)
+_forecast_executor: Optional[AffinityProcessPool] = None
+
+
+def get_forecast_executor() -> AffinityProcessPool:
+    """Get or create the shared forecast process pool"""
+    global _forecast_executor
+    if _forecast_executor is None:
+        max_workers = settings.forecast_max_workers or os.cpu_count() or 1
+        _forecast_executor = AffinityProcessPool(max_workers=max_workers)
+        logger.info(f"Forecast process pool started with {max_workers} workers")
+    return _forecast_executor
+
+
+def shutdown_forecast_executor():
+    """Shut down the shared forecast process pool"""
+    global _forecast_executor
+    if _forecast_executor is not None:
+        _forecast_executor.shutdown(wait=False, cancel_futures=True)
+        _forecast_executor = None
+        logger.info("Forecast process pool stopped")
+
+
+def _fit_product_forecast(
+    tenant_id: UUID,
+    product_id: UUID,
+    product_name: str,
+    sales_history: List[Dict],
+    forecast_horizon_days: int,
+    current_inventory: Optional[int]
+) -> Dict:
+    """
+    Fit and serialize a single product forecast.
+
+    Module-level so it can be pickled into pool worker processes.
+    """
+    from src.agents.demand_forecast_agent import DemandForecastAgent
+
+    agent = DemandForecastAgent(tenant_id=tenant_id)
+    result = agent.forecast_demand(
+        product_id=product_id,
+        product_name=product_name,
+        sales_history=sales_history,
+        forecast_horizon_days=forecast_horizon_days,
+        current_inventory=current_inventory
+    )
+    return result.to_dict()
+
+
+def _model_cache_stats() -> Dict:
+    """Fitted-model cache statistics of the calling worker process"""
+    from src.forecasting.model_cache import get_fitted_model_cache
+
+    return get_fitted_model_cache().get_stats()
+
+
+def _fit_baseline_forecasts(
+    tenant_id: UUID,
+    products: List[Dict],
+    forecast_horizon_days: int
+) -> List[Dict]:
+    """
+    Forecast many products with the vectorized baseline models.
+
+    Module-level so it can be pickled into pool worker processes.
+    """
+    from src.agents.demand_forecast_agent import DemandForecastAgent
+
+    agent = DemandForecastAgent(tenant_id=tenant_id, use_model_cache=False)
+    results = agent.forecast_demand_baselines(products, forecast_horizon_days)
+    return [result.to_dict() for result in results]
+
+
+def _fit_hierarchical_forecasts(
+    tenant_id: UUID,
+    products: List[Dict],
+    forecast_horizon_days: int,
+    reconciliation: str = 'proportional'
+) -> List[Dict]:
+    """
+    Forecast many products through the category hierarchy.
+
+    Module-level so it can be pickled into pool worker processes.
+    """
+    from src.agents.demand_forecast_agent import DemandForecastAgent
+
+    agent = DemandForecastAgent(tenant_id=tenant_id, use_model_cache=False)
+    result = agent.forecast_demand_hierarchical(products, forecast_horizon_days, reconciliation)
+    return [forecast.to_dict() for forecast in result.sku_forecasts]
+
+
+@dataclass
+class ForecastJob:
+    """Everything needed to forecast one product, detached from the DB session"""
+    product_id: UUID
+    product_name: str
+    current_inventory: Optional[int]
+    sales_history: List[Dict]
+    category: Optional[str] = None
+
+    def recent_volume(self, days: int = 28) -> int:
+        """Units sold in the last `days` days of the history"""
+        if not self.sales_history:
+            return 0
+        cutoff = max(p['date'] for p in self.sales_history) - timedelta(days=days)
+        return sum(p['quantity'] for p in self.sales_history if p['date'] > cutoff)
+
+
+@dataclass
+class BatchForecastItem:
+    """Outcome of forecasting a single product within a batch"""
+    product_id: UUID
+    product_name: str
+    status: str  # 'completed', 'insufficient_data', 'failed'
+    forecast: Optional[Dict] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for API response"""
+        return {
+            "product_id": str(self.product_id),
+            "product_name": self.product_name,
+            "status": self.status,
+            "forecast": self.forecast,
+            "error": self.error
+        }
+
+
+@dataclass
+class BatchProgress:
+    """Aggregate progress of a batch forecast run"""
+    total: int
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    started_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def processed(self) -> int:
+        return self.completed + self.failed + self.skipped
+
+    @property
+    def percent_complete(self) -> float:
+        return round(self.processed / self.total * 100, 1) if self.total else 100.0
+
+    def record(self, item: BatchForecastItem):
+        """Account for a finished item"""
+        if item.status == 'completed':
+            self.completed += 1
+        elif item.status == 'insufficient_data':
+            self.skipped += 1
+        else:
+            self.failed += 1
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for API response"""
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "percent_complete": self.percent_complete,
+            "elapsed_seconds": round((datetime.utcnow() - self.started_at).total_seconds(), 2)
+        }
+
+
+class ForecastBatchEngine:
+    """
+    Batch demand forecasting across many products.
+
+    Usage is split in two phases so the fitting phase does not hold a
+    database session (e.g. while a streaming response is being sent):
+
+    1. ``prepare_jobs`` loads products and sales series (2 queries total)
+    2. ``stream_forecasts``/``run`` fit every job in the executor, or
+       ``run_tiered`` forecasts all jobs with vectorized baselines (or
+       through the category hierarchy) and reserves the full ensemble for
+       the top SKUs
+
+    TENANT ISOLATION:
+    All queries are filtered by the engine's tenant_id.
+    """
+
+    def __init__(self, tenant_id: UUID, executor: Optional[Executor] = None):
+        """
+        Initialize batch engine.
+
+        Args:
+            tenant_id: Tenant UUID for multi-tenancy isolation
+            executor: Executor for model fits (defaults to the shared process pool)
+        """
+        self.tenant_id = tenant_id
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        return self._executor or get_forecast_executor()
+
+    async def prepare_jobs(
+        self,
+        db: AsyncSession,
+        product_ids: Optional[Sequence[UUID]] = None
+    ) -> List[ForecastJob]:
+        """
+        Load products and their daily sales series.
+
+        Args:
+            db: Database session
+            product_ids: Products to forecast (None = every product of the tenant)
+
+        Returns:
+            Jobs in the order of product_ids (or product name for tenant-wide runs).
+            Unknown product IDs are dropped.
+        """
+        query = select(
+            Product.id, Product.name, Product.inventory_level, Product.category
+        ).where(Product.tenant_id == self.tenant_id)  # TENANT ISOLATION
+
+        if product_ids is not None:
+            if not product_ids:
+                return []
+            query = query.where(Product.id.in_(list(product_ids)))
+        else:
+            query = query.order_by(Product.name)
+
+        result = await db.execute(query)
+        products = result.all()
+
+        if product_ids is not None:
+            position = {pid: i for i, pid in enumerate(product_ids)}
+            products = sorted(products, key=lambda p: position.get(p.id, len(position)))
+
+        series = await get_daily_sales_series(db, self.tenant_id, [p.id for p in products])
+
+        return [
+            ForecastJob(
+                product_id=p.id,
+                product_name=p.name,
+                current_inventory=p.inventory_level,
+                sales_history=series.get(p.id, []),
+                category=p.category
+            )
+            for p in products
+        ]
+
+    async def _run_job(self, job: ForecastJob, horizon: int) -> BatchForecastItem:
+        """Fit one job in the executor and wrap the outcome"""
+        if not job.sales_history:
+            return BatchForecastItem(
+                product_id=job.product_id,
+                product_name=job.product_name,
+                status='insufficient_data',
+                error='No sales history'
+            )
+
+        try:
+            forecast = await self._run_for_product(
+                job.product_id,
+                _fit_product_forecast,
+                self.tenant_id,
+                job.product_id,
+                job.product_name,
+                job.sales_history,
+                horizon,
+                job.current_inventory
+            )
+            return BatchForecastItem(
+                product_id=job.product_id,
+                product_name=job.product_name,
+                status='completed',
+                forecast=forecast
+            )
+        except BrokenProcessPool as e:
+            # A crashed worker poisons the pool; drop it so the next batch gets a fresh one
+            if self._executor is None:
+                shutdown_forecast_executor()
+            logger.error(f"Forecast worker pool broke while forecasting {job.product_name}: {e}")
+            return BatchForecastItem(
+                product_id=job.product_id,
+                product_name=job.product_name,
+                status='failed',
+                error=f"Worker pool failure: {e}"
+            )
+        except Exception as e:
+            logger.error(f"Error forecasting for product {job.product_name}: {e}")
+            return BatchForecastItem(
+                product_id=job.product_id,
+                product_name=job.product_name,
+                status='failed',
+                error=str(e)
+            )
+
+    async def _run_for_product(self, product_id: UUID, fn: Callable, *args):
+        """Run fn in the executor, on the product's own worker if the pool has affinity"""
+        executor = self.executor
+        if isinstance(executor, AffinityProcessPool):
+            return await asyncio.wrap_future(executor.submit_for(product_id, fn, *args))
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def stream_forecasts(
+        self,
+        jobs: List[ForecastJob],
+        forecast_horizon_days: int = 30
+    ) -> AsyncIterator[Tuple[BatchForecastItem, BatchProgress]]:
+        """
+        Fit all jobs in parallel and yield results as they finish.
+
+        Args:
+            jobs: Jobs from prepare_jobs
+            forecast_horizon_days: Number of days to forecast
+
+        Yields:
+            (item, progress) tuples in completion order
+        """
+        progress = BatchProgress(total=len(jobs))
+        pending = [
+            asyncio.ensure_future(self._run_job(job, forecast_horizon_days))
+            for job in jobs
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(pending):
+                item = await next_done
+                progress.record(item)
+                yield item, progress
+        finally:
+            # Consumer went away (e.g. client disconnected) - stop queued fits
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+
+    async def run(
+        self,
+        jobs: List[ForecastJob],
+        forecast_horizon_days: int = 30,
+        on_progress: Optional[Callable[[BatchForecastItem, BatchProgress], None]] = None
+    ) -> List[BatchForecastItem]:
+        """
+        Fit all jobs in parallel and return results in job order.
+
+        Args:
+            jobs: Jobs from prepare_jobs
+            forecast_horizon_days: Number of days to forecast
+            on_progress: Optional callback invoked after each finished item
+
+        Returns:
+            List of BatchForecastItem, one per job
+        """
+        items: Dict[UUID, BatchForecastItem] = {}
+
+        async for item, progress in self.stream_forecasts(jobs, forecast_horizon_days):
+            items[item.product_id] = item
+            if on_progress:
+                on_progress(item, progress)
+
+        return [items[job.product_id] for job in jobs]
+
+    async def run_tiered(
+        self,
+        jobs: List[ForecastJob],
+        forecast_horizon_days: int = 30,
+        heavy_top_n: Optional[int] = None
+    ) -> List[BatchForecastItem]:
+        """
+        Forecast all jobs with vectorized baselines, and the top SKUs with the full ensemble.
+
+        The `heavy_top_n` jobs with the highest recent volume are fitted with
+        the per-product model ensemble; all other jobs are forecast in a
+        single vectorized task, with per-SKU baselines or through the
+        category hierarchy depending on ``forecast_long_tail_mode``. The
+        hierarchy fits the ensemble per category, so with `heavy_top_n`
+        of 0 (baselines only) the long tail always uses per-SKU baselines.
+
+        Args:
+            jobs: Jobs from prepare_jobs
+            forecast_horizon_days: Number of days to forecast
+            heavy_top_n: SKUs that get the full ensemble (defaults to settings)
+
+        Returns:
+            List of BatchForecastItem, one per job
+        """
+        if heavy_top_n is None:
+            heavy_top_n = settings.forecast_heavy_model_top_skus
+
+        with_sales = [job for job in jobs if job.sales_history]
+        ranked = sorted(with_sales, key=lambda job: job.recent_volume(), reverse=True)
+        heavy_jobs = ranked[:heavy_top_n]
+        heavy_ids = {job.product_id for job in heavy_jobs}
+        baseline_jobs = [job for job in with_sales if job.product_id not in heavy_ids]
+
+        items: Dict[UUID, BatchForecastItem] = {}
+
+        if baseline_jobs:
+            if heavy_top_n > 0 and settings.forecast_long_tail_mode == 'hierarchical':
+                tail_items = await self.run_hierarchical(baseline_jobs, forecast_horizon_days)
+            else:
+                tail_items = await self._run_vectorized(
+                    baseline_jobs, _fit_baseline_forecasts, forecast_horizon_days
+                )
+            items.update((item.product_id, item) for item in tail_items)
+
+        for item in await self.run(heavy_jobs, forecast_horizon_days):
+            items[item.product_id] = item
+
+        return [
+            items.get(job.product_id) or BatchForecastItem(
+                product_id=job.product_id,
+                product_name=job.product_name,
+                status='insufficient_data',
+                error='No sales history'
+            )
+            for job in jobs
+        ]
+
+    async def run_hierarchical(
+        self,
+        jobs: List[ForecastJob],
+        forecast_horizon_days: int = 30,
+        reconciliation: Optional[str] = None
+    ) -> List[BatchForecastItem]:
+        """
+        Forecast all jobs through the category hierarchy in a single executor task.
+
+        The model ensemble is fitted once per category (and on the tenant
+        total for MinT) and reconciled down to the SKUs, so the number of
+        ensemble fits is the number of categories rather than SKUs.
+
+        Args:
+            jobs: Jobs from prepare_jobs
+            forecast_horizon_days: Number of days to forecast
+            reconciliation: 'proportional' or 'mint' (defaults to settings)
+
+        Returns:
+            List of BatchForecastItem, one per job
+        """
+        return await self._run_vectorized(
+            jobs,
+            _fit_hierarchical_forecasts,
+            forecast_horizon_days,
+            reconciliation or settings.forecast_reconciliation_method
+        )
+
+    async def _run_vectorized(
+        self,
+        jobs: List[ForecastJob],
+        fit_function: Callable[..., List[Dict]],
+        forecast_horizon_days: int,
+        *args
+    ) -> List[BatchForecastItem]:
+        """Forecast all jobs with sales in one executor task and wrap the outcomes"""
+        with_sales = [job for job in jobs if job.sales_history]
+        items: Dict[UUID, BatchForecastItem] = {}
+
+        if with_sales:
+            loop = asyncio.get_running_loop()
+            products = [
+                {
+                    'product_id': job.product_id,
+                    'product_name': job.product_name,
+                    'sales_history': job.sales_history,
+                    'current_inventory': job.current_inventory,
+                    'category': job.category
+                }
+                for job in with_sales
+            ]
+            try:
+                forecasts = await loop.run_in_executor(
+                    self.executor,
+                    fit_function,
+                    self.tenant_id,
+                    products,
+                    forecast_horizon_days,
+                    *args
+                )
+                for job, forecast in zip(with_sales, forecasts):
+                    items[job.product_id] = BatchForecastItem(
+                        product_id=job.product_id,
+                        product_name=job.product_name,
+                        status='completed',
+                        forecast=forecast
+                    )
+            except Exception as e:
+                logger.error(f"Vectorized forecast failed for tenant {self.tenant_id}: {e}")
+                for job in with_sales:
+                    items[job.product_id] = BatchForecastItem(
+                        product_id=job.product_id,
+                        product_name=job.product_name,
+                        status='failed',
+                        error=str(e)
+                    )
+
+        return [
+            items.get(job.product_id) or BatchForecastItem(
+                product_id=job.product_id,
+                product_name=job.product_name,
+                status='insufficient_data',
+                error='No sales history'
+            )
+            for job in jobs
+        ]
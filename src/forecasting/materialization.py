@@ -0,0 +1,321 @@
+"""
+Forecast Materialization - Precomputed demand forecasts in forecast_results
+
+Forecasts for every SKU with sales history are computed in bulk by the batch
+engine's tiered run (nightly, and again for the affected products after sales ingestion)
+and written to the ``forecast_results`` table, tagged with the selected model
+and the data watermark (last sales date they were fitted on). Readers serve
+these rows and only fall back to live computation for SKUs whose row is
+missing or stale:
+
+- the product has sales newer than the watermark
+- the row is older than ``forecast_materialization_max_age_hours``
+- the product's inventory level changed (alerts depend on it)
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Set
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.forecasting.series import compact_forecast_dict, expand_forecast_dict
+from src.config import settings
+from src.crud.sales_record import get_latest_sales_dates
+from src.forecasting.batch_engine import ForecastBatchEngine
+from src.models.forecast_result import ForecastResult
+from src.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+MATERIALIZATION_MODEL_VERSION = "demand_forecast_agent/materialized-v1"
+
+
+@dataclass
+class MaterializationSummary:
+    """Outcome of a materialization run for one tenant"""
+    tenant_id: UUID
+    forecast_horizon_days: int
+    total: int = 0
+    written: int = 0
+    skipped: int = 0
+    failed: int = 0
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for API response / logging"""
+        return {
+            "tenant_id": str(self.tenant_id),
+            "forecast_horizon_days": self.forecast_horizon_days,
+            "total": self.total,
+            "written": self.written,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+def data_watermark(sales_history: List[Dict]) -> Optional[date]:
+    """Last sales date of a daily series"""
+    if not sales_history:
+        return None
+    latest = max(point['date'] for point in sales_history)
+    return latest.date() if isinstance(latest, datetime) else latest
+
+
+class ForecastMaterializer:
+    """
+    Writes and reads precomputed forecasts.
+
+    TENANT ISOLATION:
+    All queries are filtered by the materializer's tenant_id.
+    """
+
+    def __init__(self, tenant_id: UUID, engine: Optional[ForecastBatchEngine] = None):
+        """
+        Initialize materializer.
+
+        Args:
+            tenant_id: Tenant UUID for multi-tenancy isolation
+            engine: Batch engine used for fitting (defaults to one on the shared pool)
+        """
+        self.tenant_id = tenant_id
+        self.engine = engine or ForecastBatchEngine(tenant_id=tenant_id)
+
+    async def materialize(
+        self,
+        db: AsyncSession,
+        product_ids: Optional[Sequence[UUID]] = None,
+        forecast_horizon_days: Optional[int] = None
+    ) -> MaterializationSummary:
+        """
+        Compute forecasts in bulk and store them (the caller commits).
+
+        Args:
+            db: Database session
+            product_ids: Products to refresh (None = every product of the tenant)
+            forecast_horizon_days: Horizon to materialize (defaults to settings)
+
+        Returns:
+            MaterializationSummary with per-status counts
+        """
+        horizon = forecast_horizon_days or settings.forecast_materialization_horizon_days
+        summary = MaterializationSummary(tenant_id=self.tenant_id, forecast_horizon_days=horizon)
+
+        jobs = await self.engine.prepare_jobs(db, product_ids)
+        # Only SKUs with sales history are worth forecasting
+        jobs = [job for job in jobs if job.sales_history]
+        summary.total = len(jobs)
+
+        # Vectorized baselines for the long tail, full ensemble for the top SKUs
+        items = await self.engine.run_tiered(jobs, horizon)
+        summary.written = await self.save(
+            db,
+            {item.product_id: item.forecast for item in items if item.status == 'completed'},
+            {job.product_id: data_watermark(job.sales_history) for job in jobs},
+            horizon
+        )
+        summary.skipped = sum(1 for item in items if item.status == 'insufficient_data')
+        summary.failed = sum(1 for item in items if item.status == 'failed')
+        summary.finished_at = datetime.utcnow()
+
+        logger.info(
+            f"Materialized {summary.written}/{summary.total} forecasts "
+            f"for tenant {self.tenant_id} (horizon {horizon}d)"
+        )
+        return summary
+
+    async def save(
+        self,
+        db: AsyncSession,
+        forecasts: Dict[UUID, Dict],
+        data_watermarks: Dict[UUID, Optional[date]],
+        forecast_horizon_days: int
+    ) -> int:
+        """
+        Replace the stored forecasts of the given products (the caller commits).
+
+        Args:
+            db: Database session
+            forecasts: Mapping of product_id to serialized forecast (DemandForecastResult.to_dict)
+            data_watermarks: Mapping of product_id to the last sales date the forecast used
+            forecast_horizon_days: Horizon the forecasts were computed for
+
+        Returns:
+            Number of rows written
+        """
+        now = datetime.utcnow()
+
+        rows = []
+        for product_id, forecast in forecasts.items():
+            points = forecast['forecast_points']
+            rows.append({
+                'tenant_id': self.tenant_id,
+                'product_id': product_id,
+                'forecast_horizon_days': forecast_horizon_days,
+                'model_version': MATERIALIZATION_MODEL_VERSION,
+                'best_model': forecast['best_model'],
+                'data_watermark': data_watermarks.get(product_id),
+                'predicted_demand': [p['predicted_quantity'] for p in points],
+                'confidence_intervals': [[p['lower_bound'], p['upper_bound']] for p in points],
+                'confidence_score': forecast['final_confidence'],
+                'seasonality_detected': any(s['detected'] for s in forecast['seasonality'].values()),
+                'seasonality_pattern': forecast['seasonality'],
+                'inventory_alerts': forecast['alerts'],
+                'forecast_metadata': {'forecast': compact_forecast_dict(forecast)},
+                'created_at': now,
+                'forecast_date': now
+            })
+
+        if not rows:
+            return 0
+
+        # One row per product and horizon - replace previous materializations
+        await db.execute(
+            delete(ForecastResult).where(
+                ForecastResult.tenant_id == self.tenant_id,  # TENANT ISOLATION
+                ForecastResult.product_id.in_([row['product_id'] for row in rows]),
+                ForecastResult.forecast_horizon_days == forecast_horizon_days
+            )
+        )
+        await db.execute(insert(ForecastResult), rows)
+        await db.flush()
+        return len(rows)
+
+    async def get_fresh_forecasts(
+        self,
+        db: AsyncSession,
+        product_ids: Sequence[UUID],
+        forecast_horizon_days: int,
+        max_age_hours: Optional[int] = None
+    ) -> Dict[UUID, Dict]:
+        """
+        Load materialized forecasts that are still valid.
+
+        Args:
+            db: Database session
+            product_ids: Products to look up
+            forecast_horizon_days: Requested horizon (must match exactly)
+            max_age_hours: Maximum row age (defaults to settings)
+
+        Returns:
+            Mapping of product_id to serialized forecast for fresh rows only;
+            missing or stale products are absent.
+        """
+        if not product_ids:
+            return {}
+
+        max_age = max_age_hours or settings.forecast_materialization_max_age_hours
+        cutoff = datetime.utcnow() - timedelta(hours=max_age)
+
+        result = await db.execute(
+            select(ForecastResult, Product.inventory_level)
+            .join(Product, Product.id == ForecastResult.product_id)
+            .where(
+                ForecastResult.tenant_id == self.tenant_id,  # TENANT ISOLATION
+                ForecastResult.product_id.in_(list(product_ids)),
+                ForecastResult.forecast_horizon_days == forecast_horizon_days,
+                ForecastResult.forecast_date >= cutoff
+            )
+            .order_by(ForecastResult.forecast_date.desc())
+        )
+        rows = result.all()
+        if not rows:
+            return {}
+
+        latest_sales = await get_latest_sales_dates(db, self.tenant_id, product_ids)
+
+        fresh: Dict[UUID, Dict] = {}
+        for row, inventory_level in rows:
+            if row.product_id in fresh:
+                continue  # Older duplicate
+            forecast = (row.forecast_metadata or {}).get('forecast')
+            if not forecast or row.data_watermark is None:
+                continue
+            latest = latest_sales.get(row.product_id)
+            if latest is None or latest > row.data_watermark:
+                continue  # New sales since the forecast was computed
+            if forecast.get('current_inventory') != inventory_level:
+                continue  # Inventory alerts are out of date
+            fresh[row.product_id] = expand_forecast_dict(forecast)
+
+        return fresh
+
+
+async def materialize_all_tenants(
+    forecast_horizon_days: Optional[int] = None
+) -> List[MaterializationSummary]:
+    """
+    Materialize forecasts for every active tenant (nightly job).
+
+    Each tenant runs in its own session and transaction so one failing tenant
+    does not discard the others.
+    """
+    from src.database import AsyncSessionLocal
+    from src.models.tenant import Tenant
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Tenant.id).where(Tenant.is_active.is_(True)))
+        tenant_ids = [row.id for row in result.all()]
+
+    summaries = []
+    for tenant_id in tenant_ids:
+        async with AsyncSessionLocal() as db:
+            try:
+                summary = await ForecastMaterializer(tenant_id).materialize(
+                    db, forecast_horizon_days=forecast_horizon_days
+                )
+                await db.commit()
+                summaries.append(summary)
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Forecast materialization failed for tenant {tenant_id}: {e}")
+
+    return summaries
+
+
+async def _materialize_products(tenant_id: UUID, product_ids: List[UUID]):
+    """Background refresh of specific products in a fresh session"""
+    from src.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        try:
+            await ForecastMaterializer(tenant_id).materialize(db, product_ids)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Post-ingestion forecast materialization failed for tenant {tenant_id}: {e}")
+
+
+# Keep references so background tasks are not garbage collected mid-run
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def schedule_forecast_materialization(
+    tenant_id: UUID,
+    product_ids: Sequence[UUID]
+) -> Optional[asyncio.Task]:
+    """
+    Refresh materialized forecasts after ingestion without blocking the caller.
+
+    Args:
+        tenant_id: Tenant UUID
+        product_ids: Products that received new sales
+
+    Returns:
+        The background task, or None if disabled / nothing to do
+    """
+    if not settings.forecast_materialize_on_ingest or not product_ids:
+        return None
+
+    task = asyncio.get_running_loop().create_task(
+        _materialize_products(tenant_id, list(dict.fromkeys(product_ids)))
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
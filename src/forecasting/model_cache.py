@@ -0,0 +1,172 @@
+"""
+Fitted Model Cache - Reuse of demand forecast model fits across requests
+
+Holds the fitted candidate models (full-series and validation fits) and the
+validation scores per product, keyed on tenant and product and tagged with a
+fingerprint of the daily sales series they were fitted on. When a request
+arrives with the same series the fits are reused as-is; when only a few new
+days were appended the agent updates the fits incrementally instead of
+refitting from scratch.
+
+Entries live in process memory (one cache per worker process) and are
+bounded by an LRU policy. The batch engine runs each product's fits on a
+fixed worker (``AffinityProcessPool``), so its entry is found again.
+"""
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def series_fingerprint(start_date: date, quantities) -> str:
+    """
+    Hash a daily sales series.
+
+    Args:
+        start_date: Date of the first observation
+        quantities: Daily quantities (any array-like)
+
+    Returns:
+        Hex digest identifying the series
+    """
+    digest = hashlib.sha1(start_date.isoformat().encode())
+    digest.update(np.ascontiguousarray(quantities, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedModelState:
+    """Fitted models and validation scores for one product's sales series"""
+    fingerprint: str
+    start_date: date
+    n_obs: int
+    full_fits: Dict[str, Any]  # model_name -> fitted results fitted on the full series
+    validation_fits: Dict[str, Any]  # model_name -> fitted results fitted on the training split
+    performances: List[Any]  # List[ModelPerformance]
+    best_model: str
+    appended_days: int = 0  # Days added incrementally since the last full refit
+    fitted_at: datetime = field(default_factory=datetime.utcnow)
+
+    def matches(self, start_date: date, quantities) -> bool:
+        """Whether the entry was fitted on exactly this series"""
+        return (
+            self.start_date == start_date
+            and len(quantities) == self.n_obs
+            and series_fingerprint(start_date, quantities) == self.fingerprint
+        )
+
+    def extension_days(self, start_date: date, quantities) -> Optional[int]:
+        """
+        Number of days the series extends the cached one, if it is a pure append.
+
+        Returns None if the cached history was modified or the series is shorter.
+        """
+        if self.start_date != start_date or len(quantities) <= self.n_obs:
+            return None
+        if series_fingerprint(start_date, quantities[:self.n_obs]) != self.fingerprint:
+            return None
+        return len(quantities) - self.n_obs
+
+
+class FittedModelCache:
+    """
+    Bounded LRU cache of fitted forecast models.
+
+    Thread-safe so it can be shared by thread-pool forecast workers.
+    """
+
+    DEFAULT_MAX_ENTRIES = 512
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize model cache.
+
+        Args:
+            max_entries: Maximum number of products kept before LRU eviction
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[UUID, UUID], CachedModelState]" = OrderedDict()
+        self._lock = Lock()
+        self._metrics = {
+            'hits': 0,
+            'incremental_updates': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    def get(self, tenant_id: UUID, product_id: UUID) -> Optional[CachedModelState]:
+        """Get cached state for a product (marks it most recently used)"""
+        key = (tenant_id, product_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, tenant_id: UUID, product_id: UUID, state: CachedModelState):
+        """Store state for a product, evicting least recently used entries"""
+        key = (tenant_id, product_id)
+        with self._lock:
+            self._entries[key] = state
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics['evictions'] += 1
+
+    def invalidate(self, tenant_id: UUID, product_id: Optional[UUID] = None) -> int:
+        """
+        Drop cached fits for a product, or for a whole tenant.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if product_id is not None:
+                return 1 if self._entries.pop((tenant_id, product_id), None) else 0
+            keys = [k for k in self._entries if k[0] == tenant_id]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+    def record(self, outcome: str):
+        """Record a lookup outcome ('hits', 'incremental_updates' or 'misses')"""
+        with self._lock:
+            self._metrics[outcome] += 1
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self._metrics['hits'] + self._metrics['incremental_updates'] + self._metrics['misses']
+            reused = self._metrics['hits'] + self._metrics['incremental_updates']
+            return {
+                **self._metrics,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'reuse_rate_percent': round(reused / lookups * 100, 2) if lookups else 0.0
+            }
+
+
+# Global instance (one per process)
+_model_cache: Optional[FittedModelCache] = None
+
+
+def get_fitted_model_cache() -> FittedModelCache:
+    """Get or create the process-wide fitted model cache"""
+    global _model_cache
+    if _model_cache is None:
+        from src.config import settings
+        _model_cache = FittedModelCache(max_entries=settings.forecast_model_cache_size)
+    return _model_cache
@@ -0,0 +1,142 @@
+"""
+Forecast Series - Columnar representation of daily demand forecasts
+
+Forecast models produce whole arrays of predictions, so forecasts are kept
+as NumPy columns (predicted quantity, bounds, confidence over consecutive
+days) instead of one object per day. Per-day ForecastPoint objects and API
+records are only built when a caller asks for them, and a compact column
+encoding is used for caches and stored forecasts.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List
+
+import numpy as np
+
+
+@dataclass
+class ForecastPoint:
+    """Single forecast data point"""
+    date: date
+    predicted_quantity: float
+    lower_bound: float
+    upper_bound: float
+    confidence: float
+
+
+@dataclass
+class ForecastSeries:
+    """
+    Forecast over consecutive days stored as columns (NumPy arrays).
+    
+    Replaces lists of ForecastPoint objects internally; iterating or
+    indexing still yields ForecastPoint views, built only on access.
+    """
+    start_date: date
+    predicted_quantity: np.ndarray
+    lower_bound: np.ndarray
+    upper_bound: np.ndarray
+    confidence: np.ndarray
+    
+    @property
+    def dates(self) -> np.ndarray:
+        """Forecast dates as datetime64[D]"""
+        return np.datetime64(self.start_date, 'D') + np.arange(len(self))
+    
+    def __len__(self) -> int:
+        return len(self.predicted_quantity)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, _, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("ForecastSeries only supports contiguous slices")
+            return ForecastSeries(
+                start_date=self.start_date + timedelta(days=start),
+                predicted_quantity=self.predicted_quantity[index],
+                lower_bound=self.lower_bound[index],
+                upper_bound=self.upper_bound[index],
+                confidence=self.confidence[index]
+            )
+        i = range(len(self))[index]
+        return ForecastPoint(
+            date=self.start_date + timedelta(days=i),
+            predicted_quantity=float(self.predicted_quantity[i]),
+            lower_bound=float(self.lower_bound[i]),
+            upper_bound=float(self.upper_bound[i]),
+            confidence=float(self.confidence[i])
+        )
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def to_records(self) -> List[Dict]:
+        """Convert to the API schema (one dict per day)"""
+        columns = zip(
+            np.datetime_as_string(self.dates).tolist(),
+            np.round(self.predicted_quantity, 2).tolist(),
+            np.round(self.lower_bound, 2).tolist(),
+            np.round(self.upper_bound, 2).tolist(),
+            np.round(self.confidence, 3).tolist()
+        )
+        return [
+            {
+                "date": day,
+                "predicted_quantity": predicted,
+                "lower_bound": lower,
+                "upper_bound": upper,
+                "confidence": confidence
+            }
+            for day, predicted, lower, upper, confidence in columns
+        ]
+    
+    def encode(self) -> Dict:
+        """Compact column encoding for caches and storage"""
+        return {
+            "start_date": self.start_date.isoformat(),
+            "predicted_quantity": np.round(self.predicted_quantity, 2).tolist(),
+            "lower_bound": np.round(self.lower_bound, 2).tolist(),
+            "upper_bound": np.round(self.upper_bound, 2).tolist(),
+            "confidence": np.round(self.confidence, 3).tolist()
+        }
+    
+    @classmethod
+    def decode(cls, data: Dict) -> "ForecastSeries":
+        """Inverse of encode"""
+        return cls(
+            start_date=date.fromisoformat(data["start_date"]),
+            predicted_quantity=np.asarray(data["predicted_quantity"], dtype=float),
+            lower_bound=np.asarray(data["lower_bound"], dtype=float),
+            upper_bound=np.asarray(data["upper_bound"], dtype=float),
+            confidence=np.asarray(data["confidence"], dtype=float)
+        )
+    
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "ForecastSeries":
+        """Build from the API schema (consecutive daily records)"""
+        if not records:
+            return cls(date.today(), *(np.empty(0) for _ in range(4)))
+        return cls(
+            start_date=date.fromisoformat(records[0]["date"]),
+            predicted_quantity=np.array([r["predicted_quantity"] for r in records], dtype=float),
+            lower_bound=np.array([r["lower_bound"] for r in records], dtype=float),
+            upper_bound=np.array([r["upper_bound"] for r in records], dtype=float),
+            confidence=np.array([r["confidence"] for r in records], dtype=float)
+        )
+
+
+def compact_forecast_dict(forecast: Dict) -> Dict:
+    """Replace the per-day forecast_points records of a forecast dict with column encoding"""
+    points = forecast.get("forecast_points")
+    if not isinstance(points, list):
+        return forecast
+    return {**forecast, "forecast_points": ForecastSeries.from_records(points).encode()}
+
+
+def expand_forecast_dict(forecast: Dict) -> Dict:
+    """Inverse of compact_forecast_dict"""
+    points = forecast.get("forecast_points")
+    if not isinstance(points, dict):
+        return forecast
+    return {**forecast, "forecast_points": ForecastSeries.decode(points).to_records()}
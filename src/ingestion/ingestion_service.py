@@ -4,7 +4,7 @@ import asyncio
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from uuid import UUID, uuid4
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.ingestion.base import BaseConnector, RawRecord
@@ -24,8 +24,16 @@ class IngestionService:
     - Handle duplicates (idempotency)
     - Track ingestion statistics
     - Structured logging
+    
+    Records are written in batches with one multi-row
+    ``INSERT ... ON CONFLICT (tenant_id, source, source_id) DO NOTHING
+    RETURNING source_id`` statement and one commit per batch (SQLite and
+    PostgreSQL). The RETURNING set tells inserted records from duplicates.
     """
     
+    DEFAULT_BATCH_SIZE = 2000
+    CONFLICT_COLUMNS = ['tenant_id', 'source', 'source_id']
+    
     def __init__(self, tenant_id: UUID):
         """
         Initialize ingestion service.
@@ -45,7 +53,7 @@ class IngestionService:
         self,
         connector: BaseConnector,
         since: Optional[datetime] = None,
-        batch_size: int = 100
+        batch_size: int = DEFAULT_BATCH_SIZE
     ) -> Dict[str, Any]:
         """
         Ingest data from a connector and save to database.
@@ -53,7 +61,7 @@ class IngestionService:
         Args:
             connector: Connector instance to fetch from
             since: Only fetch records after this timestamp
-            batch_size: Number of records to commit at once
+            batch_size: Number of records inserted and committed at once
             
         Returns:
             Dictionary with ingestion statistics
@@ -95,13 +103,11 @@ class IngestionService:
                 for raw_record in connector.fetch(since=since):
                     self.stats['records_fetched'] += 1
                     
-                    # Convert to database model
-                    db_record = self._create_db_record(
+                    # Convert to a raw_ingestion_records row
+                    batch.append(self._create_row(
                         raw_record=raw_record,
                         source_name=connector.source_name
-                    )
-                    
-                    batch.append(db_record)
+                    ))
                     
                     # Commit batch
                     if len(batch) >= batch_size:
@@ -146,91 +152,118 @@ class IngestionService:
                 await db.rollback()
                 raise
     
-    def _create_db_record(
+    def _create_row(
         self,
         raw_record: RawRecord,
         source_name: str
-    ) -> RawIngestionRecord:
+    ) -> Dict[str, Any]:
         """
-        Convert RawRecord to database model.
+        Convert RawRecord to a raw_ingestion_records row.
         
         Args:
             raw_record: Raw record from connector
             source_name: Name of the source
             
         Returns:
-            RawIngestionRecord instance
+            Column values of the row
         """
-        return RawIngestionRecord(
-            id=uuid4(),
-            tenant_id=self.tenant_id,
-            source=source_name,
-            source_id=raw_record.source_id,
-            payload=raw_record.payload,
-            status='raw',
-            ingestion_metadata=raw_record.metadata,
-            retrieved_at=raw_record.retrieved_at,
-            created_at=datetime.utcnow(),
-            retry_count='0'
+        return {
+            'id': uuid4(),
+            'tenant_id': self.tenant_id,
+            'source': source_name,
+            'source_id': raw_record.source_id,
+            'payload': raw_record.payload,
+            'status': 'raw',
+            'ingestion_metadata': raw_record.metadata,
+            'retrieved_at': raw_record.retrieved_at,
+            'created_at': datetime.utcnow(),
+            'retry_count': '0'
+        }
+    
+    def _insert_statement(self, dialect_name: str):
+        """
+        Multi-row insert skipping rows that already exist.
+        
+        Args:
+            dialect_name: Name of the session's database dialect
+            
+        Returns:
+            INSERT ... ON CONFLICT DO NOTHING RETURNING source_id statement
+            
+        Raises:
+            ValueError: If the dialect has no ON CONFLICT support here
+        """
+        if dialect_name == 'postgresql':
+            insert = postgresql.insert
+        elif dialect_name == 'sqlite':
+            insert = sqlite.insert
+        else:
+            raise ValueError(f"Bulk ingestion is not supported on {dialect_name}")
+        
+        return (
+            insert(RawIngestionRecord.__table__)
+            .on_conflict_do_nothing(index_elements=self.CONFLICT_COLUMNS)
+            .returning(RawIngestionRecord.__table__.c.source_id)
         )
     
-    async def _save_batch(self, db: AsyncSession, batch: List[RawIngestionRecord]) -> None:
+    async def _save_batch(self, db: AsyncSession, batch: List[Dict[str, Any]]) -> None:
         """
-        Save a batch of records to database.
+        Save a batch of rows to database in one transaction.
         
-        Handles duplicate key errors (idempotency).
+        Rows already stored (same tenant, source and source_id) are skipped
+        (idempotency). If the batch fails for another reason, its rows are
+        retried one at a time so a bad row does not fail the whole batch.
         
         Args:
             db: Database session
-            batch: List of records to save
+            batch: Rows to save (see _create_row)
         """
-        for record in batch:
+        statement = self._insert_statement(db.get_bind().dialect.name)
+        
+        try:
+            result = await db.execute(statement, batch)
+            inserted = len(result.scalars().all())
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.warning(
+                f"Batch insert of {len(batch)} records failed, retrying one at a time",
+                extra={'tenant_id': str(self.tenant_id), 'error': str(e)}
+            )
+            await self._save_rows_individually(db, statement, batch)
+            return
+        
+        self.stats['records_saved'] += inserted
+        self.stats['records_skipped_duplicate'] += len(batch) - inserted
+        
+        logger.debug(
+            f"Saved batch: {inserted} inserted, {len(batch) - inserted} duplicates",
+            extra={'tenant_id': str(self.tenant_id), 'batch_size': len(batch)}
+        )
+    
+    async def _save_rows_individually(self, db: AsyncSession, statement, rows: List[Dict[str, Any]]) -> None:
+        """Save rows one per transaction, counting the rows that fail"""
+        for row in rows:
             try:
-                db.add(record)
+                result = await db.execute(statement, [row])
+                inserted = len(result.scalars().all())
                 await db.commit()
-                self.stats['records_saved'] += 1
-                
-                logger.debug(
-                    f"Saved record: {record.source_id}",
-                    extra={
-                        'source_id': record.source_id,
-                        'source': record.source
-                    }
-                )
-                
-            except IntegrityError as e:
-                await db.rollback()
-                
-                # Check if it's a duplicate key error
-                if 'UNIQUE constraint failed' in str(e) or 'uq_raw_ingestion_tenant_source_id' in str(e):
-                    self.stats['records_skipped_duplicate'] += 1
-                    logger.debug(
-                        f"Skipped duplicate record: {record.source_id}",
-                        extra={
-                            'source_id': record.source_id,
-                            'source': record.source
-                        }
-                    )
-                else:
-                    self.stats['records_failed'] += 1
-                    logger.error(
-                        f"Failed to save record: {record.source_id}",
-                        extra={
-                            'source_id': record.source_id,
-                            'error': str(e)
-                        }
-                    )
-            
             except Exception as e:
                 await db.rollback()
                 self.stats['records_failed'] += 1
                 logger.error(
-                    f"Failed to save record: {record.source_id}",
+                    f"Failed to save record: {row['source_id']}",
                     extra={
-                        'source_id': record.source_id,
+                        'source_id': row['source_id'],
                         'error': str(e)
                     }
                 )
+                continue
+            
+            if inserted:
+                self.stats['records_saved'] += 1
+            else:
+                self.stats['records_skipped_duplicate'] += 1
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get ingestion statistics"""
@@ -1,5 +1,5 @@
 """Data ingestion pipeline integrating all components"""
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from uuid import UUID
 import logging
@@ -456,6 +456,7 @@ class IngestionPipeline:
             product_count = len(products)
             
             # Save products
+            saved_products = []
             for i, product_data in enumerate(processed_data[:product_count]):
                 product = Product(
                     tenant_id=self.tenant_id,
@@ -470,8 +471,10 @@ class IngestionPipeline:
                     extra_metadata=product_data.get('metadata', {})
                 )
                 self.db.add(product)
+                saved_products.append(product)
             
             # Save reviews
+            saved_reviews = []
             for review_data in processed_data[product_count:]:
                 review = Review(
                     tenant_id=self.tenant_id,
@@ -484,6 +487,12 @@ class IngestionPipeline:
                     is_spam=review_data.get('is_spam', False)
                 )
                 self.db.add(review)
+                saved_reviews.append(review)
+            
+            # Assign ids before committing - expired attributes cannot be read lazily afterwards
+            await self.db.flush()
+            product_ids = [product.id for product in saved_products]
+            review_ids = [(review.id, review.product_id) for review in saved_reviews]
             
             # Commit all changes
             await self.db.commit()
@@ -493,6 +502,73 @@ class IngestionPipeline:
             logger.error(f"Failed to persist data to database: {e}")
             await self.db.rollback()
             raise
+        
+        # Publish events (competitor matching, snapshots, cache invalidation) once committed
+        for publish in (
+            self._publish_product_events(product_ids),
+            self._publish_review_events(review_ids),
+            self._publish_ingestion_completed(len(processed_data))
+        ):
+            try:
+                await publish
+            except Exception as e:
+                # Log but don't fail the ingestion - the data is already committed
+                logger.warning(f"Failed to publish ingestion events: {e}")
+    
+    async def _publish_product_events(self, product_ids: List[UUID]) -> None:
+        """
+        Queue a coalesced PRODUCT_CREATED event for persisted products.
+        
+        Args:
+            product_ids: Ids of the committed products
+        """
+        from src.cache.event_bus import get_event_coalescer, EventType, DataEvent
+        
+        if product_ids:
+            get_event_coalescer().add(DataEvent.batch(
+                event_type=EventType.PRODUCT_CREATED,
+                tenant_id=self.tenant_id,
+                entity_type='product',
+                entity_ids=[str(product_id) for product_id in product_ids],
+                metadata={'source': 'ingestion_pipeline'}
+            ))
+    
+    async def _publish_review_events(self, review_ids: List[Tuple[UUID, UUID]]) -> None:
+        """
+        Queue a coalesced REVIEW_CREATED event for persisted reviews.
+        
+        Args:
+            review_ids: (review id, product id) of the committed reviews
+        """
+        from src.cache.event_bus import get_event_coalescer, EventType, DataEvent
+        
+        if review_ids:
+            get_event_coalescer().add(DataEvent.batch(
+                event_type=EventType.REVIEW_CREATED,
+                tenant_id=self.tenant_id,
+                entity_type='review',
+                entity_ids=[str(review_id) for review_id, _ in review_ids],
+                product_ids=list(dict.fromkeys(str(product_id) for _, product_id in review_ids)),
+                metadata={'source': 'ingestion_pipeline'}
+            ))
+    
+    async def _publish_ingestion_completed(self, records_saved: int) -> None:
+        """
+        Publish INGESTION_COMPLETED (the cache warmer recomputes hot entries).
+        
+        Args:
+            records_saved: Number of persisted records
+        """
+        from src.cache.event_bus import get_event_publisher, EventType, DataEvent
+        
+        if records_saved:
+            await get_event_publisher().publish(DataEvent(
+                event_type=EventType.INGESTION_COMPLETED,
+                tenant_id=self.tenant_id,
+                entity_type='ingestion',
+                entity_id='ingestion_pipeline',
+                metadata={'records_saved': records_saved}
+            ))
     
     def get_statistics(self) -> Dict[str, Any]:
         """
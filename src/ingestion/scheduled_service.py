@@ -7,6 +7,7 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from uuid import uuid4
 
+from src.config import settings
 from src.ingestion.scheduler import IngestionScheduler
 from src.ingestion.marketplace_connector import MarketplaceConnector
 from src.ingestion.competitor_scraper import CompetitorScraper
@@ -90,6 +91,30 @@ class ScheduledIngestionService:
             replace_existing=True
         )
         logger.info("Scheduled health check (every hour)")
+        
+        # Task 4: Materialize demand forecasts nightly
+        self.scheduler.add_job(
+            self._materialize_forecasts,
+            trigger=CronTrigger(hour=settings.forecast_materialization_hour, minute=0),
+            id='forecast_materialization',
+            name='Materialize Demand Forecasts',
+            replace_existing=True
+        )
+        logger.info(
+            f"Scheduled forecast materialization (daily at {settings.forecast_materialization_hour}:00)"
+        )
+        
+        # Task 5: Compact cache invalidation tag sets
+        self.scheduler.add_job(
+            self._compact_cache_tags,
+            trigger=IntervalTrigger(minutes=settings.cache_tag_compaction_minutes),
+            id='cache_tag_compaction',
+            name='Compact Cache Tag Sets',
+            replace_existing=True
+        )
+        logger.info(
+            f"Scheduled cache tag compaction (every {settings.cache_tag_compaction_minutes} minutes)"
+        )
     
     async def _fetch_marketplace_data(self):
         """Fetch data from marketplace APIs"""
@@ -153,6 +178,34 @@ class ScheduledIngestionService:
         except Exception as e:
             logger.error(f"Competitor price scraping failed: {str(e)}")
     
+    async def _materialize_forecasts(self):
+        """Precompute demand forecasts for all active tenants"""
+        try:
+            logger.info("Starting forecast materialization")
+            
+            from src.forecasting.materialization import materialize_all_tenants
+            summaries = await materialize_all_tenants()
+            
+            written = sum(s.written for s in summaries)
+            failed = sum(s.failed for s in summaries)
+            logger.info(
+                f"Materialized {written} forecasts for {len(summaries)} tenants ({failed} failed)"
+            )
+            
+        except Exception as e:
+            logger.error(f"Forecast materialization failed: {str(e)}")
+    
+    async def _compact_cache_tags(self):
+        """Drop expired entries from the cache invalidation tag sets"""
+        try:
+            from src.cache.instance import get_cache_manager
+            cache_manager = get_cache_manager()
+            if cache_manager:
+                await cache_manager.compact_tags()
+            
+        except Exception as e:
+            logger.error(f"Cache tag compaction failed: {str(e)}")
+    
     async def _health_check(self):
         """Perform health check on ingestion system"""
         try:
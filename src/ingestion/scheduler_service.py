@@ -408,8 +408,17 @@ class IngestionSchedulerService:
             extra=event
         )
         
-        # TODO: Publish to event bus/queue
-        # For now, just log
+        # Completed runs let the cache warmer recompute the tenant's hot entries
+        if event_type.endswith('_completed'):
+            from src.cache.event_bus import get_event_publisher, EventType, DataEvent
+            records_saved = (data.get('statistics') or {}).get('records_saved', 0)
+            await get_event_publisher().publish(DataEvent(
+                event_type=EventType.INGESTION_COMPLETED,
+                tenant_id=tenant_id,
+                entity_type='ingestion',
+                entity_id=source_name,
+                metadata={'source': event_type, 'records_saved': records_saved}
+            ))
     
     def _job_executed_listener(self, event):
         """Listen to job execution events"""
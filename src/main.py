@@ -9,8 +9,10 @@ from src.config import settings
 from src.logging_config import setup_logging
 from src.database import init_db
 from src.cache.cache_manager import CacheManager
+from src.cache.codec import CacheCodec
 from src.cache.instance import set_cache_manager
-from src.cache.event_bus import initialize_cache_invalidation
+from src.cache.event_bus import get_event_coalescer, get_event_publisher, initialize_cache_invalidation
+from src.cache.event_transport import RedisEventTransport
 from src.ingestion.scheduled_service import get_scheduled_service
 from src.api.products import router as products_router
 from src.api.pricing import router as pricing_router
@@ -75,24 +77,42 @@ async def lifespan(app: FastAPI):
         try:
             cache_manager = CacheManager(
                 redis_url=settings.redis_url,
-                use_memory_fallback=True
+                use_memory_fallback=True,
+                local_max_mb=settings.cache_local_max_mb,
+                local_ttl=settings.cache_local_ttl_seconds,
+                negative_ttl=settings.cache_negative_ttl_seconds,
+                codec=CacheCodec(
+                    serializer=settings.cache_serializer,
+                    compression=settings.cache_compression,
+                    compress_min_bytes=settings.cache_compress_min_bytes
+                ),
+                stale_ttl=settings.cache_stale_ttl_seconds,
+                lease_ttl=settings.cache_recompute_lease_seconds,
+                xfetch_beta=settings.cache_xfetch_beta,
+                max_connections=settings.redis_max_connections,
+                pool_timeout=settings.redis_pool_timeout_seconds,
+                health_check_interval=settings.redis_health_check_interval_seconds,
+                socket_keepalive=settings.redis_socket_keepalive
             )
-            # Connect with a hard timeout so it never blocks startup
-            try:
-                import asyncio as _asyncio
-                await _asyncio.wait_for(cache_manager.connect(), timeout=3.0)
-            except _asyncio.TimeoutError:
-                cache_manager._redis = None
-                cache_manager._redis_failed = True
-                logger.warning("⚠️  Redis connection timed out — using in-memory cache fallback")
+            # Connects within CacheManager.CONNECT_TIMEOUT so it never blocks startup
+            await cache_manager.connect()
 
-            if cache_manager._redis:
+            if cache_manager.is_connected:
                 logger.info("✅ Redis cache connected")
             else:
                 logger.warning("⚠️  Redis unavailable — using in-memory cache fallback")
 
             set_cache_manager(cache_manager)
             initialize_cache_invalidation(cache_manager)
+            
+            # Deliver data events to every worker so each drops its stale local entries
+            if cache_manager.is_connected and settings.cache_event_broadcast_enabled:
+                try:
+                    await get_event_publisher().attach_transport(
+                        RedisEventTransport(client=cache_manager.client, channel=settings.cache_event_channel)
+                    )
+                except Exception as e:
+                    logger.warning(f"⚠️  Data event broadcast unavailable: {e}")
 
             # Quick self-test
             await cache_manager.set(key="startup:ping", value="ok", ttl=60)
@@ -106,6 +126,14 @@ async def lifespan(app: FastAPI):
         logger.info("Cache disabled in configuration")
         set_cache_manager(None)
     
+    # Keep competitor product mappings current from product events
+    from src.pricing.equivalence_store import initialize_product_equivalence_maintenance
+    initialize_product_equivalence_maintenance()
+    
+    # Recompute hot cache entries after ingestion runs and uploads
+    from src.cache.warming import initialize_cache_warming
+    initialize_cache_warming()
+    
     # Start scheduled ingestion service
     try:
         scheduled_service = get_scheduled_service()
@@ -119,6 +147,17 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down application...")
     
+    # Publish coalesced events still queued, then stop receiving other workers' events
+    try:
+        await get_event_coalescer().flush()
+        await get_event_publisher().detach_transport()
+    except Exception as e:
+        logger.error(f"Failed to detach data event transport: {e}")
+    
+    # Stop cache warming
+    from src.cache.warming import get_cache_warmer
+    await get_cache_warmer().stop()
+    
     # Disconnect cache
     from src.cache.instance import get_cache_manager
     cache_manager = get_cache_manager()
@@ -129,6 +168,10 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to disconnect cache: {e}")
     
+    # Stop forecast worker processes
+    from src.forecasting.batch_engine import shutdown_forecast_executor
+    shutdown_forecast_executor()
+
     try:
         scheduled_service = get_scheduled_service()
         scheduled_service.stop()
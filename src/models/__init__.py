@@ -13,6 +13,8 @@ from src.models.analytical_report import AnalyticalReport
 from src.models.forecast_result import ForecastResult
 from src.models.aggregated_metrics import AggregatedMetrics
 from src.models.query_history import QueryHistory
+from src.models.product_equivalence import ProductEquivalence
+from src.models.competitor_price_snapshot import CompetitorPriceSnapshot
 
 __all__ = [
     "Product",
@@ -28,6 +30,8 @@ __all__ = [
     "ForecastResult",
     "AggregatedMetrics",
     "QueryHistory",
+    "ProductEquivalence",
+    "CompetitorPriceSnapshot",
     "GUID",
     "user_roles",
     "role_permissions"
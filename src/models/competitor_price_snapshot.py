@@ -0,0 +1,56 @@
+"""Competitor Price Snapshot model for precomputed per-product competitor aggregates"""
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import Column, String, DateTime, Float, Integer, Numeric, JSON, ForeignKey, Index, UniqueConstraint
+from src.database import Base
+from src.models.product import GUID
+
+
+class CompetitorPriceSnapshot(Base):
+    """
+    Competitor Price Snapshot model
+    
+    One row per tracked product with the competitor price aggregates the
+    competitor dashboard displays. Rows are refreshed when competitor
+    listings are ingested or our products change (see
+    src/pricing/competitor_snapshots.py), so the dashboard reads them with
+    an indexed keyset scan instead of recomputing them per request.
+    """
+    __tablename__ = "competitor_price_snapshots"
+    
+    # Primary key
+    id = Column(GUID(), primary_key=True, default=uuid4)
+    
+    # Foreign keys
+    tenant_id = Column(GUID(), ForeignKey('tenants.id'), nullable=False)
+    product_id = Column(GUID(), ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
+    
+    # Denormalized for filtered reads
+    category = Column(String(255), nullable=True)
+    
+    # Aggregates
+    our_price = Column(Numeric(10, 2), nullable=False)
+    competitor_count = Column(Integer, nullable=False)
+    min_price = Column(Numeric(10, 2), nullable=False)
+    max_price = Column(Numeric(10, 2), nullable=False)
+    avg_price = Column(Numeric(10, 2), nullable=False)
+    price_position = Column(String(20), nullable=False)  # "lowest", "competitive", "highest"
+    price_gap_percentage = Column(Float, nullable=False)  # Our price vs competitor average
+    potential_revenue_gain = Column(Float, nullable=False, default=0.0)
+    active_promotions = Column(Integer, nullable=False, default=0)
+    competitor_prices = Column(JSON, nullable=False)  # Per-competitor detail
+    
+    # Timestamps
+    refreshed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Indexes
+    __table_args__ = (
+        UniqueConstraint('tenant_id', 'product_id', name='uq_competitor_price_snapshot_product'),
+        Index('idx_competitor_price_snapshot_category', 'tenant_id', 'category', 'product_id'),
+    )
+    
+    def __repr__(self):
+        return (
+            f"<CompetitorPriceSnapshot(product_id={self.product_id}, "
+            f"position={self.price_position}, gap={self.price_gap_percentage})>"
+        )
@@ -1,7 +1,7 @@
 """Forecast Result model for storing demand forecasts"""
 from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, String, DateTime, Float, Integer, Boolean, JSON, ForeignKey, Index
+from sqlalchemy import Column, String, Date, DateTime, Float, Integer, Boolean, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from src.database import Base
 from src.models.product import GUID
@@ -29,6 +29,8 @@ class ForecastResult(Base):
     # Forecast parameters
     forecast_horizon_days = Column(Integer, nullable=False)
     model_version = Column(String(50), nullable=False)
+    best_model = Column(String(50), nullable=True)  # Model selected for this forecast
+    data_watermark = Column(Date, nullable=True)  # Last sales date the forecast was fitted on
     
     # Forecast results
     predicted_demand = Column(JSON, nullable=False)  # List[float]
@@ -43,7 +45,7 @@ class ForecastResult(Base):
     inventory_alerts = Column(JSON, nullable=True)  # List[InventoryAlert]
     
     # Metadata
-    forecast_metadata = Column(JSON, nullable=True)  # Additional forecast details
+    forecast_metadata = Column(JSON, nullable=True)  # Additional forecast details (incl. serialized forecast)
     
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -59,6 +61,7 @@ class ForecastResult(Base):
         Index('idx_forecast_results_product', 'product_id'),
         Index('idx_forecast_results_created', 'created_at'),
         Index('idx_forecast_results_tenant_product', 'tenant_id', 'product_id'),
+        Index('idx_forecast_results_lookup', 'tenant_id', 'product_id', 'forecast_horizon_days'),
     )
     
     def __repr__(self):
@@ -0,0 +1,45 @@
+"""Product Equivalence model for persisted product <-> competitor mappings"""
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import Column, String, DateTime, Float, ForeignKey, Index, UniqueConstraint
+from src.database import Base
+from src.models.product import GUID
+
+
+class ProductEquivalence(Base):
+    """
+    Product Equivalence model storing ProductEquivalenceMapping results
+    
+    Rows are maintained incrementally from product events (see
+    src/pricing/equivalence_store.py) so pricing analyses read mappings
+    with one indexed join instead of recomputing them per request.
+    """
+    __tablename__ = "product_equivalence"
+    
+    # Primary key
+    id = Column(GUID(), primary_key=True, default=uuid4)
+    
+    # Foreign keys
+    tenant_id = Column(GUID(), ForeignKey('tenants.id'), nullable=False)
+    product_id = Column(GUID(), ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
+    competitor_product_id = Column(GUID(), ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
+    
+    # Mapping
+    confidence = Column(Float, nullable=False)
+    mapping_type = Column(String(50), nullable=False)  # "exact_sku" or "name_similarity"
+    
+    # Timestamps
+    matched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Indexes
+    __table_args__ = (
+        UniqueConstraint('tenant_id', 'product_id', 'competitor_product_id', name='uq_product_equivalence_pair'),
+        Index('idx_product_equivalence_product', 'tenant_id', 'product_id'),
+        Index('idx_product_equivalence_competitor', 'tenant_id', 'competitor_product_id'),
+    )
+    
+    def __repr__(self):
+        return (
+            f"<ProductEquivalence(product_id={self.product_id}, "
+            f"competitor_product_id={self.competitor_product_id}, confidence={self.confidence})>"
+        )
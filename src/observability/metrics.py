@@ -113,6 +113,7 @@ class MetricsCollector:
         self._llm_completion_tokens: int = 0
         self._llm_cost_usd: float = 0.0
         self._llm_calls: int = 0
+        self._db_pools: Dict[str, dict] = {}       # engine -> connection pool stats
         
         if not self.enabled:
             logger.warning(
@@ -215,6 +216,14 @@ class MetricsCollector:
             registry=self.registry
         )
         
+        # Infrastructure
+        self.db_pool_connections = Gauge(
+            'db_pool_connections',
+            'Database connection pool connections by engine and state',
+            ['engine', 'state'],
+            registry=self.registry
+        )
+        
         logger.info("MetricsCollector initialized")
     
     def record_agent_execution(self, metrics: AgentMetrics) -> None:
@@ -317,6 +326,16 @@ class MetricsCollector:
         if self.enabled and 0 <= score <= 1:
             self.data_quality_score.labels(tenant_id=tenant_id).set(score)
     
+    def record_db_pool_stats(self, pools: Dict[str, dict]) -> None:
+        """Set the connection pool gauges (see src.database.get_pool_stats)."""
+        self._db_pools = pools
+        if not self.enabled:
+            return
+        for engine_name, stats in pools.items():
+            for state in ('size', 'checkedout', 'checkedin', 'overflow'):
+                if state in stats:
+                    self.db_pool_connections.labels(engine=engine_name, state=state).set(stats[state])
+    
     def get_summary(self) -> dict:
         """Return a human-readable JSON summary of collected stats."""
         uptime_seconds = (datetime.utcnow() - self._started_at).total_seconds()
@@ -375,6 +394,7 @@ class MetricsCollector:
             },
             'agents': agents,
             'api_endpoints': api_endpoints,
+            'database_pools': self._db_pools,
         }
 
     def get_metrics(self) -> bytes:
@@ -140,7 +140,7 @@ class ExecutionService:
             if agent in agent_task_map:
                 task = agent_task_map[agent]
                 tasks.append(
-                    self._execute_single_agent(agent, task, query_data)
+                    self._execute_single_agent(agent, task, query_data, plan.execution_mode)
                 )
         
         # Execute all tasks in parallel with semaphore for concurrency control
@@ -174,7 +174,8 @@ class ExecutionService:
         self,
         agent_type: AgentType,
         task: AgentTask,
-        query_data: Optional[Dict[str, Any]] = None
+        query_data: Optional[Dict[str, Any]] = None,
+        execution_mode: Optional[ExecutionMode] = None
     ) -> AgentResult:
         """
         Execute a single agent with timeout and error handling.
@@ -183,6 +184,7 @@ class ExecutionService:
             agent_type: Type of agent to execute
             task: Agent task with parameters
             query_data: Optional query data
+            execution_mode: QUICK or DEEP (agents pick their model tier from it)
             
         Returns:
             AgentResult
@@ -193,7 +195,13 @@ class ExecutionService:
         try:
             # Execute with timeout
             result_data = await asyncio.wait_for(
-                self._call_agent(agent_type, task.parameters, query_data),
+                self._call_agent(
+                    agent_type,
+                    task.parameters,
+                    query_data,
+                    execution_mode=execution_mode,
+                    timeout_seconds=task.timeout_seconds
+                ),
                 timeout=task.timeout_seconds
             )
             
@@ -266,7 +274,9 @@ class ExecutionService:
         self,
         agent_type: AgentType,
         parameters: Dict[str, Any],
-        query_data: Optional[Dict[str, Any]] = None
+        query_data: Optional[Dict[str, Any]] = None,
+        execution_mode: Optional[ExecutionMode] = None,
+        timeout_seconds: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Call the actual agent implementation.
@@ -275,6 +285,8 @@ class ExecutionService:
             agent_type: Type of agent
             parameters: Agent parameters
             query_data: Optional query data (includes db, tenant_id, product_sku)
+            execution_mode: QUICK or DEEP
+            timeout_seconds: Time budget of the agent task
             
         Returns:
             Agent result data
@@ -354,7 +366,11 @@ class ExecutionService:
         elif agent_type == AgentType.SENTIMENT:
             return await self._execute_sentiment_agent(db, tenant_id, product_ids, parameters)
         elif agent_type == AgentType.DEMAND_FORECAST:
-            return await self._execute_forecast_agent(db, tenant_id, product_ids, parameters)
+            return await self._execute_forecast_agent(
+                db, tenant_id, product_ids, parameters,
+                execution_mode=execution_mode or ExecutionMode.QUICK,
+                timeout_seconds=timeout_seconds
+            )
         elif agent_type == AgentType.DATA_QA:
             return await self._execute_qa_agent(db, tenant_id, product_ids, parameters)
         elif agent_type == AgentType.SALES:
@@ -424,22 +440,27 @@ class ExecutionService:
             
             logger.info("Pricing agent: Assessing data quality")
             
-            # Assess data quality
-            qa_report = qa_agent.assess_product_data_quality(our_products)
+            # Assess data quality (shared with the data QA agent and later requests until the products change)
+            from src.processing.qa_report_cache import get_qa_report_cache
+            qa_report = get_qa_report_cache().get_product_report(qa_agent, our_products, product_ids)
             
-            logger.info("Pricing agent: Getting mock competitor data")
+            logger.info("Pricing agent: Loading stored competitor mappings")
             
-            # Get mock competitor data (for MVP)
-            from src.api.pricing import _get_mock_competitor_products
-            competitor_products = _get_mock_competitor_products(our_products)
+            # Stored competitor mappings with their competitor products (one indexed join)
+            from src.pricing.equivalence_store import ProductEquivalenceStore
+            all_mappings, competitor_products = await ProductEquivalenceStore(tenant_id).get_mappings(
+                db, [p.id for p in our_products]
+            )
             
-            logger.info(f"Pricing agent: Got {len(competitor_products)} competitor products")
+            if not all_mappings:
+                # Get mock competitor data (for MVP)
+                from src.api.pricing import _get_mock_competitor_products
+                competitor_products = _get_mock_competitor_products(our_products)
+                
+                # Create product mappings (competitors indexed once for all products)
+                all_mappings = pricing_agent.map_product_equivalences(our_products, competitor_products)
             
-            # Create product mappings
-            all_mappings = []
-            for our_product in our_products:
-                mappings = pricing_agent.map_product_equivalence(our_product, competitor_products)
-                all_mappings.extend(mappings)
+            logger.info(f"Pricing agent: Got {len(competitor_products)} competitor products")
             
             logger.info(f"Pricing agent: Created {len(all_mappings)} product mappings")
             
@@ -562,8 +583,9 @@ class ExecutionService:
         sentiment_agent = EnhancedSentimentAgent(tenant_id=tenant_id)
         qa_agent = DataQAAgent(tenant_id=tenant_id)
         
-        # Assess data quality
-        qa_report = qa_agent.assess_review_data_quality(reviews)
+        # Assess data quality (cached until the products' reviews change)
+        from src.processing.qa_report_cache import get_qa_report_cache
+        qa_report = get_qa_report_cache().get_review_report(qa_agent, reviews, product_ids)
         
         # Calculate aggregate sentiment
         sentiment_result = sentiment_agent.calculate_aggregate_sentiment_with_qa(
@@ -687,23 +709,42 @@ class ExecutionService:
         db,
         tenant_id: UUID,
         product_ids: List[UUID],
-        parameters: Dict[str, Any]
+        parameters: Dict[str, Any],
+        execution_mode: ExecutionMode = ExecutionMode.QUICK,
+        timeout_seconds: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Execute demand forecast agent"""
-        from sqlalchemy import select
-        from src.models.sales_record import SalesRecord
-        from src.agents.demand_forecast_agent import DemandForecastAgent
+        """
+        Execute demand forecast agent.
         
-        # Fetch sales records
-        result = await db.execute(
-            select(SalesRecord).where(
-                SalesRecord.product_id.in_(product_ids),
-                SalesRecord.tenant_id == tenant_id
-            )
-        )
-        sales_records = result.scalars().all()
+        Fresh materialized forecasts are served as-is. The remaining products
+        are forecast from daily series aggregated in SQL, off the event loop:
+        QUICK mode uses the vectorized baseline models only, DEEP mode fits
+        the full model ensemble and falls back to baselines for products that
+        did not finish within the task's time budget.
+        """
+        import logging
+        from src.config import settings
+        from src.crud.sales_record import get_daily_sales_series
+        from src.forecasting.materialization import ForecastMaterializer
+        from src.forecasting.vectorized import BASELINE_MODELS
         
-        if not sales_records:
+        logger = logging.getLogger(__name__)
+        horizon = int(parameters.get('forecast_horizon_days') or settings.forecast_materialization_horizon_days)
+        deep = execution_mode == ExecutionMode.DEEP
+        
+        # Serve precomputed forecasts first (DEEP only accepts per-product ensemble rows)
+        materializer = ForecastMaterializer(tenant_id=tenant_id)
+        stored = await materializer.get_fresh_forecasts(db, product_ids, horizon)
+        if deep:
+            long_tail_models = set(BASELINE_MODELS) | {'hierarchical'}
+            stored = {pid: f for pid, f in stored.items() if f['best_model'] not in long_tail_models}
+        
+        # Daily series for the rest in one GROUP BY query
+        engine = materializer.engine
+        jobs = await engine.prepare_jobs(db, [pid for pid in product_ids if pid not in stored])
+        jobs = [job for job in jobs if job.sales_history]
+        
+        if not jobs and not stored:
             return {
                 'agent': 'demand_forecast',
                 'status': 'no_data',
@@ -711,37 +752,152 @@ class ExecutionService:
                 'data': {'message': 'No sales data found'}
             }
         
-        # Initialize agent
-        forecast_agent = DemandForecastAgent(tenant_id=tenant_id)
+        items = {}
+        if deep and jobs:
+            async def fit_ensemble():
+                async for item, _ in engine.stream_forecasts(jobs, horizon):
+                    items[item.product_id] = item
+            
+            # Leave part of the budget for the baseline fallback and synthesis
+            budget = timeout_seconds * 0.8 if timeout_seconds else None
+            try:
+                await asyncio.wait_for(fit_ensemble(), timeout=budget)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Forecast ensemble finished {len(items)}/{len(jobs)} products within "
+                    f"{budget:.0f}s; using baselines for the rest"
+                )
+        
+        pending = [
+            job for job in jobs
+            if job.product_id not in items or items[job.product_id].status != 'completed'
+        ]
+        for item in await engine.run_tiered(pending, horizon, heavy_top_n=0):
+            items[item.product_id] = item
+        
+        forecast_ids = [
+            pid for pid in dict.fromkeys(product_ids)
+            if pid in stored or (pid in items and items[pid].status == 'completed')
+        ]
+        forecasts = [stored[pid] if pid in stored else items[pid].forecast for pid in forecast_ids]
+        if not forecasts:
+            return {
+                'agent': 'demand_forecast',
+                'status': 'failed',
+                'confidence': 0.0,
+                'data': {'message': 'No forecasts could be generated'}
+            }
+        
+        # Sales history of every forecast product (materialized ones have no job loaded)
+        histories = {job.product_id: job.sales_history for job in jobs}
+        histories.update(await get_daily_sales_series(db, tenant_id, [pid for pid in forecast_ids if pid in stored]))
+        
+        return self._summarize_forecasts(
+            forecasts, [histories.get(pid, []) for pid in forecast_ids], horizon, execution_mode, len(stored)
+        )
+    
+    def _summarize_forecasts(
+        self,
+        forecasts: List[Dict[str, Any]],
+        sales_histories: List[List[Dict[str, Any]]],
+        horizon: int,
+        execution_mode: ExecutionMode,
+        materialized_count: int
+    ) -> Dict[str, Any]:
+        """
+        Aggregate per-product forecasts into the demand forecast agent result.
+        
+        ``sales_histories`` holds the daily sales of each forecast's product,
+        so forecast and recent actual demand cover the same products.
+        """
+        confidence = sum(f['final_confidence'] for f in forecasts) / len(forecasts)
+        
+        # Portfolio forecast per day
+        daily: Dict[str, float] = {}
+        for forecast in forecasts:
+            for point in forecast['forecast_points']:
+                daily[point['date']] = daily.get(point['date'], 0.0) + point['predicted_quantity']
+        forecast_points = [
+            {'date': day, 'predicted_quantity': round(quantity, 2)}
+            for day, quantity in sorted(daily.items())
+        ]
+        forecasted_demand = sum(
+            p['predicted_quantity'] for f in forecasts for p in f['forecast_points']
+        )
+        
+        # Recent actual demand (same horizon length) for the change estimate
+        recent_demand = 0.0
+        for history in sales_histories:
+            if not history:
+                continue
+            last_date = max(p['date'] for p in history)
+            recent_demand += sum(
+                p['quantity'] for p in history
+                if (last_date - p['date']).days < horizon
+            )
+        demand_change_pct = (
+            round((forecasted_demand - recent_demand) / recent_demand * 100, 1)
+            if recent_demand else 0.0
+        )
+        
+        supply_gap = sum(
+            max(0.0, sum(p['predicted_quantity'] for p in f['forecast_points']) - f['current_inventory'])
+            for f in forecasts
+            if f.get('current_inventory') is not None
+        )
+        
+        trends = [f['trend'] for f in forecasts]
+        trend = max(set(trends), key=trends.count)
+        alerts = [
+            {**alert, 'product_name': f['product_name']}
+            for f in forecasts
+            for alert in f['alerts']
+        ]
         
-        # For MVP, return basic forecast info
-        total_sales = sum(s.quantity for s in sales_records)
-        avg_daily_sales = total_sales / max(len(sales_records), 1)
+        recommendations = [
+            {
+                'title': f"Reorder {f['product_name']}",
+                'description': (
+                    f"Order {f['reorder_recommendation']} units to cover the next "
+                    f"{horizon} days of forecast demand plus safety stock"
+                ),
+                'priority': 'high',
+                'impact': 'high',
+                'urgency': 'high' if any(a['severity'] == 'critical' for a in f['alerts']) else 'medium',
+                'confidence': f['final_confidence']
+            }
+            for f in sorted(forecasts, key=lambda f: f.get('reorder_recommendation') or 0, reverse=True)
+            if f.get('reorder_recommendation')
+        ]
+        if not recommendations:
+            recommendations.append({
+                'title': 'Maintain current inventory levels',
+                'description': f'Forecasted demand: {forecasted_demand:.0f} units over {horizon} days',
+                'priority': 'medium',
+                'impact': 'medium',
+                'urgency': 'low',
+                'confidence': confidence
+            })
         
         return {
             'agent': 'demand_forecast',
             'status': 'completed',
-            'confidence': 0.7,
-            'final_confidence': 0.7,  # Add this for synthesizer
+            'confidence': confidence,
+            'final_confidence': confidence,  # Add this for synthesizer
             'data': {
-                'message': f'Forecasted demand based on {len(sales_records)} sales records',
-                'sales_records': len(sales_records),
-                'forecasted_demand': avg_daily_sales * 30,  # 30-day forecast
-                'demand_change_pct': 0.0,  # Would calculate from trend
-                'supply_gap': 0.0,
-                'trend': 'stable',  # Add this field for synthesizer
-                'seasonality': {},  # Add empty dict for now
-                'alerts': [],  # Add empty list for now
-                'recommendations': [
-                    {
-                        'title': 'Maintain current inventory levels',
-                        'description': f'Forecasted demand: {avg_daily_sales * 30:.0f} units/month',
-                        'priority': 'medium',
-                        'impact': 'medium',
-                        'urgency': 'low',
-                        'confidence': 0.7
-                    }
-                ]
+                'message': f'Forecasted demand for {len(forecasts)} products over {horizon} days',
+                'execution_mode': execution_mode.value,
+                'materialized_forecasts': materialized_count,
+                'forecast_horizon_days': horizon,
+                'forecasted_demand': forecasted_demand,
+                'demand_change_pct': demand_change_pct,
+                'supply_gap': supply_gap,
+                'trend': trend,
+                'seasonality': forecasts[0]['seasonality'] if len(forecasts) == 1 else {},
+                'alerts': alerts,
+                'forecast_points': forecast_points,
+                'forecasts': forecasts,
+                'recommendations': recommendations
             }
         }
     
@@ -781,8 +937,9 @@ class ExecutionService:
         # Initialize agent
         qa_agent = DataQAAgent(tenant_id=tenant_id)
         
-        # Assess data quality
-        qa_report = qa_agent.assess_product_data_quality(our_products)
+        # Assess data quality (reuses the pricing agent's report for the same products)
+        from src.processing.qa_report_cache import get_qa_report_cache
+        qa_report = get_qa_report_cache().get_product_report(qa_agent, our_products, product_ids)
         
         return {
             'agent': 'data_qa',
@@ -957,6 +1114,19 @@ class ExecutionService:
         tenant_id: UUID,
         query_text: str,
         parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run the general agent's read-only queries on the read replica when one is configured"""
+        from src.database import read_session
+
+        async with read_session(db) as read_db:
+            return await self._run_general_agent(read_db, tenant_id, query_text, parameters)
+
+    async def _run_general_agent(
+        self,
+        db,
+        tenant_id: UUID,
+        query_text: str,
+        parameters: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
         Universal agent — answers ANY natural language question from the DB.
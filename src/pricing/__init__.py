@@ -0,0 +1,38 @@
+"""Pricing infrastructure: competitor product matching and supporting services"""
+from src.pricing.equivalence import (
+    ProductEquivalenceIndex,
+    normalize_text,
+    sequence_similarity
+)
+from src.pricing.equivalence_store import (
+    ProductEquivalenceStore,
+    ProductEquivalenceMaintainer,
+    is_competitor_product,
+    initialize_product_equivalence_maintenance,
+    get_product_equivalence_maintainer
+)
+from src.pricing.competitor_snapshots import (
+    CompetitorSnapshotService,
+    summarize_competitor_prices
+)
+from src.pricing.recommendations import (
+    BulkPricingRecommendationEngine,
+    PricingInputs,
+    RecommendationPage
+)
+
+__all__ = [
+    "ProductEquivalenceIndex",
+    "normalize_text",
+    "sequence_similarity",
+    "ProductEquivalenceStore",
+    "ProductEquivalenceMaintainer",
+    "is_competitor_product",
+    "initialize_product_equivalence_maintenance",
+    "get_product_equivalence_maintainer",
+    "CompetitorSnapshotService",
+    "summarize_competitor_prices",
+    "BulkPricingRecommendationEngine",
+    "PricingInputs",
+    "RecommendationPage"
+]
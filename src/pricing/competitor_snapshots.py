@@ -0,0 +1,355 @@
+"""
+Competitor Price Snapshots - Precomputed competitor aggregates per product
+
+The competitor dashboard shows, for every tracked product, the competitor
+price range, our position in it and the gap to the competitor average.
+These aggregates are materialized in ``competitor_price_snapshots``:
+
+1. Competitor prices come from the competitor listings mapped to our
+   products in ``product_equivalence`` (ingested or scraped products
+   flagged ``metadata['is_competitor']``)
+2. Snapshots of the affected products are refreshed whenever the
+   equivalence maintainer rematches products, i.e. after every product
+   event of the ingestion pipeline, CSV uploads and product edits
+3. The dashboard reads snapshots with a keyset scan over
+   ``(tenant_id, [category,] product_id)`` and caches the tenant-level
+   totals until the next refresh
+"""
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, delete, func, insert, or_, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.models.competitor_price_snapshot import CompetitorPriceSnapshot
+from src.models.product import Product
+from src.models.product_equivalence import ProductEquivalence
+from src.pricing.equivalence_store import is_competitor_product
+
+logger = logging.getLogger(__name__)
+
+CACHE_TYPE = "competitor_dashboard"
+SIGNIFICANT_GAP_PERCENT = 10.0   # Gaps below this raise no alert
+HIGH_SEVERITY_GAP_PERCENT = 15.0
+REVENUE_GAIN_FACTOR = 0.8        # Conservative share of the gap to the average
+
+
+def price_position(our_price: float, min_price: float, max_price: float) -> str:
+    """Position of our price within the competitor range"""
+    if our_price <= min_price:
+        return "lowest"
+    if our_price >= max_price:
+        return "highest"
+    return "competitive"
+
+
+def summarize_competitor_prices(our_price: float, competitor_prices: List[float]) -> Dict[str, Any]:
+    """
+    Aggregate competitor prices for one product.
+
+    Args:
+        our_price: Our current price
+        competitor_prices: Prices of the mapped competitor listings (non-empty)
+
+    Returns:
+        Dictionary with min/max/avg, position, gap and potential revenue gain
+    """
+    min_price = min(competitor_prices)
+    max_price = max(competitor_prices)
+    avg_price = sum(competitor_prices) / len(competitor_prices)
+    position = price_position(our_price, min_price, max_price)
+
+    potential_gain = 0.0
+    if position == "lowest" and our_price < avg_price:
+        potential_gain = (avg_price - our_price) * REVENUE_GAIN_FACTOR
+
+    return {
+        "competitor_count": len(competitor_prices),
+        "min_price": min_price,
+        "max_price": max_price,
+        "avg_price": avg_price,
+        "price_position": position,
+        "price_gap_percentage": ((our_price - avg_price) / avg_price) * 100,
+        "potential_revenue_gain": potential_gain
+    }
+
+
+class CompetitorSnapshotService:
+    """
+    Refreshes and reads competitor price snapshots.
+
+    TENANT ISOLATION:
+    All queries are filtered by the service's tenant_id.
+    """
+
+    def __init__(self, tenant_id: UUID):
+        """
+        Initialize service.
+
+        Args:
+            tenant_id: Tenant UUID for multi-tenancy isolation
+        """
+        self.tenant_id = tenant_id
+
+    async def refresh(self, db: AsyncSession, product_ids: Optional[Iterable[UUID]] = None) -> int:
+        """
+        Recompute snapshots (the caller commits and then calls ``invalidate_cache``).
+
+        Args:
+            db: Database session
+            product_ids: Our products to refresh (None = the whole tenant).
+                Competitor listings in the list are ignored.
+
+        Returns:
+            Number of snapshots written
+        """
+        stale = delete(CompetitorPriceSnapshot).where(
+            CompetitorPriceSnapshot.tenant_id == self.tenant_id  # TENANT ISOLATION
+        )
+        if product_ids is not None:
+            product_ids = list(dict.fromkeys(product_ids))
+            if not product_ids:
+                return 0
+            stale = stale.where(CompetitorPriceSnapshot.product_id.in_(product_ids))
+        await db.execute(stale)
+
+        competitor_query = (
+            select(
+                ProductEquivalence.product_id,
+                Product.price,
+                Product.currency,
+                Product.marketplace,
+                Product.updated_at,
+                Product.extra_metadata
+            )
+            .join(Product, Product.id == ProductEquivalence.competitor_product_id)
+            .where(
+                ProductEquivalence.tenant_id == self.tenant_id,  # TENANT ISOLATION
+                Product.price.isnot(None)
+            )
+        )
+        if product_ids is not None:
+            competitor_query = competitor_query.where(ProductEquivalence.product_id.in_(product_ids))
+
+        competitors: Dict[UUID, List[Any]] = {}
+        for row in (await db.execute(competitor_query)).all():
+            competitors.setdefault(row.product_id, []).append(row)
+        if not competitors:
+            return 0
+
+        ours = (await db.execute(
+            select(Product.id, Product.price, Product.category, Product.extra_metadata).where(
+                Product.tenant_id == self.tenant_id,  # TENANT ISOLATION
+                Product.id.in_(list(competitors))
+            )
+        )).all()
+
+        now = datetime.utcnow()
+        snapshots = []
+        for product in ours:
+            if is_competitor_product(product) or product.price is None:
+                continue
+            rows = competitors[product.id]
+            our_price = float(product.price)
+            summary = summarize_competitor_prices(our_price, [float(row.price) for row in rows])
+            details = [self._competitor_detail(row) for row in rows]
+
+            snapshots.append({
+                "tenant_id": self.tenant_id,
+                "product_id": product.id,
+                "category": product.category,
+                "our_price": Decimal(str(our_price)),
+                "competitor_count": summary["competitor_count"],
+                "min_price": Decimal(str(round(summary["min_price"], 2))),
+                "max_price": Decimal(str(round(summary["max_price"], 2))),
+                "avg_price": Decimal(str(round(summary["avg_price"], 2))),
+                "price_position": summary["price_position"],
+                "price_gap_percentage": summary["price_gap_percentage"],
+                "potential_revenue_gain": summary["potential_revenue_gain"],
+                "active_promotions": sum(1 for detail in details if detail["is_on_sale"]),
+                "competitor_prices": details,
+                "refreshed_at": now
+            })
+
+        if snapshots:
+            await db.execute(insert(CompetitorPriceSnapshot), snapshots)
+            await db.flush()
+        return len(snapshots)
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        limit: int,
+        cursor: Optional[UUID] = None,
+        category: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[UUID]]:
+        """
+        Read one keyset page of snapshots in product id order.
+
+        Args:
+            db: Database session
+            limit: Page size
+            cursor: Last product id of the previous page
+            category: Optional category filter
+
+        Returns:
+            (snapshot dictionaries, next cursor or None)
+        """
+        query = (
+            select(CompetitorPriceSnapshot, Product.sku, Product.name, Product.currency)
+            .join(Product, Product.id == CompetitorPriceSnapshot.product_id)
+            .where(CompetitorPriceSnapshot.tenant_id == self.tenant_id)  # TENANT ISOLATION
+            .order_by(CompetitorPriceSnapshot.product_id)
+            .limit(limit + 1)
+        )
+        if category:
+            query = query.where(CompetitorPriceSnapshot.category == category)
+        if cursor is not None:
+            query = query.where(CompetitorPriceSnapshot.product_id > cursor)
+
+        rows = (await db.execute(query)).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][0].product_id
+        return [snapshot_to_dict(row[0], row) for row in rows], next_cursor
+
+    async def get_summary(
+        self,
+        db: AsyncSession,
+        category: Optional[str] = None,
+        alert_limit: int = 10,
+        opportunity_limit: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Tenant-level totals and the largest price gaps (cached until the next refresh).
+
+        Args:
+            db: Database session
+            category: Optional category filter
+            alert_limit: Number of gap rows to return for alerts
+            opportunity_limit: Number of underpriced rows to return
+
+        Returns:
+            {"totals": {...}, "alerts": [...], "opportunities": [...]}; rows are
+            snapshot dictionaries with the product's sku, name and currency
+        """
+        from src.cache.instance import get_cache_manager
+
+        cache = get_cache_manager()
+        identifier = f"summary:{category or '*'}:{alert_limit}:{opportunity_limit}"
+        if cache:
+            cached = await cache.get(CACHE_TYPE, self.tenant_id, identifier)
+            if cached:
+                return cached
+
+        snapshot = CompetitorPriceSnapshot
+        scope = [snapshot.tenant_id == self.tenant_id]  # TENANT ISOLATION
+        if category:
+            scope.append(snapshot.category == category)
+
+        totals = (await db.execute(
+            select(
+                func.count().label("tracked"),
+                func.sum(case((snapshot.price_position == "competitive", 1), else_=0)).label("competitive"),
+                func.sum(case((snapshot.price_position == "lowest", 1), else_=0)).label("lowest"),
+                func.sum(case((snapshot.price_position == "highest", 1), else_=0)).label("highest"),
+                func.avg(func.abs(snapshot.price_gap_percentage)).label("avg_gap"),
+                func.sum(snapshot.potential_revenue_gain).label("revenue_gain"),
+                func.sum(snapshot.active_promotions).label("promotions")
+            ).where(*scope)
+        )).one()
+
+        gap = snapshot.price_gap_percentage
+        high_severity = or_(
+            and_(snapshot.price_position == "lowest", gap < -HIGH_SEVERITY_GAP_PERCENT),
+            and_(snapshot.price_position == "highest", gap > HIGH_SEVERITY_GAP_PERCENT)
+        )
+        alerts = await self._snapshot_rows(
+            db,
+            [*scope, func.abs(gap) >= SIGNIFICANT_GAP_PERCENT],
+            [case((high_severity, 0), else_=1), func.abs(gap).desc()],
+            alert_limit
+        )
+        opportunities = await self._snapshot_rows(
+            db,
+            [*scope, snapshot.price_position == "lowest"],
+            [func.abs(gap).desc()],
+            opportunity_limit
+        )
+
+        summary = {
+            "totals": {
+                "total_products_tracked": totals.tracked or 0,
+                "products_competitively_priced": int(totals.competitive or 0),
+                "products_underpriced": int(totals.lowest or 0),
+                "products_overpriced": int(totals.highest or 0),
+                "avg_price_gap": round(float(totals.avg_gap or 0.0), 2),
+                "total_potential_revenue_gain": round(float(totals.revenue_gain or 0.0), 2),
+                "active_competitor_promotions": int(totals.promotions or 0)
+            },
+            "alerts": alerts,
+            "opportunities": opportunities
+        }
+        if cache:
+            await cache.set(
+                CACHE_TYPE, self.tenant_id, identifier, summary,
+                ttl=settings.competitor_dashboard_cache_ttl_seconds
+            )
+        return summary
+
+    async def invalidate_cache(self) -> int:
+        """Drop the tenant's cached dashboard summaries (call after committing a refresh)"""
+        from src.cache.instance import get_cache_manager
+
+        cache = get_cache_manager()
+        if not cache:
+            return 0
+        return await cache.invalidate_pattern(CACHE_TYPE, self.tenant_id, "*")
+
+    async def _snapshot_rows(self, db: AsyncSession, where: list, order_by: list, limit: int) -> List[Dict[str, Any]]:
+        """Snapshot dictionaries (with product sku/name/currency) for a filtered, ordered slice"""
+        result = await db.execute(
+            select(CompetitorPriceSnapshot, Product.sku, Product.name, Product.currency)
+            .join(Product, Product.id == CompetitorPriceSnapshot.product_id)
+            .where(*where)
+            .order_by(*order_by)
+            .limit(limit)
+        )
+        return [snapshot_to_dict(row[0], row) for row in result.all()]
+
+    @staticmethod
+    def _competitor_detail(row) -> Dict[str, Any]:
+        """Per-competitor entry stored in the snapshot"""
+        metadata = row.extra_metadata if isinstance(row.extra_metadata, dict) else {}
+        original_price = metadata.get("original_price")
+        return {
+            "competitor_name": row.marketplace,
+            "price": round(float(row.price), 2),
+            "currency": row.currency,
+            "last_updated": row.updated_at.isoformat() if row.updated_at else None,
+            "is_on_sale": bool(metadata.get("is_on_sale", False)),
+            "original_price": float(original_price) if original_price is not None else None
+        }
+
+
+def snapshot_to_dict(snapshot: CompetitorPriceSnapshot, product) -> Dict[str, Any]:
+    """JSON-serializable snapshot with the product's sku, name and currency"""
+    return {
+        "product_id": str(snapshot.product_id),
+        "sku": product.sku,
+        "name": product.name,
+        "currency": product.currency,
+        "our_price": float(snapshot.our_price),
+        "competitor_prices": snapshot.competitor_prices,
+        "min_competitor_price": float(snapshot.min_price),
+        "max_competitor_price": float(snapshot.max_price),
+        "avg_competitor_price": float(snapshot.avg_price),
+        "price_position": snapshot.price_position,
+        "price_gap_percentage": snapshot.price_gap_percentage,
+        "refreshed_at": snapshot.refreshed_at.isoformat()
+    }
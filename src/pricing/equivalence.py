@@ -0,0 +1,185 @@
+"""
+Product Equivalence Engine - Candidate blocking for competitor product matching
+
+Matching every product against every competitor product with
+``difflib.SequenceMatcher`` is O(N x M) pure-Python string alignment. The
+engine instead indexes competitor names and normalized SKUs once as sparse
+character n-gram TF-IDF matrices, retrieves the top-k most similar
+competitors per product with a sparse matrix product, and runs the exact
+SequenceMatcher scoring only on those candidates:
+
+1. Blocking: cosine similarity on char n-grams (names 70%, SKUs 30%)
+2. Exact SKU matches are always added to the candidates
+3. Verification: the agent's SequenceMatcher scoring and threshold
+
+Catalogs no larger than ``top_k`` are compared exhaustively, so small
+requests produce exactly the same mappings as the pairwise scan.
+"""
+import logging
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.schemas.pricing import ProductEquivalenceMapping
+from src.schemas.product import ProductResponse
+
+logger = logging.getLogger(__name__)
+
+NAME_WEIGHT = 0.7
+SKU_WEIGHT = 0.3
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Lowercase and strip a name or SKU for comparison"""
+    return (value or "").lower().strip()
+
+
+def sequence_similarity(a: str, b: str) -> float:
+    """SequenceMatcher ratio of two normalized strings"""
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class ProductEquivalenceIndex:
+    """
+    Sparse n-gram index over competitor products.
+
+    Build once per competitor catalog and reuse it for all of our products.
+    """
+
+    def __init__(
+        self,
+        competitor_products: Sequence[ProductResponse],
+        top_k: int = 25,
+        ngram_range: tuple = (2, 3),
+        query_chunk_size: int = 1024
+    ):
+        """
+        Index competitor products.
+
+        Args:
+            competitor_products: Competitor catalog to match against
+            top_k: Candidates verified per product
+            ngram_range: Character n-gram sizes (within word boundaries)
+            query_chunk_size: Products scored per sparse product (bounds memory)
+        """
+        self.competitor_products = list(competitor_products)
+        self.top_k = top_k
+        self.query_chunk_size = query_chunk_size
+
+        self._names = [normalize_text(p.name) for p in self.competitor_products]
+        self._skus = [normalize_text(p.normalized_sku) for p in self.competitor_products]
+
+        self._by_sku: Dict[str, List[int]] = {}
+        for position, sku in enumerate(self._skus):
+            self._by_sku.setdefault(sku, []).append(position)
+
+        self._name_vectorizer = self._name_matrix = None
+        self._sku_vectorizer = self._sku_matrix = None
+        if len(self.competitor_products) > top_k:
+            self._name_vectorizer, self._name_matrix = self._fit(self._names, ngram_range)
+            self._sku_vectorizer, self._sku_matrix = self._fit(self._skus, ngram_range)
+
+    @staticmethod
+    def _fit(texts: List[str], ngram_range: tuple):
+        """Fit a char n-gram TF-IDF vectorizer; (None, None) if nothing can be indexed"""
+        vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=ngram_range, dtype=np.float32)
+        try:
+            return vectorizer, vectorizer.fit_transform(texts)
+        except ValueError:
+            # Empty vocabulary (e.g. all values blank)
+            return None, None
+
+    def __len__(self) -> int:
+        return len(self.competitor_products)
+
+    @property
+    def exhaustive(self) -> bool:
+        """Whether every competitor is a candidate (small catalog or no index)"""
+        return self._name_matrix is None and self._sku_matrix is None
+
+    def candidates(self, our_products: Sequence[ProductResponse]) -> List[np.ndarray]:
+        """
+        Candidate competitor positions per product.
+
+        Args:
+            our_products: Products to find candidates for
+
+        Returns:
+            One array of competitor positions per product, in input order
+        """
+        if self.exhaustive:
+            everything = np.arange(len(self.competitor_products))
+            return [everything for _ in our_products]
+
+        names = [normalize_text(p.name) for p in our_products]
+        skus = [normalize_text(p.normalized_sku) for p in our_products]
+        results: List[np.ndarray] = []
+
+        for start in range(0, len(our_products), self.query_chunk_size):
+            stop = start + self.query_chunk_size
+            scores = None
+            for vectorizer, matrix, texts, weight in (
+                (self._name_vectorizer, self._name_matrix, names[start:stop], NAME_WEIGHT),
+                (self._sku_vectorizer, self._sku_matrix, skus[start:stop], SKU_WEIGHT),
+            ):
+                if matrix is None:
+                    continue
+                part = (vectorizer.transform(texts) @ matrix.T) * weight
+                scores = part if scores is None else scores + part
+            scores = scores.tocsr()
+
+            for row, sku in enumerate(skus[start:stop]):
+                begin, end = scores.indptr[row], scores.indptr[row + 1]
+                columns, values = scores.indices[begin:end], scores.data[begin:end]
+                if len(values) > self.top_k:
+                    best = np.argpartition(-values, self.top_k - 1)[:self.top_k]
+                    columns = columns[best]
+                exact = self._by_sku.get(sku)
+                if exact:
+                    columns = np.union1d(columns, exact)
+                results.append(np.asarray(columns, dtype=np.int64))
+
+        return results
+
+    def match(
+        self,
+        our_products: Sequence[ProductResponse],
+        threshold: float
+    ) -> List[ProductEquivalenceMapping]:
+        """
+        Map products to equivalent competitor products.
+
+        Candidates are scored exactly as the pairwise scan does:
+        confidence = 0.7 * name ratio + 0.3 * SKU ratio.
+
+        Args:
+            our_products: Products to map
+            threshold: Minimum confidence of a mapping
+
+        Returns:
+            Mappings grouped by product (input order), competitors in catalog order
+        """
+        mappings = []
+        for our_product, positions in zip(our_products, self.candidates(our_products)):
+            our_name = normalize_text(our_product.name)
+            our_sku = normalize_text(our_product.normalized_sku)
+
+            for position in np.sort(positions):
+                name_similarity = sequence_similarity(our_name, self._names[position])
+                # Upper bound with a perfect SKU match - skip the second alignment if hopeless
+                if name_similarity * NAME_WEIGHT + SKU_WEIGHT < threshold:
+                    continue
+                sku_similarity = sequence_similarity(our_sku, self._skus[position])
+                confidence = (name_similarity * NAME_WEIGHT) + (sku_similarity * SKU_WEIGHT)
+
+                if confidence >= threshold:
+                    mappings.append(ProductEquivalenceMapping(
+                        our_product_id=our_product.id,
+                        competitor_product_id=self.competitor_products[position].id,
+                        confidence=confidence,
+                        mapping_type="exact_sku" if sku_similarity > 0.9 else "name_similarity"
+                    ))
+
+        return mappings
@@ -0,0 +1,350 @@
+"""
+Product Equivalence Store - Persisted product <-> competitor mappings
+
+Mappings produced by ``EnhancedPricingIntelligenceAgent.map_product_equivalences``
+are stored in the ``product_equivalence`` table and kept current from the
+product events on the event bus: every created, updated or deleted product
+is queued, and after a short debounce window only the queued products are
+rematched (our products against the competitor index, competitor products
+against our catalog). Pricing analyses read the stored mappings together
+with the competitor products in a single indexed join.
+
+Competitor products are products of the tenant flagged with
+``metadata['is_competitor']``.
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.models.product import Product
+from src.models.product_equivalence import ProductEquivalence
+from src.pricing.equivalence import ProductEquivalenceIndex
+from src.schemas.pricing import ProductEquivalenceMapping
+from src.schemas.product import ProductResponse
+
+logger = logging.getLogger(__name__)
+
+
+def is_competitor_product(product) -> bool:
+    """Whether a product (ORM row or schema) is a competitor listing"""
+    metadata = getattr(product, 'extra_metadata', None)
+    if metadata is None:
+        metadata = getattr(product, 'metadata', None)
+    return bool(isinstance(metadata, dict) and metadata.get('is_competitor'))
+
+
+class ProductEquivalenceStore:
+    """
+    Reads and maintains persisted equivalence mappings.
+
+    Matching (TF-IDF blocking plus fuzzy scoring) is CPU-bound and runs in
+    an executor; only the database I/O stays on the event loop.
+
+    TENANT ISOLATION:
+    All queries are filtered by the store's tenant_id.
+    """
+
+    def __init__(self, tenant_id: UUID, executor: Optional[Executor] = None):
+        """
+        Initialize store.
+
+        Args:
+            tenant_id: Tenant UUID for multi-tenancy isolation
+            executor: Executor for matching (defaults to the event loop's executor)
+        """
+        self.tenant_id = tenant_id
+        self._executor = executor
+
+    async def get_mappings(
+        self,
+        db: AsyncSession,
+        product_ids: Sequence[UUID]
+    ) -> Tuple[List[ProductEquivalenceMapping], List[ProductResponse]]:
+        """
+        Load stored mappings of our products with their competitor products.
+
+        Args:
+            db: Database session
+            product_ids: Our products
+
+        Returns:
+            (mappings, competitor products referenced by them)
+        """
+        if not product_ids:
+            return [], []
+
+        result = await db.execute(
+            select(ProductEquivalence, Product)
+            .join(Product, Product.id == ProductEquivalence.competitor_product_id)
+            .where(
+                ProductEquivalence.tenant_id == self.tenant_id,  # TENANT ISOLATION
+                ProductEquivalence.product_id.in_(list(product_ids))
+            )
+        )
+
+        mappings = []
+        competitors: Dict[UUID, ProductResponse] = {}
+        for row, competitor in result.all():
+            mappings.append(ProductEquivalenceMapping(
+                our_product_id=row.product_id,
+                competitor_product_id=row.competitor_product_id,
+                confidence=row.confidence,
+                mapping_type=row.mapping_type
+            ))
+            if competitor.id not in competitors:
+                competitors[competitor.id] = ProductResponse.model_validate(competitor)
+
+        return mappings, list(competitors.values())
+
+    async def mapped_products(self, db: AsyncSession, competitor_product_ids: Iterable[UUID]) -> Set[UUID]:
+        """
+        Our products currently mapped to any of the given competitor products.
+
+        Args:
+            db: Database session
+            competitor_product_ids: Competitor listings
+
+        Returns:
+            Set of our product ids
+        """
+        competitor_product_ids = list(competitor_product_ids)
+        if not competitor_product_ids:
+            return set()
+        result = await db.execute(
+            select(ProductEquivalence.product_id).where(
+                ProductEquivalence.tenant_id == self.tenant_id,  # TENANT ISOLATION
+                ProductEquivalence.competitor_product_id.in_(competitor_product_ids)
+            )
+        )
+        return set(result.scalars().all())
+
+    async def rematch(self, db: AsyncSession, product_ids: Iterable[UUID]) -> int:
+        """
+        Recompute the mappings that involve the given products (the caller commits).
+
+        Stored rows referencing any of the products are dropped; products
+        that still exist are matched again - ours against all competitors,
+        competitors against all of our products.
+
+        Args:
+            db: Database session
+            product_ids: Created, updated or deleted products
+
+        Returns:
+            Number of mappings written
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        if not product_ids:
+            return 0
+
+        await db.execute(
+            delete(ProductEquivalence).where(
+                ProductEquivalence.tenant_id == self.tenant_id,  # TENANT ISOLATION
+                or_(
+                    ProductEquivalence.product_id.in_(product_ids),
+                    ProductEquivalence.competitor_product_id.in_(product_ids)
+                )
+            )
+        )
+
+        ours, competitors = await self._load_catalog(db)
+        changed = set(product_ids)
+
+        mappings = await self._match_in_executor(
+            [p for p in ours if p.id in changed], competitors
+        ) + await self._match_in_executor(
+            [p for p in ours if p.id not in changed], [p for p in competitors if p.id in changed]
+        )
+        return await self._insert(db, mappings)
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """
+        Recompute all mappings of the tenant (the caller commits).
+
+        Returns:
+            Number of mappings written
+        """
+        await db.execute(
+            delete(ProductEquivalence).where(
+                ProductEquivalence.tenant_id == self.tenant_id  # TENANT ISOLATION
+            )
+        )
+        ours, competitors = await self._load_catalog(db)
+        return await self._insert(db, await self._match_in_executor(ours, competitors))
+
+    async def _load_catalog(self, db: AsyncSession) -> Tuple[List[ProductResponse], List[ProductResponse]]:
+        """Load the tenant's products split into (ours, competitors)"""
+        result = await db.execute(
+            select(Product).where(Product.tenant_id == self.tenant_id)  # TENANT ISOLATION
+        )
+        ours, competitors = [], []
+        for product in result.scalars().all():
+            schema = ProductResponse.model_validate(product)
+            (competitors if is_competitor_product(product) else ours).append(schema)
+        return ours, competitors
+
+    async def _match_in_executor(
+        self,
+        our_products: List[ProductResponse],
+        competitor_products: List[ProductResponse]
+    ) -> List[ProductEquivalenceMapping]:
+        """Run ``_match`` off the event loop"""
+        if not our_products or not competitor_products:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._match, our_products, competitor_products
+        )
+
+    def _match(
+        self,
+        our_products: List[ProductResponse],
+        competitor_products: List[ProductResponse]
+    ) -> List[ProductEquivalenceMapping]:
+        """Match with the pricing agent's scoring and threshold"""
+        from src.agents.pricing_intelligence_v2 import EnhancedPricingIntelligenceAgent
+
+        if not our_products or not competitor_products:
+            return []
+        agent = EnhancedPricingIntelligenceAgent(tenant_id=self.tenant_id)
+        return agent.map_product_equivalences(
+            our_products, competitor_products, ProductEquivalenceIndex(competitor_products)
+        )
+
+    async def _insert(self, db: AsyncSession, mappings: List[ProductEquivalenceMapping]) -> int:
+        """Bulk insert mappings"""
+        if not mappings:
+            return 0
+        now = datetime.utcnow()
+        await db.execute(insert(ProductEquivalence), [
+            {
+                'tenant_id': self.tenant_id,
+                'product_id': m.our_product_id,
+                'competitor_product_id': m.competitor_product_id,
+                'confidence': m.confidence,
+                'mapping_type': m.mapping_type,
+                'matched_at': now
+            }
+            for m in mappings
+        ])
+        await db.flush()
+        return len(mappings)
+
+
+class ProductEquivalenceMaintainer:
+    """
+    Subscribes to product events and rematches the affected products.
+
+    Events are only queued in the handler; a per-tenant task rematches the
+    queued products after ``debounce_seconds`` in its own session, so the
+    publishing transaction has committed and bulk uploads are coalesced
+    into a single rematch. The competitor price snapshots of every product
+    whose mappings or competitor prices may have changed are refreshed in
+    the same transaction.
+    """
+
+    def __init__(
+        self,
+        event_publisher,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        debounce_seconds: Optional[float] = None
+    ):
+        """
+        Initialize maintainer.
+
+        Args:
+            event_publisher: EventPublisher to subscribe to
+            session_factory: Creates database sessions (defaults to AsyncSessionLocal)
+            debounce_seconds: Delay before queued products are rematched (defaults to settings)
+        """
+        from src.cache.event_bus import EventType
+
+        self._session_factory = session_factory
+        self.debounce_seconds = (
+            settings.product_equivalence_debounce_seconds
+            if debounce_seconds is None else debounce_seconds
+        )
+        self._pending: Dict[UUID, Set[UUID]] = {}
+        self._tasks: Dict[UUID, asyncio.Task] = {}
+
+        for event_type in (EventType.PRODUCT_CREATED, EventType.PRODUCT_UPDATED, EventType.PRODUCT_DELETED):
+            event_publisher.subscribe(event_type, self.handle_event)
+
+    async def handle_event(self, event):
+        """Queue the event's products for rematching"""
+        try:
+            product_ids = {UUID(str(entity_id)) for entity_id in event.all_entity_ids}
+        except ValueError:
+            logger.warning(f"Ignoring product event with invalid id: {event}")
+            return
+
+        self._pending.setdefault(event.tenant_id, set()).update(product_ids)
+        if event.tenant_id not in self._tasks:
+            task = asyncio.get_running_loop().create_task(self._flush(event.tenant_id))
+            self._tasks[event.tenant_id] = task
+
+    async def _flush(self, tenant_id: UUID):
+        """Rematch everything queued for a tenant"""
+        await asyncio.sleep(self.debounce_seconds)
+        self._tasks.pop(tenant_id, None)
+        product_ids = self._pending.pop(tenant_id, set())
+        if not product_ids:
+            return
+
+        session_factory = self._session_factory
+        if session_factory is None:
+            from src.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        from src.pricing.competitor_snapshots import CompetitorSnapshotService
+
+        store = ProductEquivalenceStore(tenant_id)
+        snapshots = CompetitorSnapshotService(tenant_id)
+        async with session_factory() as db:
+            try:
+                # Our products mapped to changed competitors, before and after rematching
+                affected = set(product_ids) | await store.mapped_products(db, product_ids)
+                written = await store.rematch(db, product_ids)
+                affected |= await store.mapped_products(db, product_ids)
+                refreshed = await snapshots.refresh(db, affected)
+                await db.commit()
+                logger.info(
+                    f"Rematched {len(product_ids)} products for tenant {tenant_id} "
+                    f"({written} equivalence mappings, {refreshed} competitor snapshots)"
+                )
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Product equivalence rematch failed for tenant {tenant_id}: {e}")
+                return
+        await snapshots.invalidate_cache()
+
+    async def drain(self):
+        """Wait until all queued rematches have run"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+
+# Global instance
+_maintainer: Optional[ProductEquivalenceMaintainer] = None
+
+
+def initialize_product_equivalence_maintenance() -> Optional[ProductEquivalenceMaintainer]:
+    """Subscribe the equivalence maintainer to the global event publisher"""
+    global _maintainer
+    if _maintainer is None and settings.product_equivalence_maintenance_enabled:
+        from src.cache.event_bus import get_event_publisher
+        _maintainer = ProductEquivalenceMaintainer(get_event_publisher())
+        logger.info("Product equivalence maintenance initialized")
+    return _maintainer
+
+
+def get_product_equivalence_maintainer() -> Optional[ProductEquivalenceMaintainer]:
+    """Get the global equivalence maintainer (None until initialized)"""
+    return _maintainer
@@ -0,0 +1,517 @@
+"""
+Bulk Pricing Recommendations - Catalog-wide, vectorized repricing review
+
+``GET /pricing/recommendations/{product_id}`` evaluates one product per
+request with three queries and scalar Python. The bulk engine walks a
+tenant's catalog in keyset pages; each page is loaded with three set-based
+queries (products, ``market_analysis``, ``competitor_pricing``) and the
+competitive, premium and margin strategies are computed with NumPy for all
+products of the page at once, using the same rules and confidence factors as
+the single-product endpoint:
+
+1. Competitive: move towards the competitor average (or the cheapest
+   competitor) when priced above the market
+2. Premium: move up towards the most expensive competitor
+3. Margin: elasticity-based profit-maximizing price P* = cost / (1 + 1/e)
+
+Products without competitor rows are compared with the same synthetic
+competitors (85%, 115% and 95% of the current price) as the endpoint.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.models.product import Product
+from src.pricing.equivalence_store import is_competitor_product
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ELASTICITY = -1.5
+DEFAULT_COST_RATIO = 0.6  # Cost estimate when a product has none
+MOCK_COMPETITOR_RATIOS = np.array([0.85, 1.15, 0.95])
+
+_MARKET_ANALYSIS_QUERY = text("""
+    SELECT product_id, market_position, price_elasticity
+    FROM market_analysis
+    WHERE tenant_id = :tenant_id AND product_id IN :product_ids
+""").bindparams(bindparam('product_ids', expanding=True))
+
+_COMPETITOR_PRICING_QUERY = text("""
+    SELECT product_id, competitor_price
+    FROM competitor_pricing
+    WHERE tenant_id = :tenant_id AND product_id IN :product_ids
+      AND competitor_price IS NOT NULL
+""").bindparams(bindparam('product_ids', expanding=True))
+
+
+@dataclass
+class PricingInputs:
+    """Column arrays for one page of products"""
+    product_ids: List[UUID]
+    names: List[str]
+    skus: List[str]
+    price: np.ndarray
+    cost: np.ndarray
+    elasticity: np.ndarray          # NaN where no market analysis exists
+    market_position: List[Optional[str]]
+    competitor_owner: np.ndarray    # Product position of each competitor price
+    competitor_price: np.ndarray
+    mock_competitors: np.ndarray    # Whether synthetic competitors were used
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+
+@dataclass
+class RecommendationPage:
+    """Recommendations for one keyset page of the catalog"""
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[UUID]
+    products_scanned: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "next_cursor": str(self.next_cursor) if self.next_cursor else None,
+            "products_scanned": self.products_scanned
+        }
+
+
+@dataclass
+class StrategyColumns:
+    """Vectorized strategy results; ``mask`` marks products receiving the strategy"""
+    mask: np.ndarray
+    suggested_price: np.ndarray
+    profit_margin: np.ndarray
+    confidence: np.ndarray
+    variant: Optional[np.ndarray] = None
+    factors: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+def _margin(price: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    """Profit margin in percent of price"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (price - cost) / price * 100
+
+
+def competitive_strategy(
+    price: np.ndarray,
+    cost: np.ndarray,
+    competitor_min: np.ndarray,
+    competitor_avg: np.ndarray,
+    competitor_count: np.ndarray
+) -> StrategyColumns:
+    """
+    Competitive price adjustment.
+
+    Variants: 0 = 5% below average, 1 = conservative (5% above average,
+    when the reduction would leave less than 5% margin), 2 = 5% above the
+    cheapest competitor (priced >10% above it but not above average).
+    """
+    above_average = price > competitor_avg
+    below_average_price = competitor_avg * 0.95
+    below_average_margin = _margin(below_average_price, cost)
+    aggressive = above_average & (below_average_margin > 5)
+    conservative = above_average & ~(below_average_margin > 5)
+
+    undercut_price = competitor_min * 1.05
+    undercut_margin = _margin(undercut_price, cost)
+    undercut = ~above_average & (price > competitor_min * 1.1) & (undercut_margin > 0)
+
+    conservative_price = competitor_avg * 1.05
+    suggested = np.select(
+        [aggressive, conservative, undercut],
+        [below_average_price, conservative_price, undercut_price],
+        default=np.nan
+    )
+    margin = np.select(
+        [aggressive, conservative, undercut],
+        [below_average_margin, _margin(conservative_price, cost), undercut_margin],
+        default=np.nan
+    )
+
+    above_ratio = (price - competitor_avg) / competitor_avg
+    aggressive_confidence = (
+        np.minimum(0.95, 0.6 + above_ratio * 1.5)
+        + np.minimum(0.9, below_average_margin / 50)
+        + np.minimum(0.85, 0.4 + competitor_count * 0.15)
+    ) / 3
+    confidence = np.select(
+        [aggressive, conservative, undercut],
+        [aggressive_confidence, 0.75, 0.85],
+        default=np.nan
+    )
+
+    return StrategyColumns(
+        mask=aggressive | conservative | undercut,
+        suggested_price=suggested,
+        profit_margin=margin,
+        confidence=confidence,
+        variant=np.select([aggressive, conservative, undercut], [0, 1, 2], default=-1)
+    )
+
+
+def premium_strategy(
+    price: np.ndarray,
+    cost: np.ndarray,
+    competitor_min: np.ndarray,
+    competitor_max: np.ndarray,
+    competitor_avg: np.ndarray,
+    competitor_count: np.ndarray
+) -> StrategyColumns:
+    """Premium positioning: up to 15% higher, just below the most expensive competitor"""
+    suggested = np.minimum(competitor_max * 0.98, price * 1.15)
+    margin = _margin(suggested, cost)
+
+    factors = {
+        "price_gap_factor": np.minimum(0.9, 0.4 + (competitor_max - price) / price * 0.5),
+        "competitor_data_factor": np.minimum(0.8, 0.3 + competitor_count * 0.1),
+        "profit_margin_factor": np.minimum(0.9, margin / 100),
+        "market_stability_factor": np.maximum(0.4, 0.8 - (competitor_max - competitor_min) / competitor_avg),
+        "price_increase_factor": np.maximum(0.5, 0.9 - (suggested - price) / price * 2)
+    }
+    confidence = sum(factors.values()) / len(factors)
+
+    return StrategyColumns(
+        mask=price < competitor_max,
+        suggested_price=suggested,
+        profit_margin=margin,
+        confidence=confidence,
+        factors=factors
+    )
+
+
+def margin_strategy(
+    price: np.ndarray,
+    cost: np.ndarray,
+    elasticity: np.ndarray,
+    competitor_min: np.ndarray,
+    competitor_max: np.ndarray
+) -> StrategyColumns:
+    """Profit-maximizing price for elastic demand, bounded by the competitor range"""
+    elastic = elasticity < -1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        optimal = cost / (1 + 1 / elasticity)
+    optimal = np.maximum(np.minimum(optimal, competitor_max * 1.1), competitor_min * 0.9)
+    margin = _margin(optimal, cost)
+
+    return StrategyColumns(
+        mask=elastic & (np.abs(optimal - price) > price * 0.02),
+        suggested_price=optimal,
+        profit_margin=margin,
+        confidence=np.full(len(price), 0.78)
+    )
+
+
+class BulkPricingRecommendationEngine:
+    """
+    Computes pricing recommendations for a tenant's whole catalog.
+
+    TENANT ISOLATION:
+    All queries are filtered by the engine's tenant_id.
+    """
+
+    def __init__(self, tenant_id: UUID, page_size: Optional[int] = None):
+        """
+        Initialize engine.
+
+        Args:
+            tenant_id: Tenant UUID for multi-tenancy isolation
+            page_size: Products per keyset page (defaults to settings)
+        """
+        self.tenant_id = tenant_id
+        self.page_size = page_size or settings.pricing_bulk_page_size
+
+    async def load_page(
+        self,
+        db: AsyncSession,
+        after: Optional[UUID] = None
+    ) -> Tuple[PricingInputs, Optional[UUID]]:
+        """
+        Load one page of products with their market analysis and competitor prices.
+
+        Args:
+            db: Database session
+            after: Keyset cursor (last product id of the previous page)
+
+        Returns:
+            (PricingInputs for our priced products, last product id scanned or None at the end)
+        """
+        query = (
+            select(Product.id, Product.name, Product.sku, Product.price, Product.cost, Product.extra_metadata)
+            .where(Product.tenant_id == self.tenant_id)  # TENANT ISOLATION
+            .order_by(Product.id)
+            .limit(self.page_size)
+        )
+        if after is not None:
+            query = query.where(Product.id > after)
+        rows = (await db.execute(query)).all()
+        last_id = rows[-1].id if rows else None
+
+        # Competitor listings are matched to our products, not repriced
+        rows = [
+            row for row in rows
+            if not is_competitor_product(row) and row.price is not None and row.price > 0
+        ]
+        position = {str(row.id): i for i, row in enumerate(rows)}
+
+        price = np.array([float(row.price) for row in rows], dtype=float)
+        cost = np.array([float(row.cost) if row.cost is not None else np.nan for row in rows], dtype=float)
+        cost = np.where(np.isnan(cost), price * DEFAULT_COST_RATIO, cost)
+
+        elasticity = np.full(len(rows), np.nan)
+        market_position: List[Optional[str]] = [None] * len(rows)
+        owner: List[int] = []
+        competitor_price: List[float] = []
+
+        if rows:
+            params = {"tenant_id": str(self.tenant_id), "product_ids": list(position)}
+            seen = set()
+            for product_id, market, product_elasticity in await db.execute(_MARKET_ANALYSIS_QUERY, params):
+                i = position.get(str(product_id))
+                if i is None or i in seen:
+                    continue
+                seen.add(i)
+                market_position[i] = market
+                if product_elasticity is not None:
+                    elasticity[i] = float(product_elasticity)
+
+            for product_id, value in await db.execute(_COMPETITOR_PRICING_QUERY, params):
+                i = position.get(str(product_id))
+                if i is not None:
+                    owner.append(i)
+                    competitor_price.append(float(value))
+
+        owner_array = np.array(owner, dtype=np.int64)
+        competitor_array = np.array(competitor_price, dtype=float)
+
+        # Synthetic competitors around the current price where none are stored
+        mock = np.bincount(owner_array, minlength=len(rows)) == 0
+        missing = np.flatnonzero(mock)
+        if len(missing):
+            owner_array = np.concatenate([owner_array, np.repeat(missing, len(MOCK_COMPETITOR_RATIOS))])
+            competitor_array = np.concatenate([
+                competitor_array, (price[missing, None] * MOCK_COMPETITOR_RATIOS).ravel()
+            ])
+
+        inputs = PricingInputs(
+            product_ids=[row.id for row in rows],
+            names=[row.name for row in rows],
+            skus=[row.sku for row in rows],
+            price=price,
+            cost=cost,
+            elasticity=elasticity,
+            market_position=market_position,
+            competitor_owner=owner_array,
+            competitor_price=competitor_array,
+            mock_competitors=mock
+        )
+        return inputs, last_id
+
+    def compute(self, inputs: PricingInputs) -> List[Dict[str, Any]]:
+        """
+        Evaluate all strategies for a page of products.
+
+        Args:
+            inputs: Column arrays from ``load_page``
+
+        Returns:
+            One result per product: market summary and recommendations
+            sorted by (confidence, profit margin), highest first
+        """
+        n = len(inputs)
+        if n == 0:
+            return []
+
+        price, cost = inputs.price, inputs.cost
+        owner, competitor_price = inputs.competitor_owner, inputs.competitor_price
+
+        count = np.bincount(owner, minlength=n).astype(float)
+        competitor_avg = np.bincount(owner, weights=competitor_price, minlength=n) / count
+        competitor_min = np.full(n, np.inf)
+        competitor_max = np.full(n, -np.inf)
+        np.minimum.at(competitor_min, owner, competitor_price)
+        np.maximum.at(competitor_max, owner, competitor_price)
+
+        elasticity = np.where(
+            np.isnan(inputs.elasticity) | (inputs.elasticity == 0), DEFAULT_ELASTICITY, inputs.elasticity
+        )
+
+        competitive = competitive_strategy(price, cost, competitor_min, competitor_avg, count)
+        premium = premium_strategy(price, cost, competitor_min, competitor_max, competitor_avg, count)
+        margin = margin_strategy(price, cost, elasticity, competitor_min, competitor_max)
+        current_margin = _margin(price, cost)
+
+        results = []
+        for i in range(n):
+            recommendations = []
+            if competitive.mask[i]:
+                recommendations.append(self._competitive(i, competitive, price, competitor_min, competitor_avg))
+            if premium.mask[i]:
+                recommendations.append(self._premium(i, premium, price, competitor_max))
+            if margin.mask[i]:
+                recommendations.append(self._margin(i, margin, price, elasticity))
+            recommendations.sort(key=lambda r: (r["confidence"], r["profit_margin"]), reverse=True)
+
+            results.append({
+                "product_id": str(inputs.product_ids[i]),
+                "product_name": inputs.names[i],
+                "product_sku": inputs.skus[i],
+                "recommendations": recommendations,
+                "market_analysis": {
+                    "current_price": float(price[i]),
+                    "product_cost": float(cost[i]),
+                    "current_margin": round(float(current_margin[i]), 1),
+                    "competitor_price_range": {
+                        "min": float(competitor_min[i]),
+                        "max": float(competitor_max[i]),
+                        "average": round(float(competitor_avg[i]), 2)
+                    },
+                    "competitor_count": int(count[i]),
+                    "synthetic_competitors": bool(inputs.mock_competitors[i]),
+                    "market_position": inputs.market_position[i] or "competitive",
+                    "price_elasticity": float(elasticity[i])
+                }
+            })
+        return results
+
+    async def iter_pages(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        cursor: Optional[UUID] = None,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[RecommendationPage]:
+        """
+        Walk the catalog page by page.
+
+        Each page is loaded in its own short-lived session, so a long
+        stream does not hold a connection between pages.
+
+        Args:
+            session_factory: Creates database sessions (defaults to AsyncSessionLocal)
+            cursor: Resume after this product id
+            max_pages: Stop after this many pages (None = whole catalog)
+
+        Yields:
+            RecommendationPage per keyset page
+        """
+        if session_factory is None:
+            from src.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            async with session_factory() as db:
+                inputs, last_id = await self.load_page(db, cursor)
+            if last_id is None:
+                return
+
+            items = self.compute(inputs)
+            pages += 1
+            cursor = last_id
+            yield RecommendationPage(items=items, next_cursor=cursor, products_scanned=len(inputs))
+
+    @staticmethod
+    def _competitive(i, strategy: StrategyColumns, price, competitor_min, competitor_avg) -> Dict[str, Any]:
+        current, suggested = float(price[i]), float(strategy.suggested_price[i])
+        margin, average = float(strategy.profit_margin[i]), float(competitor_avg[i])
+        variant = int(strategy.variant[i])
+
+        if variant == 0:
+            return {
+                "id": "competitive_pricing",
+                "type": "competitive",
+                "title": "Competitive Price Adjustment",
+                "current_price": current,
+                "suggested_price": round(suggested, 2),
+                "profit_margin": round(margin, 1),
+                "expected_impact": {
+                    "revenue_change": "+15-25%",
+                    "volume_change": "+30-50%",
+                    "market_share": "+5-10%"
+                },
+                "confidence": round(float(strategy.confidence[i]), 2),
+                "reasoning": f"Your price (₹{current:.2f}) is {((current - average) / average * 100):.1f}% above market average (₹{average:.2f}). Reducing to ₹{suggested:.2f} could increase sales volume significantly while maintaining {margin:.1f}% profit margin."
+            }
+        if variant == 1:
+            return {
+                "id": "conservative_competitive_pricing",
+                "type": "competitive",
+                "title": "Conservative Price Reduction",
+                "current_price": current,
+                "suggested_price": round(suggested, 2),
+                "profit_margin": round(margin, 1),
+                "expected_impact": {
+                    "revenue_change": "+8-15%",
+                    "volume_change": "+15-25%",
+                    "market_share": "+2-5%"
+                },
+                "confidence": 0.75,
+                "reasoning": f"Your price (₹{current:.2f}) is significantly above market average (₹{average:.2f}). A conservative reduction to ₹{suggested:.2f} maintains competitiveness while preserving {margin:.1f}% profit margin."
+            }
+        lowest = float(competitor_min[i])
+        return {
+            "id": "undercut_competition",
+            "type": "competitive",
+            "title": "Undercut Competition Strategy",
+            "current_price": current,
+            "suggested_price": round(suggested, 2),
+            "profit_margin": round(margin, 1),
+            "expected_impact": {
+                "revenue_change": "+20-35%",
+                "volume_change": "+40-60%",
+                "market_share": "+10-15%"
+            },
+            "confidence": 0.85,
+            "reasoning": f"Your price (₹{current:.2f}) is much higher than the lowest competitor (₹{lowest:.2f}). Positioning at ₹{suggested:.2f} could capture significant market share while maintaining {margin:.1f}% margin."
+        }
+
+    @staticmethod
+    def _premium(i, strategy: StrategyColumns, price, competitor_max) -> Dict[str, Any]:
+        current, suggested = float(price[i]), float(strategy.suggested_price[i])
+        margin, highest = float(strategy.profit_margin[i]), float(competitor_max[i])
+        factors = {name: float(values[i]) for name, values in strategy.factors.items()}
+
+        return {
+            "id": "premium_positioning",
+            "type": "premium",
+            "title": "Premium Market Positioning",
+            "current_price": current,
+            "suggested_price": round(suggested, 2),
+            "profit_margin": round(margin, 1),
+            "expected_impact": {
+                "revenue_change": "+8-15%",
+                "volume_change": "-5-10%",
+                "profit_increase": "+20-35%"
+            },
+            "confidence": round(float(strategy.confidence[i]), 2),
+            "confidence_breakdown": {name: round(value, 2) for name, value in factors.items()},
+            "reasoning": f"Market can support higher prices up to ${highest:.2f}. Increasing to ${suggested:.2f} positions you as premium while maximizing profit margin ({margin:.1f}%). Confidence based on: price gap ({factors['price_gap_factor']:.0%}), competitor data ({factors['competitor_data_factor']:.0%}), profit safety ({factors['profit_margin_factor']:.0%}), market stability ({factors['market_stability_factor']:.0%}), reasonable increase ({factors['price_increase_factor']:.0%})."
+        }
+
+    @staticmethod
+    def _margin(i, strategy: StrategyColumns, price, elasticity) -> Dict[str, Any]:
+        current, suggested = float(price[i]), float(strategy.suggested_price[i])
+        margin, product_elasticity = float(strategy.profit_margin[i]), float(elasticity[i])
+
+        return {
+            "id": "max_profit_optimization",
+            "type": "optimization",
+            "title": "Maximum Profit Optimization",
+            "current_price": current,
+            "suggested_price": round(suggested, 2),
+            "profit_margin": round(margin, 1),
+            "expected_impact": {
+                "profit_increase": f"+{((suggested - current) / current * 100):.1f}%",
+                "revenue_optimization": "Maximized",
+                "elasticity_factor": f"{product_elasticity:.2f}"
+            },
+            "confidence": 0.78,
+            "reasoning": f"Based on demand elasticity ({product_elasticity:.2f}), optimal price for maximum profit is ${suggested:.2f}. This balances volume and margin for highest total profit ({margin:.1f}% margin)."
+        }
@@ -0,0 +1,362 @@
+"""
+QA Report Cache - Memoized data quality reports shared across agents
+
+Data quality reports are keyed on tenant, report kind (products or reviews)
+and the set of products assessed, and tagged with the tenant's data
+generation. Every product or review event on the event bus advances the
+tenant's generation and records which products it touched, so a cached
+report is:
+
+- reused as-is when none of its products were touched since it was built
+  (the pricing and data QA agents of one request, and later requests,
+  share one assessment);
+- updated incrementally when some were: the cached columns of untouched
+  entities are kept and only the touched products' rows are extracted
+  again before the vectorized assessment runs;
+- rebuilt from scratch when it expired or the cache cannot tell what changed.
+
+Entries live in process memory (one cache per worker process) and are
+bounded by an LRU policy.
+"""
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from src.processing.quality_columns import ProductColumns, ReviewColumns
+from src.schemas.data_quality import DataQualityReport
+from src.schemas.product import ProductResponse
+from src.schemas.review import ReviewResponse
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_REPORT = "products"
+REVIEW_REPORT = "reviews"
+
+
+def _id_key(value) -> int:
+    """Integer form of a UUID or UUID string (hashes far faster than UUID objects)"""
+    return (value if isinstance(value, UUID) else UUID(str(value))).int
+
+
+@dataclass
+class CachedQAReport:
+    """A data quality report with the columns it was computed from"""
+    report: DataQualityReport
+    columns: Any  # ProductColumns or ReviewColumns
+    product_ids: FrozenSet[int]  # UUID.int of the assessed products
+    generation: int
+    computed_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class QAReportCache:
+    """
+    Bounded LRU cache of data quality reports with per-tenant data generations.
+
+    Thread-safe so it can be shared by thread-pool agent workers.
+    """
+
+    DEFAULT_MAX_ENTRIES = 256
+    DEFAULT_MAX_TOUCHED = 100_000
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = 900,
+        max_touched_per_tenant: int = DEFAULT_MAX_TOUCHED
+    ):
+        """
+        Initialize report cache.
+
+        Args:
+            max_entries: Maximum number of reports kept before LRU eviction
+            ttl_seconds: Age after which a report is rebuilt (freshness is time dependent)
+            max_touched_per_tenant: Touched products remembered per tenant; beyond
+                that all reports of the tenant are rebuilt
+        """
+        self.max_entries = max_entries
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_touched_per_tenant = max_touched_per_tenant
+        self._entries: "OrderedDict[Tuple[UUID, str, FrozenSet[int]], CachedQAReport]" = OrderedDict()
+        self._generations: Dict[UUID, int] = {}
+        self._touched: Dict[UUID, Dict[int, int]] = {}  # product_id.int -> generation of last change
+        self._floors: Dict[UUID, int] = {}  # Reports older than this are rebuilt
+        self._lock = Lock()
+        self._metrics = {
+            'hits': 0,
+            'incremental_updates': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    # ==================== Data generations ====================
+
+    def generation(self, tenant_id: UUID) -> int:
+        """Current data generation of a tenant"""
+        with self._lock:
+            return self._generations.get(tenant_id, 0)
+
+    def mark_changed(self, tenant_id: UUID, product_ids: Optional[Iterable] = None) -> int:
+        """
+        Advance the tenant's data generation.
+
+        Args:
+            tenant_id: Tenant whose data changed
+            product_ids: Products whose own data or reviews changed (None: unknown,
+                every report of the tenant is rebuilt)
+
+        Returns:
+            The new generation
+        """
+        with self._lock:
+            generation = self._generations.get(tenant_id, 0) + 1
+            self._generations[tenant_id] = generation
+
+            touched = self._touched.setdefault(tenant_id, {})
+            if product_ids is None:
+                self._floors[tenant_id] = generation
+                touched.clear()
+                return generation
+
+            for product_id in product_ids:
+                touched[_id_key(product_id)] = generation
+            if len(touched) > self.max_touched_per_tenant:
+                self._floors[tenant_id] = generation
+                touched.clear()
+            return generation
+
+    def subscribe(self, event_publisher):
+        """Advance generations from product and review events (of every worker)"""
+        from src.cache.event_bus import EventType
+
+        for event_type in (
+            EventType.PRODUCT_CREATED, EventType.PRODUCT_UPDATED, EventType.PRODUCT_DELETED,
+            EventType.PRICE_UPDATED, EventType.INVENTORY_UPDATED,
+            EventType.REVIEW_CREATED, EventType.REVIEW_UPDATED
+        ):
+            event_publisher.subscribe(event_type, self.handle_event, all_workers=True)
+
+    async def handle_event(self, event):
+        """Record the products touched by an event (or batch event)"""
+        try:
+            product_ids = [UUID(str(product_id)) for product_id in event.product_ids or ()] or None
+        except ValueError:
+            product_ids = None
+        self.mark_changed(event.tenant_id, product_ids)
+
+    def _changed_products(self, tenant_id: UUID, entry: CachedQAReport) -> Optional[Set[int]]:
+        """Products of the entry changed since it was built (None if unknown)"""
+        if entry.generation < self._floors.get(tenant_id, 0):
+            return None
+        return {
+            product_id
+            for product_id, generation in self._touched.get(tenant_id, {}).items()
+            if generation > entry.generation and product_id in entry.product_ids
+        }
+
+    # ==================== Reports ====================
+
+    def get_product_report(
+        self,
+        agent,
+        products: Sequence[ProductResponse],
+        product_ids: Optional[Iterable] = None
+    ) -> DataQualityReport:
+        """
+        Data quality report of products, reused or updated from the cache.
+
+        Args:
+            agent: DataQAAgent of the tenant
+            products: Current products to assess
+            product_ids: Requested product set (defaults to the products' ids)
+
+        Returns:
+            Data quality report
+        """
+        return self._get_report(
+            agent, PRODUCT_REPORT, products,
+            product_ids if product_ids is not None else [p.id for p in products],
+            owner=lambda p: p.id.int,
+            extract=lambda items, now: ProductColumns.from_products(
+                items, agent.required_product_fields, now=now
+            ),
+            assess=agent.assess_product_columns,
+            assess_empty=agent.assess_product_data_quality
+        )
+
+    def get_review_report(
+        self,
+        agent,
+        reviews: Sequence[ReviewResponse],
+        product_ids: Optional[Iterable] = None
+    ) -> DataQualityReport:
+        """
+        Data quality report of reviews, reused or updated from the cache.
+
+        Args:
+            agent: DataQAAgent of the tenant
+            reviews: Current reviews of the products
+            product_ids: Products whose reviews are assessed (defaults to the reviewed products)
+
+        Returns:
+            Data quality report
+        """
+        return self._get_report(
+            agent, REVIEW_REPORT, reviews,
+            product_ids if product_ids is not None else [r.product_id for r in reviews],
+            owner=lambda r: r.product_id.int,
+            extract=lambda items, now: ReviewColumns.from_reviews(items, now=now),
+            assess=agent.assess_review_columns,
+            assess_empty=agent.assess_review_data_quality
+        )
+
+    def _get_report(
+        self,
+        agent,
+        kind: str,
+        entities: Sequence,
+        product_ids: Iterable,
+        owner: Callable[[Any], int],
+        extract: Callable[[Sequence, datetime], Any],
+        assess: Callable[[Any], DataQualityReport],
+        assess_empty: Callable[[Sequence], DataQualityReport]
+    ) -> DataQualityReport:
+        """Look up, update or compute a report"""
+        tenant_id = agent.tenant_id
+        product_ids = frozenset(map(_id_key, product_ids))
+        key = (tenant_id, kind, product_ids)
+        now = datetime.utcnow()
+
+        with self._lock:
+            generation = self._generations.get(tenant_id, 0)
+            entry = self._entries.get(key)
+            changed = None
+            if entry is not None and now - entry.computed_at <= self.ttl:
+                self._entries.move_to_end(key)
+                changed = self._changed_products(tenant_id, entry)
+
+        if not entities:
+            return assess_empty(entities)
+
+        columns = None
+        if changed is not None:
+            if not changed and len(entities) == len(entry.columns):
+                self.record('hits')
+                return entry.report
+            columns = self._update_columns(entry.columns, entities, changed, owner, extract, now)
+
+        if columns is not None:
+            self.record('incremental_updates')
+            computed_at = entry.computed_at  # Rebuilt from scratch once the TTL expires
+        else:
+            self.record('misses')
+            columns = extract(entities, now)
+            computed_at = now
+
+        report = assess(columns)
+        self.put(key, CachedQAReport(
+            report=report,
+            columns=columns,
+            product_ids=product_ids,
+            generation=generation,
+            computed_at=computed_at
+        ))
+        return report
+
+    @staticmethod
+    def _update_columns(
+        cached,
+        entities: Sequence,
+        changed: Set[int],
+        owner: Callable[[Any], int],
+        extract: Callable[[Sequence, datetime], Any],
+        now: datetime
+    ):
+        """
+        Columns of ``entities`` from cached rows plus rows of the changed products.
+
+        Returns None when the cached rows do not account for the unchanged
+        entities (e.g. data changed without an event).
+        """
+        kept = [i for i, entity in enumerate(cached.entities) if owner(entity) not in changed]
+        fresh = [entity for entity in entities if owner(entity) in changed]
+        if len(kept) + len(fresh) != len(entities):
+            return None
+
+        combined = cached.take(kept).concat(extract(fresh, now)).at(now)
+        positions = {entity.id.int: i for i, entity in enumerate(combined.entities)}
+        try:
+            order = [positions[entity.id.int] for entity in entities]
+        except KeyError:
+            return None
+        return combined.take(order)
+
+    # ==================== Storage ====================
+
+    def put(self, key: Tuple[UUID, str, FrozenSet[int]], entry: CachedQAReport):
+        """Store a report, evicting least recently used entries"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics['evictions'] += 1
+
+    def invalidate(self, tenant_id: UUID) -> int:
+        """
+        Drop all reports of a tenant.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == tenant_id]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+    def record(self, outcome: str):
+        """Record a lookup outcome ('hits', 'incremental_updates' or 'misses')"""
+        with self._lock:
+            self._metrics[outcome] += 1
+
+    def clear(self):
+        """Remove all entries and generations"""
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._touched.clear()
+            self._floors.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self._metrics['hits'] + self._metrics['incremental_updates'] + self._metrics['misses']
+            reused = self._metrics['hits'] + self._metrics['incremental_updates']
+            return {
+                **self._metrics,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'reuse_rate_percent': round(reused / lookups * 100, 2) if lookups else 0.0
+            }
+
+
+# Global instance (one per process)
+_report_cache: Optional[QAReportCache] = None
+
+
+def get_qa_report_cache() -> QAReportCache:
+    """Get or create the process-wide QA report cache (subscribed to the global event publisher)"""
+    global _report_cache
+    if _report_cache is None:
+        from src.cache.event_bus import get_event_publisher
+        from src.config import settings
+        _report_cache = QAReportCache(
+            max_entries=settings.qa_report_cache_size,
+            ttl_seconds=settings.qa_report_cache_ttl_seconds
+        )
+        _report_cache.subscribe(get_event_publisher())
+    return _report_cache
@@ -0,0 +1,292 @@
+"""
+Columnar views of products and reviews for data quality assessment
+
+The Data QA Agent scores several quality dimensions and detects anomalies
+over the same entities. Instead of walking the entity list once per check,
+each assessment extracts every field it needs once into NumPy arrays and
+pandas string columns; every dimension is then a vectorized expression over
+those columns.
+
+Character-level review checks (uppercase ratio, runs of a repeated
+character) work on one concatenated code point array, so they do not loop
+over characters in Python either.
+
+Column sets can be sliced (``take``) and appended (``concat``) row-wise, so
+a cached column set can be updated for a few changed entities instead of
+being rebuilt.
+"""
+import re
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.schemas.product import ProductResponse
+from src.schemas.review import ReviewResponse
+
+NANOSECONDS_PER_DAY = 86_400_000_000_000
+_SEPARATOR = 0x110000  # Outside the Unicode range - never equal to a real character
+_NEWLINE = ord("\n")
+
+
+def _timestamps(values: List[Optional[datetime]]) -> np.ndarray:
+    """datetime64[ns] array (NaT where the timestamp is missing)"""
+    return pd.DatetimeIndex(values).to_numpy().astype('datetime64[ns]')
+
+
+def _floats(values: List) -> np.ndarray:
+    """Float array with NaN for None"""
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def older_than(ages: np.ndarray, days: float) -> np.ndarray:
+    """``age > timedelta(days=days)``, False where the timestamp is missing"""
+    return ages > np.timedelta64(int(days * NANOSECONDS_PER_DAY), 'ns')
+
+
+def age_in_days(ages: np.ndarray) -> np.ndarray:
+    """Whole days like ``timedelta.days`` (NaN where the timestamp is missing)"""
+    days = np.full(len(ages), np.nan)
+    present = ~np.isnat(ages)
+    days[present] = ages[present].astype(np.int64) // NANOSECONDS_PER_DAY
+    return days
+
+
+def contains_any(texts: pd.Series, words: Sequence[str]) -> np.ndarray:
+    """Whether each text contains any of the words as a substring"""
+    if not words or texts.empty:
+        return np.zeros(len(texts), dtype=bool)
+    pattern = "|".join(map(re.escape, words))
+    return texts.str.contains(pattern, regex=True).to_numpy(dtype=bool)
+
+
+def count_duplicated_values(values: pd.Series) -> int:
+    """Number of distinct values occurring more than once"""
+    counts = values.value_counts(dropna=False)
+    return int((counts > 1).sum())
+
+
+@lru_cache(maxsize=1)
+def _uppercase_table() -> np.ndarray:
+    """``str.isupper`` for every code point (plus the separator)"""
+    table = np.zeros(_SEPARATOR + 1, dtype=bool)
+    table[:_SEPARATOR] = np.fromiter(
+        (chr(code).isupper() for code in range(_SEPARATOR)), dtype=bool, count=_SEPARATOR
+    )
+    return table
+
+
+def character_statistics(texts: List[str], run_length: int = 5) -> tuple:
+    """
+    Per-text uppercase character counts and repeated-character runs.
+
+    Args:
+        texts: Texts to scan
+        run_length: Minimum run of one repeated character (``(.)\\1{run_length-1,}``;
+            like the regex, newlines do not form runs)
+
+    Returns:
+        (uppercase counts, bool array of texts containing a run)
+    """
+    n = len(texts)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+
+    # All texts in one code point array, each followed by a separator
+    joined = "\U0010ffff".join(texts) + "\U0010ffff"
+    codes = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=n)
+    ends = np.cumsum(lengths + 1) - 1
+    codes[ends] = _SEPARATOR  # U+10FFFF may occur in a text; the separator cannot
+
+    owner = np.repeat(np.arange(n), lengths + 1)
+    upper = np.bincount(owner, weights=_uppercase_table()[codes], minlength=n).astype(np.int64)
+
+    has_run = np.zeros(n, dtype=bool)
+    if run_length > 1 and len(codes) >= run_length:
+        same = (codes[1:] == codes[:-1]) & (codes[1:] != _NEWLINE) & (codes[1:] != _SEPARATOR)
+        window = run_length - 1
+        cumulative = np.concatenate([[0], np.cumsum(same)])
+        runs = np.flatnonzero(cumulative[window:] - cumulative[:-window] == window)
+        if len(runs):
+            has_run[np.unique(owner[runs])] = True
+
+    return upper, has_run
+
+
+class _EntityColumns:
+    """Row-wise slicing and appending shared by the column sets"""
+
+    now: np.datetime64
+    timestamps: np.ndarray
+
+    @property
+    def ages(self) -> np.ndarray:
+        """timedelta64[ns] from each timestamp to ``now`` (NaT where missing)"""
+        return self.now - self.timestamps
+
+    def take(self, indices: Sequence[int]):
+        """Column set with the rows at the given positions, in that order"""
+        indices = np.asarray(indices, dtype=np.int64)
+        values = {}
+        for f in fields(self):
+            column = getattr(self, f.name)
+            if isinstance(column, np.ndarray):
+                values[f.name] = column[indices]
+            elif isinstance(column, pd.Series):
+                values[f.name] = column.iloc[indices].reset_index(drop=True)
+            elif f.name == 'now':
+                values[f.name] = column
+            else:
+                values[f.name] = [column[i] for i in indices]
+        return type(self)(**values)
+
+    def concat(self, other):
+        """Rows of this column set followed by the rows of ``other``"""
+        values = {}
+        for f in fields(self):
+            mine, theirs = getattr(self, f.name), getattr(other, f.name)
+            if isinstance(mine, np.ndarray):
+                values[f.name] = np.concatenate([mine, theirs])
+            elif isinstance(mine, pd.Series):
+                values[f.name] = pd.concat([mine, theirs], ignore_index=True)
+            elif f.name == 'now':
+                values[f.name] = max(mine, theirs)
+            else:
+                values[f.name] = list(mine) + list(theirs)
+        return type(self)(**values)
+
+    def at(self, now: datetime):
+        """Same rows with ages measured from ``now``"""
+        return replace(self, now=np.datetime64(now, 'ns'))
+
+
+@dataclass
+class ProductColumns(_EntityColumns):
+    """Column arrays for a list of products"""
+    products: Sequence[ProductResponse]
+    required_present: np.ndarray   # Number of required fields that are not None
+    has_category: np.ndarray
+    has_metadata: np.ndarray
+    price: np.ndarray              # NaN where missing
+    inventory: np.ndarray          # NaN where missing
+    currency_length: np.ndarray
+    sku_length: np.ndarray         # 0 where missing
+    sku: pd.Series
+    name_lower: pd.Series
+    timestamps: np.ndarray         # updated_at as datetime64[ns]
+    now: np.datetime64             # Reference time for ages
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    @property
+    def entities(self) -> Sequence[ProductResponse]:
+        return self.products
+
+    def entity_ids(self, indices: Iterable[int]) -> List[str]:
+        """String ids of the products at the given positions"""
+        return [str(self.products[i].id) for i in indices]
+
+    @classmethod
+    def from_products(
+        cls,
+        products: Sequence[ProductResponse],
+        required_fields: Sequence[str],
+        now: Optional[datetime] = None
+    ) -> "ProductColumns":
+        """
+        Extract all assessed fields, one column at a time.
+
+        Args:
+            products: Products to assess
+            required_fields: Fields counted for completeness
+            now: Reference time for ages (defaults to utcnow)
+        """
+        now = now or datetime.utcnow()
+        n = len(products)
+
+        required_present = np.zeros(n, dtype=np.int64)
+        for field in required_fields:
+            required_present += np.fromiter(
+                (getattr(p, field, None) is not None for p in products), dtype=bool, count=n
+            )
+
+        skus = [p.sku for p in products]
+        currencies = [p.currency for p in products]
+        return cls(
+            products=list(products),
+            required_present=required_present,
+            has_category=np.fromiter((bool(p.category) for p in products), dtype=bool, count=n),
+            has_metadata=np.fromiter((bool(p.metadata) for p in products), dtype=bool, count=n),
+            price=_floats([p.price for p in products]),
+            inventory=_floats([p.inventory_level for p in products]),
+            currency_length=np.fromiter(
+                (len(c) if c is not None else 0 for c in currencies), dtype=np.int64, count=n
+            ),
+            sku_length=np.fromiter((len(s) if s else 0 for s in skus), dtype=np.int64, count=n),
+            sku=pd.Series(skus, dtype=object),
+            name_lower=pd.Series([p.name.lower() for p in products], dtype=object),
+            timestamps=_timestamps([p.updated_at for p in products]),
+            now=np.datetime64(now, 'ns')
+        )
+
+
+@dataclass
+class ReviewColumns(_EntityColumns):
+    """Column arrays for a list of reviews"""
+    reviews: Sequence[ReviewResponse]
+    rating: np.ndarray             # NaN where missing
+    text_length: np.ndarray
+    text_lower: pd.Series
+    uppercase_count: np.ndarray
+    has_repeated_run: np.ndarray
+    is_spam: np.ndarray
+    has_sentiment: np.ndarray
+    timestamps: np.ndarray         # created_at as datetime64[ns]
+    now: np.datetime64             # Reference time for ages
+
+    def __len__(self) -> int:
+        return len(self.reviews)
+
+    @property
+    def entities(self) -> Sequence[ReviewResponse]:
+        return self.reviews
+
+    def entity_ids(self, indices: Iterable[int]) -> List[str]:
+        """String ids of the reviews at the given positions"""
+        return [str(self.reviews[i].id) for i in indices]
+
+    @classmethod
+    def from_reviews(
+        cls,
+        reviews: Sequence[ReviewResponse],
+        now: Optional[datetime] = None
+    ) -> "ReviewColumns":
+        """
+        Extract all assessed fields, one column at a time.
+
+        Args:
+            reviews: Reviews to assess
+            now: Reference time for ages (defaults to utcnow)
+        """
+        now = now or datetime.utcnow()
+        n = len(reviews)
+        texts = [r.text or "" for r in reviews]
+        upper, has_run = character_statistics(texts)
+
+        return cls(
+            reviews=list(reviews),
+            rating=_floats([r.rating for r in reviews]),
+            text_length=np.fromiter(map(len, texts), dtype=np.int64, count=n),
+            text_lower=pd.Series([t.lower() for t in texts], dtype=object),
+            uppercase_count=upper,
+            has_repeated_run=has_run,
+            is_spam=np.fromiter((bool(r.is_spam) for r in reviews), dtype=bool, count=n),
+            has_sentiment=np.fromiter((bool(r.sentiment) for r in reviews), dtype=bool, count=n),
+            timestamps=_timestamps([r.created_at for r in reviews]),
+            now=np.datetime64(now, 'ns')
+        )
@@ -37,6 +37,7 @@ class PriceChange(BaseModel):
     price_change_percent: float
     timestamp: datetime
     is_significant: bool = Field(..., description="Whether change exceeds threshold (>5%)")
+    competitor_id: Optional[UUID] = None
 
 
 class PriceTrend(BaseModel):
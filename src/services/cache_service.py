@@ -1,9 +1,8 @@
 """
 Cache Service - Helper functions for Redis caching with tenant isolation
 """
-import json
 import logging
-from typing import Any, Optional, Dict
+from typing import Any, Awaitable, Callable, Optional, Dict, List
 from src.cache.instance import get_cache_manager
 
 logger = logging.getLogger(__name__)
@@ -46,7 +45,7 @@ def make_cache_key(prefix: str, tenant_id: str, **params) -> str:
 
 async def get_cached(key: str) -> Optional[Any]:
     """
-    Retrieve data from Redis cache.
+    Retrieve data from the cache (in-process tier first, then Redis).
     
     Args:
         key: Cache key to retrieve
@@ -60,26 +59,17 @@ async def get_cached(key: str) -> Optional[Any]:
         logger.warning(f"Cache manager not available for key: {key}")
         return None
     
-    if not cache_manager._redis:
-        logger.warning(f"Redis not connected for key: {key}")
-        return None
-    
     try:
-        # Use simple API pattern with full key
-        cached_json = await cache_manager._redis.get(key)
+        # Entries carry their own TTL; no cache-type freshness threshold applies
+        cached_data = await cache_manager.get(key=key, check_freshness=False)
         
-        if cached_json is None:
+        from src.observability.metrics import get_metrics_collector
+        if cached_data is None:
             logger.info(f"❌ Cache MISS: {key}")
-            from src.observability.metrics import get_metrics_collector
             get_metrics_collector().record_cache_miss()
             return None
         
-        # Parse JSON
-        import json
-        cached_data = json.loads(cached_json)
-        
         logger.info(f"✅ Cache HIT: {key}")
-        from src.observability.metrics import get_metrics_collector
         get_metrics_collector().record_cache_hit()
         return cached_data
     
@@ -90,7 +80,7 @@ async def get_cached(key: str) -> Optional[Any]:
 
 async def set_cached(key: str, data: Any, ttl: int) -> bool:
     """
-    Store data in Redis cache with TTL.
+    Store data in the cache with TTL.
     
     Args:
         key: Cache key
@@ -106,24 +96,115 @@ async def set_cached(key: str, data: Any, ttl: int) -> bool:
         logger.warning(f"Cache manager not available, skipping cache set for: {key}")
         return False
     
-    if not cache_manager._redis:
-        logger.warning(f"Redis not connected, skipping cache set for: {key}")
+    try:
+        stored = await cache_manager.set(key=key, value=data, ttl=ttl)
+        if stored:
+            logger.info(f"💾 Cache SET: {key} (TTL: {ttl}s)")
+        return stored
+    
+    except Exception as e:
+        logger.warning(f"Cache set error for {key}: {e}")
         return False
+
+
+async def get_or_compute_cached(key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+    """
+    Retrieve data from the cache, computing it once on a miss or expiry.
+    
+    Concurrent requests for an expired key do not all recompute it: one
+    refreshes it while the others are served the previous data (see
+    CacheManager.get_or_compute).
+    
+    Args:
+        key: Cache key
+        compute: Coroutine function producing the data (must be JSON serializable)
+        ttl: Time-to-live in seconds
+    
+    Returns:
+        Cached or computed data
+    """
+    cache_manager = get_cache_manager()
+    
+    if not cache_manager:
+        logger.warning(f"Cache manager not available for key: {key}")
+        return await compute()
+    
+    computed = False
+    
+    async def tracked_compute():
+        nonlocal computed
+        computed = True
+        return await compute()
+    
+    data = await cache_manager.get_or_compute(key=key, compute=tracked_compute, ttl=ttl)
+    
+    from src.observability.metrics import get_metrics_collector
+    if computed:
+        logger.info(f"❌ Cache MISS: {key} (computed, TTL: {ttl}s)")
+        get_metrics_collector().record_cache_miss()
+    else:
+        logger.info(f"✅ Cache HIT: {key}")
+        get_metrics_collector().record_cache_hit()
+    return data
+
+
+async def get_many_cached(keys: List[str]) -> Dict[str, Any]:
+    """
+    Retrieve several keys with one cache round-trip.
+    
+    Args:
+        keys: Cache keys to retrieve
+    
+    Returns:
+        Cached data by key (keys not found are omitted)
+    """
+    cache_manager = get_cache_manager()
+    
+    if not cache_manager or not keys:
+        return {}
     
     try:
-        # Serialize to JSON
-        import json
-        cached_json = json.dumps(data)
+        cached = await cache_manager.get_many(keys=keys, check_freshness=False)
         
-        # Store in Redis with TTL
-        await cache_manager._redis.set(key, cached_json, ex=ttl)
-        
-        logger.info(f"💾 Cache SET: {key} (TTL: {ttl}s)")
-        return True
+        from src.observability.metrics import get_metrics_collector
+        collector = get_metrics_collector()
+        for _ in range(len(cached)):
+            collector.record_cache_hit()
+        for _ in range(len(set(keys)) - len(cached)):
+            collector.record_cache_miss()
+        logger.info(f"Cache batch: {len(cached)}/{len(set(keys))} hits")
+        return cached
     
     except Exception as e:
-        logger.warning(f"Cache set error for {key}: {e}")
-        return False
+        logger.warning(f"Cache batch retrieval error: {e}")
+        return {}
+
+
+async def set_many_cached(items: Dict[str, Any], ttl: int) -> int:
+    """
+    Store several keys with one cache round-trip.
+    
+    Args:
+        items: Data to cache by key (must be JSON serializable)
+        ttl: Time-to-live in seconds
+    
+    Returns:
+        Number of keys stored
+    """
+    cache_manager = get_cache_manager()
+    
+    if not cache_manager or not items:
+        return 0
+    
+    try:
+        stored = await cache_manager.set_many(mapping=items, ttl=ttl)
+        if stored:
+            logger.info(f"💾 Cache SET: {stored} keys (TTL: {ttl}s)")
+        return stored
+    
+    except Exception as e:
+        logger.warning(f"Cache batch set error: {e}")
+        return 0
 
 
 async def invalidate_cache(key: str) -> bool:
@@ -142,11 +223,10 @@ async def invalidate_cache(key: str) -> bool:
         return False
     
     try:
-        if cache_manager._redis:
-            await cache_manager._redis.delete(key)
+        deleted = await cache_manager.delete(key=key)
+        if deleted:
             logger.info(f"🗑️  Cache INVALIDATED: {key}")
-            return True
-        return False
+        return deleted
     
     except Exception as e:
         logger.warning(f"Cache invalidation error for {key}: {e}")
@@ -166,7 +246,7 @@ async def invalidate_tenant_cache(tenant_id: str, prefix: Optional[str] = None)
     """
     cache_manager = get_cache_manager()
     
-    if not cache_manager or not cache_manager._redis:
+    if not cache_manager:
         return 0
     
     try:
@@ -176,18 +256,10 @@ async def invalidate_tenant_cache(tenant_id: str, prefix: Optional[str] = None)
         else:
             pattern = f"*:{tenant_id}:*"
         
-        # Find all matching keys
-        keys = []
-        async for key in cache_manager._redis.scan_iter(match=pattern):
-            keys.append(key)
-        
-        # Delete all matching keys
-        if keys:
-            deleted = await cache_manager._redis.delete(*keys)
+        deleted = await cache_manager.invalidate_pattern(pattern)
+        if deleted:
             logger.info(f"🗑️  Cache INVALIDATED: {deleted} keys for tenant {tenant_id} (pattern: {pattern})")
-            return deleted
-        
-        return 0
+        return deleted
     
     except Exception as e:
         logger.warning(f"Tenant cache invalidation error for {tenant_id}: {e}")
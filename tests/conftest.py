@@ -2,13 +2,14 @@
 import pytest
 import asyncio
 import os
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker, AsyncEngine, AsyncConnection
 from uuid import UUID, uuid4
 
 from src.main import app
-from src.database import Base, get_db
+from src.database import Base, get_db, get_read_db, get_session_factory
 # Import all models to register with SQLAlchemy
 from src.models.role import Role  # Import Role first
 from src.models.product import Product
@@ -186,6 +187,10 @@ async def client(test_db: AsyncSession, test_tenant_id: UUID) -> AsyncGenerator[
     async def override_get_db():
         yield test_db
     
+    @asynccontextmanager
+    async def test_session():
+        yield test_db
+    
     async def override_get_current_active_user():
         return test_user
     
@@ -193,6 +198,8 @@ async def client(test_db: AsyncSession, test_tenant_id: UUID) -> AsyncGenerator[
         return test_tenant_id
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: test_session
     app.dependency_overrides[get_current_active_user] = override_get_current_active_user
     app.dependency_overrides[get_tenant_id] = override_get_tenant_id
     
@@ -200,3 +207,144 @@ async def client(test_db: AsyncSession, test_tenant_id: UUID) -> AsyncGenerator[
         yield ac
     
     app.dependency_overrides.clear()
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the redis.asyncio client used by CacheManager.
+    
+    Implements the commands the cache layer issues (string values with
+    expiry, sets, key scans) and counts round-trips in ``calls``.
+    """
+    
+    def __init__(self):
+        self.store = {}
+        self.expiry = {}
+        self.sets = {}
+        self.calls = 0
+    
+    def _live(self, key):
+        import time
+        deadline = self.expiry.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.store.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.store
+    
+    async def ping(self):
+        self.calls += 1
+        return True
+    
+    async def get(self, key):
+        self.calls += 1
+        return self.store[key] if self._live(key) else None
+    
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        import time
+        self.calls += 1
+        if nx and self._live(key):
+            return None
+        self.store[key] = value
+        self.expiry.pop(key, None)
+        if ex is not None:
+            self.expiry[key] = time.monotonic() + ex
+        elif px is not None:
+            self.expiry[key] = time.monotonic() + px / 1000
+        return True
+    
+    async def setex(self, key, ttl, value):
+        return await self.set(key, value, ex=ttl)
+    
+    async def mget(self, keys):
+        self.calls += 1
+        return [self.store[key] if self._live(key) else None for key in keys]
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    async def delete(self, *keys):
+        self.calls += 1
+        deleted = 0
+        for key in keys:
+            if self._live(key):
+                deleted += 1
+            self.store.pop(key, None)
+            self.expiry.pop(key, None)
+        return deleted
+    
+    async def unlink(self, *keys):
+        return await self.delete(*keys)
+    
+    async def exists(self, *keys):
+        self.calls += 1
+        return sum(self._live(key) for key in keys)
+    
+    async def sadd(self, key, *members):
+        self.calls += 1
+        members_set = self.sets.setdefault(key, set())
+        added = len(set(members) - members_set)
+        members_set.update(members)
+        return added
+    
+    async def srem(self, key, *members):
+        self.calls += 1
+        members_set = self.sets.get(key, set())
+        removed = len(members_set & set(members))
+        members_set.difference_update(members)
+        if not members_set:
+            self.sets.pop(key, None)
+        return removed
+    
+    async def smembers(self, key):
+        self.calls += 1
+        return {member.encode() for member in self.sets.get(key, ())}
+    
+    async def sinter(self, keys):
+        self.calls += 1
+        result = set.intersection(*(self.sets.get(key, set()) for key in keys))
+        return {member.encode() for member in result}
+    
+    async def scan_iter(self, match="*"):
+        import fnmatch
+        self.calls += 1
+        for key in list(self.store):
+            if self._live(key) and fnmatch.fnmatchcase(key, match):
+                yield key
+    
+    async def flushdb(self):
+        self.calls += 1
+        self.store.clear()
+        self.expiry.clear()
+        self.sets.clear()
+    
+    async def aclose(self):
+        pass
+
+
+class FakePipeline:
+    """Buffers FakeRedis commands and sends them as one round-trip"""
+    
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+    
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        
+        def buffer(*args, **kwargs):
+            self.commands.append((command, args, kwargs))
+            return self
+        return buffer
+    
+    async def execute(self):
+        calls = self.redis.calls
+        results = [await command(*args, **kwargs) for command, args, kwargs in self.commands]
+        self.redis.calls = calls + 1
+        self.commands = []
+        return results
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    """In-memory Redis stand-in"""
+    return FakeRedis()
@@ -0,0 +1,133 @@
+"""Tests for bulk, vectorized pricing recommendations"""
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, text
+
+from src.api.pricing import get_pricing_recommendations
+from src.models.product import Product
+from src.pricing.recommendations import BulkPricingRecommendationEngine
+
+STRATEGY_IDS = {
+    "competitive_pricing", "conservative_competitive_pricing", "undercut_competition",
+    "premium_positioning", "max_profit_optimization"
+}
+
+
+async def _create_pricing_tables(db):
+    await db.execute(text("""
+        CREATE TABLE market_analysis (
+            id VARCHAR(36), product_id VARCHAR(36), tenant_id VARCHAR(36),
+            market_position VARCHAR(50), price_elasticity FLOAT, demand_score FLOAT,
+            competitive_index FLOAT, recommended_price FLOAT, confidence_score FLOAT
+        )
+    """))
+    await db.execute(text("""
+        CREATE TABLE competitor_pricing (
+            id VARCHAR(36), product_id VARCHAR(36), tenant_id VARCHAR(36),
+            competitor_name VARCHAR(255), competitor_price NUMERIC(10, 2),
+            competitor_rating FLOAT, market_share FLOAT
+        )
+    """))
+
+
+async def _add_product(db, tenant_id, price, cost=None, competitors=(), elasticity=None, metadata=None):
+    product = Product(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        sku=f"SKU-{uuid4().hex[:8]}",
+        normalized_sku=f"SKU{uuid4().hex[:8]}",
+        name="Product",
+        price=Decimal(str(price)),
+        cost=Decimal(str(cost)) if cost is not None else None,
+        currency="USD",
+        marketplace="our-store",
+        inventory_level=10,
+        extra_metadata=metadata
+    )
+    db.add(product)
+    await db.flush()
+
+    params = {"product_id": str(product.id), "tenant_id": str(tenant_id)}
+    for i, competitor_price in enumerate(competitors):
+        await db.execute(text("""
+            INSERT INTO competitor_pricing (id, product_id, tenant_id, competitor_name, competitor_price, market_share)
+            VALUES (:id, :product_id, :tenant_id, :name, :price, :share)
+        """), {**params, "id": str(uuid4()), "name": f"Competitor {i}", "price": competitor_price, "share": 0.1 * (i + 1)})
+    if elasticity is not None:
+        await db.execute(text("""
+            INSERT INTO market_analysis (id, product_id, tenant_id, market_position, price_elasticity)
+            VALUES (:id, :product_id, :tenant_id, 'leader', :elasticity)
+        """), {**params, "id": str(uuid4()), "elasticity": elasticity})
+    return product.id
+
+
+@pytest.mark.asyncio
+async def test_bulk_matches_single_product_endpoint(test_db, test_tenant_id):
+    """Vectorized strategies produce the same recommendations as the per-product endpoint"""
+    await _create_pricing_tables(test_db)
+    product_ids = [
+        await _add_product(test_db, test_tenant_id, 120, 60, [90, 100, 110]),          # Above average
+        await _add_product(test_db, test_tenant_id, 120, 99, [90, 100, 110]),          # Thin margin
+        await _add_product(test_db, test_tenant_id, 100, 50, [80, 150], -2.5),         # Above cheapest
+        await _add_product(test_db, test_tenant_id, 50, 20, [55, 70, 90, 95], -3.0),   # Premium room
+        await _add_product(test_db, test_tenant_id, 40),                               # Synthetic competitors
+        await _add_product(test_db, test_tenant_id, 75, 30, [60, 120], -0.5),          # Inelastic
+    ]
+
+    engine = BulkPricingRecommendationEngine(tenant_id=test_tenant_id)
+    inputs, _ = await engine.load_page(test_db)
+    bulk = {item["product_id"]: item for item in engine.compute(inputs)}
+    assert set(bulk) == {str(p) for p in product_ids}
+
+    compared = 0
+    for product_id in product_ids:
+        single = await get_pricing_recommendations(
+            product_id, db=test_db, current_user=None, tenant_id=test_tenant_id
+        )
+        item = bulk[str(product_id)]
+        ours = {r["id"]: r for r in item["recommendations"]}
+        for recommendation in single["recommendations"]:
+            if recommendation["id"] in STRATEGY_IDS:
+                assert ours.pop(recommendation["id"]) == recommendation
+                compared += 1
+        # Anything left was only cut by the endpoint's top-3 limit
+        assert len(ours) + len(single["recommendations"]) > 3 or not ours
+
+        summary = single["market_analysis"]
+        assert item["market_analysis"]["competitor_price_range"] == summary["competitor_price_range"]
+        assert item["market_analysis"]["current_margin"] == summary["current_margin"]
+    assert compared >= 8
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_catalog_with_three_queries_each(test_db, test_engine, test_tenant_id):
+    """Keyset pages visit every product of the tenant once, three statements per page"""
+    await _create_pricing_tables(test_db)
+    ours = {await _add_product(test_db, test_tenant_id, 10 + i, 5, [9, 12]) for i in range(5)}
+    await _add_product(test_db, test_tenant_id, 10, metadata={"is_competitor": True})
+    await _add_product(test_db, uuid4(), 10)
+
+    @asynccontextmanager
+    async def session_factory():
+        yield test_db
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(test_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        engine = BulkPricingRecommendationEngine(tenant_id=test_tenant_id, page_size=2)
+        pages = [page async for page in engine.iter_pages(session_factory)]
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", listener)
+
+    seen = [item["product_id"] for page in pages for item in page.items]
+    assert sorted(seen) == sorted(str(p) for p in ours)
+    assert len(pages) == 3
+    # Three queries per page plus the final empty products query
+    assert len(statements) == 3 * len(pages) + 1
+
+    resumed = [page async for page in engine.iter_pages(session_factory, cursor=pages[0].next_cursor)]
+    assert sum(len(page.items) for page in resumed) == len(seen) - len(pages[0].items)
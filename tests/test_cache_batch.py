@@ -0,0 +1,88 @@
+"""Tests for batched cache reads and writes"""
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.cache.cache_manager import CacheManager
+from src.cache.query_cache_service import QueryCacheService
+
+
+def _manager(fake_redis, **kwargs):
+    manager = CacheManager(**kwargs)
+    manager._redis = fake_redis
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_batch_round_trips(fake_redis):
+    """set_many, get_many and delete_many each cost one Redis round-trip"""
+    manager = _manager(fake_redis, negative_ttl=0)
+    tenant_id = uuid4()
+    items = {f"p{i}": {'price': i} for i in range(50)}
+
+    calls = fake_redis.calls
+    assert await manager.set_many('pricing', tenant_id, items) == 50
+    assert fake_redis.calls == calls + 1
+    assert fake_redis.expiry  # Entries carry the pricing TTL
+
+    manager._memory_cache.clear()
+    calls = fake_redis.calls
+    found = await manager.get_many('pricing', tenant_id, list(items) + ['missing'])
+    assert found == items
+    assert fake_redis.calls == calls + 1
+
+    # Served from the in-process tier now
+    assert await manager.get_many('pricing', tenant_id, ['p1', 'p2']) == {'p1': {'price': 1}, 'p2': {'price': 2}}
+    assert fake_redis.calls == calls + 1
+
+    assert await manager.delete_many('pricing', tenant_id, ['p1', 'p2', 'missing']) == 2
+    assert fake_redis.calls == calls + 2
+    assert await manager.get_many('pricing', tenant_id, ['p1', 'p3']) == {'p3': {'price': 3}}
+
+
+@pytest.mark.asyncio
+async def test_get_many_checks_freshness_per_entry(fake_redis):
+    manager = _manager(fake_redis)
+    tenant_id = uuid4()
+    await manager.set_many('pricing', tenant_id, {'fresh': 1, 'stale': 2})
+
+    stale_key = manager._build_cache_key('pricing', tenant_id, 'stale')
+    old = (datetime.utcnow() - timedelta(hours=2)).isoformat()
+    fake_redis.store[stale_key] = json.dumps({'data': 2, 'cached_at': old}).encode()
+    manager._memory_cache.clear()
+
+    assert await manager.get_many('pricing', tenant_id, ['fresh', 'stale']) == {'fresh': 1}
+    assert await manager.get_many('pricing', tenant_id, ['stale'], check_freshness=False) == {'stale': 2}
+
+
+@pytest.mark.asyncio
+async def test_batch_in_memory_fallback():
+    manager = CacheManager(use_memory_fallback=True)
+    manager._redis_failed = True
+    keys = {f"dashboard_kpis:t:days:{d}": {'days': d} for d in (7, 30)}
+
+    assert await manager.set_many(mapping=keys, ttl=60) == 2
+    assert await manager.get_many(keys=list(keys) + ['dashboard_kpis:t:days:90']) == keys
+    assert await manager.delete_many(keys=list(keys)) == 2
+    assert await manager.get_many(keys=list(keys)) == {}
+
+
+@pytest.mark.asyncio
+async def test_query_cache_service_per_product_batches(fake_redis):
+    manager = _manager(fake_redis)
+    service = QueryCacheService(manager)
+    tenant_id = uuid4()
+    product_ids = [uuid4() for _ in range(5)]
+
+    await service.set_demand_forecasts(tenant_id, {pid: {'units': 3} for pid in product_ids[:3]}, horizon_days=14)
+    manager._memory_cache.clear()
+
+    calls = fake_redis.calls
+    forecasts = await service.get_demand_forecasts(tenant_id, product_ids, horizon_days=14)
+    assert set(forecasts) == set(product_ids[:3])
+    assert fake_redis.calls == calls + 1
+    # Batch and single-key APIs share entries
+    assert await service.get_demand_forecast(tenant_id, product_ids[0], horizon_days=14) == {'units': 3}
+    assert await service.get_demand_forecasts(tenant_id, product_ids, horizon_days=30) == {}
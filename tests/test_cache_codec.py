@@ -0,0 +1,68 @@
+"""Tests for the cache payload codec"""
+import json
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.cache.cache_manager import CacheManager
+from src.cache.codec import HEADER_SIZE, MAGIC, SERIALIZERS, CacheCodec
+
+
+@pytest.mark.parametrize("serializer", sorted(SERIALIZERS))
+@pytest.mark.parametrize("compression", ["zlib", "none"])
+def test_round_trip(serializer, compression):
+    codec = CacheCodec(serializer=serializer, compression=compression, compress_min_bytes=256)
+    value = {
+        'data': {'series': [float(i) / 3 for i in range(200)], 'label': 'forecast', 'empty': None},
+        'cached_at': datetime.utcnow().isoformat()
+    }
+
+    payload = codec.encode(value)
+
+    assert payload[0] == MAGIC
+    assert codec.decode(payload) == value
+    # Payloads from a codec with another configuration still decode
+    assert CacheCodec(serializer='json', compression='none').decode(payload) == value
+
+
+def test_compression_only_above_threshold():
+    codec = CacheCodec(serializer='json', compression='zlib', compress_min_bytes=1024)
+    small = codec.encode({'price': 10})
+    large = codec.encode({'history': [{'price': 10.5, 'source': 'marketplace'}] * 500})
+
+    assert chr(small[3]) == 'n'
+    assert chr(large[3]) == 'z'
+    assert len(large) < len(json.dumps({'history': [{'price': 10.5, 'source': 'marketplace'}] * 500})) / 10
+    assert codec.get_stats()['compressed'] == 1
+
+
+def test_legacy_json_and_fallbacks():
+    codec = CacheCodec()
+    legacy = json.dumps({'data': [1, 2], 'cached_at': '2024-01-01T00:00:00'})
+
+    assert codec.decode(legacy) == codec.decode(legacy.encode()) == {'data': [1, 2], 'cached_at': '2024-01-01T00:00:00'}
+    assert codec.get_stats()['legacy_decoded'] == 2
+    # Values the binary serializer rejects fall back to json; unknown types become strings
+    assert codec.decode(codec.encode({'big': 2 ** 70, 'amount': Decimal('1.50')})) == {'big': 2 ** 70, 'amount': '1.50'}
+    # Unknown libraries fall back instead of failing
+    assert CacheCodec(serializer='unknown', compression='unknown').compression in ('lz4', 'zlib', 'none')
+
+    with pytest.raises(ValueError):
+        codec.decode(bytes((MAGIC, 99, ord('j'), ord('n'))) + b'{}')
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_stores_encoded_payloads(fake_redis):
+    manager = CacheManager(codec=CacheCodec(compress_min_bytes=128))
+    manager._redis = fake_redis
+    tenant_id = uuid4()
+    forecast = {'predictions': [{'date': f'2024-01-{d:02d}', 'units': d * 1.5} for d in range(1, 29)]}
+
+    await manager.set('forecast', tenant_id, 'p1', forecast)
+    stored = fake_redis.store[manager._build_cache_key('forecast', tenant_id, 'p1')]
+    manager._memory_cache.clear()
+
+    assert stored[0] == MAGIC and len(stored) - HEADER_SIZE < len(json.dumps(forecast))
+    assert await manager.get('forecast', tenant_id, 'p1') == forecast
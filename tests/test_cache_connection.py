@@ -0,0 +1,118 @@
+"""Tests for the pooled, race-free CacheManager connection"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import src.cache.cache_manager as cache_manager_module
+from src.cache.cache_manager import CacheManager
+from src.cache.event_transport import RedisEventTransport
+
+
+class FakePool:
+    """Connection pool stand-in recording how it was created"""
+
+    created = []
+
+    def __init__(self, url, **kwargs):
+        self.url = url
+        self.kwargs = kwargs
+        self.disconnected = False
+        self._in_use_connections = set()
+        self._available_connections = []
+        FakePool.created.append(self)
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        return cls(url, **kwargs)
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+class FakeClient:
+    """Redis client stand-in whose ping takes a moment (or fails)"""
+
+    fail = False
+
+    def __init__(self, connection_pool):
+        self.connection_pool = connection_pool
+        self.closed = False
+
+    async def ping(self):
+        await asyncio.sleep(0.05)
+        if FakeClient.fail:
+            raise ConnectionError("refused")
+        return True
+
+    async def config_set(self, name, value):
+        return True
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_redis_module(monkeypatch):
+    FakePool.created = []
+    FakeClient.fail = False
+    module = SimpleNamespace(BlockingConnectionPool=FakePool, Redis=FakeClient)
+    monkeypatch.setattr(cache_manager_module, 'redis', module)
+    monkeypatch.setattr(cache_manager_module, 'REDIS_AVAILABLE', True)
+    return module
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_requests_open_one_pool(fake_redis_module):
+    manager = CacheManager(max_connections=8, health_check_interval=15, socket_keepalive=True)
+
+    await asyncio.gather(*(manager._ensure_connected() for _ in range(10)))
+
+    assert len(FakePool.created) == 1
+    pool = FakePool.created[0]
+    assert pool.kwargs['max_connections'] == 8
+    assert pool.kwargs['health_check_interval'] == 15
+    assert pool.kwargs['socket_keepalive'] is True
+    assert manager.is_connected and manager.client.connection_pool is pool
+
+    pool._in_use_connections.update({1, 2})
+    assert manager.get_pool_stats() == {
+        'connected': True, 'max_connections': 8, 'in_use': 2, 'idle': 0, 'utilization_percent': 25.0
+    }
+
+    client = manager.client
+    await manager.disconnect()
+    assert client.closed and pool.disconnected
+    assert not manager.is_connected
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_is_not_retried_by_waiting_requests(fake_redis_module):
+    FakeClient.fail = True
+    manager = CacheManager(use_memory_fallback=True)
+
+    await asyncio.gather(*(manager.set(key='dashboard:t', value={'n': i}, ttl=60) for i in range(5)))
+
+    assert len(FakePool.created) == 1 and FakePool.created[0].disconnected
+    assert not manager.is_connected
+    assert await manager.get(key='dashboard:t', check_freshness=False) is not None
+
+    # An explicit connect retries
+    FakeClient.fail = False
+    await manager.connect()
+    assert manager.is_connected and len(FakePool.created) == 2
+
+
+@pytest.mark.asyncio
+async def test_event_transport_shares_the_cache_client():
+    client = FakeClient(connection_pool=None)
+    transport = RedisEventTransport(client=client)
+
+    async def handler(message):
+        pass
+
+    transport._listen = lambda handler: asyncio.sleep(0)
+    await transport.start(handler)
+    await transport.stop(handler)
+
+    assert not client.closed
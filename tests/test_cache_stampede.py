@@ -0,0 +1,112 @@
+"""Tests for CacheManager.get_or_compute stampede protection"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.cache.cache_manager import CacheManager
+
+
+class Counter:
+    """Compute function recording how often it ran"""
+
+    def __init__(self, value=None, delay=0.05, error=None):
+        self.calls = 0
+        self.value = value
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.value if self.value is not None else {'version': self.calls}
+
+
+def _manager(fake_redis=None, **kwargs):
+    manager = CacheManager(use_memory_fallback=True, **kwargs)
+    if fake_redis is None:
+        manager._redis_failed = True
+    else:
+        manager._redis = fake_redis
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once():
+    manager = _manager()
+    compute = Counter()
+    tenant_id = uuid4()
+
+    results = await asyncio.gather(*(
+        manager.get_or_compute('forecast', tenant_id, 'p1', compute=compute, ttl=60) for _ in range(20)
+    ))
+
+    assert compute.calls == 1
+    assert all(result == {'version': 1} for result in results)
+    assert await manager.get('forecast', tenant_id, 'p1') == {'version': 1}
+
+
+@pytest.mark.asyncio
+async def test_workers_wait_on_the_recompute_lease(fake_redis):
+    """A second worker waits for the lease holder instead of recomputing"""
+    worker_a, worker_b = _manager(fake_redis), _manager(fake_redis)
+    compute_a, compute_b = Counter(delay=0.2), Counter()
+
+    result_a, result_b = await asyncio.gather(
+        worker_a.get_or_compute(key='forecast:t:p1', compute=compute_a, ttl=60),
+        worker_b.get_or_compute(key='forecast:t:p1', compute=compute_b, ttl=60)
+    )
+
+    assert result_a == result_b == {'version': 1}
+    assert (compute_a.calls, compute_b.calls) == (1, 0)
+    assert not any(key.startswith(CacheManager.LEASE_PREFIX) for key in fake_redis.store)
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_served_while_one_caller_refreshes(fake_redis):
+    manager = _manager(fake_redis, local_ttl=0)
+    compute = Counter(delay=0.1)
+    await manager.get_or_compute(key='dashboard_stats:t', compute=compute, ttl=0.05)
+    await asyncio.sleep(0.1)
+
+    # Plain reads treat the entry as expired; get_or_compute may still serve it
+    assert await manager.get(key='dashboard_stats:t', check_freshness=False) is None
+    results = await asyncio.gather(*(
+        manager.get_or_compute(key='dashboard_stats:t', compute=compute, ttl=60) for _ in range(5)
+    ))
+
+    assert compute.calls == 2
+    assert sorted(result['version'] for result in results) == [1, 1, 1, 1, 2]
+    assert (await manager.get_metrics())['stale_served'] == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_serves_stale_and_failed_miss_raises():
+    manager = _manager()
+    await manager.get_or_compute(key='sentiment:t:p1', compute=Counter(), ttl=0.01)
+    await asyncio.sleep(0.02)
+
+    failing = Counter(error=RuntimeError("model fit failed"))
+    assert await manager.get_or_compute(key='sentiment:t:p1', compute=failing, ttl=60) == {'version': 1}
+    with pytest.raises(RuntimeError):
+        await manager.get_or_compute(key='sentiment:t:p2', compute=failing, ttl=60)
+    assert not manager._inflight
+
+
+@pytest.mark.asyncio
+async def test_expensive_entries_refresh_early(monkeypatch):
+    """XFetch: entries that took long to compute are refreshed before they expire"""
+    manager = _manager()
+    await manager._write('forecast:t:p1', manager._serialize_entry({'version': 0}, ttl=60, compute_seconds=10), 360)
+    compute = Counter()
+
+    monkeypatch.setattr('src.cache.cache_manager.random.random', lambda: 0.0)  # -ln(1) = 0: never early
+    assert await manager.get_or_compute(key='forecast:t:p1', compute=compute, ttl=60) == {'version': 0}
+
+    monkeypatch.setattr('src.cache.cache_manager.random.random', lambda: 0.999999)
+    assert await manager.get_or_compute(key='forecast:t:p1', compute=compute, ttl=60) == {'version': 1}
+    assert await manager.get_or_compute(key='forecast:t:p1', compute=compute, ttl=60, beta=0) == {'version': 1}
+    assert compute.calls == 1
+    assert (await manager.get_metrics())['early_refreshes'] == 1
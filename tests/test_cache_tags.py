@@ -0,0 +1,87 @@
+"""Tests for tag-set based cache invalidation"""
+from uuid import uuid4
+
+import pytest
+
+from src.cache.cache_manager import CacheManager
+from src.cache.event_bus import CacheInvalidationSubscriber, DataEvent, EventPublisher, EventType
+from src.cache.tags import TAG_INDEX_KEY, entity_tag, tags_for_key, tags_for_pattern, tenant_tag, type_tag
+
+
+def test_tags_for_keys_and_patterns():
+    tenant_id, product_id = uuid4(), uuid4()
+
+    assert tags_for_key(f"forecast:{tenant_id}:{product_id}:30") == [
+        tenant_tag(tenant_id), type_tag(tenant_id, 'forecast'), entity_tag(tenant_id, product_id)
+    ]
+    assert tags_for_key("startup:ping") == [tenant_tag("ping"), type_tag("ping", "startup")]
+    assert tags_for_pattern(f"*:{tenant_id}:*") == [tenant_tag(tenant_id)]
+    assert tags_for_pattern(f"pricing:{tenant_id}:*{product_id}*") == [
+        type_tag(tenant_id, 'pricing'), entity_tag(tenant_id, product_id)
+    ]
+    assert tags_for_pattern("pricing:*:*") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reads_tag_sets_instead_of_scanning(fake_redis):
+    manager = CacheManager()
+    manager._redis = fake_redis
+    tenant_id, other_tenant = uuid4(), uuid4()
+    products = [uuid4() for _ in range(3)]
+
+    for product_id in products:
+        await manager.set('pricing', tenant_id, str(product_id), {'price': 1})
+        await manager.set('forecast', tenant_id, f"{product_id}:30", {'units': 2})
+    await manager.set('pricing', other_tenant, str(products[0]), {'price': 1})
+
+    async def no_scan(match="*"):
+        raise AssertionError("keyspace scan")
+        yield
+    fake_redis.scan_iter = no_scan
+
+    calls = fake_redis.calls
+    assert await manager.invalidate_pattern(f"forecast:{tenant_id}:*{products[0]}*") == 1
+    assert fake_redis.calls == calls + 2  # SINTER, then UNLINK/SREM pipeline
+    assert await manager.invalidate_pattern('pricing', tenant_id, '*') == 3
+    assert await manager.get('pricing', other_tenant, str(products[0])) == {'price': 1}
+
+    assert await manager.clear_tenant_cache(tenant_id) == 2
+    assert fake_redis.sets.get(tenant_tag(tenant_id)) is None  # Registrations removed with the keys
+    assert [key for key in fake_redis.store if str(tenant_id) in key] == []
+
+
+@pytest.mark.asyncio
+async def test_subscriber_invalidates_entity_entries(fake_redis):
+    manager = CacheManager(local_ttl=60)
+    manager._redis = fake_redis
+    publisher = EventPublisher()
+    CacheInvalidationSubscriber(manager, publisher)
+    tenant_id, product_id = uuid4(), uuid4()
+
+    await manager.set('pricing', tenant_id, str(product_id), {'price': 1})
+    await manager.set('pricing', tenant_id, str(uuid4()), {'price': 2})
+    await publisher.publish(DataEvent(
+        event_type=EventType.PRICE_UPDATED,
+        tenant_id=tenant_id,
+        entity_type='product',
+        entity_id=str(product_id)
+    ))
+
+    assert await manager.get('pricing', tenant_id, str(product_id)) is None
+    assert len(fake_redis.sets[type_tag(tenant_id, 'pricing')]) == 1
+
+
+@pytest.mark.asyncio
+async def test_compaction_drops_expired_members(fake_redis):
+    manager = CacheManager()
+    manager._redis = fake_redis
+    tenant_id = uuid4()
+    await manager.set('pricing', tenant_id, 'kept', {'price': 1})
+    await manager.set('sentiment', tenant_id, 'expired', {'score': 1})
+    del fake_redis.store[manager._build_cache_key('sentiment', tenant_id, 'expired')]
+
+    stats = await manager.compact_tags(batch_size=2)
+
+    assert stats == {'tags_checked': 3, 'members_removed': 2, 'tags_removed': 1}
+    assert type_tag(tenant_id, 'sentiment') not in fake_redis.sets
+    assert fake_redis.sets[TAG_INDEX_KEY] == {tenant_tag(tenant_id), type_tag(tenant_id, 'pricing')}
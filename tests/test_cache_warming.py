@@ -0,0 +1,119 @@
+"""Tests for post-ingestion cache warming"""
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+from src.cache.cache_manager import CacheManager
+from src.cache.event_bus import DataEvent, EventPublisher, EventType
+from src.cache.warming import CacheWarmer, WarmableEndpoint
+
+
+@asynccontextmanager
+async def _session():
+    yield None
+
+
+def _warmer(**kwargs):
+    manager = CacheManager(use_memory_fallback=True)
+    manager._redis_failed = True
+    warmer = CacheWarmer(cache_manager=manager, session_factory=_session, delay_seconds=0, **kwargs)
+    loaded = []
+
+    async def load(db, tenant_id, params):
+        loaded.append((tenant_id, params['days']))
+        return {'tenant': str(tenant_id), 'days': params['days']}
+
+    warmer.register(WarmableEndpoint(
+        name='dashboard_kpis',
+        cache_key=lambda tenant_id, params: f"dashboard_kpis:{tenant_id}:days:{params['days']}",
+        loader=load,
+        ttl=300
+    ))
+    return warmer, manager, loaded
+
+
+def test_hot_targets_need_repeated_accesses():
+    warmer, _, _ = _warmer(min_score=2)
+    tenant_id = uuid4()
+
+    for _ in range(3):
+        warmer.record_access('dashboard_kpis', tenant_id, {'days': 30})
+    warmer.record_access('dashboard_kpis', str(tenant_id), {'days': 7})
+    warmer.record_access('unregistered', tenant_id, {})
+
+    assert [target.params['days'] for target in warmer.hot_targets(tenant_id)] == [30]
+    assert warmer.tenant_activity(tenant_id) == pytest.approx(4, rel=0.01)
+    assert warmer.hot_targets(uuid4()) == []
+
+
+@pytest.mark.asyncio
+async def test_ingestion_event_warms_hot_entries_by_tenant_activity():
+    warmer, manager, loaded = _warmer(concurrency=1, min_score=0.5)
+    publisher = EventPublisher()
+    warmer.subscribe(publisher)
+    quiet, busy = uuid4(), uuid4()
+
+    warmer.record_access('dashboard_kpis', quiet, {'days': 30})
+    for _ in range(5):
+        warmer.record_access('dashboard_kpis', busy, {'days': 30})
+        warmer.record_access('dashboard_kpis', busy, {'days': 7})
+    warmer.record_access('dashboard_kpis', busy, {'days': 7})
+
+    # Both tenants are queued before the single worker runs
+    assert warmer.enqueue_tenant(quiet) == 1
+    assert warmer.enqueue_tenant(busy) == 2
+    await warmer.drain()
+    assert loaded == [(busy, 7), (busy, 30), (quiet, 30)]
+
+    assert await manager.get(key=f"dashboard_kpis:{busy}:days:7", check_freshness=False) == {
+        'tenant': str(busy), 'days': 7
+    }
+
+    # An ingestion run triggers the same warming
+    loaded.clear()
+    await publisher.publish(DataEvent(
+        event_type=EventType.INGESTION_COMPLETED,
+        tenant_id=quiet,
+        entity_type='ingestion',
+        entity_id='csv_upload:sales.csv'
+    ))
+    await warmer.drain()
+    assert loaded == [(quiet, 30)]
+    assert warmer.get_stats()['warmed'] == 4
+    await warmer.stop()
+
+
+@pytest.mark.asyncio
+async def test_ingestion_on_another_worker_warms_local_hot_entries():
+    warmer, _, loaded = _warmer(min_score=0.5)
+    publisher = EventPublisher()
+    warmer.subscribe(publisher)
+    tenant_id = uuid4()
+    warmer.record_access('dashboard_kpis', tenant_id, {'days': 30})
+
+    await publisher._receive(DataEvent(
+        event_type=EventType.INGESTION_COMPLETED,
+        tenant_id=tenant_id,
+        entity_type='ingestion',
+        entity_id='ingestion_pipeline',
+        origin='other-worker'
+    ).to_message())
+    await warmer.drain()
+
+    assert loaded == [(tenant_id, 30)]
+    await warmer.stop()
+
+
+@pytest.mark.asyncio
+async def test_refresh_skips_entries_being_recomputed(fake_redis):
+    manager = CacheManager()
+    manager._redis = fake_redis
+
+    async def compute():
+        return {'v': 1}
+
+    await fake_redis.set(f"{CacheManager.LEASE_PREFIX}:pricing:t:p1", "other-worker", px=30000)
+    assert not await manager.refresh(key='pricing:t:p1', compute=compute, ttl=60)
+    assert await manager.refresh(key='pricing:t:p2', compute=compute, ttl=60)
+    assert await manager.get(key='pricing:t:p2') == {'v': 1}
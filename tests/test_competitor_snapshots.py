@@ -0,0 +1,154 @@
+"""Tests for materialized competitor price snapshots and the competitor dashboard"""
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.cache.event_bus import DataEvent, EventPublisher, EventType
+from src.models.competitor_price_snapshot import CompetitorPriceSnapshot
+from src.models.product import Product
+from src.pricing.competitor_snapshots import CompetitorSnapshotService
+from src.pricing.equivalence_store import ProductEquivalenceMaintainer, ProductEquivalenceStore
+
+
+async def _add_product(db, tenant_id, sku, price, competitor=None, category="electronics", on_sale=False):
+    product = Product(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        sku=sku,
+        normalized_sku=sku,
+        name=f"Item {sku}",
+        category=category,
+        price=Decimal(str(price)),
+        currency="USD",
+        marketplace=competitor or "our-store",
+        inventory_level=10,
+        extra_metadata={"is_competitor": True, "is_on_sale": on_sale} if competitor else None
+    )
+    db.add(product)
+    await db.flush()
+    return product
+
+
+async def _catalog(db, tenant_id):
+    """Three tracked products (lowest, competitive, highest) and one without competitors"""
+    cheap = await _add_product(db, tenant_id, "AAA01", 50)
+    fair = await _add_product(db, tenant_id, "BBB02", 100, category="garden")
+    pricey = await _add_product(db, tenant_id, "CCC03", 200)
+    await _add_product(db, tenant_id, "ZZZ09", 10)
+    for sku, prices in (("AAA01", (80, 90)), ("BBB02", (90, 110)), ("CCC03", (100, 120))):
+        for i, price in enumerate(prices):
+            await _add_product(db, tenant_id, sku, price, competitor=f"shop_{i}", on_sale=(i == 0))
+    await ProductEquivalenceStore(tenant_id).rebuild(db)
+    return cheap, fair, pricey
+
+
+@pytest.mark.asyncio
+async def test_refresh_and_keyset_reads(test_db, test_tenant_id):
+    """Snapshots hold per-product aggregates; pages and totals are read from them"""
+    cheap, fair, pricey = await _catalog(test_db, test_tenant_id)
+    service = CompetitorSnapshotService(test_tenant_id)
+
+    assert await service.refresh(test_db) == 3
+
+    rows = {
+        row.product_id: row
+        for row in (await test_db.execute(select(CompetitorPriceSnapshot))).scalars().all()
+    }
+    assert {pid: rows[pid].price_position for pid in rows} == \
+        {cheap.id: "lowest", fair.id: "competitive", pricey.id: "highest"}
+    assert rows[cheap.id].avg_price == Decimal("85.00")
+    assert rows[cheap.id].price_gap_percentage == pytest.approx((50 - 85) / 85 * 100)
+    assert rows[cheap.id].potential_revenue_gain == pytest.approx(28.0)
+    assert rows[pricey.id].competitor_count == 2 and rows[pricey.id].active_promotions == 1
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = await service.get_page(test_db, limit=2, cursor=cursor)
+        seen += [item["product_id"] for item in page]
+        if cursor is None:
+            break
+    assert seen == sorted(str(pid) for pid in rows)
+
+    garden, _ = await service.get_page(test_db, limit=10, category="garden")
+    assert [item["product_id"] for item in garden] == [str(fair.id)]
+
+    summary = await service.get_summary(test_db)
+    assert summary["totals"] == {
+        "total_products_tracked": 3,
+        "products_competitively_priced": 1,
+        "products_underpriced": 1,
+        "products_overpriced": 1,
+        "avg_price_gap": round((abs(-35 / 85) + 0 + abs(90 / 110)) * 100 / 3, 2),
+        "total_potential_revenue_gain": 28.0,
+        "active_competitor_promotions": 3
+    }
+    assert [item["product_id"] for item in summary["alerts"]] == [str(pricey.id), str(cheap.id)]
+    assert [item["product_id"] for item in summary["opportunities"]] == [str(cheap.id)]
+
+
+@pytest.mark.asyncio
+async def test_maintainer_refreshes_snapshots_of_affected_products(test_db, test_tenant_id):
+    """A competitor price change or removal refreshes the snapshots of our mapped products"""
+    @asynccontextmanager
+    async def session_factory():
+        yield test_db
+
+    cheap, _, _ = await _catalog(test_db, test_tenant_id)
+    service = CompetitorSnapshotService(test_tenant_id)
+    await service.refresh(test_db)
+
+    competitor = (await test_db.execute(
+        select(Product).where(Product.sku == "AAA01", Product.marketplace == "shop_1")
+    )).scalar_one()
+
+    publisher = EventPublisher()
+    maintainer = ProductEquivalenceMaintainer(publisher, session_factory, debounce_seconds=0.01)
+
+    async def snapshot():
+        return (await test_db.execute(
+            select(CompetitorPriceSnapshot).where(CompetitorPriceSnapshot.product_id == cheap.id)
+        )).scalar_one_or_none()
+
+    competitor.price = Decimal("40")
+    await test_db.flush()
+    await publisher.publish(DataEvent(
+        event_type=EventType.PRODUCT_UPDATED, tenant_id=test_tenant_id,
+        entity_type='product', entity_id=str(competitor.id)
+    ))
+    await maintainer.drain()
+    refreshed = await snapshot()
+    assert (refreshed.min_price, refreshed.price_position) == (Decimal("40.00"), "competitive")
+
+    await test_db.delete(competitor)
+    await test_db.flush()
+    await publisher.publish(DataEvent(
+        event_type=EventType.PRODUCT_DELETED, tenant_id=test_tenant_id,
+        entity_type='product', entity_id=str(competitor.id)
+    ))
+    await maintainer.drain()
+    refreshed = await snapshot()
+    assert (refreshed.competitor_count, refreshed.max_price) == (1, Decimal("80.00"))
+
+
+@pytest.mark.asyncio
+async def test_overview_endpoint_reads_snapshots(client, test_db, test_tenant_id):
+    """The overview pages through snapshots and reports totals for the whole tenant"""
+    await _catalog(test_db, test_tenant_id)
+    await CompetitorSnapshotService(test_tenant_id).refresh(test_db)
+
+    response = await client.get("/api/v1/competitor-dashboard/overview", params={"limit": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["price_comparisons"]) == 2 and body["next_cursor"]
+    assert body["market_overview"]["total_products_tracked"] == 3
+    assert {alert["severity"] for alert in body["price_alerts"]} == {"high"}
+    assert len(body["top_opportunities"]) == 1
+
+    response = await client.get(
+        "/api/v1/competitor-dashboard/overview", params={"limit": 2, "cursor": body["next_cursor"]}
+    )
+    assert len(response.json()["price_comparisons"]) == 1
+    assert response.json()["next_cursor"] is None
@@ -1,6 +1,7 @@
 """Tests for CSV upload with LLM analysis"""
 import pytest
 import io
+from types import SimpleNamespace
 from uuid import uuid4
 from fastapi import UploadFile
 
@@ -174,5 +175,82 @@ def test_llm_query_generation():
     assert 'amazon' in query or 'ebay' in query
 
 
+class _StubLLMEngine:
+    """Answers the upload analysis without calling an LLM"""
+
+    def __init__(self, tenant_id):
+        pass
+
+    def understand_query(self, query):
+        return SimpleNamespace(value='analysis'), {'confidence': 0.9}
+
+    def select_agents(self, intent, parameters):
+        return [SimpleNamespace(value='pricing')]
+
+    def generate_execution_plan(self, **kwargs):
+        return None
+
+    def get_token_usage(self):
+        return {}
+
+
+class _StubExecutionService:
+    def __init__(self, tenant_id):
+        pass
+
+    async def execute_plan(self, plan, query_data):
+        return []
+
+
+class _StubSynthesizer:
+    def __init__(self, tenant_id):
+        pass
+
+    def synthesize_results(self, **kwargs):
+        return SimpleNamespace(model_dump=lambda: {'summary': 'ok'})
+
+
+@pytest.mark.asyncio
+async def test_product_and_review_uploads_succeed(client, monkeypatch):
+    """Product and review uploads save their rows and leave forecasts alone"""
+    import src.api.csv_upload as csv_upload
+
+    scheduled = []
+    monkeypatch.setattr(csv_upload, 'LLMReasoningEngine', _StubLLMEngine)
+    monkeypatch.setattr(csv_upload, 'ExecutionService', _StubExecutionService)
+    monkeypatch.setattr(csv_upload, 'ResultSynthesizer', _StubSynthesizer)
+    monkeypatch.setattr(
+        csv_upload, 'schedule_forecast_materialization',
+        lambda tenant_id, product_ids: scheduled.append(product_ids)
+    )
+
+    products_csv = (
+        "sku,name,category,price,marketplace,inventory_level\n"
+        "PROD-001,Product 1,Electronics,29.99,amazon,100\n"
+        "PROD-002,Product 2,Office,49.99,ebay,50\n"
+    )
+    response = await client.post(
+        "/api/v1/csv/upload/products",
+        files={"file": ("products.csv", products_csv, "text/csv")}
+    )
+    assert response.status_code == 200
+    assert response.json()['products_uploaded'] == 2
+
+    product_id = uuid4()
+    reviews_csv = (
+        "product_id,rating,text,source\n"
+        f"{product_id},5,Great!,csv_upload\n"
+        f"{product_id},2,Broke quickly,csv_upload\n"
+    )
+    response = await client.post(
+        "/api/v1/csv/upload/reviews",
+        files={"file": ("reviews.csv", reviews_csv, "text/csv")}
+    )
+    assert response.status_code == 200
+    assert response.json()['reviews_uploaded'] == 2
+
+    assert scheduled == []  # Only sales uploads refresh materialized forecasts
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,41 @@
+"""Tests for the combined dashboard overview endpoint"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.api import dashboard
+from src.services.cache_service import get_ttl, make_cache_key
+
+
+@pytest.mark.asyncio
+async def test_overview_computes_misses_through_the_lease(monkeypatch):
+    """Hits come from one batched read; each miss goes through get_or_compute_cached"""
+    tenant_id = uuid4()
+    kpis_key = make_cache_key("dashboard_kpis", str(tenant_id), days=30)
+    computed = {}
+
+    async def get_many_cached(keys):
+        return {kpis_key: {"revenue": 1}}
+
+    async def get_or_compute_cached(key, compute, ttl):
+        computed[key] = ttl
+        return await compute()
+
+    async def load(service, params):
+        return {"loaded": True}
+
+    monkeypatch.setattr(dashboard, "get_many_cached", get_many_cached)
+    monkeypatch.setattr(dashboard, "get_or_compute_cached", get_or_compute_cached)
+    for cache_type in dashboard.WARMABLE_WIDGETS:
+        monkeypatch.setitem(dashboard.WARMABLE_WIDGETS, cache_type, load)
+
+    request = SimpleNamespace(state=SimpleNamespace(tenant_id=tenant_id))
+    response = await dashboard.get_dashboard_overview(request, days=30, activity_limit=10, db=None)
+
+    overview = response["payload"]
+    assert overview["kpis"] == {"revenue": 1}
+    assert overview["stats"] == {"loaded": True}
+    assert kpis_key not in computed
+    assert len(computed) == 5
+    assert computed[make_cache_key("dashboard_activity", str(tenant_id), limit=10)] == get_ttl("dashboard_activity")
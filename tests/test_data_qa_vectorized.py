@@ -0,0 +1,122 @@
+"""Tests for the columnar data quality checks"""
+import re
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.agents.data_qa_agent import DataQAAgent
+from src.processing.quality_columns import (
+    ProductColumns,
+    ReviewColumns,
+    character_statistics,
+    count_duplicated_values
+)
+from src.schemas.product import ProductResponse
+from src.schemas.review import ReviewResponse
+
+
+def _product(name, sku, price, inventory=10, days_old=0, category="home"):
+    now = datetime.utcnow()
+    return ProductResponse(
+        id=uuid4(),
+        sku=sku,
+        normalized_sku=sku,
+        name=name,
+        category=category,
+        price=price,
+        currency="USD",
+        marketplace="test",
+        inventory_level=inventory,
+        created_at=now,
+        updated_at=now - timedelta(days=days_old)
+    )
+
+
+def _review(text, rating, days_old=0, sentiment=None):
+    return ReviewResponse(
+        id=uuid4(),
+        product_id=uuid4(),
+        rating=rating,
+        text=text,
+        source="test",
+        sentiment=sentiment,
+        created_at=datetime.utcnow() - timedelta(days=days_old)
+    )
+
+
+@pytest.mark.parametrize("texts", [
+    ["aaaaa", "aaaa", "ab\n\n\n\n\ncd", "", "ÄÖÜ ok", "xxxx\nx", "CAPS ONLY!!!!!"],
+    ["\U0010ffff" * 6, "a", "bbbbbb"],
+])
+def test_character_statistics_match_per_text_checks(texts):
+    """Uppercase counts and runs agree with str.isupper and the (.)\\1{4,} regex"""
+    upper, has_run = character_statistics(texts)
+
+    assert upper.tolist() == [sum(c.isupper() for c in t) for t in texts]
+    assert has_run.tolist() == [bool(re.search(r'(.)\1{4,}', t)) for t in texts]
+
+
+def test_character_statistics_empty():
+    upper, has_run = character_statistics([])
+    assert len(upper) == 0 and len(has_run) == 0
+
+
+def test_product_columns():
+    """Missing values become NaN and ages are measured from updated_at"""
+    products = [
+        _product("Desk Lamp", "LAMP-1", 20, inventory=None, days_old=31),
+        _product("desk lamp", "LAMP-1", 30, category=None),
+    ]
+    columns = ProductColumns.from_products(products, ['id', 'sku', 'name', 'price', 'marketplace'])
+
+    assert columns.required_present.tolist() == [5, 5]
+    assert columns.has_category.tolist() == [True, False]
+    assert columns.price.tolist() == [20.0, 30.0]
+    assert columns.inventory[0] != columns.inventory[0]  # NaN
+    assert count_duplicated_values(columns.sku) == 1
+    assert count_duplicated_values(columns.name_lower) == 1
+    assert columns.entity_ids([1]) == [str(products[1].id)]
+
+
+def test_product_report_dimensions():
+    """Anomalies and dimension counts from the vectorized checks"""
+    products = [_product(f"Lamp {i}", f"LAMP-{i}", 20 + i % 3, inventory=0) for i in range(30)]
+    products.append(_product("Sample chair", "CHAIR-1", 5000, days_old=45))
+
+    report = DataQAAgent(uuid4()).assess_product_data_quality(products)
+
+    outliers = [a for a in report.anomalies if a.type == "price_outlier"]
+    assert [a.affected_entities for a in outliers] == [[str(products[-1].id)]]
+    assert outliers[0].severity == "high"
+    out_of_stock = [a for a in report.anomalies if a.type == "high_out_of_stock_rate"]
+    assert len(out_of_stock[0].affected_entities) == 30
+    assert report.dimensions.freshness.issues_count == 1
+    # Round price (0.5) plus generic name (1)
+    assert report.dimensions.accuracy.issues_count == 1
+
+
+def test_review_report_dimensions():
+    """Mismatches, suspicious reviews and surge detection"""
+    reviews = [_review("Great value for the money", 5, days_old=1) for _ in range(8)]
+    reviews += [
+        _review("Worst purchase, I hate it", 5, days_old=100),
+        _review("I love the colour but it broke", 1, sentiment="negative"),
+        _review("BAD!!!!!", 1),
+    ]
+
+    report = DataQAAgent(uuid4()).assess_review_data_quality(reviews)
+
+    assert report.dimensions.consistency.issues_count == 2
+    assert report.dimensions.freshness.issues_count == 1
+    # Short, mostly uppercase and repeated characters: 1.5 suspicious
+    assert report.dimensions.accuracy.details == "0 spam, 1 suspicious reviews"
+    assert report.missing_data[0].affected_count == 10
+    surge = [a for a in report.anomalies if a.type == "review_surge"]
+    assert len(surge[0].affected_entities) == 10
+
+
+def test_review_columns_without_text():
+    columns = ReviewColumns.from_reviews([_review("x", 3)])
+    assert columns.text_length.tolist() == [1]
+    assert columns.has_sentiment.tolist() == [False]
@@ -224,3 +224,65 @@ def test_to_dict_conversion(tenant_id, sample_sales_history):
         assert 'lower_bound' in fp
         assert 'upper_bound' in fp
         assert 'confidence' in fp
+
+
+def test_model_cache_reuses_fits_for_same_series(tenant_id, sample_sales_history):
+    """Repeat forecasts of an unchanged series reuse cached fits and scores"""
+    from src.forecasting.model_cache import FittedModelCache
+    
+    cache = FittedModelCache()
+    agent = DemandForecastAgent(tenant_id=tenant_id, model_cache=cache)
+    product_id = uuid4()
+    
+    first = agent.forecast_demand(product_id, "Test Product", sample_sales_history, 30)
+    second = agent.forecast_demand(product_id, "Test Product", sample_sales_history, 14)
+    
+    stats = cache.get_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+    assert second.best_model == first.best_model
+    assert second.model_performances == first.model_performances
+    assert len(second.forecast_points) == 14
+    assert second.forecast_points[0].predicted_quantity == first.forecast_points[0].predicted_quantity
+
+
+def test_model_cache_updates_incrementally_on_new_day(tenant_id, sample_sales_history):
+    """One appended day updates cached fits instead of refitting"""
+    from src.forecasting.model_cache import FittedModelCache
+    
+    cache = FittedModelCache()
+    agent = DemandForecastAgent(tenant_id=tenant_id, model_cache=cache)
+    product_id = uuid4()
+    
+    agent.forecast_demand(product_id, "Test Product", sample_sales_history[:-1], 30)
+    updated = agent.forecast_demand(product_id, "Test Product", sample_sales_history, 30)
+    
+    assert cache.get_stats()['incremental_updates'] == 1
+    assert cache.get(tenant_id, product_id).appended_days == 1
+    
+    # Incremental result stays close to a full refit
+    refit = DemandForecastAgent(tenant_id=tenant_id, use_model_cache=False).forecast_demand(
+        product_id, "Test Product", sample_sales_history, 30
+    )
+    assert updated.forecast_points[0].date == refit.forecast_points[0].date
+    assert abs(
+        updated.forecast_points[0].predicted_quantity - refit.forecast_points[0].predicted_quantity
+    ) < 5
+
+
+def test_model_cache_refits_when_history_changes(tenant_id, sample_sales_history):
+    """Edits to past sales invalidate cached fits"""
+    from src.forecasting.model_cache import FittedModelCache
+    
+    cache = FittedModelCache()
+    agent = DemandForecastAgent(tenant_id=tenant_id, model_cache=cache)
+    product_id = uuid4()
+    
+    agent.forecast_demand(product_id, "Test Product", sample_sales_history, 30)
+    edited = [dict(record) for record in sample_sales_history]
+    edited[10]['quantity'] += 50
+    agent.forecast_demand(product_id, "Test Product", edited, 30)
+    
+    stats = cache.get_stats()
+    assert stats['misses'] == 2
+    assert stats['hits'] == 0
@@ -0,0 +1,110 @@
+"""Tests for coalescing per-row data events into batch events"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.cache.cache_manager import CacheManager
+from src.cache.event_bus import (
+    CacheInvalidationSubscriber,
+    DataEvent,
+    EventCoalescer,
+    EventPublisher,
+    EventType,
+)
+from src.pricing.equivalence_store import ProductEquivalenceMaintainer
+from src.processing.qa_report_cache import QAReportCache
+
+
+def _review_event(tenant_id, product_id):
+    return DataEvent(
+        event_type=EventType.REVIEW_CREATED,
+        tenant_id=tenant_id,
+        entity_type='review',
+        entity_id=str(uuid4()),
+        metadata={'product_id': str(product_id)}
+    )
+
+
+@pytest.mark.asyncio
+async def test_events_of_a_window_are_published_once():
+    publisher = EventPublisher()
+    received = []
+
+    async def record(event):
+        received.append(event)
+
+    publisher.subscribe(EventType.REVIEW_CREATED, record)
+    coalescer = EventCoalescer(publisher, window_seconds=0.01)
+    tenant_id = uuid4()
+    product_ids = [uuid4() for _ in range(5)]
+
+    coalescer.add_many([_review_event(tenant_id, product_ids[i % 5]) for i in range(100)])
+    assert not received  # Nothing is published on the request path
+    await asyncio.sleep(0.05)
+
+    assert len(received) == 1
+    batch = received[0]
+    assert len(batch.entity_ids) == 100
+    assert batch.product_ids == [str(product_id) for product_id in product_ids]
+    assert DataEvent.from_message(batch.to_message()) == batch
+
+
+@pytest.mark.asyncio
+async def test_flush_splits_large_groups():
+    publisher = EventPublisher()
+    received = []
+
+    async def record(event):
+        received.append(event)
+
+    publisher.subscribe(EventType.PRODUCT_CREATED, record)
+    coalescer = EventCoalescer(publisher, window_seconds=60, max_batch_size=40)
+    tenant_id = uuid4()
+
+    coalescer.add(DataEvent.batch(EventType.PRODUCT_CREATED, tenant_id, 'product', [str(uuid4()) for _ in range(100)]))
+    await coalescer.flush()
+
+    assert [len(event.entity_ids) for event in received] == [40, 40, 20]
+    assert all(event.product_ids == event.entity_ids for event in received)
+
+
+@pytest.mark.asyncio
+async def test_batch_invalidation_is_bounded_in_round_trips(fake_redis):
+    publisher = EventPublisher()
+    manager = CacheManager(local_ttl=300)
+    manager._redis = fake_redis
+    CacheInvalidationSubscriber(manager, publisher)
+    tenant_id, other_product = uuid4(), str(uuid4())
+    product_ids = [str(uuid4()) for _ in range(50)]
+
+    await manager.set_many('pricing', tenant_id, {product_id: {'price': 1} for product_id in product_ids + [other_product]})
+    await manager.set_many('forecast', tenant_id, {f'{product_id}:30': {'series': []} for product_id in product_ids})
+
+    calls = fake_redis.calls
+    await publisher.publish(DataEvent.batch(EventType.PRODUCT_UPDATED, tenant_id, 'product', product_ids))
+
+    # One SINTER pipeline and one UNLINK per cache type, not one scan per product
+    assert fake_redis.calls - calls <= 2 * 5
+    assert await manager.get_many('pricing', tenant_id, product_ids + [other_product]) == {other_product: {'price': 1}}
+    assert await manager.get_many('forecast', tenant_id, [f'{product_id}:30' for product_id in product_ids]) == {}
+
+
+@pytest.mark.asyncio
+async def test_subscribers_handle_batch_events():
+    publisher = EventPublisher()
+    reports = QAReportCache()
+    reports.subscribe(publisher)
+    maintainer = ProductEquivalenceMaintainer(publisher, debounce_seconds=60)
+    tenant_id = uuid4()
+    product_ids = [str(uuid4()) for _ in range(3)]
+
+    await publisher.publish(DataEvent.batch(EventType.PRODUCT_CREATED, tenant_id, 'product', product_ids))
+    await publisher.publish(DataEvent.batch(
+        EventType.REVIEW_CREATED, tenant_id, 'review', [str(uuid4())], product_ids=product_ids[:1]
+    ))
+
+    assert reports.generation(tenant_id) == 2
+    assert {str(product_id) for product_id in maintainer._pending[tenant_id]} == set(product_ids)
+    for task in maintainer._tasks.values():
+        task.cancel()
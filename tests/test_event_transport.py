@@ -0,0 +1,139 @@
+"""Tests for delivering data events to every worker"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.cache.cache_manager import CacheManager
+from src.cache.event_bus import CacheInvalidationSubscriber, DataEvent, EventPublisher, EventType
+from src.cache.event_transport import InMemoryEventTransport, RedisEventTransport
+from src.processing.qa_report_cache import QAReportCache
+
+
+def test_event_message_round_trip():
+    event = DataEvent(
+        event_type=EventType.REVIEW_CREATED,
+        tenant_id=uuid4(),
+        entity_type='review',
+        entity_id=str(uuid4()),
+        metadata={'product_id': str(uuid4())},
+        origin='worker-a'
+    )
+    assert DataEvent.from_message(event.to_message().encode()) == event
+
+
+async def _worker(transport, fake_redis):
+    """Publisher, cache manager and subscribers of one simulated worker process"""
+    publisher = EventPublisher()
+    manager = CacheManager(local_ttl=300)
+    manager._redis = fake_redis
+    CacheInvalidationSubscriber(manager, publisher)
+    reports = QAReportCache()
+    reports.subscribe(publisher)
+    await publisher.attach_transport(transport)
+    return publisher, manager, reports
+
+
+@pytest.mark.asyncio
+async def test_events_invalidate_local_state_of_every_worker(fake_redis):
+    transport = InMemoryEventTransport()
+    publisher_a, manager_a, _ = await _worker(transport, fake_redis)
+    publisher_b, manager_b, reports_b = await _worker(transport, fake_redis)
+    tenant_id, product_id = uuid4(), uuid4()
+
+    await manager_a.set('pricing', tenant_id, str(product_id), {'price': 10})
+    assert await manager_b.get('pricing', tenant_id, str(product_id)) == {'price': 10}  # Now in B's local tier
+
+    received = []
+    publisher_b.subscribe(EventType.PRICE_UPDATED, lambda event: _record(received, event))
+    calls = fake_redis.calls
+    await publisher_a.publish(DataEvent(
+        event_type=EventType.PRICE_UPDATED,
+        tenant_id=tenant_id,
+        entity_type='product',
+        entity_id=str(product_id)
+    ))
+
+    # Worker A invalidated Redis; worker B only dropped its local entry
+    assert fake_redis.calls == calls + 2
+    assert not manager_b._memory_cache.keys()
+    assert await manager_b.get('pricing', tenant_id, str(product_id)) is None
+    assert reports_b.generation(tenant_id) == 1
+    # Plain subscribers run only in the publishing worker
+    assert received == []
+
+    await publisher_b.detach_transport()
+    await publisher_a.publish(DataEvent(
+        event_type=EventType.PRICE_UPDATED,
+        tenant_id=tenant_id,
+        entity_type='product',
+        entity_id=str(product_id)
+    ))
+    assert reports_b.generation(tenant_id) == 1
+
+
+async def _record(received, event):
+    received.append(event)
+
+
+class _PooledRedis:
+    """Redis client stand-in whose reads time out like a pooled connection with socket_timeout"""
+
+    def __init__(self, socket_timeout):
+        self.socket_timeout = socket_timeout
+        self.subscriptions = 0
+        self.messages = asyncio.Queue()
+
+    async def ping(self):
+        return True
+
+    async def publish(self, channel, message):
+        await self.messages.put(message)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return _PooledPubSub(self)
+
+
+class _PooledPubSub:
+    def __init__(self, client):
+        self.client = client
+
+    async def subscribe(self, channel):
+        self.client.subscriptions += 1
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        wait = self.client.socket_timeout if timeout is None else min(timeout, self.client.socket_timeout)
+        try:
+            data = await asyncio.wait_for(self.client.messages.get(), wait)
+        except asyncio.TimeoutError:
+            if timeout is None or timeout >= self.client.socket_timeout:
+                raise TimeoutError("Timeout reading from socket")
+            return None
+        return {'type': 'message', 'data': data}
+
+    async def listen(self):
+        while True:
+            data = await asyncio.wait_for(self.client.messages.get(), self.client.socket_timeout)
+            yield {'type': 'message', 'data': data}
+
+    async def aclose(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_idle_subscription_on_pooled_client_stays_subscribed():
+    client = _PooledRedis(socket_timeout=0.1)
+    transport = RedisEventTransport(client=client, poll_interval=0.02)
+    received = []
+
+    async def handler(message):
+        received.append(message)
+
+    await transport.start(handler)
+    await asyncio.sleep(0.35)  # Idle for several socket timeouts
+    await transport.send(b'event')
+    await asyncio.sleep(0.1)
+    await transport.stop(handler)
+
+    assert received == [b'event']
+    assert client.subscriptions == 1
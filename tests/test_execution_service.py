@@ -1,8 +1,10 @@
 """Tests for Execution Service"""
 import pytest
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
-from datetime import timedelta
+from datetime import date, timedelta
+from decimal import Decimal
 
 from src.orchestration.execution_service import ExecutionService
 from src.schemas.orchestration import (
@@ -222,3 +224,125 @@ class TestExecutionStats:
         assert stats['success_rate'] > 0
         assert 'avg_execution_time' in stats
         assert 'by_mode' in stats
+
+
+class TestForecastAgent:
+    """Tests for the demand forecast agent tiers"""
+    
+    @pytest.fixture
+    async def forecast_products(self, test_db, test_tenant_id, monkeypatch):
+        """Two products with 45 days of sales, fitted on an in-process executor"""
+        from src.models.product import Product
+        from src.models.sales_record import SalesRecord
+        
+        pool = ThreadPoolExecutor(max_workers=2)
+        monkeypatch.setattr("src.forecasting.batch_engine.get_forecast_executor", lambda: pool)
+        
+        products = []
+        for name in ("Widget", "Gadget"):
+            product = Product(
+                id=uuid4(), tenant_id=test_tenant_id, sku=f"SKU-{name}", normalized_sku=name,
+                name=name, price=Decimal("9.99"), currency="USD", marketplace="test",
+                inventory_level=50
+            )
+            test_db.add(product)
+            start = date.today() - timedelta(days=45)
+            for i in range(45):
+                test_db.add(SalesRecord(
+                    tenant_id=test_tenant_id, product_id=product.id, quantity=8 + (i % 7),
+                    revenue=Decimal("80.00"), date=start + timedelta(days=i), marketplace="test"
+                ))
+            products.append(product)
+        await test_db.flush()
+        
+        yield [p.id for p in products]
+        pool.shutdown(wait=True)
+    
+    @pytest.mark.asyncio
+    async def test_quick_mode_uses_vectorized_baselines(self, test_db, test_tenant_id, forecast_products):
+        """Quick mode forecasts every product with the baseline models"""
+        from src.forecasting.vectorized import BASELINE_MODELS
+        
+        service = ExecutionService(tenant_id=test_tenant_id)
+        result = await service._execute_forecast_agent(
+            test_db, test_tenant_id, forecast_products, {'forecast_horizon_days': 14},
+            execution_mode=ExecutionMode.QUICK
+        )
+        
+        data = result['data']
+        assert result['status'] == 'completed'
+        assert len(data['forecasts']) == 2
+        assert all(f['best_model'] in BASELINE_MODELS for f in data['forecasts'])
+        assert len(data['forecast_points']) == 14
+        assert data['forecasted_demand'] == pytest.approx(
+            sum(p['predicted_quantity'] for p in data['forecast_points']), rel=1e-3
+        )
+        # 50 units on hand cannot cover two weeks of ~11 units/day
+        assert data['supply_gap'] > 0
+        assert data['recommendations'][0]['title'].startswith("Reorder")
+    
+    @pytest.mark.asyncio
+    async def test_demand_change_covers_materialized_products(
+        self, test_db, test_tenant_id, forecast_products, monkeypatch
+    ):
+        """Recent actuals of materialized products count toward the demand change"""
+        from src.forecasting.materialization import ForecastMaterializer
+        
+        service = ExecutionService(tenant_id=test_tenant_id)
+        live = await service._execute_forecast_agent(
+            test_db, test_tenant_id, forecast_products, {'forecast_horizon_days': 14},
+            execution_mode=ExecutionMode.QUICK
+        )
+        
+        # Serve the first product's forecast as if it had been materialized
+        stored = {forecast_products[0]: live['data']['forecasts'][0]}
+        
+        async def get_fresh_forecasts(self, db, product_ids, horizon, max_age_hours=None):
+            return {pid: f for pid, f in stored.items() if pid in product_ids}
+        monkeypatch.setattr(ForecastMaterializer, "get_fresh_forecasts", get_fresh_forecasts)
+        
+        mixed = await service._execute_forecast_agent(
+            test_db, test_tenant_id, forecast_products, {'forecast_horizon_days': 14},
+            execution_mode=ExecutionMode.QUICK
+        )
+        
+        assert mixed['data']['materialized_forecasts'] == 1
+        assert mixed['data']['demand_change_pct'] == pytest.approx(live['data']['demand_change_pct'], abs=0.1)
+    
+    @pytest.mark.asyncio
+    async def test_deep_mode_fits_full_ensemble(self, test_db, test_tenant_id, forecast_products):
+        """Deep mode validates the statistical models per product"""
+        service = ExecutionService(tenant_id=test_tenant_id)
+        result = await service._execute_forecast_agent(
+            test_db, test_tenant_id, forecast_products, {'forecast_horizon_days': 14},
+            execution_mode=ExecutionMode.DEEP, timeout_seconds=60
+        )
+        
+        forecasts = result['data']['forecasts']
+        assert len(forecasts) == 2
+        for forecast in forecasts:
+            assert 'arima' in {p['model_name'] for p in forecast['model_performances']}
+    
+    @pytest.mark.asyncio
+    async def test_deep_mode_falls_back_to_baselines_when_over_budget(
+        self, test_db, test_tenant_id, forecast_products, monkeypatch
+    ):
+        """Products not fitted within the budget still get a baseline forecast"""
+        import time
+        import src.forecasting.batch_engine as batch_engine
+        from src.forecasting.vectorized import BASELINE_MODELS
+        
+        def slow_fit(*args, **kwargs):
+            time.sleep(0.5)
+            raise RuntimeError("too slow")
+        monkeypatch.setattr(batch_engine, "_fit_product_forecast", slow_fit)
+        
+        service = ExecutionService(tenant_id=test_tenant_id)
+        result = await service._execute_forecast_agent(
+            test_db, test_tenant_id, forecast_products, {'forecast_horizon_days': 14},
+            execution_mode=ExecutionMode.DEEP, timeout_seconds=0.2
+        )
+        
+        forecasts = result['data']['forecasts']
+        assert len(forecasts) == 2
+        assert all(f['best_model'] in BASELINE_MODELS for f in forecasts)
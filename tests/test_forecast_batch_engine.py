@@ -0,0 +1,185 @@
+"""Tests for the batch forecast engine"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+from src.models.product import Product
+from src.models.sales_record import SalesRecord
+from src.crud.sales_record import get_daily_sales_series
+from src.forecasting.batch_engine import (
+    AffinityProcessPool,
+    ForecastBatchEngine,
+    ForecastJob,
+    _model_cache_stats
+)
+
+
+async def _seed_product(db, tenant_id, name, days=30, records_per_day=1):
+    """Create a product with `days` days of sales history"""
+    product = Product(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        sku=f"SKU-{name}",
+        normalized_sku=f"SKU{name}",
+        name=name,
+        price=Decimal("19.99"),
+        currency="USD",
+        marketplace="test-marketplace",
+        inventory_level=120
+    )
+    db.add(product)
+    start = date.today() - timedelta(days=days)
+    for i in range(days):
+        for _ in range(records_per_day):
+            db.add(SalesRecord(
+                tenant_id=tenant_id,
+                product_id=product.id,
+                quantity=10 + (i % 7),
+                revenue=Decimal("100.00"),
+                date=start + timedelta(days=i),
+                marketplace="test-marketplace"
+            ))
+    await db.flush()
+    return product
+
+
+@pytest.fixture
+def executor():
+    """In-process executor keeps unit tests fast"""
+    pool = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_daily_sales_series_grouped_per_product(test_db, test_tenant_id):
+    """Multiple records on the same day are summed in one grouped query"""
+    product = await _seed_product(test_db, test_tenant_id, "A", days=5, records_per_day=2)
+    other_tenant_product = await _seed_product(test_db, uuid4(), "B", days=5)
+
+    series = await get_daily_sales_series(
+        test_db, test_tenant_id, [product.id, other_tenant_product.id]
+    )
+
+    assert list(series.keys()) == [product.id]
+    assert len(series[product.id]) == 5
+    assert series[product.id][0]['quantity'] == 20
+    dates = [p['date'] for p in series[product.id]]
+    assert dates == sorted(dates)
+
+
+@pytest.mark.asyncio
+async def test_prepare_jobs_preserves_request_order(test_db, test_tenant_id, executor):
+    """Jobs follow the requested order and drop unknown products"""
+    a = await _seed_product(test_db, test_tenant_id, "A", days=3)
+    b = await _seed_product(test_db, test_tenant_id, "B", days=3)
+
+    engine = ForecastBatchEngine(tenant_id=test_tenant_id, executor=executor)
+    jobs = await engine.prepare_jobs(test_db, [b.id, uuid4(), a.id])
+
+    assert [j.product_id for j in jobs] == [b.id, a.id]
+    assert all(len(j.sales_history) == 3 for j in jobs)
+
+
+@pytest.mark.asyncio
+async def test_prepare_jobs_tenant_wide(test_db, test_tenant_id, executor):
+    """Omitting product IDs forecasts every product of the tenant only"""
+    await _seed_product(test_db, test_tenant_id, "A", days=3)
+    await _seed_product(test_db, test_tenant_id, "B", days=3)
+    await _seed_product(test_db, uuid4(), "C", days=3)
+
+    engine = ForecastBatchEngine(tenant_id=test_tenant_id, executor=executor)
+    jobs = await engine.prepare_jobs(test_db)
+
+    assert [j.product_name for j in jobs] == ["A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_progress(test_tenant_id, executor):
+    """Every finished product is yielded with cumulative progress"""
+    history = [
+        {'date': date.today() - timedelta(days=30 - i), 'quantity': 10 + (i % 5)}
+        for i in range(30)
+    ]
+    jobs = [
+        ForecastJob(uuid4(), "With sales", 50, history),
+        ForecastJob(uuid4(), "No sales", 50, []),
+    ]
+
+    engine = ForecastBatchEngine(tenant_id=test_tenant_id, executor=executor)
+    seen = []
+    async for item, progress in engine.stream_forecasts(jobs, forecast_horizon_days=7):
+        seen.append((item.status, progress.processed))
+
+    assert sorted(status for status, _ in seen) == ['completed', 'insufficient_data']
+    assert [processed for _, processed in seen] == [1, 2]
+    assert progress.percent_complete == 100.0
+
+
+@pytest.mark.asyncio
+async def test_run_in_process_pool(test_db, test_tenant_id):
+    """Fits run in worker processes and results come back in job order"""
+    a = await _seed_product(test_db, test_tenant_id, "A", days=30)
+    b = await _seed_product(test_db, test_tenant_id, "B", days=30)
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        engine = ForecastBatchEngine(tenant_id=test_tenant_id, executor=pool)
+        jobs = await engine.prepare_jobs(test_db, [a.id, b.id])
+        items = await engine.run(jobs, forecast_horizon_days=14)
+
+    assert [i.product_id for i in items] == [a.id, b.id]
+    assert all(i.status == 'completed' for i in items)
+    assert len(items[0].forecast['forecast_points']) == 14
+    assert items[0].forecast['product_id'] == str(a.id)
+
+
+@pytest.mark.asyncio
+async def test_repeat_fits_hit_model_cache_across_pool(test_tenant_id):
+    """Each product is pinned to one worker, so every repeat request hits its cached fits"""
+    history = [
+        {'date': date.today() - timedelta(days=30 - i), 'quantity': 10 + (i % 7)}
+        for i in range(30)
+    ]
+    jobs = [ForecastJob(uuid4(), f"P{i}", 100, history) for i in range(6)]
+
+    def totals(pool):
+        # Forked workers inherit this process's counters - compare deltas
+        stats = [future.result() for future in pool.broadcast(_model_cache_stats)]
+        return {key: sum(s[key] for s in stats) for key in ('hits', 'misses', 'entries')}
+
+    pool = AffinityProcessPool(max_workers=3)
+    try:
+        before = totals(pool)
+        engine = ForecastBatchEngine(tenant_id=test_tenant_id, executor=pool)
+        for _ in range(3):
+            items = await engine.run(jobs, forecast_horizon_days=7)
+            assert all(i.status == 'completed' for i in items)
+        after = totals(pool)
+    finally:
+        pool.shutdown(wait=True)
+
+    assert after['misses'] - before['misses'] == len(jobs)
+    assert after['hits'] - before['hits'] == 2 * len(jobs)
+    assert after['entries'] - before['entries'] == len(jobs)
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_emits_results_and_summary(client, test_db, test_tenant_id):
+    """The streaming endpoint returns one NDJSON line per product plus a summary"""
+    import json
+
+    a = await _seed_product(test_db, test_tenant_id, "A", days=30)
+    b = await _seed_product(test_db, test_tenant_id, "B", days=0)
+
+    response = await client.post(
+        "/api/v1/forecast/batch/stream",
+        json={"product_ids": [str(a.id), str(b.id)], "forecast_horizon_days": 7}
+    )
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [e["type"] for e in events] == ["result", "result", "summary"]
+    assert events[-2]["progress"]["percent_complete"] == 100.0
+    assert events[-1]["summary"]["total_products_forecasted"] == 1
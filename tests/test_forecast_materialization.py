@@ -0,0 +1,169 @@
+"""Tests for forecast materialization into forecast_results"""
+import pytest
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import select, update
+
+from src.database import get_db, get_session_factory
+from src.main import app
+from src.models.forecast_result import ForecastResult
+from src.models.product import Product
+from src.models.sales_record import SalesRecord
+from src.forecasting.batch_engine import ForecastBatchEngine
+from src.forecasting.materialization import ForecastMaterializer
+
+
+async def _seed_product(db, tenant_id, name, days=30):
+    """Create a product with `days` days of sales history ending yesterday"""
+    product = Product(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        sku=f"SKU-{name}",
+        normalized_sku=f"SKU{name}",
+        name=name,
+        price=Decimal("19.99"),
+        currency="USD",
+        marketplace="test-marketplace",
+        inventory_level=120
+    )
+    db.add(product)
+    start = date.today() - timedelta(days=days)
+    for i in range(days):
+        db.add(SalesRecord(
+            tenant_id=tenant_id,
+            product_id=product.id,
+            quantity=10 + (i % 7),
+            revenue=Decimal("100.00"),
+            date=start + timedelta(days=i),
+            marketplace="test-marketplace"
+        ))
+    await db.flush()
+    return product
+
+
+@pytest.fixture
+def materializer_factory():
+    """Materializers backed by an in-process executor"""
+    pool = ThreadPoolExecutor(max_workers=2)
+
+    def make(tenant_id):
+        engine = ForecastBatchEngine(tenant_id=tenant_id, executor=pool)
+        return ForecastMaterializer(tenant_id=tenant_id, engine=engine)
+
+    yield make
+    pool.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_materialize_writes_tagged_rows(test_db, test_tenant_id, materializer_factory):
+    """Every SKU with sales gets one row tagged with model and watermark"""
+    a = await _seed_product(test_db, test_tenant_id, "A")
+    b = await _seed_product(test_db, test_tenant_id, "B")
+    await _seed_product(test_db, test_tenant_id, "NoSales", days=0)
+
+    materializer = materializer_factory(test_tenant_id)
+    summary = await materializer.materialize(test_db, forecast_horizon_days=14)
+
+    assert summary.total == 2
+    assert summary.written == 2
+
+    rows = (await test_db.execute(select(ForecastResult))).scalars().all()
+    assert {r.product_id for r in rows} == {a.id, b.id}
+    for row in rows:
+        assert row.best_model
+        assert row.data_watermark == date.today() - timedelta(days=1)
+        assert len(row.predicted_demand) == 14
+
+    # Re-running replaces rather than appends
+    await materializer.materialize(test_db, forecast_horizon_days=14)
+    rows = (await test_db.execute(select(ForecastResult))).scalars().all()
+    assert len(rows) == 2
+
+
+@pytest.mark.asyncio
+async def test_fresh_forecasts_skip_stale_rows(test_db, test_tenant_id, materializer_factory):
+    """New sales, aged rows, inventory changes and other horizons are not served"""
+    fresh = await _seed_product(test_db, test_tenant_id, "Fresh")
+    new_sales = await _seed_product(test_db, test_tenant_id, "NewSales")
+    aged = await _seed_product(test_db, test_tenant_id, "Aged")
+    restocked = await _seed_product(test_db, test_tenant_id, "Restocked")
+
+    materializer = materializer_factory(test_tenant_id)
+    await materializer.materialize(test_db, forecast_horizon_days=14)
+
+    test_db.add(SalesRecord(
+        tenant_id=test_tenant_id,
+        product_id=new_sales.id,
+        quantity=5,
+        revenue=Decimal("50.00"),
+        date=date.today(),
+        marketplace="test-marketplace"
+    ))
+    await test_db.execute(
+        update(ForecastResult)
+        .where(ForecastResult.product_id == aged.id)
+        .values(forecast_date=datetime.utcnow() - timedelta(days=3))
+    )
+    restocked.inventory_level = 500
+    await test_db.flush()
+
+    product_ids = [fresh.id, new_sales.id, aged.id, restocked.id]
+    stored = await materializer.get_fresh_forecasts(test_db, product_ids, 14)
+
+    assert list(stored.keys()) == [fresh.id]
+    assert stored[fresh.id]['product_name'] == "Fresh"
+    assert await materializer.get_fresh_forecasts(test_db, product_ids, 30) == {}
+
+    # Other tenants never see these rows
+    other = materializer_factory(uuid4())
+    assert await other.get_fresh_forecasts(test_db, product_ids, 14) == {}
+
+
+@pytest.mark.asyncio
+async def test_product_forecast_endpoint_serves_materialized_row(client, test_db, test_tenant_id, materializer_factory):
+    """The API returns the stored forecast instead of refitting"""
+    product = await _seed_product(test_db, test_tenant_id, "Served")
+    await materializer_factory(test_tenant_id).materialize(test_db, forecast_horizon_days=30)
+
+    row = (await test_db.execute(select(ForecastResult))).scalar_one()
+    row.forecast_metadata = {'forecast': {**row.forecast_metadata['forecast'], 'best_model': 'materialized'}}
+    await test_db.commit()
+
+    response = await client.get(f"/api/v1/forecast/product/{product.id}?forecast_horizon_days=30")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['best_model'] == 'materialized'
+    assert len(body['historical_sales']) == 30
+
+
+@pytest.mark.asyncio
+async def test_product_forecast_computes_in_its_own_session(client, test_db, test_tenant_id, materializer_factory):
+    """The shared computation can outlive the request, so it must not use the request's session"""
+    product = await _seed_product(test_db, test_tenant_id, "Owned")
+    await materializer_factory(test_tenant_id).materialize(test_db, forecast_horizon_days=30)
+    await test_db.commit()
+
+    opened = []
+
+    @asynccontextmanager
+    async def session_factory():
+        opened.append(True)
+        yield test_db
+
+    async def closed_request_session():
+        raise AssertionError("the request session must not be used")
+        yield
+
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    app.dependency_overrides[get_db] = closed_request_session
+
+    response = await client.get(f"/api/v1/forecast/product/{product.id}?forecast_horizon_days=30")
+
+    assert response.status_code == 200
+    assert response.json()['product_id'] == str(product.id)
+    assert opened == [True]
@@ -0,0 +1,63 @@
+"""Tests for the columnar forecast representation"""
+import numpy as np
+import pytest
+from datetime import date, timedelta
+
+from src.forecasting.series import (
+    ForecastPoint,
+    ForecastSeries,
+    compact_forecast_dict,
+    expand_forecast_dict
+)
+
+
+@pytest.fixture
+def series():
+    predicted = np.array([10.123, 11.0, 12.456, 9.0])
+    return ForecastSeries(
+        start_date=date(2026, 3, 30),
+        predicted_quantity=predicted,
+        lower_bound=predicted - 1,
+        upper_bound=predicted + 1,
+        confidence=np.array([0.9, 0.85, 0.8, 0.75])
+    )
+
+
+def test_points_are_built_on_access(series):
+    """Indexing and iteration yield ForecastPoint views over the columns"""
+    assert len(series) == 4
+    assert series[1] == ForecastPoint(date(2026, 3, 31), 11.0, 10.0, 12.0, 0.85)
+    assert series[-1].date == date(2026, 4, 2)
+    assert [p.date for p in series] == [date(2026, 3, 30) + timedelta(days=i) for i in range(4)]
+
+    head = series[:2]
+    assert isinstance(head, ForecastSeries)
+    np.testing.assert_array_equal(head.predicted_quantity, [10.123, 11.0])
+    assert series[2:].start_date == date(2026, 4, 1)
+
+
+def test_records_match_api_schema(series):
+    """Records are rounded like the per-point API output"""
+    records = series.to_records()
+
+    assert records[0] == {
+        "date": "2026-03-30",
+        "predicted_quantity": 10.12,
+        "lower_bound": 9.12,
+        "upper_bound": 11.12,
+        "confidence": 0.9
+    }
+    assert [r["date"] for r in records][-1] == "2026-04-02"
+
+
+def test_compact_encoding_round_trip(series):
+    """Encoded columns decode back and expand to the same records"""
+    decoded = ForecastSeries.decode(series.encode())
+    assert decoded.to_records() == series.to_records()
+
+    forecast = {"product_name": "A", "forecast_points": series.to_records()}
+    compact = compact_forecast_dict(forecast)
+
+    assert compact["forecast_points"]["predicted_quantity"] == [10.12, 11.0, 12.46, 9.0]
+    assert expand_forecast_dict(compact) == forecast
+    assert expand_forecast_dict(forecast) == forecast
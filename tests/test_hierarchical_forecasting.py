@@ -0,0 +1,175 @@
+"""Tests for hierarchical (category-level) forecasting and reconciliation"""
+import numpy as np
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.agents.demand_forecast_agent import DemandForecastAgent, ModelPerformance
+from src.forecasting.batch_engine import ForecastBatchEngine, ForecastJob
+from src.forecasting.reconciliation import historical_shares, mint_reconcile, top_down
+from src.forecasting.vectorized import BASELINE_MODELS
+
+
+def _history(quantities):
+    """Daily series ending yesterday"""
+    end = date.today() - timedelta(days=1)
+    start = end - timedelta(days=len(quantities) - 1)
+    return [{'date': start + timedelta(days=i), 'quantity': q} for i, q in enumerate(quantities)]
+
+
+def _jobs(products):
+    return [
+        ForecastJob(
+            product_id=p['product_id'],
+            product_name=p['product_name'],
+            current_inventory=p['current_inventory'],
+            sales_history=p['sales_history'],
+            category=p['category']
+        )
+        for p in products
+    ]
+
+
+def _products(n_per_category, categories=('toys', 'garden', None), days=60):
+    rng = np.random.default_rng(3)
+    return [
+        {
+            'product_id': uuid4(),
+            'product_name': f"{category}-{i}",
+            'category': category,
+            'sales_history': _history(rng.poisson(1 + i % 4, days).tolist()),
+            'current_inventory': 20
+        }
+        for category in categories
+        for i in range(n_per_category)
+    ]
+
+
+def test_shares_and_top_down_allocation():
+    """Shares sum to one per group with fallbacks for groups without recent demand"""
+    values = np.array([
+        [1.0, 1.0, 3.0, 3.0],
+        [np.nan, 1.0, 1.0, 1.0],
+        [4.0, 0.0, 0.0, 0.0],     # group 1: demand only outside the window
+        [2.0, 0.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0, 0.0],     # group 2: no demand at all
+        [np.nan, 0.0, 0.0, 0.0],
+    ])
+    groups = np.array([0, 0, 1, 1, 2, 2])
+    shares = historical_shares(values, groups, window=2)
+
+    np.testing.assert_allclose(shares, [0.75, 0.25, 2 / 3, 1 / 3, 0.5, 0.5])
+
+    parents = np.array([[8.0, 4.0], [3.0, 3.0], [1.0, 1.0]])
+    allocated = top_down(parents, groups, shares)
+    np.testing.assert_allclose(np.bincount(groups, weights=allocated[:, 0]), parents[:, 0])
+
+
+def test_mint_reconciliation_is_coherent():
+    """MinT output satisfies total = sum(categories) and category = sum(SKUs)"""
+    rng = np.random.default_rng(0)
+    groups = np.array([0, 0, 1, 1, 1])
+    skus = rng.uniform(1, 5, (5, 7))
+    categories = np.vstack([skus[:2].sum(0) + 2, skus[2:].sum(0) - 1])
+    total = categories.sum(0) + 3
+
+    variances = np.r_[1.0, 1.0, 1.0, np.full(5, 4.0)]
+    rec_total, rec_categories, rec_skus = mint_reconcile(total, categories, skus, groups, variances)
+
+    np.testing.assert_allclose(rec_total, rec_categories.sum(0))
+    for k in range(2):
+        np.testing.assert_allclose(rec_categories[k], rec_skus[groups == k].sum(0))
+
+    # Already coherent forecasts are left unchanged
+    coherent = np.vstack([skus[:2].sum(0), skus[2:].sum(0)])
+    _, _, unchanged = mint_reconcile(coherent.sum(0), coherent, skus, groups, variances)
+    np.testing.assert_allclose(unchanged, skus)
+
+
+@pytest.mark.parametrize("reconciliation", ["proportional", "mint"])
+def test_hierarchical_forecast_fits_ensemble_per_category(reconciliation):
+    """The ensemble runs once per category and SKU forecasts add up to category totals"""
+    agent = DemandForecastAgent(tenant_id=uuid4(), use_model_cache=False)
+    products = _products(n_per_category=8)
+
+    fitted = []
+    original = agent._run_models
+    agent._run_models = lambda *args: fitted.append(args) or original(*args)
+
+    result = agent.forecast_demand_hierarchical(products, 14, reconciliation=reconciliation)
+
+    expected_fits = 3 + (1 if reconciliation == 'mint' else 0)
+    assert len(fitted) == expected_fits
+    assert result.model_fits == {'aggregate': expected_fits, 'sku_baseline': 24}
+    assert set(result.category_forecasts) == {'toys', 'garden', 'uncategorized'}
+
+    assert len(result.sku_forecasts) == 24
+    assert all(f.best_model == 'hierarchical' for f in result.sku_forecasts)
+    by_name = {f.product_name: f for f in result.sku_forecasts}
+    for category, series in result.category_forecasts.items():
+        members = [f for name, f in by_name.items() if name.startswith(f"{category}-")]
+        if category == 'uncategorized':
+            members = [f for name, f in by_name.items() if name.startswith("None-")]
+        np.testing.assert_allclose(
+            sum(f.forecast_points.predicted_quantity for f in members),
+            series.predicted_quantity
+        )
+        assert all((f.forecast_points.predicted_quantity >= 0).all() for f in members)
+
+    np.testing.assert_allclose(
+        result.total_forecast.predicted_quantity,
+        sum(s.predicted_quantity for s in result.category_forecasts.values())
+    )
+    assert result.to_dict()['model_fits']['aggregate'] == expected_fits
+
+    with pytest.raises(ValueError):
+        agent.forecast_demand_hierarchical(products, 14, reconciliation='bottom_up')
+
+
+@pytest.mark.asyncio
+async def test_tiered_run_uses_hierarchy_for_long_tail(monkeypatch):
+    """With forecast_long_tail_mode=hierarchical the tail is reconciled from category models"""
+    from src.config import settings
+
+    monkeypatch.setattr(settings, 'forecast_long_tail_mode', 'hierarchical')
+    engine = ForecastBatchEngine(tenant_id=uuid4(), executor=ThreadPoolExecutor(max_workers=2))
+    jobs = _jobs(_products(n_per_category=3, categories=('toys', 'garden')))
+    jobs.append(ForecastJob(uuid4(), 'no sales', 0, [], 'toys'))
+
+    items = await engine.run_tiered(jobs, 7, heavy_top_n=1)
+
+    assert [item.status for item in items] == ['completed'] * 6 + ['insufficient_data']
+    assert sum(item.forecast['best_model'] == 'hierarchical' for item in items[:6]) == 5
+
+
+@pytest.mark.asyncio
+async def test_tiered_run_without_heavy_models_uses_baselines(monkeypatch):
+    """QUICK mode (no heavy SKUs) never fits the category ensemble, even in hierarchical mode"""
+    from src.config import settings
+
+    monkeypatch.setattr(settings, 'forecast_long_tail_mode', 'hierarchical')
+    engine = ForecastBatchEngine(tenant_id=uuid4(), executor=ThreadPoolExecutor(max_workers=2))
+
+    items = await engine.run_tiered(_jobs(_products(n_per_category=2, categories=('toys',))), 7, heavy_top_n=0)
+
+    assert all(item.forecast['best_model'] in BASELINE_MODELS for item in items)
+
+
+def test_aggregate_variance_uses_selected_model(monkeypatch):
+    """The error variance is the selected model's RMSE, not the lowest across models"""
+    agent = DemandForecastAgent(tenant_id=uuid4(), use_model_cache=False)
+    performances = [
+        ModelPerformance('arima', mae=1.0, rmse=1.0, mape=10.0, confidence_score=0.5),
+        ModelPerformance('prophet', mae=2.0, rmse=3.0, mape=20.0, confidence_score=0.9),
+    ]
+    monkeypatch.setattr(
+        agent, '_run_models',
+        lambda product_id, df, horizon: ('prophet', SimpleNamespace(predicted_quantity=np.ones(horizon)), performances)
+    )
+
+    model, _, variance = agent._forecast_aggregate(np.ones(30), date(2026, 1, 1), 7)
+
+    assert model == 'prophet'
+    assert variance == pytest.approx(9.0)
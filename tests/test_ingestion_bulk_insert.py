@@ -0,0 +1,74 @@
+"""Tests for the bulk, idempotent IngestionService insert path"""
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from src.ingestion.base import RawRecord
+from src.ingestion.ingestion_service import IngestionService
+from src.models.raw_ingestion_record import RawIngestionRecord
+
+
+def _rows(service, source_ids, source='csv_products'):
+    return [
+        service._create_row(
+            raw_record=RawRecord(
+                source_id=source_id,
+                payload={'sku': source_id, 'price': 10.0},
+                retrieved_at=datetime.utcnow(),
+                metadata={'data_type': 'product'}
+            ),
+            source_name=source
+        )
+        for source_id in source_ids
+    ]
+
+
+async def _count(db, tenant_id):
+    result = await db.execute(
+        select(func.count()).select_from(RawIngestionRecord).where(RawIngestionRecord.tenant_id == tenant_id)
+    )
+    return result.scalar()
+
+
+@pytest.mark.asyncio
+async def test_batches_count_inserted_and_duplicate_rows(test_db, test_tenant_id):
+    service = IngestionService(tenant_id=test_tenant_id)
+
+    await service._save_batch(test_db, _rows(service, [f"SKU-{i}" for i in range(1500)]))
+    assert service.stats['records_saved'] == 1500
+    assert service.stats['records_skipped_duplicate'] == 0
+
+    # Re-ingesting overlapping data (and a duplicate within the batch) inserts only new rows
+    await service._save_batch(test_db, _rows(service, [f"SKU-{i}" for i in range(1400, 1600)] + ['SKU-1599']))
+    assert service.stats['records_saved'] == 1600
+    assert service.stats['records_skipped_duplicate'] == 101
+    assert service.stats['records_failed'] == 0
+    assert await _count(test_db, test_tenant_id) == 1600
+
+
+@pytest.mark.asyncio
+async def test_same_source_id_is_not_a_duplicate_across_sources_or_tenants(test_db, test_tenant_id):
+    service = IngestionService(tenant_id=test_tenant_id)
+    other_tenant = IngestionService(tenant_id=uuid4())
+
+    await service._save_batch(test_db, _rows(service, ['SKU-1'], source='csv_products'))
+    await service._save_batch(test_db, _rows(service, ['SKU-1'], source='amazon_api'))
+    await other_tenant._save_batch(test_db, _rows(other_tenant, ['SKU-1'], source='csv_products'))
+
+    assert service.stats['records_saved'] == 2
+    assert other_tenant.stats['records_saved'] == 1
+
+
+@pytest.mark.asyncio
+async def test_failing_rows_do_not_fail_the_batch(test_db, test_tenant_id):
+    service = IngestionService(tenant_id=test_tenant_id)
+    rows = _rows(service, ['SKU-1', 'SKU-2', 'SKU-3'])
+    rows[1]['source_id'] = None  # Violates NOT NULL
+
+    await service._save_batch(test_db, rows)
+
+    assert service.stats['records_saved'] == 2
+    assert service.stats['records_failed'] == 1
+    assert await _count(test_db, test_tenant_id) == 2
@@ -0,0 +1,47 @@
+"""Tests for IngestionPipeline persistence and event publishing"""
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from src.cache import event_bus
+from src.ingestion.pipeline import IngestionPipeline
+from src.models.product import Product
+
+
+class _FailingCoalescer:
+    def add(self, event):
+        raise ConnectionError("event bus unavailable")
+
+
+class _RecordingPublisher:
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event):
+        self.events.append(event)
+
+
+@pytest.mark.asyncio
+async def test_publish_failure_does_not_fail_committed_ingestion(test_db, test_tenant_id, monkeypatch):
+    """Events are published after the commit; a failing publish is logged, not raised"""
+    publisher = _RecordingPublisher()
+    monkeypatch.setattr(event_bus, "get_event_coalescer", lambda: _FailingCoalescer())
+    monkeypatch.setattr(event_bus, "get_event_publisher", lambda: publisher)
+
+    pipeline = IngestionPipeline(tenant_id=test_tenant_id, db=test_db)
+    processed = [{
+        'sku': 'MOUSE01',
+        'normalized_sku': 'MOUSE01',
+        'name': 'Wireless Mouse',
+        'price': Decimal('25.00'),
+        'marketplace': 'our-store',
+        'inventory_level': 10
+    }]
+
+    await pipeline._persist_to_database(processed, products=[object()], reviews=[])
+
+    result = await test_db.execute(select(Product.sku).where(Product.tenant_id == test_tenant_id))
+    assert result.scalars().all() == ['MOUSE01']
+    # The failing product event did not stop the remaining publishes
+    assert [event.event_type for event in publisher.events] == [event_bus.EventType.INGESTION_COMPLETED]
@@ -0,0 +1,100 @@
+"""Tests for the in-process cache tier and two-tier CacheManager reads"""
+import time
+from uuid import uuid4
+
+import pytest
+
+from src.cache.cache_manager import CacheManager
+from src.cache.local_cache import ENTRY_OVERHEAD_BYTES, LocalLRUCache
+
+
+def _entry_size(key, payload):
+    return len(key) + len(payload) + ENTRY_OVERHEAD_BYTES
+
+
+def test_lru_eviction_by_bytes():
+    """The total budget evicts least recently used entries"""
+    payload = "x" * 100
+    size = _entry_size("pricing:t:0", payload)
+    cache = LocalLRUCache(max_bytes=3 * size)
+
+    for i in range(3):
+        assert cache.set(f"pricing:t:{i}", payload, ttl=60)
+    cache.get("pricing:t:0")  # Most recently used now
+    cache.set("pricing:t:3", payload, ttl=60)
+
+    assert cache.keys() == ["pricing:t:2", "pricing:t:0", "pricing:t:3"]
+    assert cache.size_bytes == 3 * size
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_type_quota_protects_other_types():
+    """A cache type beyond its share evicts its own entries only"""
+    payload = "x" * 100
+    size = _entry_size("query_result:t:0", payload)
+    cache = LocalLRUCache(max_bytes=10 * size, type_shares={'query_result': 0.2})
+
+    cache.set("dashboard:t:0", payload, ttl=60)
+    for i in range(5):
+        cache.set(f"query_result:t:{i}", payload, ttl=60)
+
+    assert cache.get("dashboard:t:0") is not None
+    assert cache.get_stats()['bytes_by_type']['query_result'] == 2 * size
+    # Entries larger than the type's quota are not kept
+    assert not cache.set("query_result:t:big", "x" * (3 * size), ttl=60)
+
+
+def test_ttl_and_negative_entries():
+    cache = LocalLRUCache(max_bytes=10_000)
+    cache.set("pricing:t:a", "payload", ttl=0.01)
+    cache.set("pricing:t:b", None, ttl=60)
+    time.sleep(0.02)
+
+    assert cache.get("pricing:t:a") is None
+    assert cache.get("pricing:t:b").negative
+    assert cache.delete_matching("pricing:t:*") == 1
+    assert len(cache) == 0 and cache.size_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_local_tier_in_front_of_redis(fake_redis):
+    """Hot keys and known-missing keys are served without a Redis round-trip"""
+    manager = CacheManager(local_ttl=60, negative_ttl=60)
+    manager._redis = fake_redis
+    tenant_id = uuid4()
+
+    await manager.set('pricing', tenant_id, 'p1', {'price': 10})
+    manager._memory_cache.clear()  # As if written by another worker
+
+    calls = fake_redis.calls
+    for _ in range(3):
+        assert await manager.get('pricing', tenant_id, 'p1') == {'price': 10}
+        assert await manager.get('pricing', tenant_id, 'missing') is None
+    assert fake_redis.calls == calls + 2
+
+    metrics = await manager.get_metrics()
+    assert (metrics['l2_hits'], metrics['l1_hits'], metrics['l1_negative_hits']) == (1, 2, 2)
+
+    # Writes and invalidation keep the local tier consistent for this process
+    await manager.set('pricing', tenant_id, 'missing', {'price': 12})
+    assert await manager.get('pricing', tenant_id, 'missing') == {'price': 12}
+    await manager.invalidate_pattern('pricing', tenant_id, '*')
+    assert await manager.get('pricing', tenant_id, 'p1') is None
+
+
+@pytest.mark.asyncio
+async def test_memory_fallback_is_bounded():
+    """Without Redis the local tier is the whole cache, with entry TTLs and a byte budget"""
+    manager = CacheManager(use_memory_fallback=True, local_max_mb=0.01)
+    manager._redis_failed = True
+    tenant_id = uuid4()
+
+    for i in range(100):
+        await manager.set('forecast', tenant_id, f'p{i}', {'series': [1.0] * 20}, ttl=3600)
+    assert manager._memory_cache.size_bytes <= manager._memory_cache.quota('forecast')
+    assert await manager.get('forecast', tenant_id, 'p99') == {'series': [1.0] * 20}
+    assert await manager.get('forecast', tenant_id, 'p0') is None
+
+    await manager.set('pricing', tenant_id, 'short', {'v': 1}, ttl=0.01)
+    time.sleep(0.02)
+    assert await manager.get('pricing', tenant_id, 'short', check_freshness=False) is None
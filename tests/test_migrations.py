@@ -0,0 +1,63 @@
+"""Offline (SQL rendering) checks of alembic migrations against PostgreSQL"""
+import importlib.util
+import io
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+VERSIONS_DIR = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+
+
+def _upgrade_sql(filename: str, dialect_name: str = "postgresql") -> str:
+    """Render a migration's upgrade() as DDL for the given dialect"""
+    spec = importlib.util.spec_from_file_location(filename, VERSIONS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    buffer = io.StringIO()
+    context = MigrationContext.configure(
+        dialect_name=dialect_name,
+        opts={"as_sql": True, "output_buffer": buffer}
+    )
+    with Operations.context(context):
+        module.upgrade()
+    return buffer.getvalue()
+
+
+def _column_types(sql: str, table: str) -> dict:
+    """Column name -> declared type of a CREATE TABLE statement"""
+    body = sql.split(f"CREATE TABLE {table} (", 1)[1].split(";", 1)[0]
+    columns = {}
+    for line in body.splitlines():
+        parts = line.strip().rstrip(",").split()
+        if len(parts) >= 2 and parts[0].islower():
+            columns[parts[0]] = parts[1]
+    return columns
+
+
+def test_product_equivalence_ids_are_uuid_on_postgres():
+    """FK columns must match the native UUID keys of tenants and products"""
+    columns = _column_types(
+        _upgrade_sql("2026_10_18_0002-add_product_equivalence_table.py"), "product_equivalence"
+    )
+
+    for name in ("id", "tenant_id", "product_id", "competitor_product_id"):
+        assert columns[name] == "UUID"
+
+
+def test_product_equivalence_ids_stay_strings_on_sqlite():
+    columns = _column_types(
+        _upgrade_sql("2026_10_18_0002-add_product_equivalence_table.py", "sqlite"), "product_equivalence"
+    )
+
+    assert columns["tenant_id"] == "VARCHAR(36)"
+
+
+def test_competitor_price_snapshot_ids_are_uuid_on_postgres():
+    columns = _column_types(
+        _upgrade_sql("2026_10_18_0003-add_competitor_price_snapshots_table.py"), "competitor_price_snapshots"
+    )
+
+    for name in ("id", "tenant_id", "product_id"):
+        assert columns[name] == "UUID"
@@ -0,0 +1,116 @@
+"""Tests for SQL-side price change detection and trend statistics"""
+import statistics
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.crud.price_history import (
+    create_price_history,
+    detect_price_changes,
+    detect_price_changes_bulk,
+    get_price_trend
+)
+from src.models.product import Product
+from src.schemas.price_history import PriceHistoryCreate
+
+
+async def _add_product(db, tenant_id, sku):
+    product = Product(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        sku=sku,
+        normalized_sku=sku,
+        name=f"Product {sku}",
+        price=Decimal("10.00"),
+        currency="USD",
+        marketplace="test-marketplace",
+        inventory_level=10
+    )
+    db.add(product)
+    await db.flush()
+    return product.id
+
+
+async def _add_prices(db, tenant_id, product_id, prices, competitor_id=None):
+    now = datetime.utcnow()
+    for days_ago, price in zip(range(len(prices), 0, -1), prices):
+        await create_price_history(db, PriceHistoryCreate(
+            product_id=product_id,
+            price=Decimal(str(price)),
+            competitor_id=competitor_id,
+            source="test",
+            timestamp=now - timedelta(days=days_ago)
+        ), tenant_id)
+
+
+@pytest.mark.asyncio
+async def test_bulk_detection_pairs_consecutive_prices(db_session, test_tenant_id):
+    """Changes are computed per product and per competitor series, tenant-filtered"""
+    first = await _add_product(db_session, test_tenant_id, "A")
+    second = await _add_product(db_session, test_tenant_id, "B")
+    await _add_prices(db_session, test_tenant_id, first, [100, 104, 90, 90, 0, 50])
+    await _add_prices(db_session, test_tenant_id, second, [20, 25])
+    # A competitor series interleaved with our own prices must not produce changes
+    await _add_prices(db_session, test_tenant_id, second, [21, 21], competitor_id=uuid4())
+
+    other_tenant = uuid4()
+    other = await _add_product(db_session, other_tenant, "C")
+    await _add_prices(db_session, other_tenant, other, [10, 20])
+
+    changes = await detect_price_changes_bulk(db_session, test_tenant_id, days=30)
+
+    by_product = {}
+    for change in changes:
+        by_product.setdefault(change.product_id, []).append(
+            (change.old_price, change.new_price, round(change.price_change_percent, 2))
+        )
+    assert by_product == {
+        first: [(Decimal("104"), Decimal("90"), -13.46), (Decimal("90"), Decimal("0"), -100.0)],
+        second: [(Decimal("20"), Decimal("25"), 25.0)]
+    }
+    assert all(change.is_significant for change in changes)
+
+    single = await detect_price_changes(db_session, second, test_tenant_id, threshold_percent=30, days=30)
+    assert single == []
+    assert await detect_price_changes_bulk(db_session, test_tenant_id, product_ids=[]) == []
+
+
+@pytest.mark.asyncio
+async def test_trend_statistics_match_reference(db_session, test_tenant_id):
+    """Aggregates match a Python computation; the trend compares recent to older prices"""
+    rising = await _add_product(db_session, test_tenant_id, "UP")
+    prices = [10, 11, 10.5, 12, 13, 14.5, 15]
+    await _add_prices(db_session, test_tenant_id, rising, prices)
+
+    trend = await get_price_trend(db_session, rising, test_tenant_id, days=30)
+
+    assert trend.data_points == len(prices)
+    assert trend.current_price == Decimal("15")
+    assert float(trend.average_price) == pytest.approx(statistics.mean(prices))
+    assert trend.min_price == Decimal("10") and trend.max_price == Decimal("15")
+    assert trend.price_volatility == pytest.approx(statistics.pstdev(prices))
+    assert trend.trend_direction == "up"
+
+    falling = await _add_product(db_session, test_tenant_id, "DOWN")
+    await _add_prices(db_session, test_tenant_id, falling, list(reversed(prices)))
+    assert (await get_price_trend(db_session, falling, test_tenant_id, days=30)).trend_direction == "down"
+
+    assert await get_price_trend(db_session, rising, uuid4(), days=30) is None
+
+
+@pytest.mark.asyncio
+async def test_agent_reads_alerts_from_database(db_session, test_tenant_id):
+    """The pricing agent turns stored price changes into alerts"""
+    from src.agents.pricing_intelligence_v2 import EnhancedPricingIntelligenceAgent
+
+    product_id = await _add_product(db_session, test_tenant_id, "A")
+    competitor_id = await _add_product(db_session, test_tenant_id, "COMP")
+    await _add_prices(db_session, test_tenant_id, product_id, [50, 40], competitor_id=competitor_id)
+
+    agent = EnhancedPricingIntelligenceAgent(tenant_id=test_tenant_id)
+    alerts = await agent.detect_stored_price_changes(db_session, [product_id])
+
+    assert [(a.product_id, a.competitor_id, a.change_percentage) for a in alerts] == \
+        [(product_id, competitor_id, -20.0)]
@@ -0,0 +1,101 @@
+"""Tests for the competitor product equivalence index"""
+import random
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.agents.pricing_intelligence_v2 import EnhancedPricingIntelligenceAgent
+from src.pricing.equivalence import ProductEquivalenceIndex
+from src.schemas.product import ProductResponse
+
+WORDS = ["wireless", "mouse", "keyboard", "usb", "cable", "laptop", "stand", "charger",
+         "monitor", "hub", "speaker", "webcam", "headset", "pro", "mini", "black"]
+
+
+def _product(name, sku):
+    return ProductResponse(
+        id=uuid4(),
+        sku=sku,
+        normalized_sku=sku,
+        name=name,
+        category="electronics",
+        price=Decimal("19.99"),
+        currency="USD",
+        marketplace="test",
+        inventory_level=10,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        metadata={}
+    )
+
+
+def _catalog(n, seed):
+    rng = random.Random(seed)
+    return [
+        _product(" ".join(rng.sample(WORDS, 3)), f"SKU-{rng.randint(1000, 9999)}")
+        for _ in range(n)
+    ]
+
+
+def _pairwise(agent, our_products, competitors):
+    """Reference O(N x M) scan with the agent's exact scoring"""
+    mappings = []
+    for our in our_products:
+        for comp in competitors:
+            name = agent._calculate_name_similarity(our.name, comp.name)
+            sku = agent._calculate_name_similarity(our.normalized_sku, comp.normalized_sku)
+            confidence = name * 0.7 + sku * 0.3
+            if confidence >= agent.mapping_confidence_threshold:
+                mappings.append((our.id, comp.id, pytest.approx(confidence)))
+    return mappings
+
+
+@pytest.fixture
+def agent():
+    return EnhancedPricingIntelligenceAgent(tenant_id=uuid4())
+
+
+def test_small_catalog_matches_pairwise_scan(agent):
+    """Catalogs up to top_k are compared exhaustively"""
+    competitors = _catalog(20, seed=1)
+    ours = [_product(c.name, c.normalized_sku) for c in competitors[:3]] + _catalog(3, seed=2)
+
+    mappings = agent.map_product_equivalences(ours, competitors)
+
+    assert [(m.our_product_id, m.competitor_product_id, m.confidence) for m in mappings] == \
+        _pairwise(agent, ours, competitors)
+    assert agent.map_product_equivalence(ours[0], competitors)[0].mapping_type == "exact_sku"
+
+
+def test_index_recalls_pairwise_matches_on_large_catalog(agent):
+    """Blocking only verifies top-k candidates but finds the same mappings"""
+    competitors = _catalog(400, seed=3)
+    ours = [
+        _product(c.name.replace("pro", "pro+"), c.normalized_sku)
+        for c in random.Random(4).sample(competitors, 40)
+    ]
+
+    index = ProductEquivalenceIndex(competitors)
+    candidates = index.candidates(ours)
+    assert not index.exhaustive
+    assert all(len(c) <= index.top_k + 1 for c in candidates)
+
+    expected = {(o, c) for o, c, _ in _pairwise(agent, ours, competitors)}
+    found = {
+        (m.our_product_id, m.competitor_product_id)
+        for m in agent.map_product_equivalences(ours, competitors, index=index)
+    }
+    assert found == expected
+
+
+def test_exact_sku_is_always_a_candidate():
+    """An identical normalized SKU is verified even when names share no n-grams"""
+    competitors = _catalog(50, seed=5)
+    target = competitors[17]
+    ours = [_product("zzzz qqqq", target.normalized_sku)]
+
+    index = ProductEquivalenceIndex(competitors, top_k=3)
+
+    assert 17 in index.candidates(ours)[0]
@@ -0,0 +1,138 @@
+"""Tests for persisted product equivalence mappings"""
+import threading
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from src.cache.event_bus import DataEvent, EventPublisher, EventType
+from src.models.product import Product
+from src.models.product_equivalence import ProductEquivalence
+from src.pricing.equivalence_store import ProductEquivalenceMaintainer, ProductEquivalenceStore
+
+
+async def _add_product(db, tenant_id, name, sku, competitor=False, marketplace="competitor_1"):
+    product = Product(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        sku=sku,
+        normalized_sku=sku,
+        name=name,
+        price=Decimal("25.00"),
+        currency="USD",
+        marketplace=marketplace if competitor else "our-store",
+        inventory_level=10,
+        extra_metadata={"is_competitor": True} if competitor else None
+    )
+    db.add(product)
+    await db.flush()
+    return product
+
+
+async def _pairs(db):
+    rows = (await db.execute(select(ProductEquivalence))).scalars().all()
+    return {(row.product_id, row.competitor_product_id) for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_rebuild_and_read_mappings(test_db, test_tenant_id):
+    """Rebuild stores matches; get_mappings returns them with the competitor products"""
+    ours = await _add_product(test_db, test_tenant_id, "Wireless Mouse", "MOUSE01")
+    other = await _add_product(test_db, test_tenant_id, "Desk Lamp", "LAMP01")
+    comp = await _add_product(test_db, test_tenant_id, "Wireless Mouse", "MOUSE01", competitor=True)
+    await _add_product(test_db, uuid4(), "Wireless Mouse", "MOUSE01", competitor=True)  # Other tenant
+
+    store = ProductEquivalenceStore(test_tenant_id)
+    assert await store.rebuild(test_db) == 1
+    assert await _pairs(test_db) == {(ours.id, comp.id)}
+
+    mappings, competitors = await store.get_mappings(test_db, [ours.id, other.id])
+    assert [(m.our_product_id, m.competitor_product_id, m.mapping_type) for m in mappings] == \
+        [(ours.id, comp.id, "exact_sku")]
+    assert [c.id for c in competitors] == [comp.id]
+
+
+@pytest.mark.asyncio
+async def test_rematch_only_touches_changed_products(test_db, test_tenant_id):
+    """Renaming a product replaces its mappings; deleting drops them"""
+    mouse = await _add_product(test_db, test_tenant_id, "Wireless Mouse", "MOUSE01")
+    lamp = await _add_product(test_db, test_tenant_id, "Desk Lamp", "LAMP01")
+    comp_mouse = await _add_product(test_db, test_tenant_id, "Wireless Mouse", "MOUSE01", competitor=True)
+    comp_lamp = await _add_product(test_db, test_tenant_id, "Desk Lamp", "LAMP01", competitor=True)
+
+    store = ProductEquivalenceStore(test_tenant_id)
+    await store.rebuild(test_db)
+    assert await _pairs(test_db) == {(mouse.id, comp_mouse.id), (lamp.id, comp_lamp.id)}
+
+    # A new competitor listing is matched against our catalog
+    comp_lamp_2 = await _add_product(
+        test_db, test_tenant_id, "Desk Lamp", "LAMP01", competitor=True, marketplace="competitor_2"
+    )
+    await store.rematch(test_db, [comp_lamp_2.id])
+    assert (lamp.id, comp_lamp_2.id) in await _pairs(test_db)
+
+    # Our product renamed away from any competitor loses its mapping
+    mouse.name, mouse.normalized_sku = "Garden Hose", "HOSE01"
+    await test_db.flush()
+    await store.rematch(test_db, [mouse.id])
+    assert await _pairs(test_db) == {(lamp.id, comp_lamp.id), (lamp.id, comp_lamp_2.id)}
+
+    await test_db.delete(comp_lamp)
+    await test_db.flush()
+    await store.rematch(test_db, [comp_lamp.id])
+    assert await _pairs(test_db) == {(lamp.id, comp_lamp_2.id)}
+
+
+@pytest.mark.asyncio
+async def test_matching_runs_off_the_event_loop(test_db, test_tenant_id, monkeypatch):
+    """Matching is CPU-bound and must not block the event loop thread"""
+    await _add_product(test_db, test_tenant_id, "Wireless Mouse", "MOUSE01")
+    await _add_product(test_db, test_tenant_id, "Wireless Mouse", "MOUSE01", competitor=True)
+
+    match_threads = []
+    original = ProductEquivalenceStore._match
+
+    def recording_match(self, ours, competitors):
+        match_threads.append(threading.get_ident())
+        return original(self, ours, competitors)
+
+    monkeypatch.setattr(ProductEquivalenceStore, "_match", recording_match)
+
+    assert await ProductEquivalenceStore(test_tenant_id).rebuild(test_db) == 1
+    assert match_threads and threading.get_ident() not in match_threads
+
+
+@pytest.mark.asyncio
+async def test_maintainer_coalesces_product_events(test_db, test_tenant_id, monkeypatch):
+    """Product events are queued per tenant and rematched together after the debounce"""
+    @asynccontextmanager
+    async def session_factory():
+        yield test_db
+
+    publisher = EventPublisher()
+    maintainer = ProductEquivalenceMaintainer(publisher, session_factory, debounce_seconds=0.01)
+
+    rematched = []
+    original = ProductEquivalenceStore.rematch
+
+    async def spy(self, db, product_ids):
+        rematched.append(set(product_ids))
+        return await original(self, db, product_ids)
+
+    monkeypatch.setattr(ProductEquivalenceStore, "rematch", spy)
+
+    ours = await _add_product(test_db, test_tenant_id, "Wireless Mouse", "MOUSE01")
+    comp = await _add_product(test_db, test_tenant_id, "Wireless Mouse", "MOUSE01", competitor=True)
+    for product in (ours, comp):
+        await publisher.publish(DataEvent(
+            event_type=EventType.PRODUCT_CREATED,
+            tenant_id=test_tenant_id,
+            entity_type='product',
+            entity_id=str(product.id)
+        ))
+    await maintainer.drain()
+
+    assert rematched == [{ours.id, comp.id}]
+    assert await _pairs(test_db) == {(ours.id, comp.id)}
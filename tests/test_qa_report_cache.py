@@ -0,0 +1,119 @@
+"""Tests for memoized, data-versioned data quality reports"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.agents.data_qa_agent import DataQAAgent
+from src.cache.event_bus import DataEvent, EventPublisher, EventType
+from src.processing.qa_report_cache import QAReportCache
+from src.schemas.product import ProductResponse
+from src.schemas.review import ReviewResponse
+
+
+def _product(index, price=20.0, inventory=10, days_old=0):
+    now = datetime.utcnow()
+    return ProductResponse(
+        id=uuid4(),
+        sku=f"SKU-{index}",
+        normalized_sku=f"SKU{index}",
+        name=f"Lamp {index}",
+        category="home",
+        price=price,
+        currency="USD",
+        marketplace="test",
+        inventory_level=inventory,
+        created_at=now,
+        updated_at=now - timedelta(days=days_old)
+    )
+
+
+def _review(product_id, rating=4, text="Works as described", days_old=1):
+    return ReviewResponse(
+        id=uuid4(),
+        product_id=product_id,
+        rating=rating,
+        text=text,
+        source="test",
+        created_at=datetime.utcnow() - timedelta(days=days_old)
+    )
+
+
+def _dump(report):
+    data = report.model_dump()
+    data.pop('assessment_timestamp')
+    return data
+
+
+def test_report_reused_until_products_change():
+    """Agents of the same tenant share a report; a touched product updates only its rows"""
+    tenant_id = uuid4()
+    cache = QAReportCache()
+    products = [_product(i, price=20 + i % 5, days_old=i) for i in range(40)]
+
+    first = cache.get_product_report(DataQAAgent(tenant_id), products)
+    assert cache.get_product_report(DataQAAgent(tenant_id), list(reversed(products))) is first
+    assert cache.get_stats()['hits'] == 1
+
+    # Another tenant with the same product ids does not share the report
+    cache.get_product_report(DataQAAgent(uuid4()), products)
+    assert cache.get_stats()['misses'] == 2
+
+    # An unrelated product changing keeps the report
+    cache.mark_changed(tenant_id, [uuid4()])
+    assert cache.get_product_report(DataQAAgent(tenant_id), products) is first
+
+    changed = products[7].model_copy(update={'price': 5000, 'inventory_level': 0})
+    products[7] = changed
+    cache.mark_changed(tenant_id, [changed.id])
+
+    updated = cache.get_product_report(DataQAAgent(tenant_id), products)
+    assert cache.get_stats()['incremental_updates'] == 1
+    assert _dump(updated) == _dump(DataQAAgent(tenant_id).assess_product_data_quality(products))
+    assert [a.affected_entities for a in updated.anomalies if a.type == "price_outlier"] == \
+        [[str(changed.id)]]
+
+
+def test_unknown_change_and_missed_events_rebuild():
+    """Changes without a product id, or data changed without an event, are rebuilt in full"""
+    tenant_id = uuid4()
+    cache = QAReportCache()
+    products = [_product(i) for i in range(10)]
+    cache.get_product_report(DataQAAgent(tenant_id), products)
+
+    cache.mark_changed(tenant_id)
+    cache.get_product_report(DataQAAgent(tenant_id), products)
+    assert cache.get_stats()['misses'] == 2
+
+    # A product removed without an event: the cached rows no longer add up
+    report = cache.get_product_report(DataQAAgent(tenant_id), products[:-1], [p.id for p in products])
+    assert report.entities_assessed == 9
+    assert cache.get_stats()['misses'] == 3
+
+
+@pytest.mark.asyncio
+async def test_review_events_update_review_reports():
+    """A review created for one product recomputes only that product's review rows"""
+    tenant_id = uuid4()
+    publisher = EventPublisher()
+    cache = QAReportCache()
+    cache.subscribe(publisher)
+
+    product_ids = [uuid4() for _ in range(3)]
+    reviews = [_review(pid, rating=r) for pid in product_ids for r in (1, 5, 5, 4)]
+    cache.get_review_report(DataQAAgent(tenant_id), reviews, product_ids)
+
+    new_review = _review(product_ids[1], rating=5, text="AMAZING!!!!!", days_old=0)
+    await publisher.publish(DataEvent(
+        event_type=EventType.REVIEW_CREATED,
+        tenant_id=tenant_id,
+        entity_type='review',
+        entity_id=str(new_review.id),
+        metadata={'product_id': str(new_review.product_id)}
+    ))
+    reviews.insert(5, new_review)
+
+    updated = cache.get_review_report(DataQAAgent(tenant_id), reviews, product_ids)
+    assert cache.get_stats()['incremental_updates'] == 1
+    assert updated.entities_assessed == 13
+    assert _dump(updated) == _dump(DataQAAgent(tenant_id).assess_review_data_quality(reviews))
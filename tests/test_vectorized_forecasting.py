@@ -0,0 +1,165 @@
+"""Tests for the vectorized SKU x day forecasting kernels"""
+import numpy as np
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from uuid import uuid4
+
+from statsmodels.tsa.holtwinters import ExponentialSmoothing, SimpleExpSmoothing
+
+from src.agents.demand_forecast_agent import DemandForecastAgent
+from src.forecasting.batch_engine import ForecastBatchEngine, ForecastJob
+from src.forecasting.vectorized import (
+    DemandMatrix,
+    backtest_errors,
+    holt_linear,
+    moving_average,
+    seasonal_naive,
+    seasonal_strength,
+    select_baselines,
+    simple_exponential_smoothing,
+    trend_slopes
+)
+
+
+def _history(quantities, end=None):
+    """Daily series ending at `end` (default yesterday)"""
+    end = end or date.today() - timedelta(days=1)
+    start = end - timedelta(days=len(quantities) - 1)
+    return [
+        {'date': start + timedelta(days=i), 'quantity': q}
+        for i, q in enumerate(quantities)
+        if q is not None
+    ]
+
+
+def test_matrix_aligns_skus_on_shared_calendar():
+    """Rows are right-aligned, NaN before the first sale, 0 on days without sales"""
+    a, b = uuid4(), uuid4()
+    matrix = DemandMatrix.from_series({
+        a: _history([1, 2, 3, 4, 5]),
+        b: _history([7, None, 9]),
+        uuid4(): []
+    })
+
+    assert matrix.product_ids == [a, b]
+    assert matrix.values.shape == (2, 5)
+    np.testing.assert_array_equal(matrix.values[0], [1, 2, 3, 4, 5])
+    np.testing.assert_array_equal(matrix.values[1], [np.nan, np.nan, 7, 0, 9])
+    np.testing.assert_array_equal(matrix.n_obs, [5, 3])
+
+
+def test_kernels_match_reference_implementations():
+    """Vectorized smoothing matches statsmodels for fixed parameters"""
+    rng = np.random.default_rng(7)
+    y = rng.poisson(5, 60).astype(float)
+    values = np.vstack([y, np.r_[np.full(10, np.nan), y[10:]]])
+
+    ses = simple_exponential_smoothing(values, 3, alphas=np.array([0.3]))
+    expected = SimpleExpSmoothing(y, initialization_method='known', initial_level=y[0]).fit(
+        smoothing_level=0.3, optimized=False
+    ).forecast(3)
+    np.testing.assert_allclose(ses[0], expected)
+
+    holt = holt_linear(values, 3, alphas=np.array([0.5]), betas=np.array([0.1]))
+    expected = ExponentialSmoothing(
+        y, trend='add', initialization_method='known', initial_level=y[0], initial_trend=0.0
+    ).fit(smoothing_level=0.5, smoothing_trend=0.1, optimized=False).forecast(3)
+    np.testing.assert_allclose(holt[0], expected)
+
+    np.testing.assert_allclose(moving_average(values, 2)[:, 0], [y[-7:].mean()] * 2)
+    np.testing.assert_array_equal(seasonal_naive(values, 9)[0], np.r_[y[-7:], y[-7:-5]])
+
+
+def test_selection_and_diagnostics_per_sku():
+    """Each SKU gets its own best model, backtest errors and diagnostics"""
+    days = np.arange(84)
+    weekly = 10 + 8 * (days % 7 == 5)
+    trending = 5 + 0.5 * days
+    matrix = DemandMatrix.from_series({
+        uuid4(): _history(weekly.tolist()),
+        uuid4(): _history(trending.tolist()),
+        uuid4(): _history([3] * 5)
+    })
+
+    selection = select_baselines(matrix, horizon=14)
+
+    assert selection.best_models[0] == 'seasonal_naive'
+    assert selection.best_models[1] == 'holt'
+    assert selection.best_models[2] == 'simple_exponential_smoothing'
+    assert selection.validated.tolist() == [True, True, False]
+    assert selection.forecasts.shape == (3, 14)
+    assert backtest_errors(matrix.values, 'seasonal_naive')['mae'][0] == pytest.approx(0.0)
+
+    assert seasonal_strength(matrix.values, 7)[0] > 0.5
+    assert trend_slopes(matrix.values)[1] == pytest.approx(0.5)
+
+
+def test_short_history_reports_fallback_model():
+    """A SKU too short for seasonal naive is labelled with the moving average it falls back to"""
+    matrix = DemandMatrix.from_series({
+        uuid4(): _history([10] * 28),
+        uuid4(): _history([4, 6, 5, 7, 3])
+    })
+
+    # The short SKU's backtests all lack training data and tie, so seasonal naive (listed first) wins
+    selection = select_baselines(
+        matrix,
+        horizon=14,
+        min_data_points=3,
+        models=('seasonal_naive', 'moving_average', 'simple_exponential_smoothing')
+    )
+
+    assert selection.best_models[1] == 'moving_average'
+    np.testing.assert_allclose(selection.forecasts[1], moving_average(matrix.values, 14)[1])
+
+
+def test_agent_baseline_forecasts_in_input_order():
+    """The agent turns the vectorized selection into full forecast results"""
+    agent = DemandForecastAgent(tenant_id=uuid4(), use_model_cache=False)
+    products = [
+        {'product_id': uuid4(), 'product_name': f"P{i}",
+         'sales_history': _history([10 + (d % 7) for d in range(30 + i)]),
+         'current_inventory': 40}
+        for i in range(5)
+    ]
+    products.append({'product_id': uuid4(), 'product_name': "Empty", 'sales_history': []})
+
+    results = agent.forecast_demand_baselines(products, forecast_horizon_days=30)
+
+    assert [r.product_name for r in results] == [f"P{i}" for i in range(5)]
+    for result in results:
+        data = result.to_dict()
+        assert len(data['forecast_points']) == 30
+        assert data['forecast_points'][0]['date'] == date.today().isoformat()
+        assert data['model_performances']
+        assert 0 < data['final_confidence'] <= 1
+        assert any(a['alert_type'] == 'stockout_risk' for a in data['alerts'])
+
+
+@pytest.mark.asyncio
+async def test_tiered_run_reserves_heavy_models_for_top_skus():
+    """Only the highest-volume SKUs are fitted with the model ensemble"""
+    jobs = [
+        ForecastJob(
+            product_id=uuid4(),
+            product_name=f"P{volume}",
+            current_inventory=100,
+            sales_history=_history([volume + (d % 3) for d in range(30)])
+        )
+        for volume in (1, 50, 5)
+    ]
+    jobs.append(ForecastJob(uuid4(), "NoSales", None, []))
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        engine = ForecastBatchEngine(tenant_id=uuid4(), executor=pool)
+        items = await engine.run_tiered(jobs, 14, heavy_top_n=1)
+
+    assert [i.product_name for i in items] == ["P1", "P50", "P5", "NoSales"]
+    assert [i.status for i in items] == ['completed'] * 3 + ['insufficient_data']
+    candidates = [
+        {p['model_name'] for p in item.forecast['model_performances']} for item in items[:3]
+    ]
+    assert 'arima' in candidates[1]
+    assert 'holt' in candidates[0] and 'arima' not in candidates[0]
+    assert 'holt' in candidates[2] and 'arima' not in candidates[2]